@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from supabase import create_client
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import logging
 import uuid
 
 from api.device_dto import DeviceDTO
@@ -9,57 +11,132 @@ from api.device_dto import DeviceDTO
 LogSummary = List[Dict[str, Any]]
 LogDetails = List[Dict[str, Any]]
 
+DEVICES_TABLE = "devices"
+DATA_TABLE = "pressure_data"
+FRAMES_TABLE = "pressure_frames"
+
 
 class APIClient:
-    """서버와 통신하기 위한 객체지향 API 클라이언트.
+    """서버(Supabase PostgREST)와 통신하기 위한 객체지향 API 클라이언트.
 
-    - 인스턴스 생성 시 기본 `server_url`, `api_key`를 설정할 수 있으며,
-      각 메서드 호출 시 인자로 전달하면 해당 값이 우선합니다.
-    - 재시도, 타임아웃, 공통 헤더를 내부 세션에서 관리합니다.
-    - 현재는 샘플 데이터를 반환하도록 구현되어 있습니다.
+    - HTTP keep-alive 커넥션 풀을 가진 세션 하나를 재사용합니다 (처음 사용할 때 생성).
+    - 모든 요청에 타임아웃을 적용하며, 호출마다 `timeout`으로 덮어쓸 수 있습니다.
+    - 비동기 전송(`insert_rows_async`)은 동시 요청 수를 `max_in_flight`로 제한합니다.
+    - `insert_rows`는 여러 행을 하나의 POST로 전송합니다 (bulk insert).
     """
 
     def __init__(
         self,
         server_url: Optional[str] = None,
         api_key: Optional[str] = None,
+        timeout: float = 5.0,
+        max_in_flight: int = 4,
+        batch_size: int = 500,
     ) -> None:
         self.server_url = server_url.rstrip("/") if server_url else None
         self.api_key = api_key
-        if not self.server_url or not self.api_key:
-            self.client = None
-        else:
-            self.client = create_client(self.server_url, self.api_key)
+        self.timeout = timeout
+        self.max_in_flight = max(1, max_in_flight)
+        self.batch_size = max(1, batch_size)
+        self.logger = logging.getLogger("api_client")
+
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.server_url and self.api_key)
+
+    @property
+    def session(self):
+        """커넥션 풀 세션은 처음 사용할 때 생성 (requests import 비용 지연)."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+
+                    session = requests.Session()
+                    # 연결 실패만 재시도 (POST 중복 삽입 방지)
+                    retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight, max_retries=retry)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers.update({
+                        "apikey": self.api_key or "",
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json",
+                    })
+                    self._session = session
+        return self._session
+
+    def _request(self, method: str, table: str, timeout: Optional[float] = None, **kwargs):
+        url = f"{self.server_url}/rest/v1/{table}"
+        resp = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def _generate_device_id(self) -> int:
         device_uuid = uuid.uuid4()
         device_id = int(device_uuid.hex, 16) % (2**31)
         return device_id
 
-    def register_device(self) -> Optional[int]:
-        if self.client is None:
+    def register_device(self, timeout: Optional[float] = None) -> Optional[int]:
+        if not self.configured:
             return None
         device_id = self._generate_device_id()
         dto = DeviceDTO(device_id, datetime.now())
-        devices_table = self.client.table("devices")
-        query = devices_table.insert(dto.to_dict())
         try:
-            response = query.execute()
-            if response.data:
-                return response.data[0]["id"]
+            resp = self._request("POST", DEVICES_TABLE, timeout=timeout, json=dto.to_dict(),
+                                 headers={"Prefer": "return=representation"})
+            data = resp.json()
+            if data:
+                return data[0]["id"]
         except Exception as e:
+            self.logger.error(f"Device registration failed: {e}")
             return None
         return None
 
+    def insert_rows(self, table: str, rows: List[Dict[str, Any]], timeout: Optional[float] = None) -> int:
+        """여러 행을 batch_size 단위의 POST로 삽입하고 삽입된 행 수를 반환."""
+        if not self.configured or not rows:
+            return 0
+        inserted = 0
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            self._request("POST", table, timeout=timeout, json=chunk, headers={"Prefer": "return=minimal"})
+            inserted += len(chunk)
+        return inserted
+
+    def insert_rows_async(self, table: str, rows: List[Dict[str, Any]], timeout: Optional[float] = None) -> Future:
+        """insert_rows를 백그라운드에서 실행. 진행 중인 요청이 max_in_flight개이면 대기."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="api-client")
+        self._in_flight.acquire()
+        try:
+            future = self._executor.submit(self.insert_rows, table, rows, timeout)
+        except Exception:
+            self._in_flight.release()
+            raise
+        future.add_done_callback(lambda _: self._in_flight.release())
+        return future
+
     def get_logs_by_date(self, device_id: int) -> LogSummary:
         """날짜별 로그 요약(부위별 압력 시간 총합-초)을 조회.
 
         현재는 샘플 데이터를 반환합니다.
         """
-        # base_url, key = self._resolve_credentials(server_url, api_key)
-        # resp = self._request("GET", f"{base_url}/devices/{device_id}/logs/summary", key)
-        # resp.raise_for_status()
-        # return resp.json()
         return [
             {
                 "datetime": "2025-08-19",
@@ -79,15 +156,11 @@ class APIClient:
             },
         ]
 
-    def get_log_details(self, server_url: Optional[str], api_key: Optional[str], device_id: str, date: str) -> LogDetails:
+    def get_log_details(self, device_id: str, date: str) -> LogDetails:
         """특정 날짜의 상세 로그(시간대별 압력 값)를 조회.
 
         현재는 샘플 데이터를 반환합니다.
         """
-        # base_url, key = self._resolve_credentials(server_url, api_key)
-        # resp = self._request("GET", f"{base_url}/devices/{device_id}/logs/{date}", key)
-        # resp.raise_for_status()
-        # return resp.json()
         return [
             {
                 "datetime": f"{date} 10:00:00",
@@ -107,13 +180,11 @@ class APIClient:
             },
         ]
 
-    def send_data(self, server_url: Optional[str], api_key: Optional[str], device_id: str, data: Dict[str, Any]) -> bool:
-        """측정 데이터를 서버로 전송.
-
-        현재는 성공(True)으로 가정합니다.
-        """
-        # base_url, key = self._resolve_credentials(server_url, api_key)
-        # resp = self._request("POST", f"{base_url}/devices/{device_id}/data", key, json=data)
-        # resp.raise_for_status()
-        # return True
-        return True
\ No newline at end of file
+    def send_data(self, device_id: str, data: Dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """측정 데이터 한 건을 서버로 전송. 주기적 전송에는 UploadQueue 사용 권장."""
+        row = {"device_id": device_id, "created_at": datetime.now().isoformat(), **data}
+        try:
+            return self.insert_rows(DATA_TABLE, [row], timeout=timeout) == 1
+        except Exception as e:
+            self.logger.warning(f"send_data failed: {e}")
+            return False
@@ -0,0 +1,142 @@
+"""로컬 테스트/벤치마크용 Supabase(PostgREST) 대체 서버.
+
+    python -m api.fake_server --port 54321 --api-key test
+
+`POST /rest/v1/<table>` (단일 객체 또는 배열), `GET /rest/v1/<table>?col=eq.value`만 지원합니다.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qsl
+import argparse
+import itertools
+import json
+import threading
+import time
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive
+    server: "FakeSupabaseServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Optional[Any] = None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _table(self) -> Optional[str]:
+        path = urlparse(self.path).path
+        prefix = "/rest/v1/"
+        if not path.startswith(prefix) or len(path) == len(prefix):
+            return None
+        return path[len(prefix):]
+
+    def _authorized(self) -> bool:
+        key = self.server.api_key
+        return key is None or self.headers.get("apikey") == key
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        table = self._table()
+        if not self._authorized():
+            return self._reply(401, {"message": "Invalid API key"})
+        if table is None:
+            return self._reply(404, {"message": "Not found"})
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            return self._reply(400, {"message": "Invalid JSON"})
+        rows = data if isinstance(data, list) else [data]
+        if not all(isinstance(r, dict) for r in rows):
+            return self._reply(400, {"message": "Rows must be objects"})
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        inserted = self.server.insert(table, rows)
+        self.server.requests += 1
+        if "return=representation" in self.headers.get("Prefer", ""):
+            return self._reply(201, inserted)
+        return self._reply(201)
+
+    def do_GET(self):
+        table = self._table()
+        if not self._authorized():
+            return self._reply(401, {"message": "Invalid API key"})
+        if table is None:
+            return self._reply(404, {"message": "Not found"})
+        filters = {k: v[3:] for k, v in parse_qsl(urlparse(self.path).query) if v.startswith("eq.")}
+        rows = [r for r in self.server.rows(table) if all(str(r.get(k)) == v for k, v in filters.items())]
+        return self._reply(200, rows)
+
+
+class FakeSupabaseServer(ThreadingHTTPServer):
+    """메모리에 테이블을 저장하는 PostgREST 호환 서버. `with` 블록에서 백그라운드 실행."""
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, api_key: Optional[str] = None, latency: float = 0.0):
+        super().__init__((host, port), _Handler)
+        self.api_key = api_key
+        self.latency = latency
+        self.requests = 0
+        self._tables: Dict[str, List[Dict[str, Any]]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def insert(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with self._lock:
+            stored = self._tables.setdefault(table, [])
+            inserted = []
+            for row in rows:
+                row = dict(row)
+                row.setdefault("id", next(self._ids))
+                stored.append(row)
+                inserted.append(row)
+            return inserted
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._tables.get(table, []))
+
+    def start(self) -> "FakeSupabaseServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-supabase", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeSupabaseServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Supabase/PostgREST server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 인위적 지연 (초)")
+    args = parser.parse_args()
+    server = FakeSupabaseServer(args.host, args.port, args.api_key, args.latency)
+    print(f"Serving on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,172 @@
+from collections import deque
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import threading
+import logging
+import time
+
+from api.api_client import APIClient, DATA_TABLE, FRAMES_TABLE
+
+
+def _is_permanent(error: Exception) -> bool:
+    """재시도해도 같은 결과인 HTTP 오류 (408/429를 제외한 4xx)."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and 400 <= status < 500 and status not in (408, 429)
+
+
+class UploadQueue:
+    """측정 데이터를 모아서 bulk insert로 전송하는 백그라운드 업로드 큐.
+
+    - `put()`은 블로킹하지 않으며, 큐가 가득 차면 가장 오래된 행을 버립니다.
+    - batch_size개가 모이거나 flush_interval초가 지나면 한 번의 POST로 전송합니다.
+    - 연결 오류/타임아웃/5xx/408/429는 행을 큐 앞쪽으로 되돌리고 다음 주기에 재시도합니다 (오프라인 버퍼링).
+    - 그 밖의 4xx(스키마 불일치, 없는 컬럼, RLS 거부 등)는 재시도해도 같으므로 배치를 버리고 rejected로 셉니다
+      (뒤에 쌓인 행을 막지 않도록, 같은 오류는 한 번만 로그).
+    """
+    def __init__(self, client: APIClient, table: str = DATA_TABLE, batch_size: int = 50,
+                 flush_interval: float = 2.0, max_pending: int = 10000):
+        self.client = client
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.pending: deque = deque(maxlen=max_pending)
+        self.logger = logging.getLogger("upload_queue")
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rejected = 0 # 서버가 거부하여 버린 행 (재시도하지 않음)
+        self.online = True
+        self._rejected_errors = set() # 이미 로그한 거부 오류
+
+        self._cv = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._loop, name="upload-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True, timeout: float = 5.0):
+        with self._cv:
+            self._stop = True
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if flush:
+            self._flush_all()
+
+    def put(self, device_id: Any, data: Dict[str, Any], ts: Optional[float] = None):
+        created_at = datetime.fromtimestamp(ts) if ts is not None else datetime.now()
+        row = {"device_id": device_id, "created_at": created_at.isoformat(), **data}
+        with self._cv:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+            self.pending.append(row)
+            if len(self.pending) >= self.batch_size:
+                self._cv.notify()
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        while self.pending and len(batch) < self.batch_size:
+            batch.append(self.pending.popleft())
+        return batch
+
+    def _requeue(self, batch: List[Dict[str, Any]]):
+        with self._cv:
+            free = self.pending.maxlen - len(self.pending)
+            keep = batch[len(batch) - free:] if free < len(batch) else batch
+            self.dropped += len(batch) - len(keep)
+            self.pending.extendleft(reversed(keep))
+
+    def _send(self, batch: List[Dict[str, Any]]) -> bool:
+        try:
+            self.client.insert_rows(self.table, batch)
+        except Exception as e:
+            if _is_permanent(e):
+                # 서버에는 닿았으므로 오프라인이 아님: 배치를 버리고 다음 배치를 바로 보냄
+                self.rejected += len(batch)
+                self.online = True
+                message = str(e)
+                if message not in self._rejected_errors:
+                    self._rejected_errors.add(message)
+                    self.logger.error(f"Upload rejected by server, dropping batch of {len(batch)} rows: {message}")
+                return True
+            self.failed += len(batch)
+            if self.online:
+                self.logger.warning(f"Upload failed, buffering locally: {e}")
+            self.online = False
+            self._requeue(batch)
+            return False
+        self.sent += len(batch)
+        self.online = True
+        return True
+
+    def _loop(self):
+        last_flush = time.monotonic()
+        while True:
+            with self._cv:
+                if not self._stop and len(self.pending) < self.batch_size:
+                    self._cv.wait(timeout=max(0.0, self.flush_interval - (time.monotonic() - last_flush)))
+                if self._stop:
+                    return
+                due = len(self.pending) >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval
+                batch = self._take_batch() if due else []
+            if not due:
+                continue
+            last_flush = time.monotonic()
+            if batch and not self._send(batch):
+                # 오프라인: 다음 flush 주기까지 대기
+                with self._cv:
+                    self._cv.wait(timeout=self.flush_interval)
+
+    def _flush_all(self):
+        while True:
+            with self._cv:
+                batch = self._take_batch()
+            if not batch or not self._send(batch):
+                return
+
+
+class FrameUploader:
+    """원시 프레임을 압축 블록(codec.frame_codec)으로 묶어 UploadQueue로 전송.
+
+    블록마다 키프레임으로 시작하므로 서버는 블록 단위로 (head, body)를 복원할 수 있습니다.
+    """
+    def __init__(self, client: APIClient, block_frames: int = 60, compression: str = "zlib",
+                 table: str = FRAMES_TABLE, **queue_kwargs):
+        from codec.frame_codec import FrameBlockEncoder
+        self.queue = UploadQueue(client, table=table, **queue_kwargs)
+        self.block_frames = max(1, block_frames)
+        self.blocks = FrameBlockEncoder(compression)
+        self._device_id = None
+
+    def start(self):
+        self.queue.start()
+
+    def stop(self, flush: bool = True):
+        if flush:
+            self._finish_block()
+        self.queue.stop(flush=flush)
+
+    def put(self, device_id: Any, ts: float, head, body):
+        self._device_id = device_id
+        self.blocks.add(head, body, ts)
+        if len(self.blocks) >= self.block_frames:
+            self._finish_block()
+
+    def _finish_block(self):
+        if not len(self.blocks):
+            return
+        count, first_ts = len(self.blocks), self.blocks.first_ts
+        block = self.blocks.finish()
+        self.queue.put(self._device_id, {
+            "frame_count": count,
+            "frames": base64.b64encode(block).decode("ascii"),
+        }, first_ts)
@@ -0,0 +1,136 @@
+"""활동량/압력 중심 집계(ActivityTracker) 벤치마크.
+
+합성 말뭉치(자세가 바뀌는 시퀀스 연속)를 1Hz로 24시간 분량 반복 재생하며
+- update()의 프레임당 시간 (detect() 대비 비율)과 tracemalloc 기준 프레임당 피크 할당량
+- 1시간 재생 후와 24시간 재생 후의 추적 메모리 차이 (원형 버퍼이므로 늘지 않아야 함)
+- 분/시간 집계가 프레임별 값의 합과 일치하는지, 자세가 바뀌는 시퀀스 경계에서 활동량이 큰지
+를 확인합니다. detect() 대비 비용이 --max-ratio를 넘거나, 프레임마다 할당하거나,
+실행 시간에 따라 메모리가 늘거나, 집계가 맞지 않으면 exit 1.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.activity [--hours 24]
+"""
+from dataclasses import replace
+from typing import List
+import argparse
+import logging
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import generate_corpus
+from detection.activity import ActivityTracker
+from detection.config import DetectionConfig
+from detection.detection import Detection
+
+
+def _detect_cost(config: DetectionConfig, head: List[np.ndarray], body: List[np.ndarray]) -> float:
+    detector = Detection(replace(config, activity_tracking=False))
+    start = time.perf_counter()
+    for i in range(len(body)):
+        detector.detect(head[i], body[i])
+    return (time.perf_counter() - start) / len(body) * 1e6
+
+
+def _update_cost(config: DetectionConfig, ts: np.ndarray, head: List[np.ndarray], body: List[np.ndarray]):
+    tracker = ActivityTracker(config)
+    for i in range(min(20, len(body))):
+        tracker.update(ts[i], head[i], body[i], 0)
+    # 분 경계(원형 버퍼 기록)는 분당 한 번이므로 프레임당 할당 측정에서는 같은 분 안의 프레임만 봄
+    worst = 0
+    tracemalloc.start()
+    try:
+        for i in range(len(body)):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            tracker.update(ts[20], head[i], body[i], 0)
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    for i in range(len(body)):
+        tracker.update(ts[i], head[i], body[i], 0)
+    return (time.perf_counter() - start) / len(body) * 1e6, worst
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Activity tracker benchmark")
+    parser.add_argument("--hours", type=int, default=24, help="재생할 시간 (1Hz)")
+    parser.add_argument("--max-ratio", type=float, default=0.05, help="detect() 대비 허용 비용 비율")
+    parser.add_argument("--peak-budget", type=int, default=256, help="update() 프레임당 허용 피크 할당 (바이트)")
+    parser.add_argument("--growth-budget", type=int, default=4096, help="1시간 → 전체 재생 사이 허용 메모리 증가 (바이트)")
+    args = parser.parse_args(argv)
+    logging.getLogger("sensor_health").setLevel(logging.ERROR)
+
+    corpus = generate_corpus()
+    head, body, postures = list(corpus["head"]), list(corpus["body"]), corpus["labels"]
+    n = len(body)
+    config = DetectionConfig(log_path=os.devnull, activity_log_path="")
+    failures = []
+
+    detect_us = _detect_cost(config, head, body)
+    update_us, peak = _update_cost(config, corpus["ts"], head, body)
+    ratio = update_us / detect_us
+    print(f"detect: {detect_us:.1f} us/frame, activity update: {update_us:.1f} us/frame ({ratio:.1%}), peak {peak} B/frame")
+    if ratio > args.max_ratio:
+        failures.append(f"update() costs {ratio:.1%} of detect() (budget {args.max_ratio:.0%})")
+    if peak > args.peak_budget:
+        failures.append(f"update() allocates {peak} B per frame (budget {args.peak_budget})")
+
+    # 1Hz로 --hours 시간 재생 (말뭉치 반복)
+    tracker = ActivityTracker(config)
+    frames = args.hours * 3600
+    per_frame = np.empty(frames)
+    hour_memory = 0
+    tracemalloc.start()
+    try:
+        for t in range(frames):
+            i = t % n
+            per_frame[t] = tracker.update(float(t), head[i], body[i], int(postures[i]))["activity"]
+            if t == 3600:
+                hour_memory = tracemalloc.get_traced_memory()[0]
+        growth = tracemalloc.get_traced_memory()[0] - hour_memory
+    finally:
+        tracemalloc.stop()
+    tracker.flush()
+    print(f"{args.hours} h replay: memory growth after first hour {growth} B, "
+          f"{tracker.minutes.count} minutes / {tracker.hours.count} hours in rings")
+    if growth > args.growth_budget:
+        failures.append(f"memory grew by {growth} B between hour 1 and hour {args.hours}")
+
+    # 집계 일치: 분 단위 합 = 링에 남은 구간의 프레임별 합, 시간 단위 합 = 분 단위 합
+    minutes = tracker.minutes.last()
+    covered = per_frame[int(minutes["start"][0]):]
+    if int(minutes["frames"].sum()) != len(covered):
+        failures.append(f"minute rollups cover {int(minutes['frames'].sum())} frames, expected {len(covered)}")
+    if not math.isclose(float(minutes["activity"].astype(np.float64).sum()), float(covered.sum()), rel_tol=1e-4):
+        failures.append("minute activity sums do not match per-frame activity")
+    hours = tracker.hours.last()
+    if len(hours) != min(args.hours - 1, len(tracker.hours.data)) or np.any(hours["frames"] != 3600):
+        failures.append(f"unexpected hour rollups: {len(hours)} hours, frames {sorted(set(hours['frames'].tolist()))}")
+    if len(hours) and not math.isclose(float(hours["activity"].sum()), float(per_frame[:len(hours) * 3600].sum()), rel_tol=1e-3):
+        failures.append("hour activity sums do not match per-frame activity")
+
+    # 자세가 바뀌는 시퀀스 경계 프레임 vs 시퀀스 내부 프레임의 활동량
+    changes = np.flatnonzero(np.diff(corpus["sequence"])) + 1
+    boundary = float(per_frame[changes].mean())
+    steady = float(np.delete(per_frame[1:n], changes - 1).mean())
+    print(f"activity at sequence boundaries {boundary:.1f} vs within sequences {steady:.1f}")
+    if boundary <= 2 * steady:
+        failures.append("activity index does not separate posture changes from steady frames")
+
+    if failures:
+        for failure in failures:
+            print(failure)
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
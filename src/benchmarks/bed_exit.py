@@ -0,0 +1,266 @@
+"""침대 이탈/재실 빠른 경로 지연 시간 벤치마크 (시리얼 바이트 → 알림).
+
+가상 시리얼 포트(pty)에 SerialSupervisor 리더를 붙이고, 재실 프레임과 빈 침대 프레임을
+보드 7개 분량의 텍스트 줄(또는 바이너리 프레임) 묶음으로 번갈아 쓰면서
+쓰기 직전부터 각 알림 훅이 이벤트를 받기까지의 시간을 측정합니다.
+- callback: 리더 스레드에서 호출된 시각
+- socket: Unix 데이터그램 소켓 수신 스레드가 받은 시각
+- file: 파일에 한 줄을 추가하고 돌아온 시각
+이벤트는 상태를 바꾸는 묶음만으로 (다음 프레임 없이) 와야 하고, 재실 상태의 노이즈/뒤척임 프레임에서는
+이벤트가 없어야 합니다. 누가 누운 채로 시작할 때 (보드가 하나씩 들어오는 첫 프레임) 재실 알림이 없어야 하고,
+보드가 stale이 되어 행이 0으로 지워져도 이탈 알림이 없어야 합니다. 어느 훅이든 p95가 --budget-ms를 넘거나 이벤트가 빠지거나 잘못 오면 exit 1.
+
+측정은 마지막 바이트를 쓴 이후의 소프트웨어 지연이며, 실제 선로 전송 시간
+(9600bps 텍스트 형식에서 보드 한 줄 약 0.1초, 바이너리 115200bps에서 약 3ms)은 포함하지 않습니다.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.bed_exit [--cycles 50]
+"""
+from typing import Dict, List
+import argparse
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import tty
+
+import numpy as np
+
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.occupancy import CallbackHook, FileHook, OccupancyMonitor, SocketHook
+from serialcm.binary_protocol import encode_frame
+from serialcm.board import BoardData
+from serialcm.serial_communication import BOARDS, HEAD_BOARD, SerialCommunication
+from serialcm.supervisor import SerialSupervisor
+
+
+def _board_values(head: np.ndarray, body: np.ndarray) -> List[np.ndarray]:
+    """프레임 → 보드별 채널 값 (SerialCommunication의 작업 행렬 배치와 같은 순서)."""
+    return [head.reshape(-1) if board == HEAD_BOARD else body[2 * idx - 2:2 * idx].reshape(-1)
+            for idx, board in enumerate(BOARDS)]
+
+
+def encode(head: np.ndarray, body: np.ndarray, binary: bool) -> bytes:
+    chunks = []
+    for idx, (board, values) in enumerate(zip(BOARDS, _board_values(head, body))):
+        if binary:
+            chunks.append(encode_frame(idx, values))
+        else:
+            chunks.append((" ".join(f"{board}C{c}:{int(v)}" for c, v in enumerate(values)) + "\n").encode())
+    return b"".join(chunks)
+
+
+class _Timed:
+    """훅 호출이 끝난 시각 기록."""
+    def __init__(self, hook, times: Dict[int, float], done: threading.Event):
+        self.hook, self.times, self.done = hook, times, done
+
+    def send(self, event: Dict):
+        self.hook.send(event)
+        self.times[event["revision"]] = time.perf_counter()
+        self.done.set()
+
+    def close(self):
+        self.hook.close()
+
+
+def _update_cost(config: DetectionConfig, head: np.ndarray, body: np.ndarray):
+    monitor = OccupancyMonitor(config)
+    heads, bodies = list(head), list(body)
+    for i in range(20):
+        monitor.update(heads[i], bodies[i], 0.0)
+    worst = 0
+    tracemalloc.start()
+    try:
+        for i in range(len(bodies)):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            monitor.update(heads[i], bodies[i], 0.0)
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    for i in range(len(bodies)):
+        monitor.update(heads[i], bodies[i], 0.0)
+    return (time.perf_counter() - start) / len(bodies) * 1e6, worst
+
+
+def _partial_frames(config: DetectionConfig, occupied: List, empty: List) -> List[str]:
+    """stale/미수신 보드의 0으로 채운 행을 빈 침대로 읽지 않는지 확인 (오류 목록)."""
+    events: List[Dict] = []
+    serial_comm = SerialCommunication(occupancy=OccupancyMonitor(config, [CallbackHook(events.append)]))
+
+    def publish(head, body, boards):
+        for board, values in zip(BOARDS, _board_values(head, body)):
+            if board in boards:
+                serial_comm._publish(BoardData(board, time.time(), {}, values.copy()))
+
+    errors = []
+    # 재실 상태로 시작: 감시자처럼 보드가 처음 수신될 때마다 stale 목록에서 뺌
+    for i, board in enumerate(BOARDS):
+        serial_comm._on_stale(set(BOARDS[i + 1:]))
+        publish(*occupied[0], {board})
+    for head, body in occupied[1:4]:
+        publish(head, body, set(BOARDS))
+    if events or serial_comm.occupancy.occupied is not True:
+        errors.append(f"startup while occupied: events {[e['event'] for e in events]}, "
+                      f"occupied={serial_comm.occupancy.occupied}")
+    # 재실 중 발쪽 보드만 남고 모두 stale → 행이 0으로 지워짐 (발쪽 행에 하중이 없으면 남은 행만으로는 이탈처럼 보임)
+    serial_comm._on_stale(set(BOARDS[:-1]))
+    for (head, body), (_, empty_body) in zip(occupied[4:8], empty):
+        body = body.copy()
+        body[-2:] = empty_body[-2:]
+        publish(head, body, {BOARDS[-1]})
+    if events:
+        errors.append(f"stale boards while occupied: events {[e['event'] for e in events]}")
+    # 모든 보드가 돌아온 뒤 빈 침대 → 이탈 한 번
+    serial_comm._on_stale(set())
+    for head, body in empty[:3]:
+        publish(head, body, set(BOARDS))
+    if [e["event"] for e in events] != ["exit"]:
+        errors.append(f"exit after boards recovered: events {[e['event'] for e in events]}")
+    return errors
+
+
+def run(config: DetectionConfig, occupied: List, empty: List, cycles: int, binary: bool, timeout: float) -> Dict:
+    """pty로 cycles번 재실/이탈을 반복 → 훅별 지연(ms) 목록과 오류."""
+    tmp = tempfile.mkdtemp(prefix="bed_exit_")
+    sock_path, file_path = os.path.join(tmp, "alerts.sock"), os.path.join(tmp, "alerts.log")
+    receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    receiver.bind(sock_path)
+    receiver.settimeout(0.2)
+
+    times = {"callback": {}, "file": {}, "socket": {}}
+    events: List[Dict] = []
+    got = {name: threading.Event() for name in times}
+
+    def on_event(event):
+        times["callback"][event["revision"]] = time.perf_counter()
+        events.append(dict(event))
+        got["callback"].set()
+
+    stop = threading.Event()
+
+    def receive():
+        while not stop.is_set():
+            try:
+                payload = receiver.recv(4096)
+            except socket.timeout:
+                continue
+            times["socket"][json.loads(payload)["revision"]] = time.perf_counter()
+            got["socket"].set()
+
+    monitor = OccupancyMonitor(config, [CallbackHook(on_event), _Timed(FileHook(file_path), times["file"], got["file"]),
+                                        SocketHook(sock_path)])
+    serial_comm = SerialCommunication(occupancy=monitor)
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    supervisor = SerialSupervisor(SerialCommunication._parse, serial_comm._publish, read_timeout=0.05,
+                                  patterns=(os.ttyname(slave),), boards=BOARDS, on_stale=serial_comm._on_stale)
+    serial_comm.supervisor = supervisor
+    thread = threading.Thread(target=receive, daemon=True)
+    thread.start()
+    latencies = {name: [] for name in times}
+    errors = []
+    try:
+        supervisor.start()
+        # 첫 판정(빈 침대)이 끝나도록 빈 프레임을 몇 번 보냄
+        for frame in empty[:3]:
+            os.write(master, frame)
+            time.sleep(0.05)
+        for cycle in range(cycles):
+            for kind, frames in (("enter", occupied), ("exit", empty)):
+                before = len(events)
+                for flag in got.values():
+                    flag.clear()
+                start = time.perf_counter()
+                os.write(master, frames[cycle % len(frames)])
+                if not all(flag.wait(timeout) for flag in got.values()):
+                    errors.append(f"cycle {cycle}: no '{kind}' alert within {timeout:.1f}s")
+                    continue
+                new = events[before:]
+                if [e["event"] for e in new] != [kind]:
+                    errors.append(f"cycle {cycle}: expected one '{kind}' event, got {[e['event'] for e in new]}")
+                    continue
+                revision = new[0]["revision"]
+                for name in times:
+                    latencies[name].append((times[name][revision] - start) * 1000)
+                # 같은 상태의 노이즈/뒤척임 프레임 (이벤트가 없어야 함)
+                for i in range(1, 4):
+                    os.write(master, frames[(cycle + i) % len(frames)])
+                    time.sleep(0.01)
+                time.sleep(0.02)
+                if len(events) != before + 1:
+                    errors.append(f"cycle {cycle}: spurious events while {kind}ed: {[e['event'] for e in events[before + 1:]]}")
+    finally:
+        stop.set()
+        supervisor.stop()
+        monitor.close()
+        os.close(master)
+        os.close(slave)
+        thread.join(1.0)
+        receiver.close()
+    with open(file_path) as f:
+        logged = sum(1 for _ in f)
+    if logged != len(events):
+        errors.append(f"alert file has {logged} lines for {len(events)} events")
+    return {"latencies": latencies, "errors": errors}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bed-exit fast path latency benchmark")
+    parser.add_argument("--cycles", type=int, default=50, help="재실/이탈 반복 횟수")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="훅별 허용 p95 지연 (ms)")
+    parser.add_argument("--peak-budget", type=int, default=256, help="update() 프레임당 허용 피크 할당 (바이트)")
+    args = parser.parse_args(argv)
+    logging.getLogger("occupancy").setLevel(logging.ERROR)
+    logging.getLogger("serial_supervisor").setLevel(logging.ERROR)
+
+    corpus = generate_corpus(frames_per_sequence=10)
+    config = DetectionConfig(log_path=os.devnull, activity_log_path="")
+    rng = np.random.default_rng(0)
+    empty_head = np.clip(np.rint(90 + rng.normal(0, 8, (20, 2, 3))), 0, 1023).astype(np.uint16)
+    empty_body = np.clip(np.rint(90 + rng.normal(0, 8, (20, 12, 7))), 0, 1023).astype(np.uint16)
+    failures = []
+
+    us, peak = _update_cost(config, corpus["head"], corpus["body"])
+    print(f"occupancy update: {us:.1f} us/frame, peak {peak} B/frame")
+    if peak > args.peak_budget:
+        failures.append(f"update() allocates {peak} B per frame (budget {args.peak_budget})")
+
+    partial = _partial_frames(config, list(zip(corpus["head"], corpus["body"])), list(zip(empty_head, empty_body)))
+    print(f"partial/stale frames: {'ok' if not partial else '; '.join(partial)}")
+    failures += partial
+
+    print(f"{'protocol':<8} {'hook':<9} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7}")
+    for binary in (False, True):
+        protocol = "binary" if binary else "text"
+        occupied = [encode(h, b, binary) for h, b in zip(corpus["head"], corpus["body"])]
+        empty = [encode(h, b, binary) for h, b in zip(empty_head, empty_body)]
+        result = run(config, occupied, empty, args.cycles, binary, timeout=1.0)
+        failures += [f"{protocol}: {e}" for e in result["errors"]]
+        for hook, values in result["latencies"].items():
+            if not values:
+                continue
+            p50, p95, worst = np.percentile(values, 50), np.percentile(values, 95), max(values)
+            print(f"{protocol:<8} {hook:<9} {p50:>7.2f} {p95:>7.2f} {worst:>7.2f}")
+            if p95 > args.budget_ms:
+                failures.append(f"{protocol}/{hook}: p95 {p95:.1f} ms > {args.budget_ms:.0f} ms")
+
+    if failures:
+        for failure in failures:
+            print(failure)
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""셀별 보정 조회 테이블 벤치마크 + 정확도/동등성 검사.
+
+셀마다 오프셋/게인/비선형성이 다른 합성 센서로 빈 침대 + 하중 단계를 '수집'하여 보정을 맞춘 뒤
+- 같은 하중에서 셀 간 출력 편차(표준편차)가 보정 전보다 줄어드는지
+- 저장/불러오기 후 테이블이 같은지, apply_cells()(수집 경로)와 apply()(일괄)가 같은 값을 내는지
+- 보정 곡선을 프레임마다 직접 계산하는 방식과 테이블 조회의 프레임당 시간
+을 확인합니다. 하중 단계 수(모델 복잡도)가 달라도 테이블 조회 시간은 같아야 합니다.
+검사에 실패하면 exit 1.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.calibration [--frames 2000]
+"""
+from typing import List
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from calibration.calibration import CELLS, HEAD_CELLS, LEVELS, Calibration, _interp, _monotone
+
+
+class SyntheticSensors:
+    """raw = offset + gain * 900 * (1 - exp(-load / scale)) (셀마다 다른 포화 곡선)."""
+    def __init__(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.offset = rng.uniform(0, 80, CELLS)
+        self.gain = rng.uniform(0.7, 1.3, CELLS)
+        self.scale = rng.uniform(30, 70, CELLS)
+        self.rng = rng
+
+    def read(self, load: float, noise: float = 0.0) -> np.ndarray:
+        raw = self.offset + self.gain * 900 * (1 - np.exp(-load / self.scale))
+        return np.clip(raw + self.rng.normal(0, noise, CELLS), 0, LEVELS - 1)
+
+
+def _direct(raw: np.ndarray, loads: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """보정 곡선을 셀마다 직접 계산 (조회 테이블 없이 프레임마다 수행하는 경우)."""
+    reference = _monotone(np.median(points, axis=1))
+    out = np.empty(CELLS)
+    for cell in range(CELLS):
+        load = _interp(raw[cell:cell + 1], _monotone(points[:, cell]), loads)
+        out[cell] = _interp(load, loads, reference)[0]
+    return np.clip(np.rint(out), 0, LEVELS - 1)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-cell calibration lookup table benchmark")
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    sensors = SyntheticSensors()
+    rng = np.random.default_rng(1)
+    frames = np.stack([sensors.read(load, noise=3.0) for load in rng.uniform(0, 100, args.frames)]).astype(np.uint16)
+    failures = []
+
+    print(f"{'steps':<22} {'spread@50':>10} {'lut us':>8} {'direct us':>10}")
+    raw_spread = float(np.std(sensors.read(50.0)))
+    print(f"{'(uncalibrated)':<22} {raw_spread:>10.1f}")
+    lut_times = []
+    for loads in ([0.0], [0.0, 40.0], [0.0, 10.0, 25.0, 50.0, 100.0]):
+        loads = np.array(loads)
+        points = np.stack([sensors.read(load) for load in loads])
+        calibration = Calibration.fit(loads, points)
+
+        # 정확도: 같은 하중에서 셀 간 편차
+        probe = sensors.read(50.0).astype(np.uint16)
+        head, body = calibration.apply(probe[:HEAD_CELLS].reshape(2, 3), probe[HEAD_CELLS:].reshape(12, 7))
+        spread = float(np.std(np.concatenate([head.ravel(), body.ravel()])))
+        if len(loads) > 1 and spread >= raw_spread:
+            failures.append(f"{len(loads)} steps: spread not reduced ({spread:.1f} >= {raw_spread:.1f})")
+
+        # 저장/불러오기
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.npz")
+            calibration.save(path)
+            loaded = Calibration.load(path)
+            size = os.path.getsize(path)
+        if not np.array_equal(loaded.lut, calibration.lut):
+            failures.append(f"{len(loads)} steps: lookup table changed after save/load")
+
+        # 수집 경로(보드 구간별 제자리 보정)와 일괄 경로, 직접 계산이 같은 값인지
+        out = np.empty(CELLS, dtype=np.uint16)
+        for i in range(min(200, len(frames))):
+            frame = frames[i]
+            for start in range(0, CELLS, 14):
+                calibration.apply_cells(frame[start:start + 14], start, out[start:start + 14])
+            head, body = calibration.apply(frame[:HEAD_CELLS].reshape(2, 3), frame[HEAD_CELLS:].reshape(12, 7))
+            batch = np.concatenate([head.ravel(), body.ravel()])
+            direct = _direct(frame.astype(np.float64), loads, points)
+            if not np.array_equal(out, batch) or np.abs(out - direct).max() > 1:
+                failures.append(f"{len(loads)} steps: frame {i} differs between paths")
+                break
+
+        start = time.perf_counter()
+        for frame in frames:
+            calibration.apply_cells(frame, 0, out)
+        lut_us = (time.perf_counter() - start) / len(frames) * 1e6
+        lut_times.append(lut_us)
+        n_direct = min(200, len(frames))
+        start = time.perf_counter()
+        for frame in frames[:n_direct]:
+            _direct(frame.astype(np.float64), loads, points)
+        direct_us = (time.perf_counter() - start) / n_direct * 1e6
+        name = f"{len(loads)} ({size} B file)"
+        print(f"{name:<22} {spread:>10.1f} {lut_us:>8.1f} {direct_us:>10.1f}")
+
+    if failures:
+        for failure in failures:
+            print(failure)
+        print("FAIL")
+        return 1
+    print(f"lookup cost spread across models: {max(lut_times) - min(lut_times):.1f} us")
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
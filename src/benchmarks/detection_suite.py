@@ -0,0 +1,217 @@
+"""Detection 정확도/지연 시간 회귀 벤치마크.
+
+라벨된 프레임 시퀀스(합성 또는 수집 로그)에 감지기를 돌려
+자세 정확도·혼동 행렬, 랜드마크 오차, 프레임당 지연 시간 백분위수를 측정하고
+저장된 기준값(baseline)보다 나빠지면 0이 아닌 코드로 종료합니다.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.detection_suite                          # 기준값과 비교
+    python -m benchmarks.detection_suite --set percentile_p=65     # 설정 변경 효과 확인
+    python -m benchmarks.detection_suite --update-baseline         # 기준값 갱신
+    python -m benchmarks.detection_suite --logs a.csv b.bfc        # 라벨된 수집 로그 (랜드마크 오차 제외)
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, fields, replace
+from typing import Dict, List, Optional, get_type_hints
+
+import numpy as np
+
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.detection import Detection, Posture
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "detection_suite.json")
+LANDMARKS = ("head", "shoulder", "hip")
+WARMUP_FRAMES = 20
+
+
+def parse_overrides(items: List[str]) -> Dict[str, object]:
+    """`key=value` 목록을 DetectionConfig 필드 타입에 맞춰 변환."""
+    hints = get_type_hints(DetectionConfig)
+    names = {f.name for f in fields(DetectionConfig)}
+    overrides = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep or key not in names:
+            raise ValueError(f"invalid override '{item}' (expected <DetectionConfig field>=<value>)")
+        if hints[key] is bool:
+            overrides[key] = value.lower() in ("true", "1", "t", "y", "yes")
+        else:
+            overrides[key] = hints[key](value)
+    return overrides
+
+
+def load_corpus(logs: Optional[List[str]] = None, seed: int = 0, frames_per_sequence: int = 60,
+                sequences_per_posture: int = 5) -> Dict[str, np.ndarray]:
+    """벤치마크 말뭉치: ts, head, body, labels, landmarks (로그는 랜드마크 정답이 없어 NaN)."""
+    if not logs:
+        return generate_corpus(frames_per_sequence, sequences_per_posture, seed)
+    from ml_utils.dataset import encode_labels, load_frames
+    loaded = [load_frames(path) for path in logs]
+    labels = np.concatenate([encode_labels(l[3]) for l in loaded])
+    keep = labels >= 0
+    return {
+        "ts": np.concatenate([l[0] for l in loaded])[keep],
+        "head": np.concatenate([l[1] for l in loaded])[keep],
+        "body": np.concatenate([l[2] for l in loaded])[keep],
+        "labels": labels[keep],
+        "landmarks": np.full((int(keep.sum()), len(LANDMARKS), 2), np.nan),
+    }
+
+
+def run_detector(config: DetectionConfig, head: np.ndarray, body: np.ndarray):
+    """프레임 순서대로 감지 → (자세, 랜드마크 (n,3,2), 프레임당 지연 시간(초))."""
+    n = len(body)
+    postures = np.empty(n, dtype=np.int64)
+    landmarks = np.full((n, len(LANDMARKS), 2), np.nan)
+    latencies = np.empty(n)
+
+    # 첫 호출의 지연(캐시, 지연 import 등)이 백분위수에 섞이지 않도록 별도 인스턴스로 예열
+    warmup = Detection(config)
+    for i in range(min(WARMUP_FRAMES, n)):
+        warmup.detect(head[i], body[i])
+
+    detector = Detection(config)
+    for i in range(n):
+        start = time.perf_counter()
+        result = detector.detect(head[i], body[i])
+        latencies[i] = time.perf_counter() - start
+        postures[i] = result["posture"].value
+        for j, name in enumerate(LANDMARKS):
+            if result[name] is not None:
+                landmarks[i, j] = result[name][:2]
+    return postures, landmarks, latencies
+
+
+def evaluate(truth: np.ndarray, true_landmarks: np.ndarray, postures: np.ndarray,
+             landmarks: np.ndarray, latencies: np.ndarray) -> Dict:
+    classes = len(Posture)
+    confusion = np.bincount(truth * classes + postures, minlength=classes * classes).reshape(classes, classes)
+    support = confusion.sum(axis=1)
+    recall = np.divide(np.diag(confusion), support, out=np.full(classes, np.nan), where=support > 0)
+
+    errors = np.linalg.norm(landmarks - true_landmarks, axis=-1) # (n, 3), 미검출/정답 없음은 NaN
+    landmark_error = {}
+    for j, name in enumerate(LANDMARKS):
+        e = errors[:, j][np.isfinite(errors[:, j])]
+        if len(e):
+            landmark_error[name] = {"mean": float(e.mean()), "p95": float(np.percentile(e, 95)),
+                                    "detected": float(np.isfinite(landmarks[:, j, 0]).mean())}
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1e3
+    return {
+        "frames": int(len(truth)),
+        "accuracy": float((postures == truth).mean()),
+        "recall": {p.name: (None if np.isnan(recall[p.value]) else float(recall[p.value])) for p in Posture},
+        "confusion": confusion.tolist(),
+        "landmark_error": landmark_error,
+        "latency_ms": {"mean": float(latencies.mean() * 1e3), "p50": float(p50), "p95": float(p95), "p99": float(p99)},
+    }
+
+
+def compare(result: Dict, baseline: Dict, accuracy_tol: float, landmark_tol: float, latency_tol: float) -> List[str]:
+    """기준값 대비 회귀 항목 목록 (비어 있으면 통과)."""
+    failures = []
+    if result["accuracy"] < baseline["accuracy"] - accuracy_tol:
+        failures.append(f"accuracy {result['accuracy']:.3f} < baseline {baseline['accuracy']:.3f} - {accuracy_tol}")
+    for name, base in baseline.get("landmark_error", {}).items():
+        current = result["landmark_error"].get(name)
+        if current is None:
+            failures.append(f"{name} landmark no longer detected")
+        elif current["mean"] > base["mean"] + landmark_tol:
+            failures.append(f"{name} landmark error {current['mean']:.3f} > baseline {base['mean']:.3f} + {landmark_tol}")
+    if latency_tol >= 0:
+        for key in ("p50", "p95"):
+            limit = baseline["latency_ms"][key] * (1.0 + latency_tol)
+            if result["latency_ms"][key] > limit:
+                failures.append(f"latency {key} {result['latency_ms'][key]:.3f} ms > {limit:.3f} ms "
+                                f"(baseline {baseline['latency_ms'][key]:.3f} ms + {latency_tol:.0%})")
+    return failures
+
+
+def print_report(result: Dict, baseline: Optional[Dict] = None):
+    names = [p.name for p in Posture]
+    base_acc = f" (baseline {baseline['accuracy']:.3f})" if baseline else ""
+    print(f"frames: {result['frames']}")
+    print(f"accuracy: {result['accuracy']:.3f}{base_acc}")
+    print("confusion (rows: truth, cols: predicted)")
+    print(f"{'':>14}" + "".join(f"{n[:10]:>11}" for n in names) + f"{'recall':>9}")
+    for name, row in zip(names, result["confusion"]):
+        recall = result["recall"][name]
+        print(f"{name:>14}" + "".join(f"{v:>11}" for v in row) + (f"{recall:9.3f}" if recall is not None else f"{'-':>9}"))
+    if result["landmark_error"]:
+        print(f"{'landmark':<10} {'mean':>7} {'p95':>7} {'detected':>9}  (cells)")
+        for name, e in result["landmark_error"].items():
+            print(f"{name:<10} {e['mean']:7.3f} {e['p95']:7.3f} {e['detected']:9.1%}")
+    lat = result["latency_ms"]
+    print(f"latency ms: mean {lat['mean']:.3f}  p50 {lat['p50']:.3f}  p95 {lat['p95']:.3f}  p99 {lat['p99']:.3f}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Detection accuracy/latency regression benchmark")
+    parser.add_argument("--logs", nargs="*", help="라벨된 MLLogger 로그 (없으면 합성 데이터)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames-per-sequence", type=int, default=60)
+    parser.add_argument("--sequences-per-posture", type=int, default=5)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="DetectionConfig 값 변경 (반복 가능)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--accuracy-tol", type=float, default=0.01, help="허용 정확도 하락 (절대값)")
+    parser.add_argument("--landmark-tol", type=float, default=0.1, help="허용 랜드마크 오차 증가 (셀)")
+    parser.add_argument("--latency-tol", type=float, default=0.5,
+                        help="허용 지연 시간 증가 비율 (음수면 지연 시간 검사 안 함)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.logs, args.seed, args.frames_per_sequence, args.sequences_per_posture)
+    corpus_info = ({"logs": [os.path.basename(p) for p in args.logs]} if args.logs else
+                   {"synthetic_seed": args.seed, "frames_per_sequence": args.frames_per_sequence,
+                    "sequences_per_posture": args.sequences_per_posture})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = replace(DetectionConfig(log_path=os.path.join(tmp, "posture_log.csv")), **parse_overrides(args.overrides))
+        postures, landmarks, latencies = run_detector(config, corpus["head"], corpus["body"])
+    result = evaluate(corpus["labels"], corpus["landmarks"], postures, landmarks, latencies)
+    result["corpus"] = corpus_info
+    result["config"] = {k: v for k, v in asdict(config).items() if k != "log_path"}
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print_report(result)
+        print(f"baseline written: {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if baseline is None:
+        print(f"no baseline at {args.baseline} (run with --update-baseline)")
+        return 0
+    if baseline.get("corpus") != corpus_info:
+        print(f"baseline corpus {baseline.get('corpus')} differs from {corpus_info}; skipping regression check")
+        return 0
+
+    failures = compare(result, baseline, args.accuracy_tol, args.landmark_tol, args.latency_tol)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
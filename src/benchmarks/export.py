@@ -0,0 +1,269 @@
+"""녹화 로그 일괄 내보내기(heatmap.export) 벤치마크: 하룻밤 분량 → PNG + GIF/AVI 타임랩스.
+
+합성 말뭉치를 Run 기록 속도(--rate, 기본 10Hz: stream()이 새 데이터가 없어도 0.1초마다 프레임을 냄)로
+--hours시간 반복한 .bfc 로그(8시간 28.8만 프레임)를 만들고, --every초 간격 PNG(기본 10초)와 1분 간격 타임랩스
+GIF/AVI를 --workers 프로세스로 내보내는 시간을 측정합니다. 감지는 모든 프레임에 적용하므로 시간은 대부분
+프레임 수에 비례합니다. 결과물은 벤치마크 안의 독립 디코더 (PNG inflate + Up 필터 복원, GIF LZW, AVI DIB)로
+읽어 첫 프레임, 구간 경계 앞뒤 PNG 프레임이 한 프로세스에서 처음부터 재생하며 그린 프레임과 같은지 확인합니다.
+전체 시간이 프레임당 --budget-ms를 넘거나, 빠진 프레임/다른 픽셀이 있거나,
+부모 프로세스 메모리가 --memory-budget MB 이상 늘면(로그 전체를 메모리에 올리지 않아야 함) exit 1.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.export [--hours 8] [--rate 10] [--every 10] [--workers 4]
+"""
+from dataclasses import replace
+from typing import Dict, List
+import argparse
+import os
+import resource
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+
+import numpy as np
+
+from benchmarks.synthetic import generate_corpus
+from codec.frame_codec import FrameLogWriter
+from detection.config import DetectionConfig
+from detection.detection import Detection
+from heatmap.export import FrameRenderer, export_log, iter_log, plan_chunks, warmup_frames
+
+START_TS = 1_700_000_000.0
+
+
+def write_night(path: str, hours: float, rate: float):
+    corpus = generate_corpus()
+    n = len(corpus["body"])
+    with FrameLogWriter(path) as writer:
+        for t in range(int(hours * 3600 * rate)):
+            writer.add(corpus["head"][t % n], corpus["body"][t % n], START_TS + t / rate)
+
+
+def first_in_bucket(frames: int, rate: float, interval: float) -> List[int]:
+    """write_night 로그에서 interval초 구간마다 첫 프레임 번호 (0이면 모든 프레임)."""
+    if interval <= 0:
+        return list(range(frames))
+    ts = START_TS + np.arange(frames) / rate
+    buckets = (ts - START_TS) // interval
+    return np.flatnonzero(np.diff(buckets, prepend=-1)).tolist()
+
+
+def read_png(path: str) -> np.ndarray:
+    """팔레트/RGB PNG → (높이, 너비, 3) RGB (CRC 확인, Up/None 필터만 지원)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("not a PNG")
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])[0] != zlib.crc32(tag + body):
+            raise ValueError(f"bad CRC in {tag!r}")
+        chunks[tag] = chunks.get(tag, b"") + body
+        pos += 12 + length
+    w, h, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    channels = 3 if color_type == 2 else 1
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(h, w * channels + 1)
+    rows = raw[:, 1:].copy()
+    for r in range(h):
+        if raw[r, 0] == 2 and r > 0:
+            rows[r] += rows[r - 1]
+        elif raw[r, 0] not in (0, 2):
+            raise ValueError(f"unsupported filter {raw[r, 0]}")
+    if color_type == 3:
+        palette = np.frombuffer(chunks[b"PLTE"], dtype=np.uint8).reshape(-1, 3)
+        return palette[rows]
+    return rows.reshape(h, w, 3)
+
+
+def _lzw_decode(data: bytes, min_code_size: int) -> bytes:
+    clear, eoi = 1 << min_code_size, (1 << min_code_size) + 1
+    bits, table = min_code_size + 1, [bytes([i]) for i in range(clear)] + [b"", b""]
+    out, prev, acc, n, pos = bytearray(), None, 0, 0, 0
+    while True:
+        while n < bits and pos < len(data):
+            acc |= data[pos] << n
+            pos += 1
+            n += 8
+        if n < bits:
+            break
+        code = acc & ((1 << bits) - 1)
+        acc >>= bits
+        n -= bits
+        if code == clear:
+            bits, table, prev = min_code_size + 1, table[:clear + 2], None
+            continue
+        if code == eoi:
+            break
+        if prev is None:
+            entry = table[code]
+        else:
+            entry = table[code] if code < len(table) else prev + prev[:1]
+            table.append(prev + entry[:1])
+        out += entry
+        if len(table) == (1 << bits) and bits < 12:
+            bits += 1
+        prev = entry
+    return bytes(out)
+
+
+def read_gif(path: str, wanted: List[int]) -> Dict:
+    """GIF → {"count", "palette", "frames": {번호: 색인 이미지}} (wanted 프레임만 LZW 디코딩)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:6] != b"GIF89a" or data[-1:] != b"\x3b":
+        raise ValueError("not a complete GIF89a")
+    w, h, flags = struct.unpack("<HHB", data[6:11])
+    palette = np.frombuffer(data[13:13 + 3 * 2 ** ((flags & 7) + 1)], dtype=np.uint8).reshape(-1, 3)
+    pos, count, frames = 13 + len(palette) * 3, 0, {}
+    while data[pos] != 0x3B:
+        if data[pos] == 0x21: # 확장 블록
+            pos += 2
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+            continue
+        _, _, fw, fh = struct.unpack("<HHHH", data[pos + 1:pos + 9])
+        min_code_size = data[pos + 10]
+        pos += 11
+        blocks = []
+        while data[pos]:
+            blocks.append(data[pos + 1:pos + 1 + data[pos]])
+            pos += data[pos] + 1
+        pos += 1
+        if count in wanted:
+            pixels = _lzw_decode(b"".join(blocks), min_code_size)
+            frames[count] = np.frombuffer(pixels, dtype=np.uint8)[:fw * fh].reshape(fh, fw)
+        count += 1
+    return {"count": count, "palette": palette, "frames": frames, "size": (h, w)}
+
+
+def read_avi(path: str, wanted: List[int]) -> Dict:
+    """무압축 24비트 AVI → {"count", "frames": {번호: RGB}} (RIFF 크기와 idx1 색인 확인)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    riff_size = struct.unpack("<I", data[4:8])[0]
+    total = struct.unpack("<I", data[48:52])[0]
+    w, h = struct.unpack("<II", data[64:72])
+    movi = data.index(b"LIST", 12 + 8 + struct.unpack("<I", data[16:20])[0])
+    idx1 = data.index(b"idx1", movi)
+    entries = np.frombuffer(data[idx1 + 8:], dtype="<u4").reshape(-1, 4)
+    stride = (w * 3 + 3) & ~3
+    frames = {}
+    for i in wanted:
+        if i < len(entries):
+            offset = movi + 8 + int(entries[i, 2]) + 8
+            bgr = np.frombuffer(data[offset:offset + stride * h], dtype=np.uint8).reshape(h, stride)[:, :w * 3]
+            frames[i] = bgr.reshape(h, w, 3)[::-1, :, ::-1]
+    return {"count": total, "indexed": len(entries), "riff_ok": riff_size == len(data) - 8, "frames": frames}
+
+
+def reference_frames(path: str, config: DetectionConfig, indices: List[int], cell_px: int, mode: str) -> Dict[int, np.ndarray]:
+    """처음부터 한 프로세스에서 재생하며 그린 색인 이미지 (구간 분할 없음)."""
+    detector = Detection(replace(config, log_path=os.devnull, activity_tracking=False))
+    renderer = FrameRenderer(config, cell_px, mode)
+    frames = {}
+    for i, (ts, head, body) in enumerate(iter_log(path)):
+        result = detector.detect(head, body, ts=ts)
+        if i in indices:
+            frames[i] = renderer.render_indexed(head, body, result, ts).copy()
+        if i >= max(indices):
+            break
+    return frames
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline heatmap export benchmark")
+    parser.add_argument("--hours", type=float, default=8.0, help="로그 길이 (시간)")
+    parser.add_argument("--rate", type=float, default=10.0, help="기록 속도 (Hz)")
+    parser.add_argument("--every", type=float, default=10.0, help="PNG 간격 (초, 0이면 모든 프레임)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--budget-ms", type=float, default=1.0,
+                        help="프레임당 허용 내보내기 시간 (ms, 전체 시간 / 프레임 수; 8시간 10Hz면 288초)")
+    parser.add_argument("--memory-budget", type=float, default=64.0, help="부모 프로세스 허용 메모리 증가 (MB)")
+    parser.add_argument("--mode", default="bilinear")
+    parser.add_argument("--cell-px", type=int, default=16)
+    parser.add_argument("--keep", action="store_true", help="결과물 디렉터리를 지우지 않음")
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+
+    tmp = tempfile.mkdtemp(prefix="export_bench_")
+    log, png_dir = os.path.join(tmp, "night.bfc"), os.path.join(tmp, "png")
+    gif_path, avi_path = os.path.join(tmp, "night.gif"), os.path.join(tmp, "night.avi")
+    failures = []
+    try:
+        write_night(log, args.hours, args.rate)
+        frames = int(args.hours * 3600 * args.rate)
+        config = DetectionConfig(log_path=os.devnull)
+        chunks = plan_chunks(log, warmup_frames(config), workers)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        summary = export_log(log, config, png_dir=png_dir, gif_path=gif_path, avi_path=avi_path, every=args.every,
+                             timelapse=60, mode=args.mode, cell_px=args.cell_px, workers=workers)
+        growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+        png_mb = sum(e.stat().st_size for e in os.scandir(png_dir)) / 2 ** 20
+        print(f"{frames} frames ({args.hours:g} h at {args.rate:g} Hz), {workers} workers, {summary['chunks']} chunks: "
+              f"{summary['seconds']:.1f}s ({summary['seconds'] / frames * 1e3:.2f} ms/frame)")
+        print(f"PNG {summary['pngs']} files {png_mb:.1f} MB, GIF {summary['gif_frames']} frames "
+              f"{os.path.getsize(gif_path) / 2 ** 20:.1f} MB, AVI {summary['avi_frames']} frames "
+              f"{os.path.getsize(avi_path) / 2 ** 20:.1f} MB, parent memory +{growth_mb:.1f} MB")
+        if summary["seconds"] > args.budget_ms * frames / 1e3:
+            failures.append(f"export took {summary['seconds']:.1f}s (budget {args.budget_ms * frames / 1e3:.0f}s)")
+        if growth_mb > args.memory_budget:
+            failures.append(f"parent memory grew by {growth_mb:.1f} MB (budget {args.memory_budget:.0f} MB)")
+        # 간격 구간이 바뀐 첫 프레임 번호 (export_chunk와 같은 계산)
+        png_frames = first_in_bucket(frames, args.rate, args.every)
+        lapse_frames = first_in_bucket(frames, args.rate, 60)
+        minutes = len(lapse_frames)
+        written = sorted(int(name[6:-4]) for name in os.listdir(png_dir))
+        if summary["frames"] != frames or summary["pngs"] != len(png_frames) or written != png_frames:
+            failures.append(f"expected {frames} frames / {len(png_frames)} PNGs, got {summary['frames']} / "
+                            f"{summary['pngs']} ({len(written)} files)")
+        if summary["gif_frames"] != minutes or summary["avi_frames"] != minutes:
+            failures.append(f"expected {minutes} timelapse frames, got GIF {summary['gif_frames']} / AVI {summary['avi_frames']}")
+
+        # 첫 프레임, 두 번째 구간 경계 앞뒤 PNG 프레임, 경계 이후 첫 타임랩스 프레임
+        boundary = chunks[1].first if len(chunks) > 1 else frames // 2
+        before = max(i for i in png_frames if i < boundary)
+        after = min((i for i in png_frames if i >= boundary), default=before)
+        lapse = next((k for k, i in enumerate(lapse_frames) if i >= boundary), minutes - 1)
+        checks = sorted({0, before, after, lapse_frames[lapse]})
+        reference = reference_frames(log, config, checks, args.cell_px, args.mode)
+        palette = FrameRenderer(config, args.cell_px, args.mode).palette
+        gif = read_gif(gif_path, [0, lapse])
+        avi = read_avi(avi_path, [0, lapse])
+        if gif["count"] != minutes or avi["count"] != minutes or avi["indexed"] != minutes or not avi["riff_ok"]:
+            failures.append(f"container frame counts: GIF {gif['count']}, AVI header {avi['count']} / index {avi['indexed']}")
+        if not np.array_equal(gif["palette"], palette):
+            failures.append("GIF palette differs from the renderer palette")
+        for i in sorted({0, before, after}):
+            decoded = read_png(os.path.join(png_dir, f"frame_{i:06d}.png"))
+            diff = int(np.any(decoded != palette[reference[i]], axis=-1).sum())
+            print(f"frame {i:>6}: PNG differs from serial render in {diff} px")
+            if diff:
+                failures.append(f"PNG frame {i} differs from the serial render in {diff} px")
+        for k in (0, lapse):
+            expected = reference[lapse_frames[k]]
+            if k not in gif["frames"] or not np.array_equal(gif["frames"][k], expected):
+                failures.append(f"GIF frame {k} does not decode to serial frame {lapse_frames[k]}")
+            if k not in avi["frames"] or not np.array_equal(avi["frames"][k], palette[expected]):
+                failures.append(f"AVI frame {k} does not match serial frame {lapse_frames[k]}")
+    finally:
+        if args.keep:
+            print(f"output kept in {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    if failures:
+        for failure in failures:
+            print(failure)
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
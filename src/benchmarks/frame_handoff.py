@@ -0,0 +1,169 @@
+"""시리얼 프레임 전달 경로의 정상 상태 메모리 할당 검사 (tracemalloc).
+
+리더 스레드가 보드 데이터를 발행 → stream()이 트리플 버퍼에서 읽기 전용 뷰를 전달 →
+AdaptiveSampler가 처리 여부를 판단하는 경로를 반복하며, 예열 이후 프레임당 할당되는
+메모리(추적 피크 - 기준)와 누적 증가량을 측정합니다. 예산을 넘으면 exit 1.
+
+- 누적 증가량: --frames 프레임 구간마다 0이어야 함 (프레임마다 남는 할당 없음)
+- 피크: 배열 할당은 없고, 프레임마다 만들어졌다 바로 해제되는 파이썬 객체만 남음
+  (revision/ts의 int/float, stream()이 내보내는 (ts, head, body) 튜플, 보정 시 np.take(out=)의 배열 객체 약 150 B).
+  기본 예산 256 B는 body 행렬 복사 한 번(데이터 168 B + 배열 객체)보다 작으므로 프레임 배열을 새로 만들면 실패합니다.
+- FrameHub(serialcm/frame_hub.py)는 구독자들이 프레임을 보관할 수 있도록 프레임마다 한 번 복사하며
+  (구독자 수와 무관), 이 검사 대상이 아닙니다.
+
+비교용으로 이전 방식(프레임마다 dict → 새 행렬 변환)도 함께 측정합니다.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.frame_handoff [--frames 20000] [--peak-budget 256]
+
+셀별 보정(calibration.calibration)을 켠 경로도 같은 예산으로 검사합니다.
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from calibration.calibration import CELLS, LEVELS, Calibration
+from detection.adaptive import AdaptiveSampler
+from detection.config import DetectionConfig
+from serialcm.board import BoardData
+from serialcm.serial_communication import BOARDS, HEAD_BOARD, SerialCommunication
+
+
+
+def _board_frames(binary: bool) -> List[BoardData]:
+    rng = np.random.default_rng(0)
+    frames = []
+    for board in BOARDS:
+        n = 6 if board == HEAD_BOARD else 14
+        values = rng.integers(100, 900, n).astype(np.uint16)
+        if binary:
+            frames.append(BoardData(board, time.time(), None, values))
+        else:
+            frames.append(BoardData(board, time.time(), {f"{board}C{c}": int(v) for c, v in enumerate(values)}))
+    return frames
+
+
+def _legacy_convert(boards: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """이전 stream()의 프레임 변환 (매 프레임 새 행렬 할당)."""
+    head, body = np.zeros((2, 3)), np.zeros((12, 7))
+    for idx, board in enumerate(BOARDS):
+        data = boards[board].data
+        if board == HEAD_BOARD:
+            for c in range(6):
+                head[c // 3][c % 3] = data.get(f"{board}C{c}", 0)
+        else:
+            for c in range(14):
+                body[2 * idx - 2 + c // 7][c % 7] = data.get(f"{board}C{c}", 0)
+    return head, body
+
+
+def _noop(i: int):
+    pass
+
+
+def _peak(step: Callable[[int], None], frames: int, warmup: int) -> int:
+    """예열 이후 기준 대비 최대 추적 메모리 증가량 (바이트)."""
+    for i in range(warmup):
+        step(i)
+    tracemalloc.start()
+    try:
+        for i in range(warmup):
+            step(i)
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for i in range(warmup, warmup + frames):
+            step(i)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def _growth(step: Callable[[int], None], frames: int, warmup: int, windows: int) -> int:
+    """정상 상태 누적 증가량 (바이트): 예열 뒤 frames 프레임 구간 windows개의 추적 메모리 증가량 중 최솟값.
+
+    예열 직후 첫 구간은 버립니다 (tracemalloc을 켠 뒤 튜플/float 재사용 목록이 다시 채워지는 수십~백여 바이트).
+    프레임마다 남는 할당이 있으면 모든 구간에서 프레임 수에 비례하여 늘어납니다.
+    """
+    growth = []
+    tracemalloc.start()
+    try:
+        for i in range(warmup):
+            step(i)
+        for w in range(windows + 1):
+            before, _ = tracemalloc.get_traced_memory()
+            for i in range(warmup + w * frames, warmup + (w + 1) * frames):
+                step(i)
+            growth.append(tracemalloc.get_traced_memory()[0] - before)
+    finally:
+        tracemalloc.stop()
+    return min(growth[1:])
+
+
+def _measure(step: Callable[[int], None], frames: int, warmup: int = 1000, windows: int = 2) -> Tuple[int, int]:
+    """(프레임당 피크 할당, 정상 상태 누적 증가량) 바이트.
+
+    피크는 빈 step으로 잰 측정 도구 자체의 몫(루프 변수 등)을 뺀 값이고, 누적 증가량은 _growth() 참고.
+    """
+    return _peak(step, frames, warmup) - _peak(_noop, frames, warmup), _growth(step, frames, warmup, windows)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Zero-allocation frame handoff check")
+    parser.add_argument("--frames", type=int, default=20000, help="측정 구간 길이 (누적 증가량은 이 길이의 구간 2개)")
+    parser.add_argument("--peak-budget", type=int, default=256,
+                        help="프레임당 허용 피크 할당 (바이트, body 행렬 복사 한 번(약 280 B)보다 작음)")
+    parser.add_argument("--growth-budget", type=int, default=0, help="허용 누적 증가량 (바이트)")
+    args = parser.parse_args(argv)
+
+    config = DetectionConfig(adaptive_sampling=True)
+    failures = []
+    print(f"{'path':<36} {'peak B/frame':>13} {'growth B':>9} {'us/frame':>9}")
+    # 오프셋/게인이 셀마다 다른 보정 테이블
+    rng = np.random.default_rng(1)
+    lut = np.clip(rng.uniform(0.8, 1.2, (CELLS, 1)) * np.arange(LEVELS) - rng.uniform(0, 50, (CELLS, 1)), 0, LEVELS - 1)
+    calibration = Calibration(lut.astype(np.uint16))
+    for binary, calibrated in ((True, False), (False, False), (True, True)):
+        boards = _board_frames(binary)
+        serial_comm = SerialCommunication(calibration=calibration if calibrated else None)
+        stream = serial_comm.stream(min_interval=0.0, timeout=0.0)
+        sampler = AdaptiveSampler(config)
+
+        def step(i: int):
+            serial_comm._publish(boards[i % len(boards)])
+            ts, head, body = next(stream)
+            sampler.should_process(ts, head, body)
+
+        peak, growth = _measure(step, args.frames)
+        start = time.perf_counter()
+        for i in range(args.frames):
+            step(i)
+        us = (time.perf_counter() - start) / args.frames * 1e6
+        name = f"store ({'binary' if binary else 'text'} frames{', calibrated' if calibrated else ''})"
+        print(f"{name:<36} {peak:>13} {growth:>9} {us:>9.1f}")
+        if peak > args.peak_budget or growth > args.growth_budget:
+            failures.append(name)
+
+    # 이전 방식: 발행은 dict 교체, 소비 시 매번 새 행렬로 변환
+    legacy_boards = {b.board: b for b in _board_frames(False)}
+    legacy_sampler = AdaptiveSampler(config)
+
+    def legacy_step(i: int):
+        head, body = _legacy_convert(legacy_boards)
+        legacy_sampler.should_process(float(i), head, body)
+
+    peak, growth = _measure(legacy_step, args.frames)
+    print(f"{'legacy (convert per frame)':<36} {peak:>13} {growth:>9} {'':>9}")
+
+    if failures:
+        print(f"FAIL: over budget ({args.peak_budget} B peak, {args.growth_budget} B growth): {', '.join(failures)}")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""히트맵 렌더 비용 비교 (셀 표시 vs 보간 확대).
+
+합성 말뭉치 프레임을 표시 방식별로 PressureHeatmap.render()한 뒤 Rich 콘솔(truecolor, 메모리 출력)에
+그리기까지의 프레임당 시간을 측정하고, 보간 확대의 행렬 곱(upsample) 단계만의 시간도 따로 출력합니다.
+기본 확대 설정(bilinear x2, 셀 표시와 같은 화면 크기)이 셀 표시의 --max-ratio배를 넘으면 exit 1.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.heatmap_render [--frames 200]
+"""
+from dataclasses import replace
+from typing import List
+import argparse
+import io
+import os
+import sys
+import time
+
+from rich.console import Console
+
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.detection import Detection
+from heatmap.heatmap import PressureHeatmap
+
+SETTINGS = {
+    "cells": dict(heatmap_mode="cells"),
+    "bilinear x2": dict(heatmap_mode="bilinear", heatmap_scale=2),
+    "bicubic x2": dict(heatmap_mode="bicubic", heatmap_scale=2),
+    "bilinear x4": dict(heatmap_mode="bilinear", heatmap_scale=4),
+    "bicubic x4": dict(heatmap_mode="bicubic", heatmap_scale=4),
+}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Heatmap render cost benchmark")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--max-ratio", type=float, default=1.5, help="bilinear x2 / cells 허용 비용 비율")
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus()
+    n = min(args.frames, len(corpus["body"]))
+    head, body = list(corpus["head"][:n]), list(corpus["body"][:n])
+    base = DetectionConfig(log_path=os.devnull, activity_log_path="")
+    detector = Detection(base)
+    results = [detector.detect(head[i], body[i]) for i in range(n)]
+    console = Console(file=io.StringIO(), width=120, color_system="truecolor", force_terminal=True)
+
+    costs = {}
+    print(f"{'view':<13} {'render+draw us':>15} {'upsample us':>12} {'rows':>5}")
+    for name, overrides in SETTINGS.items():
+        renderer = PressureHeatmap(replace(base, **overrides))
+        upsample_us = 0.0
+        if overrides["heatmap_mode"] != "cells":
+            renderer._upsample_levels(head[0], body[0], overrides["heatmap_scale"], overrides["heatmap_mode"])
+            start = time.perf_counter()
+            for i in range(n):
+                renderer._upsample_levels(head[i], body[i], overrides["heatmap_scale"], overrides["heatmap_mode"])
+            upsample_us = (time.perf_counter() - start) / n * 1e6
+        start = time.perf_counter()
+        for i in range(n):
+            r = results[i]
+            panel = renderer.render(head[i], body[i], r["head"], r["shoulder"], r["hip"], r["heels"], r["threshold"],
+                                    elbows=r["elbows"], health=r["health"])
+            console.file.seek(0)
+            console.file.truncate()
+            console.print(panel)
+        costs[name] = (time.perf_counter() - start) / n * 1e6
+        rows = console.file.getvalue().count("\n")
+        print(f"{name:<13} {costs[name]:>15.0f} {upsample_us:>12.1f} {rows:>5}")
+
+    ratio = costs["bilinear x2"] / costs["cells"]
+    print(f"bilinear x2 / cells: {ratio:.2f}")
+    if ratio > args.max_ratio:
+        print(f"bilinear x2 render costs {ratio:.2f}x the cell view (budget {args.max_ratio:.2f}x)")
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
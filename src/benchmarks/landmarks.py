@@ -0,0 +1,201 @@
+"""랜드마크 추출 단계 벤치마크 + 동등성 검사.
+
+합성 말뭉치의 평활화 프레임으로 적분 영상 기반 LandmarkExtractor와 이전 방식
+(sliding_window_view로 2x2 블록 합을 영역마다 다시 계산, 머리/발뒤꿈치용 복사본 생성)을
+비교합니다. 어깨/엉덩이/머리/발뒤꿈치/팔꿈치 결과가 다르면 exit 1.
+블록 합은 계산 순서가 달라 부동소수점 오차가 생길 수 있으므로 점수는 tol 이내,
+위치는 두 후보의 블록 합 차이가 tol 이내(동점)인 경우만 달라도 허용합니다.
+
+프레임당 시간과 tracemalloc 기준 프레임당 피크 할당량도 함께 출력합니다.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.landmarks [--frames 2000] [--repeat 3]
+"""
+from typing import List, Optional, Tuple
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.frame_buffer import moving_average
+from detection.landmarks import LandmarkExtractor
+
+
+def _sum2x2(x: np.ndarray) -> np.ndarray:
+    return sliding_window_view(x, (2, 2)).sum(axis=(-1, -2))
+
+
+def _argmax2d(x: np.ndarray) -> Tuple[int, int]:
+    return divmod(int(np.argmax(x)), x.shape[1])
+
+
+def reference_landmarks(head: np.ndarray, body: np.ndarray, threshold: float, heel_search_rows: int) -> dict:
+    """이전 Detection의 다중 패스 구현 (평활화 프레임 기준, 어깨/엉덩이 판정 방향 수정)."""
+    h = body.shape[0]
+    half = h // 2
+    s = _sum2x2(body)
+    f_r, f_c = _argmax2d(s)
+    mean = float(body[f_r:f_r + 2, f_c:f_c + 2].mean())
+    if f_r + 0.5 <= math.floor((h - 1) * 0.5):
+        shoulder = (f_r + 0.5, f_c + 0.5, mean)
+        lower = body[half:]
+        l_r, l_c = _argmax2d(_sum2x2(lower))
+        hip = (l_r + half + 0.5, l_c + 0.5, float(lower[l_r:l_r + 2, l_c:l_c + 2].mean()))
+    else:
+        hip = (f_r + 0.5, f_c + 0.5, mean)
+        upper = body[:half]
+        u_r, u_c = _argmax2d(_sum2x2(upper))
+        shoulder = (u_r + 0.5, u_c + 0.5, float(upper[u_r:u_r + 2, u_c:u_c + 2].mean()))
+
+    x = head.copy()
+    x[x < threshold] = 0.0
+    r, c = _argmax2d(x)
+    detected_head = (r, c, float(x[r, c]))
+
+    heels = []
+    if heel_search_rows >= 1:
+        start = h - heel_search_rows
+        mask = body[start:].copy()
+        mask[mask < threshold] = 0.0
+        vals, rows_idx = mask.max(axis=0), mask.argmax(axis=0)
+        heels = [(start + int(rows_idx[c]), c, float(vals[c])) for c in range(mask.shape[1]) if vals[c] > 0.0]
+        heels.sort(key=lambda x: x[2], reverse=True)
+        heels = heels[:2]
+
+    return {"head": detected_head, "shoulder": shoulder, "hip": hip,
+            "elbows": reference_elbows(body, shoulder, hip, threshold), "heels": heels}
+
+
+def reference_elbows(body: np.ndarray, shoulder: tuple, hip: tuple, threshold: float) -> list:
+    """팔꿈치: 어깨~엉덩이 블록 행 사이, 몸통 블록 열 바깥의 최대 2x2 블록 (평균이 임계값 이상)."""
+    s = _sum2x2(body)
+    sh_rc = (int(shoulder[0]), int(shoulder[1]))
+    hip_rc = (int(hip[0]), int(hip[1]))
+    r0, r1 = sorted((sh_rc[0], hip_rc[0]))
+    left, right = min(sh_rc[1], hip_rc[1]), max(sh_rc[1], hip_rc[1]) + 1
+    elbows = []
+    for c0, c1 in ((0, max(0, left - 1)), (right + 1, s.shape[1])):
+        region = s[r0:r1 + 1, c0:c1]
+        if region.size == 0:
+            continue
+        er, ec = _argmax2d(region)
+        score = float(body[r0 + er:r0 + er + 2, c0 + ec:c0 + ec + 2].mean())
+        if score >= threshold:
+            elbows.append((r0 + er + 0.5, c0 + ec + 0.5, score))
+    return elbows
+
+
+def _block_sum(body: np.ndarray, rc: Tuple[float, float]) -> float:
+    r, c = int(rc[0]), int(rc[1])
+    return float(body[r:r + 2, c:c + 2].sum())
+
+
+def compare(body: np.ndarray, threshold: float, expected: dict, actual: dict, tol: float) -> Optional[str]:
+    """두 결과가 같으면 None, 다르면 사유."""
+    for name in ("shoulder", "hip"):
+        e, a = expected[name], actual[name]
+        if abs(e[2] - a[2]) > tol:
+            return f"{name} score {a[2]} != {e[2]}"
+        if e[:2] != a[:2] and abs(_block_sum(body, e) - _block_sum(body, a)) > tol:
+            return f"{name} at {a[:2]} != {e[:2]}"
+    if (expected["shoulder"][:2], expected["hip"][:2]) != (actual["shoulder"][:2], actual["hip"][:2]):
+        # 동점 블록을 다르게 골랐으면 팔꿈치 탐색 영역도 달라지므로 같은 몸통 위치로 다시 계산
+        expected = {**expected, "elbows": reference_elbows(body, actual["shoulder"], actual["hip"], threshold)}
+    for name in ("head", "elbows", "heels"):
+        e, a = expected[name], actual[name]
+        e = [e] if name == "head" else e
+        a = [a] if name == "head" else a
+        if len(e) != len(a):
+            return f"{name} count {len(a)} != {len(e)}"
+        for x, y in zip(e, a):
+            if abs(x[2] - y[2]) > tol or (x[:2] != y[:2] and name == "head"):
+                return f"{name} {y} != {x}"
+            if x[:2] != y[:2] and name == "elbows" and abs(_block_sum(body, x) - _block_sum(body, y)) > tol:
+                return f"{name} {y} != {x}"
+            if x[:2] != y[:2] and name == "heels":
+                return f"{name} {y} != {x}"
+    return None
+
+
+def _frames(n: int, config: DetectionConfig):
+    corpus = generate_corpus(frames_per_sequence=max(1, n // 20))
+    head = np.clip(corpus["head"], config.value_min, config.value_max)[:n]
+    body = np.clip(corpus["body"], config.value_min, config.value_max)[:n]
+    head_avg, body_avg = moving_average(head, config.moving_avg_N), moving_average(body, config.moving_avg_N)
+    thresholds = [float(np.percentile(np.concatenate([h.ravel(), b.ravel()]), config.percentile_p))
+                  for h, b in zip(head_avg, body_avg)]
+    return head_avg, body_avg, thresholds
+
+
+def _time(fn, head_avg, body_avg, thresholds, heel_rows: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(len(body_avg)):
+            fn(head_avg[i], body_avg[i], thresholds[i], heel_rows)
+        best = min(best, time.perf_counter() - start)
+    return best / len(body_avg) * 1e6
+
+
+def _peak_alloc(fn, head_avg, body_avg, thresholds, heel_rows: int) -> float:
+    """예열 이후 프레임당 피크 할당 (바이트)."""
+    for i in range(min(50, len(body_avg))):
+        fn(head_avg[i], body_avg[i], thresholds[i], heel_rows)
+    worst = 0
+    tracemalloc.start()
+    try:
+        for i in range(len(body_avg)):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(head_avg[i], body_avg[i], thresholds[i], heel_rows)
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return worst
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fused landmark extraction benchmark and parity check")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tol", type=float, default=1e-6)
+    args = parser.parse_args(argv)
+
+    config = DetectionConfig()
+    head_avg, body_avg, thresholds = _frames(args.frames, config)
+    extractor = LandmarkExtractor(head_avg.shape[1:], body_avg.shape[1:])
+
+    mismatches = 0
+    for i in range(len(body_avg)):
+        expected = reference_landmarks(head_avg[i], body_avg[i], thresholds[i], config.heel_search_rows)
+        actual = extractor.extract(head_avg[i], body_avg[i], thresholds[i], config.heel_search_rows)
+        reason = compare(body_avg[i], thresholds[i], expected, actual, args.tol)
+        if reason is not None:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"frame {i}: {reason}")
+    elbow_rate = np.mean([len(extractor.extract(head_avg[i], body_avg[i], thresholds[i], config.heel_search_rows)["elbows"]) > 0
+                          for i in range(len(body_avg))])
+
+    print(f"frames: {len(body_avg)}  (elbow candidates in {elbow_rate:.1%})")
+    print(f"{'path':<12} {'us/frame':>9} {'peak B/frame':>13}")
+    for name, fn in (("reference", reference_landmarks), ("fused", extractor.extract)):
+        us = _time(fn, head_avg, body_avg, thresholds, config.heel_search_rows, args.repeat)
+        peak = _peak_alloc(fn, head_avg, body_avg, thresholds, config.heel_search_rows)
+        print(f"{name:<12} {us:>9.1f} {peak:>13}")
+
+    if mismatches:
+        print(f"FAIL: {mismatches} frames differ from the reference")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""실시간 보기 서버 부하 벤치마크 (localhost, 모의 클라이언트 다수).
+
+LiveViewServer를 임의 포트로 띄우고, 별도 프로세스에서 asyncio WebSocket 클라이언트 --clients개
+(전송률 1/2/5/10/max를 돌아가며 협상, 일부는 중간에 전송률을 다시 협상)와 전혀 읽지 않는 느린 클라이언트
+--slow개(작은 수신 버퍼)를 붙인 상태에서, 합성 말뭉치 프레임과 감지 결과를 --fps로 --seconds초 동안 발행합니다.
+
+검사 항목 (하나라도 넘으면 exit 1):
+- publish_frame/publish_detection 호출 시간 p99/최대 (느린 클라이언트가 수집을 막지 않음)
+- 클라이언트별 수신률이 협상한 전송률의 80~110% (발행률이 더 낮으면 발행률 기준)
+- 발행 → 클라이언트 수신 지연 p95
+- 델타를 이어 붙여 복원한 마지막 격자 == 서버 마지막 스냅숏, 원시 프레임과 차이 <= deadband
+- 느린 클라이언트는 송신 버퍼가 high_water + 메시지 하나 이내이거나 연결이 끊김
+- GET / 가 캔버스 페이지를 반환
+
+src 디렉터리에서 실행:
+    python -m benchmarks.live_view [--clients 200] [--slow 10] [--seconds 10]
+"""
+from typing import Dict, List
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import socket
+import struct
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.detection import Detection
+from liveview.server import HEADER, KEYFRAME, LiveViewServer
+
+RATES = (1.0, 2.0, 5.0, 10.0, None) # None: 서버 최대
+
+
+async def _client(port: int, rate: float, renegotiate: float, deadline: float, window: tuple) -> Dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(f"GET /ws?rate={rate} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    status = await reader.readuntil(b"\r\n\r\n")
+    assert status.startswith(b"HTTP/1.1 101"), status
+    cells, revision, in_window, latencies, sizes, accepted, rates = None, 0, 0, [], [], None, []
+    kinds = [0, 0]
+    renegotiated = False
+    try:
+        while True:
+            now = time.time()
+            if now >= deadline:
+                break
+            if renegotiate and not renegotiated and now >= (window[0] + window[1]) / 2:
+                renegotiated = True
+                payload, mask = json.dumps({"rate": renegotiate}).encode(), os.urandom(4)
+                masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+                writer.write(struct.pack("!BB", 0x81, 0x80 | len(payload)) + mask + masked)
+            try:
+                head = await asyncio.wait_for(reader.readexactly(2), deadline - now)
+            except asyncio.TimeoutError:
+                break
+            length = head[1] & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await reader.readexactly(2))[0]
+            payload = await reader.readexactly(length)
+            received = time.time()
+            if head[0] & 0x0F == 0x1:
+                message = json.loads(payload)
+                if message["type"] == "hello":
+                    accepted = message["rate"]
+                    cells = np.zeros(message["cells"], np.uint16)
+                else:
+                    rates.append(message["rate"])
+                continue
+            kind, _, n, m, revision, ts = HEADER.unpack_from(payload)
+            body = HEADER.size + 3 * m
+            if kind == KEYFRAME:
+                cells[:] = np.frombuffer(payload, "<u2", n, body)
+            else:
+                cells[np.frombuffer(payload, np.uint8, n, body)] = np.frombuffer(payload, "<u2", n, body + n)
+            kinds[kind] += 1
+            sizes.append(len(payload) + 2)
+            latencies.append(received - ts)
+            if window[0] <= received < window[1]:
+                in_window += 1
+    finally:
+        writer.close()
+    return {"rate": accepted, "renegotiated": rates, "received": in_window, "latencies": latencies, "sizes": sizes,
+            "kinds": kinds, "revision": revision, "cells": None if cells is None else cells.tolist()}
+
+
+def _slow_client(port: int) -> socket.socket:
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall(f"GET /ws?rate=1000 HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    return sock # 읽지 않음
+
+
+def _client_process(port: int, n_clients: int, n_slow: int, max_rate: float, start: float, seconds: float,
+                    tail: float, conn):
+    async def run():
+        window = (start + 1.0, start + seconds) # 연결 직후 1초는 제외
+        tasks = []
+        for i in range(n_clients):
+            rate = RATES[i % len(RATES)] or max_rate
+            renegotiate = 2.0 if i % 10 == 9 else 0.0
+            tasks.append(asyncio.create_task(_client(port, rate, renegotiate, start + seconds + tail, window)))
+        return await asyncio.gather(*tasks)
+
+    slow = [_slow_client(port) for _ in range(n_slow)]
+    conn.send(asyncio.run(run()))
+    for sock in slow:
+        sock.close()
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Live view server load benchmark")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--slow", type=int, default=10, help="읽지 않는 클라이언트 수")
+    parser.add_argument("--fps", type=float, default=20.0, help="프레임 발행률 (프레임마다 감지 결과도 발행)")
+    parser.add_argument("--max-rate", type=float, default=20.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--publish-p99-ms", type=float, default=5.0, help="GIL 전환 간격 (5ms) 이내")
+    parser.add_argument("--publish-max-ms", type=float, default=50.0)
+    parser.add_argument("--latency-p95-ms", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus()
+    n = int(args.fps * args.seconds)
+    head = [corpus["head"][i % len(corpus["head"])] for i in range(n)]
+    body = [corpus["body"][i % len(corpus["body"])] for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        detector = Detection(DetectionConfig(log_path=os.path.join(tmp, "posture_log.csv"), activity_log_path=""))
+        results = [detector.detect(head[i], body[i]) for i in range(n)]
+
+    server = LiveViewServer(DetectionConfig(), host="127.0.0.1", port=0, max_rate=args.max_rate, device="bench",
+                            high_water=4096, send_buffer=4096, stall_timeout=2.0)
+    if not server.start():
+        print("FAIL")
+        return 1
+    page = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/").read()
+    try:
+        missing = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/missing").status
+    except urllib.error.HTTPError as e:
+        missing = e.code
+
+    start, tail = time.time() + 1.0, 2.0
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_client_process, args=(server.port, args.clients, args.slow, args.max_rate,
+                                                                     start, args.seconds, tail, child), daemon=True)
+    process.start()
+    time.sleep(max(0.0, start - time.time()))
+
+    publish_ms = []
+    for i in range(n):
+        due = start + i / args.fps
+        time.sleep(max(0.0, due - time.time()))
+        t0 = time.perf_counter()
+        server.publish_frame(time.time(), head[i], body[i])
+        t1 = time.perf_counter()
+        server.publish_detection(time.time(), results[i])
+        publish_ms += [(t1 - t0) * 1e3, (time.perf_counter() - t1) * 1e3]
+    time.sleep(0.5)
+    final = server._current
+    slow_buffers = [c.writer.transport.get_write_buffer_size() for c in list(server.clients) if c.bytes and c.skipped]
+    stats = server.stats()
+    clients = parent.recv()
+    process.join(timeout=10.0)
+    server.stop()
+
+    failures = []
+    p99, worst = np.percentile(publish_ms, 99), max(publish_ms)
+    print(f"publish calls: {len(publish_ms)}  p99 {p99:.3f} ms  max {worst:.3f} ms")
+    if p99 > args.publish_p99_ms or worst > args.publish_max_ms:
+        failures.append(f"publish p99 {p99:.3f} ms / max {worst:.3f} ms over budget")
+
+    snapshot_rate = 2 * args.fps
+    window = args.seconds - 1.0
+    print(f"{'rate':>6} {'clients':>7} {'recv/s':>7} {'min/s':>6} {'p95 ms':>7} {'B/msg':>6} {'delta %':>7}")
+    latencies = []
+    for rate in sorted({c["rate"] for c in clients}):
+        group = [c for c in clients if c["rate"] == rate]
+        per_second = [c["received"] / window for c in group]
+        expected = min(rate, snapshot_rate)
+        steady = [p for c, p in zip(group, per_second) if not c["renegotiated"]]
+        for p in steady:
+            if not 0.8 * expected <= p <= 1.1 * expected:
+                failures.append(f"client at {rate}/s received {p:.2f}/s")
+                break
+        lat = np.concatenate([c["latencies"] for c in group]) * 1e3
+        latencies.append(lat)
+        sizes = np.concatenate([c["sizes"] for c in group])
+        kinds = np.sum([c["kinds"] for c in group], axis=0)
+        print(f"{rate:>6g} {len(group):>7} {np.mean(steady):>7.2f} {min(steady):>6.2f} {np.percentile(lat, 95):>7.1f} "
+              f"{sizes.mean():>6.0f} {100 * kinds[1] / kinds.sum():>7.1f}")
+    renegotiated = [c for c in clients if c["renegotiated"]]
+    if any(c["renegotiated"] != [2.0] for c in renegotiated):
+        failures.append("rate renegotiation not acknowledged")
+    p95 = np.percentile(np.concatenate(latencies), 95)
+    print(f"end-to-end latency p95: {p95:.1f} ms")
+    if p95 > args.latency_p95_ms:
+        failures.append(f"latency p95 {p95:.1f} ms over {args.latency_p95_ms} ms")
+
+    stale = [c for c in clients if c["revision"] != final.revision or c["cells"] != final.cells.tolist()]
+    drift = np.abs(final.cells.astype(int) - np.concatenate((head[-1].ravel(), body[-1].ravel())).astype(int)).max()
+    print(f"reconstructed == final snapshot: {len(clients) - len(stale)}/{len(clients)}, "
+          f"max |snapshot - raw| {drift} (deadband {server.deadband})")
+    if stale or drift > server.deadband:
+        failures.append("reconstructed frames do not match")
+
+    bound = server.high_water + 4096
+    print(f"slow clients: {stats['disconnected']} disconnected, buffers {slow_buffers} (bound {bound} B), "
+          f"skips {stats['skipped']}")
+    if stats["disconnected"] + len(slow_buffers) < args.slow or any(b > bound for b in slow_buffers):
+        failures.append("slow clients not bounded")
+
+    if b"<canvas" not in page or missing != 404:
+        failures.append("GET / did not return the page")
+
+    for failure in failures:
+        print(failure)
+    print("FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""자세 분류기(model 백엔드) vs 규칙 기반 정확도/지연 시간 비교.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.posture_model                    # 합성 데이터
+    python -m benchmarks.posture_model --logs a.csv b.csv # posture 라벨이 있는 MLLogger 로그
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.detection import Detection
+from ml_utils.posture_model import train
+
+
+def _run_detector(config: DetectionConfig, head: np.ndarray, body: np.ndarray):
+    detector = Detection(config)
+    predictions = np.empty(len(body), dtype=np.int64)
+    latencies = np.empty(len(body))
+    for i in range(len(body)):
+        start = time.perf_counter()
+        predictions[i] = detector.detect(head[i], body[i])["posture"].value
+        latencies[i] = time.perf_counter() - start
+    return predictions, latencies
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Posture classifier vs rule-based benchmark")
+    parser.add_argument("--logs", nargs="*", help="posture 라벨이 있는 MLLogger 로그 (없으면 합성 데이터)")
+    parser.add_argument("--hidden", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.logs:
+        from ml_utils.dataset import load_frames, encode_labels
+        loaded = [load_frames(p) for p in args.logs]
+        head = np.concatenate([l[1] for l in loaded])
+        body = np.concatenate([l[2] for l in loaded])
+        y = np.concatenate([encode_labels(l[3]) for l in loaded])
+        keep = y >= 0
+        head, body, y = head[keep], body[keep], y[keep]
+        # 시간 순서를 유지한 채 앞 80% 학습 / 뒤 20% 평가
+        cut = int(len(y) * 0.8)
+    else:
+        corpus = generate_corpus(seed=args.seed)
+        head, body, y = corpus["head"], corpus["body"], corpus["labels"]
+        seq = corpus["sequence"]
+        cut = int(np.searchsorted(seq, int(seq.max() * 0.8)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "posture_model.npz")
+        model = train(head[:cut], body[:cut], y[:cut], hidden=args.hidden, seed=args.seed)
+        model.save(model_path)
+
+        log_path = os.path.join(tmp, "posture_log.csv")
+        rules_pred, rules_lat = _run_detector(DetectionConfig(log_path=log_path), head[cut:], body[cut:])
+        model_pred, model_lat = _run_detector(
+            DetectionConfig(log_path=log_path, posture_backend="model", posture_model_path=model_path),
+            head[cut:], body[cut:])
+
+        # 분류기 단독 추론 시간 (행렬곱만)
+        start = time.perf_counter()
+        for i in range(cut, len(y)):
+            model.predict(head[i], body[i])
+        infer_us = (time.perf_counter() - start) / max(1, len(y) - cut) * 1e6
+        size = os.path.getsize(model_path)
+
+    truth = y[cut:]
+    print(f"test frames: {len(truth)} (train {cut})")
+    print(f"{'backend':<8} {'accuracy':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, pred, lat in (("rules", rules_pred, rules_lat), ("model", model_pred, model_lat)):
+        print(f"{name:<8} {(pred == truth).mean():9.3f} {np.percentile(lat, 50) * 1e3:8.3f} {np.percentile(lat, 95) * 1e3:8.3f}")
+    print(f"model-only inference: {infer_us:.1f} us/frame, weights {size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
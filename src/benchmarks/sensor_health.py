@@ -0,0 +1,147 @@
+"""고장 셀 감지(SensorHealth) 검사 + 감지 정확도 영향 측정.
+
+합성 말뭉치에 고장 셀(0 고정, 1023 고정, 같은 값에 멈춤, 큰 노이즈)을 넣고
+- 정상 말뭉치에서 잘못 표시되는 셀이 없는지
+- 넣은 고장 셀이 모두 올바른 상태로 표시되는지
+- 고장 셀이 있을 때 자세 정확도/랜드마크 오차가 감시 켬/끔에 따라 어떻게 달라지는지
+- update()의 프레임당 시간과 tracemalloc 기준 피크 할당량
+을 출력합니다. 오탐/미탐이 있거나, 고장 말뭉치에서 감시를 켠 정확도가 끈 것보다 낮거나,
+update()가 프레임마다 할당하면 exit 1.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.sensor_health [--frames-per-sequence 120]
+"""
+from dataclasses import replace
+from typing import Dict, List, Tuple
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.detection_suite import evaluate, run_detector
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.health import CellHealth, SensorHealth
+
+# body 셀 → 넣을 고장 (몸통/엉덩이/다리 부위의 하중이 있는 셀)
+FAULTS: Dict[Tuple[int, int], CellHealth] = {
+    (2, 3): CellHealth.DEAD,
+    (6, 3): CellHealth.SATURATED,
+    (4, 2): CellHealth.STUCK,
+    (8, 4): CellHealth.NOISY,
+}
+
+
+def inject_faults(body: np.ndarray, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    body = body.copy()
+    for (r, c), fault in FAULTS.items():
+        if fault == CellHealth.DEAD:
+            body[:, r, c] = 0
+        elif fault == CellHealth.SATURATED:
+            body[:, r, c] = 1023
+        elif fault == CellHealth.STUCK:
+            body[:, r, c] = body[0, r, c]
+        else:
+            noisy = body[:, r, c] + rng.normal(0.0, 150.0, len(body))
+            body[:, r, c] = np.clip(np.rint(noisy), 0, 1023)
+    return body
+
+
+def flagged(config: DetectionConfig, head: np.ndarray, body: np.ndarray) -> Dict[Tuple[str, int, int], CellHealth]:
+    health = SensorHealth(config)
+    for i in range(len(body)):
+        health.update(head[i], body[i])
+    found = {}
+    for name, grid in zip(("head", "body"), health.status):
+        for r, c in zip(*np.nonzero(grid)):
+            found[(name, int(r), int(c))] = CellHealth(int(grid[r, c]))
+    return found
+
+
+def _update_cost(config: DetectionConfig, head: np.ndarray, body: np.ndarray) -> Tuple[float, int]:
+    health = SensorHealth(config)
+    valid = (np.ones(head.shape[1:], dtype=bool), np.ones(body.shape[1:], dtype=bool))
+    head, body = list(head), list(body) # 프레임 뷰를 미리 만들어 인덱싱 할당이 측정에 섞이지 않게 함
+    for i in range(min(50, len(body))):
+        health.update(head[i], body[i], valid)
+    # 구간 판정 프레임은 제외하고 프레임당 할당 측정
+    health.config = replace(config, health_window=len(body) + 100)
+    health.frames = 0
+    worst = 0
+    tracemalloc.start()
+    try:
+        for i in range(len(body)):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            health.update(head[i], body[i], valid)
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    health.frames = 0
+    start = time.perf_counter()
+    for i in range(len(body)):
+        health.update(head[i], body[i], valid)
+    return (time.perf_counter() - start) / len(body) * 1e6, worst
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Sensor health monitor check")
+    parser.add_argument("--frames-per-sequence", type=int, default=120)
+    parser.add_argument("--peak-budget", type=int, default=256, help="update() 프레임당 허용 피크 할당 (바이트)")
+    args = parser.parse_args(argv)
+    logging.getLogger("sensor_health").setLevel(logging.ERROR) # 구간마다 출력되는 경고 생략
+
+    corpus = generate_corpus(frames_per_sequence=args.frames_per_sequence)
+    head, body = corpus["head"], corpus["body"]
+    faulty = inject_faults(body)
+    config = DetectionConfig(log_path=os.devnull, activity_log_path="")
+    failures = []
+
+    false_positives = flagged(config, head, body)
+    if false_positives:
+        failures.append(f"clean corpus flagged: {false_positives}")
+    found = flagged(config, head, faulty)
+    for (r, c), fault in FAULTS.items():
+        status = found.get(("body", r, c))
+        print(f"body[{r},{c}] {fault.name:<10} -> {status.name if status else 'not flagged'}")
+        if status != fault:
+            failures.append(f"body[{r},{c}] {fault.name} reported as {status}")
+    extra = {k: v for k, v in found.items() if k[0] != "body" or (k[1], k[2]) not in FAULTS}
+    if extra:
+        failures.append(f"healthy cells flagged: {extra}")
+
+    print(f"{'corpus':<26} {'accuracy':>9} {'shoulder':>9} {'hip':>9}")
+    accuracy = {}
+    for name, frames, monitor in (("clean", body, False), ("faulty, monitor off", faulty, False),
+                                  ("faulty, monitor on", faulty, True)):
+        postures, landmarks, latencies = run_detector(replace(config, health_monitor=monitor), head, frames)
+        result = evaluate(corpus["labels"], corpus["landmarks"], postures, landmarks, latencies)
+        errors = result["landmark_error"]
+        accuracy[name] = result["accuracy"]
+        print(f"{name:<26} {result['accuracy']:>9.3f} {errors['shoulder']['mean']:>9.3f} {errors['hip']['mean']:>9.3f}")
+
+    if accuracy["faulty, monitor on"] < accuracy["faulty, monitor off"]:
+        failures.append(f"monitor lowers accuracy on the faulty corpus "
+                        f"({accuracy['faulty, monitor on']:.3f} < {accuracy['faulty, monitor off']:.3f})")
+
+    us, peak = _update_cost(config, head, faulty)
+    print(f"update: {us:.1f} us/frame, peak {peak} B/frame")
+    if peak > args.peak_budget:
+        failures.append(f"update() allocates {peak} B per frame (budget {args.peak_budget})")
+
+    if failures:
+        for failure in failures:
+            print(failure)
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""스파이크 필터(SpikeFilter) 벤치마크.
+
+합성 말뭉치에 한 프레임짜리 튐 값(잘린 줄로 값이 한 자릿수가 되거나 최댓값으로 튀는 셀,
+가끔은 보드 한 줄 전체)을 넣고 필터 설정별로
+- 넣은 튐 값 중 제거된 비율 / 정상 말뭉치에서 바뀐 셀 수 (오탐)
+- 자세 정확도와 어깨/엉덩이 위치 오차, 몸통 블록이 튄 프레임 수
+- 프레임당 시간과 tracemalloc 기준 피크 할당량
+을 비교합니다. 기본 설정(hampel)이 튐 값을 90% 이상 제거하지 못하거나 정상 말뭉치 정확도를
+떨어뜨리거나 프레임마다 할당하면 exit 1.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.spike_filter [--rate 0.01]
+"""
+from dataclasses import replace
+from typing import List, Tuple
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.detection_suite import evaluate, run_detector
+from benchmarks.synthetic import generate_corpus
+from detection.config import DetectionConfig
+from detection.spike_filter import SpikeFilter, filter_frames
+
+SETTINGS = {
+    "off": dict(spike_filter="off"),
+    "median-3": dict(spike_filter="median", spike_window=3),
+    "hampel-5 (default)": dict(),
+    "hampel-5 + 3x3": dict(spike_spatial_median=True),
+}
+
+
+def inject_spikes(head: np.ndarray, body: np.ndarray, rate: float, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """셀 단위 튐 값 (비율 rate)과 프레임 200개당 한 번 보드 한 줄 전체 튐 → (head, body, 튐 위치 (n, cells))."""
+    rng = np.random.default_rng(seed)
+    head, body = head.copy(), body.copy()
+    n = len(body)
+    cells = np.concatenate([head.reshape(n, -1), body.reshape(n, -1)], axis=1)
+    spikes = rng.random(cells.shape) < rate
+    for i in rng.choice(n, size=max(1, n // 200), replace=False):
+        board = rng.integers(1, 7) # body 보드 (2행 = 14셀)
+        start = head[0].size + (2 * board - 2) * body.shape[2]
+        spikes[i, start:start + 14] = True
+    # 절반은 잘린 값(한 자릿수), 절반은 최댓값 근처
+    values = np.where(rng.random(cells.shape) < 0.5, rng.integers(0, 10, cells.shape), rng.integers(980, 1024, cells.shape))
+    cells[spikes] = values[spikes]
+    head = cells[:, :head[0].size].reshape(head.shape)
+    body = cells[:, head[0].size:].reshape(body.shape)
+    return head, body, spikes
+
+
+def _torso_jumps(landmarks: np.ndarray, sequence: np.ndarray) -> int:
+    """같은 시퀀스 안에서 어깨 위치가 한 프레임 만에 2셀 이상 움직인 횟수."""
+    moved = np.abs(np.diff(landmarks[:, 1], axis=0)).max(axis=1) >= 2
+    return int((moved & (sequence[1:] == sequence[:-1])).sum())
+
+
+def _cost(config: DetectionConfig, head: np.ndarray, body: np.ndarray) -> Tuple[float, int]:
+    spike_filter = SpikeFilter(config)
+    head, body = head.copy(), body.copy()
+    heads, bodies = list(head), list(body) # 인덱싱 뷰 할당이 측정에 섞이지 않게 함
+    for i in range(min(20, len(bodies))):
+        spike_filter.apply(heads[i], bodies[i])
+    worst = 0
+    tracemalloc.start()
+    try:
+        for i in range(len(bodies)):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            spike_filter.apply(heads[i], bodies[i])
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    for i in range(len(bodies)):
+        spike_filter.apply(heads[i], bodies[i])
+    return (time.perf_counter() - start) / len(bodies) * 1e6, worst
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Spike filter benchmark")
+    parser.add_argument("--rate", type=float, default=0.01, help="셀별 튐 값 비율")
+    parser.add_argument("--frames-per-sequence", type=int, default=60)
+    parser.add_argument("--peak-budget", type=int, default=256, help="프레임당 허용 피크 할당 (바이트)")
+    args = parser.parse_args(argv)
+    logging.getLogger("sensor_health").setLevel(logging.ERROR)
+
+    corpus = generate_corpus(frames_per_sequence=args.frames_per_sequence)
+    head, body = corpus["head"], corpus["body"]
+    spiky_head, spiky_body, spikes = inject_spikes(head, body, args.rate)
+    base = DetectionConfig(log_path=os.devnull, activity_log_path="", health_monitor=False)
+    failures = []
+
+    print(f"spikes: {int(spikes.sum())} cells in {len(body)} frames")
+    print(f"{'filter':<20} {'removed':>8} {'clean chg':>10} {'acc':>6} {'clean acc':>10} {'shoulder':>9} {'hip':>6} "
+          f"{'jumps':>6} {'us':>6} {'peak B':>7}")
+    for name, overrides in SETTINGS.items():
+        config = replace(base, **overrides)
+        # 튐 값 제거율: 필터 출력이 원래(튐 전) 값에서 spike_min_dev 이내로 돌아온 튐 셀 비율
+        fh, fb, _ = filter_frames(spiky_head, spiky_body, config)
+        n = len(body)
+        restored = np.concatenate([fh.reshape(n, -1), fb.reshape(n, -1)], axis=1).astype(np.int64)
+        clipped = np.clip(np.concatenate([head.reshape(n, -1), body.reshape(n, -1)], axis=1), 0, 1023).astype(np.int64)
+        removed = float((np.abs(restored - clipped)[spikes] <= config.spike_min_dev).mean())
+        _, _, clean_changed = filter_frames(head, body, config)
+
+        postures, landmarks, latencies = run_detector(config, spiky_head, spiky_body)
+        result = evaluate(corpus["labels"], corpus["landmarks"], postures, landmarks, latencies)
+        clean_postures, clean_landmarks, clean_latencies = run_detector(config, head, body)
+        clean = evaluate(corpus["labels"], corpus["landmarks"], clean_postures, clean_landmarks, clean_latencies)
+        errors = result["landmark_error"]
+        us, peak = _cost(config, spiky_head, spiky_body)
+        print(f"{name:<20} {removed:>8.1%} {int(clean_changed.sum()):>10} {result['accuracy']:>6.3f} "
+              f"{clean['accuracy']:>10.3f} {errors['shoulder']['mean']:>9.3f} {errors['hip']['mean']:>6.3f} "
+              f"{_torso_jumps(landmarks, corpus['sequence']):>6} {us:>6.1f} {peak:>7}")
+
+        if name == "off":
+            off_clean = clean["accuracy"]
+            continue
+        if peak > args.peak_budget:
+            failures.append(f"{name}: {peak} B allocated per frame (budget {args.peak_budget})")
+        if not overrides:
+            if removed < 0.9:
+                failures.append(f"{name}: only {removed:.1%} of spikes removed")
+            if clean["accuracy"] < off_clean - 1e-9:
+                failures.append(f"{name}: clean accuracy {clean['accuracy']:.3f} < unfiltered {off_clean:.3f}")
+
+    if failures:
+        for failure in failures:
+            print(failure)
+        print("FAIL")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
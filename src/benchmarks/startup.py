@@ -0,0 +1,112 @@
+"""시작 시간 벤치마크: time-to-menu / time-to-first-frame 예산 검사.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.startup [--menu-budget 1.5] [--frame-budget 3.0]
+
+`python -X importtime`으로 메뉴 표시 전까지 import되는 모듈을 수집하여
+무거운 모듈(NumPy, supabase, serial 등)이 메뉴 이전에 로드되면 실패합니다.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 메뉴가 표시되기 전에 import되면 안 되는 모듈
+DEFERRED_MODULES = ["numpy", "requests", "serial", "rich.live", "rich.layout"]
+
+MENU_SCRIPT = """
+from cli import BedSolutionCLI
+BedSolutionCLI()
+"""
+
+FIRST_FRAME_SCRIPT = """
+import os
+import time
+from serialcm.board import BoardData
+from serialcm.serial_communication import SerialCommunication, BOARDS
+from detection.config import DetectionConfig
+from detection.detection import Detection
+
+serial_comm = SerialCommunication()
+for idx, board in enumerate(BOARDS):
+    n = 6 if idx == 0 else 14
+    serial_comm._publish(BoardData(board, time.time(), {f"{board}C{c}": 300 + 10 * c for c in range(n)}))
+snapshot = serial_comm.store.acquire(0)
+Detection(DetectionConfig(log_path=os.devnull, activity_log_path="")).detect(snapshot.head, snapshot.body)
+"""
+
+
+def _run(script: str, importtime: bool = False) -> Tuple[float, str]:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", script]
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    with tempfile.TemporaryDirectory() as cwd:
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark script failed:\n{proc.stderr[-2000:]}")
+    return elapsed, proc.stderr
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """`-X importtime` 출력에서 {모듈: 누적 시간(us)} 추출."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        modules[parts[2]] = int(parts[1])
+    return modules
+
+
+def _best_of(script: str, repeat: int) -> float:
+    return min(_run(script)[0] for _ in range(repeat))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Startup time budget benchmark")
+    parser.add_argument("--menu-budget", type=float, default=1.5, help="time-to-menu 예산 (초)")
+    parser.add_argument("--frame-budget", type=float, default=3.0, help="time-to-first-frame 예산 (초)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 느린 import 수")
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    _, stderr = _run(MENU_SCRIPT, importtime=True)
+    modules = _parse_importtime(stderr)
+    eager = [m for m in modules if any(m == d or m.startswith(d + ".") for d in DEFERRED_MODULES)]
+    if eager:
+        failures.append(f"modules imported before menu: {', '.join(sorted(eager))}")
+
+    print(f"Slowest imports before menu (cumulative):")
+    for name, us in sorted(modules.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    menu_sec = _best_of(MENU_SCRIPT, args.repeat)
+    print(f"time-to-menu:        {menu_sec:.3f}s (budget {args.menu_budget:.3f}s)")
+    if menu_sec > args.menu_budget:
+        failures.append(f"time-to-menu {menu_sec:.3f}s > {args.menu_budget:.3f}s")
+
+    frame_sec = _best_of(FIRST_FRAME_SCRIPT, args.repeat)
+    print(f"time-to-first-frame: {frame_sec:.3f}s (budget {args.frame_budget:.3f}s)")
+    if frame_sec > args.frame_budget:
+        failures.append(f"time-to-first-frame {frame_sec:.3f}s > {args.frame_budget:.3f}s")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
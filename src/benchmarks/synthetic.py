@@ -0,0 +1,82 @@
+"""벤치마크용 합성 라벨 프레임 시퀀스 생성기.
+
+신체 부위를 가우시안 압력 분포로 모사하여 (head 2x3, body 12x7) 프레임과
+자세 라벨, 랜드마크 정답(head/shoulder/hip 좌표)을 만듭니다.
+"""
+from typing import Dict, Tuple
+import numpy as np
+
+from detection.detection import Posture
+
+HEAD_SHAPE = (2, 3)
+BODY_SHAPE = (12, 7)
+
+_BR, _BC = np.meshgrid(np.arange(BODY_SHAPE[0]), np.arange(BODY_SHAPE[1]), indexing="ij")
+_HR, _HC = np.meshgrid(np.arange(HEAD_SHAPE[0]), np.arange(HEAD_SHAPE[1]), indexing="ij")
+
+
+def _blob(r: float, c: float, amp: float, sr: float, sc: float, grid=(_BR, _BC)) -> np.ndarray:
+    gr, gc = grid
+    return amp * np.exp(-0.5 * (((gr - r) / sr) ** 2 + ((gc - c) / sc) ** 2))
+
+
+def _layout(posture: Posture, c0: float) -> Tuple[list, Tuple[float, float], Tuple[float, float], Tuple[float, float]]:
+    """자세별 (blob 목록, head, shoulder, hip 좌표)."""
+    if posture == Posture.SUPINE:
+        shoulder, hip, head = (2.0, c0), (6.0, c0), (0.5, 1.0)
+        blobs = [(*shoulder, 600, 0.9, 1.3), (*hip, 750, 1.0, 1.2),
+                 (9.0, c0 - 1, 380, 1.2, 0.5), (9.0, c0 + 1, 380, 1.2, 0.5),
+                 (11.0, c0 - 1, 450, 0.5, 0.5), (11.0, c0 + 1, 450, 0.5, 0.5)]
+    elif posture in (Posture.LEFT_LATERAL, Posture.RIGHT_LATERAL):
+        s = 1.0 if posture == Posture.LEFT_LATERAL else -1.0 # LEFT: 발 방향으로 열 증가
+        shoulder, hip = (2.0, c0 - s), (6.0, c0 + s)
+        head = (0.5, 1.0 - 0.5 * s)
+        blobs = [(*shoulder, 650, 0.9, 0.7), (4.0, c0, 500, 1.0, 0.6), (*hip, 800, 1.0, 0.8),
+                 (8.5, c0 + 1.5 * s, 450, 1.0, 0.6), (10.5, c0 + 2.0 * s, 420, 0.8, 0.6)]
+    else: # PRONE
+        shoulder, hip, head = (2.5, c0), (6.0, c0), (0.5, 1.0)
+        blobs = [(*shoulder, 720, 1.1, 1.4), (*hip, 230, 1.0, 1.0),
+                 (8.5, c0 - 1, 600, 0.6, 0.5), (8.5, c0 + 1, 600, 0.6, 0.5),
+                 (11.0, c0 - 1, 260, 0.6, 0.5), (11.0, c0 + 1, 260, 0.6, 0.5)]
+    return blobs, head, shoulder, hip
+
+
+def generate_sequence(posture: Posture, n_frames: int, rng: np.random.Generator,
+                      sampling_sec: float = 1.0, start_ts: float = 0.0, noise: float = 8.0) -> Dict[str, np.ndarray]:
+    """한 자세를 유지하는 시퀀스 (호흡에 의한 미세 변동 + 센서 노이즈)."""
+    c0 = 3.0 + rng.integers(-1, 2) * 0.5
+    blobs, head_rc, shoulder_rc, hip_rc = _layout(posture, c0)
+    gain = rng.uniform(0.85, 1.15)
+
+    base_body = 90.0 + sum(_blob(r, c, amp * gain, sr, sc) for r, c, amp, sr, sc in blobs)
+    base_head = 90.0 + _blob(*head_rc, 520 * gain, 0.6, 0.7, grid=(_HR, _HC))
+
+    t = np.arange(n_frames)
+    breath = 1.0 + 0.03 * np.sin(2 * np.pi * t * sampling_sec / rng.uniform(3.5, 5.0))
+    body = base_body[None] * breath[:, None, None] + rng.normal(0.0, noise, (n_frames, *BODY_SHAPE))
+    head = base_head[None] * breath[:, None, None] + rng.normal(0.0, noise, (n_frames, *HEAD_SHAPE))
+
+    landmarks = np.array([head_rc, shoulder_rc, hip_rc], dtype=np.float64)
+    return {
+        "ts": start_ts + t * sampling_sec,
+        "head": np.clip(np.rint(head), 0, 1023).astype(np.uint16), # 센서 원시값과 같은 자료형
+        "body": np.clip(np.rint(body), 0, 1023).astype(np.uint16),
+        "labels": np.full(n_frames, posture.value, dtype=np.int64),
+        "landmarks": np.repeat(landmarks[None], n_frames, axis=0), # (n, 3, 2): head, shoulder, hip
+    }
+
+
+def generate_corpus(frames_per_sequence: int = 60, sequences_per_posture: int = 5, seed: int = 0) -> Dict[str, np.ndarray]:
+    """모든 자세의 시퀀스를 시간순으로 이어 붙인 말뭉치 (sequence: 시퀀스 번호)."""
+    rng = np.random.default_rng(seed)
+    order = [p for p in Posture for _ in range(sequences_per_posture)]
+    rng.shuffle(order)
+    parts = []
+    ts = 0.0
+    for posture in order:
+        seq = generate_sequence(posture, frames_per_sequence, rng, start_ts=ts)
+        ts = float(seq["ts"][-1]) + 1.0
+        parts.append(seq)
+    corpus = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+    corpus["sequence"] = np.repeat(np.arange(len(parts)), frames_per_sequence)
+    return corpus
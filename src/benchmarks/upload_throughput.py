@@ -0,0 +1,83 @@
+"""업로드 처리량 벤치마크 (rows/sec): 로컬 가짜 Supabase 서버 대상.
+
+src 디렉터리에서 실행:
+    python -m benchmarks.upload_throughput [--rows 5000] [--latency 0.005]
+"""
+import argparse
+import sys
+import time
+from typing import List
+
+from api.api_client import APIClient, DATA_TABLE
+from api.fake_server import FakeSupabaseServer
+from api.upload_queue import UploadQueue
+
+API_KEY = "bench-key"
+
+
+def _row(i: int) -> dict:
+    return {"device_id": 1, "occiput": 25.0 + i % 7, "scapula": 40.0, "elbow": 0, "hip": 80.0, "heel": 30.0}
+
+
+def bench_single(server: FakeSupabaseServer, rows: int) -> float:
+    client = APIClient(server.url, API_KEY)
+    start = time.perf_counter()
+    for i in range(rows):
+        client.send_data(1, _row(i))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return rows / elapsed
+
+
+def bench_bulk(server: FakeSupabaseServer, rows: int, batch_size: int, in_flight: int) -> float:
+    client = APIClient(server.url, API_KEY, max_in_flight=in_flight, batch_size=batch_size)
+    data = [_row(i) for i in range(rows)]
+    start = time.perf_counter()
+    futures = [client.insert_rows_async(DATA_TABLE, data[i:i + batch_size]) for i in range(0, rows, batch_size)]
+    for f in futures:
+        f.result()
+    elapsed = time.perf_counter() - start
+    client.close()
+    return rows / elapsed
+
+
+def bench_queue(server: FakeSupabaseServer, rows: int, batch_size: int) -> float:
+    client = APIClient(server.url, API_KEY)
+    queue = UploadQueue(client, batch_size=batch_size, flush_interval=0.05, max_pending=rows)
+    queue.start()
+    start = time.perf_counter()
+    for i in range(rows):
+        queue.put(1, _row(i))
+    queue.stop(flush=True)
+    elapsed = time.perf_counter() - start
+    client.close()
+    if queue.sent != rows:
+        raise RuntimeError(f"UploadQueue sent {queue.sent}/{rows} rows")
+    return rows / elapsed
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Upload throughput benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--single-rows", type=int, default=200, help="단건 전송 측정 행 수")
+    parser.add_argument("--batch-size", type=int, default=250)
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.005, help="서버 요청당 지연 (초, 네트워크 RTT 모사)")
+    args = parser.parse_args(argv)
+
+    with FakeSupabaseServer(api_key=API_KEY, latency=args.latency) as server:
+        single = bench_single(server, args.single_rows)
+        bulk = bench_bulk(server, args.rows, args.batch_size, args.in_flight)
+        queued = bench_queue(server, args.rows, args.batch_size)
+        stored = len(server.rows(DATA_TABLE))
+
+    expected = args.single_rows + 2 * args.rows
+    print(f"single row per POST:              {single:10.0f} rows/s")
+    print(f"bulk x{args.batch_size}, {args.in_flight} in flight:       {bulk:10.0f} rows/s")
+    print(f"UploadQueue (batch {args.batch_size}):          {queued:10.0f} rows/s")
+    print(f"rows stored on server: {stored}/{expected}")
+    return 0 if stored == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""센서 셀별 보정: 오프셋/게인/비선형 응답 → (cells, 1024) 조회 테이블.
+
+수집 절차 (Settings → Sensor Calibration):
+    1) 빈 침대에서 셀별 무부하 출력 (오프셋)
+    2) 알려진 하중(균일 하중판 + 추 등)을 단계별로 올려 셀별 출력
+
+셀마다 (원시값 → 하중) 단조 구간 선형 곡선을 맞춘 뒤, 전체 셀의 중앙값 응답(하중 → 원시값)으로
+다시 사상하여 모든 셀이 '평균적인 센서'와 같은 눈금을 갖게 합니다. 하중 단계가 없으면 오프셋만,
+하나면 오프셋+게인, 둘 이상이면 곡선까지 보정합니다.
+
+결과는 셀마다 원시값 0~1023 전체에 대한 조회 테이블로 미리 계산하므로, 프레임당 비용은
+보정 모델의 복잡도와 무관하게 인덱스 계산 + np.take 한 번입니다.
+
+셀 순서: head (2x3) → body (12x7) 행 우선 (codec.frame_codec과 동일)
+"""
+from typing import Dict, Iterable, Optional, Tuple
+import os
+import time
+
+import numpy as np
+
+HEAD_SHAPE = (2, 3)
+BODY_SHAPE = (12, 7)
+HEAD_CELLS = HEAD_SHAPE[0] * HEAD_SHAPE[1]
+CELLS = HEAD_CELLS + BODY_SHAPE[0] * BODY_SHAPE[1]
+LEVELS = 1024 # 10비트 ADC 원시값 범위
+
+
+def _interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """구간 선형 보간, 범위 밖은 양 끝 구간의 기울기로 외삽 (점이 하나면 기울기 1)."""
+    if len(xp) == 1:
+        return fp[0] + (x - xp[0])
+    y = np.interp(x, xp, fp)
+    lo, hi = x < xp[0], x > xp[-1]
+    y[lo] = fp[0] + (x[lo] - xp[0]) * (fp[1] - fp[0]) / (xp[1] - xp[0])
+    y[hi] = fp[-1] + (x[hi] - xp[-1]) * (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+    return y
+
+
+def _monotone(x: np.ndarray) -> np.ndarray:
+    """하중이 늘수록 출력이 줄지 않도록 누적 최댓값을 취하고, 같은 값은 아주 조금씩 벌림 (보간용)."""
+    x = np.maximum.accumulate(x, axis=0)
+    return x + np.arange(len(x)).reshape(-1, *([1] * (x.ndim - 1))) * 1e-3
+
+
+def fit_lut(loads: np.ndarray, raw: np.ndarray, levels: int = LEVELS) -> np.ndarray:
+    """수집 결과로 조회 테이블 생성.
+
+    loads: (k,) 단계별 하중 (첫 단계는 빈 침대 = 0), raw: (k, cells) 단계별 셀 평균 원시값
+    (수신되지 않은 셀은 NaN → 보정 없이 원시값 그대로).
+    """
+    loads = np.asarray(loads, dtype=np.float64)
+    raw = np.asarray(raw, dtype=np.float64)
+    order = np.argsort(loads, kind="stable")
+    loads, raw = loads[order], raw[order]
+    if len(loads) != len(np.unique(loads)):
+        raise ValueError("하중 단계가 중복되었습니다.")
+
+    measured = np.all(np.isfinite(raw), axis=0)
+    if not measured.any():
+        raise ValueError("수신된 셀이 없습니다.")
+    reference = _monotone(np.median(raw[:, measured], axis=1)) # 기준 응답: 하중 → 원시값
+    values = np.arange(levels, dtype=np.float64)
+    lut = np.empty((raw.shape[1], levels))
+    for cell in range(raw.shape[1]):
+        if not measured[cell]:
+            lut[cell] = values
+            continue
+        load = _interp(values, _monotone(raw[:, cell]), loads) # 원시값 → 하중
+        lut[cell] = _interp(load, loads, reference) # 하중 → 기준 센서 원시값
+    return np.clip(np.rint(lut), 0, levels - 1).astype(np.uint16)
+
+
+class Calibration:
+    """조회 테이블 기반 보정기.
+
+    apply_cells()는 미리 할당한 인덱스 버퍼를 쓰므로 스레드 안전하지 않습니다
+    (SerialCommunication은 store.lock을 잡은 상태에서 호출).
+    """
+    def __init__(self, lut: np.ndarray, loads: Optional[np.ndarray] = None, raw: Optional[np.ndarray] = None,
+                 created: Optional[float] = None):
+        self.lut = np.ascontiguousarray(lut, dtype=np.uint16)
+        self.cells, self.levels = self.lut.shape
+        self.loads = loads
+        self.raw = raw
+        self.created = created
+        self._flat = self.lut.ravel()
+        self._base = np.arange(self.cells, dtype=np.intp) * self.levels # 셀별 테이블 시작 위치
+        self._idx = np.empty(self.cells, dtype=np.intp)
+        self._views = {} # {start: (인덱스 버퍼 뷰, 셀 시작 위치 뷰)} — 보드마다 같은 구간이므로 재사용
+        # ufunc에 파이썬 스칼라를 넘기면 호출마다 0차원 배열을 만들므로 미리 만들어 둠
+        self._top = np.array(self.levels - 1, dtype=np.intp)
+
+    @classmethod
+    def fit(cls, loads: Iterable[float], raw: np.ndarray) -> "Calibration":
+        loads = np.asarray(list(loads), dtype=np.float64)
+        raw = np.asarray(raw, dtype=np.float64)
+        return cls(fit_lut(loads, raw), loads, raw, time.time())
+
+    @classmethod
+    def load(cls, path: str) -> "Calibration":
+        with np.load(path) as data:
+            lut = np.cumsum(data["lut_delta"], axis=1)
+            return cls(lut, data["loads"], data["raw"], float(data["created"]))
+
+    def save(self, path: str):
+        """셀별로 인접 원시값 간 차이만 저장 (단조 테이블이라 대부분 0/1 → 압축률이 높음)."""
+        tmp = f"{path}.tmp.npz"
+        delta = np.diff(self.lut.astype(np.int16), axis=1, prepend=np.int16(0))
+        np.savez_compressed(tmp, lut_delta=delta,
+                            loads=self.loads if self.loads is not None else np.empty(0),
+                            raw=self.raw if self.raw is not None else np.empty((0, self.cells)),
+                            created=self.created or time.time())
+        os.replace(tmp, path)
+
+    def apply_cells(self, values: np.ndarray, start: int, out: np.ndarray) -> np.ndarray:
+        """셀 start부터 len(values)개의 원시값을 보정하여 out에 기록 (values와 out이 같아도 됨)."""
+        # 시작 셀로만 조회 (튜플 키는 호출마다 새로 만들어짐), 길이가 다르면 다시 만듦
+        views = self._views.get(start)
+        if views is None or views[0].size != values.size:
+            views = self._views[start] = (self._idx[:values.size], self._base[start:start + values.size])
+        idx, base = views
+        # 같은 dtype 연산만 사용 (uint16 ↔ intp 혼합 ufunc는 형 변환 버퍼를 할당함)
+        np.copyto(idx, values, casting="unsafe")
+        np.minimum(idx, self._top, out=idx)
+        np.add(idx, base, out=idx)
+        return np.take(self._flat, idx, out=out, mode="clip")
+
+    def apply(self, head: np.ndarray, body: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(..., 2, 3), (..., 12, 7) 원시 프레임(배치 포함)을 보정한 새 배열."""
+        head_idx = np.minimum(head, self.levels - 1).astype(np.intp).reshape(*head.shape[:-2], -1)
+        body_idx = np.minimum(body, self.levels - 1).astype(np.intp).reshape(*body.shape[:-2], -1)
+        head_idx += self._base[:head_idx.shape[-1]]
+        body_idx += self._base[head_idx.shape[-1]:head_idx.shape[-1] + body_idx.shape[-1]]
+        return np.take(self._flat, head_idx).reshape(head.shape), np.take(self._flat, body_idx).reshape(body.shape)
+
+    def summary(self, hot_sigma: float = 3.0) -> Dict:
+        """빈 침대 출력 기준 요약 (중앙값에서 MAD의 hot_sigma배 이상 벗어난 셀을 이상 셀로 표시)."""
+        if self.raw is None or len(self.raw) == 0:
+            return {"levels": 0, "cells": self.cells}
+        empty = self.raw[int(np.argmin(self.loads))]
+        measured = np.isfinite(empty)
+        median = float(np.median(empty[measured])) if measured.any() else 0.0
+        mad = float(np.median(np.abs(empty[measured] - median))) if measured.any() else 0.0
+        outliers = np.flatnonzero(measured & (np.abs(empty - median) > hot_sigma * max(mad * 1.4826, 1.0)))
+        return {
+            "levels": len(self.loads),
+            "loads": [float(l) for l in self.loads],
+            "cells": self.cells,
+            "missing": int((~measured).sum()),
+            "empty_median": median,
+            "outliers": [cell_name(int(c)) for c in outliers],
+        }
+
+
+def cell_name(cell: int) -> str:
+    """셀 번호 → 'head[r,c]' / 'body[r,c]'."""
+    if cell < HEAD_CELLS:
+        return f"head[{cell // HEAD_SHAPE[1]},{cell % HEAD_SHAPE[1]}]"
+    cell -= HEAD_CELLS
+    return f"body[{cell // BODY_SHAPE[1]},{cell % BODY_SHAPE[1]}]"
+
+
+def capture(stream, seconds: float, valid=None, settle: float = 1.0) -> np.ndarray:
+    """stream()에서 seconds초 동안 프레임을 받아 셀별 평균 원시값 (cells,) — 한 번도 유효하지 않은 셀은 NaN.
+
+    valid: 호출 시점의 (head, body) 유효 마스크를 돌려주는 함수 (stale 보드 제외용).
+    settle: 하중을 올린 직후 흔들림/이전 프레임을 버리는 시간 (초)
+    """
+    total = np.zeros(CELLS)
+    count = np.zeros(CELLS)
+    cells = np.empty(CELLS)
+    mask = np.ones(CELLS, dtype=bool)
+    start = time.monotonic() + settle
+    deadline = start + seconds
+    for _, head, body in stream:
+        if time.monotonic() < start:
+            continue
+        cells[:HEAD_CELLS] = head.ravel()
+        cells[HEAD_CELLS:] = body.ravel()
+        if valid is not None:
+            head_valid, body_valid = valid()
+            mask[:HEAD_CELLS] = head_valid.ravel()
+            mask[HEAD_CELLS:] = body_valid.ravel()
+        total[mask] += cells[mask]
+        count[mask] += 1
+        if time.monotonic() >= deadline:
+            break
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
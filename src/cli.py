@@ -7,33 +7,37 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.align import Align
 from rich.table import Table
-from rich.layout import Layout
 from rich.text import Text
-from rich.live import Live
 import datetime
-from dataclasses import fields, asdict
-from typing import get_type_hints
+from dataclasses import asdict
+from typing import TYPE_CHECKING, get_type_hints
 
 # Project Modules
+# NumPy/serial/supabase를 사용하는 모듈은 메뉴 진입 시점에 import (시작 시간 단축)
 from config_manager import config_manager
-from api.api_client import APIClient
-from heatmap.heatmap import PressureHeatmap
-from detection.config import DetectionConfig
-from serialcm.serial_communication import SerialCommunication
-from detection.detection import Detection
-from ml_utils.mllogger import MLLogger
+
+if TYPE_CHECKING:
+    from api.api_client import APIClient
+    from detection.config import DetectionConfig
+    from profiling.profiler import Profiler
+
+# heatmap 로그 기본 파일명: 키프레임+델타 압축 형식 (ml_utils.mllogger.DEFAULT_LOG_FILE, .csv로 바꾸면 CSV)
+DEFAULT_HEATMAP_LOG = "heatmap_log.bfc"
+# Run 중 기록: 이 프레임 수마다 heatmap 로그에 이어서 기록 (.bfc 한 블록, 10 Hz 기준 약 30초)
+RUN_RECORD_FLUSH_FRAMES = 300
 
 
 class BedSolutionCLI:
 
-    def __init__(self):
+    def __init__(self, profile: bool | None = None, profile_window: float | None = None):
         """Initializes the CLI application."""
         self.console = Console()
         self.config_manager = config_manager
-        # APIClient를 설정의 기본값으로 초기화
-        initial_server_url = self.config_manager.get_setting("Server", "url", "")
-        initial_api_key = self.config_manager.get_setting("Server", "api_key", "")
-        self.api_client = APIClient(initial_server_url, initial_api_key)
+        # 명령행 --profile 옵션 (None이면 Settings의 Profiling 설정을 따름)
+        self.profile_override = profile
+        self.profile_window_override = profile_window
+        # APIClient는 처음 사용할 때 설정값으로 생성
+        self._api_client = None
         self.title_art = """
 ██████╗ ███████╗██████╗     ███████╗ ██████╗ ██╗     ██╗   ██╗████████╗██╗ ██████╗ ███╗   ██╗
 ██╔══██╗██╔════╝██╔══██╗    ██╔════╝██╔═══██╗██║     ██║   ██║╚══██╔══╝██║██╔═══██╗████╗  ██║
@@ -78,6 +82,16 @@ class BedSolutionCLI:
             logging.info(f"Log level: {log_level_str}")
             logging.info(f"Log file: {log_file}")
 
+    @property
+    def api_client(self) -> "APIClient":
+        """Creates the APIClient from the current settings on first use."""
+        if self._api_client is None:
+            from api.api_client import APIClient
+            server_url = self.config_manager.get_setting("Server", "url", "")
+            api_key = self.config_manager.get_setting("Server", "api_key", "")
+            self._api_client = APIClient(server_url, api_key)
+        return self._api_client
+
     def _clear_screen(self):
         """Clears the console screen."""
         os.system("cls" if os.name == "nt" else "clear")
@@ -93,41 +107,154 @@ class BedSolutionCLI:
         device_id = self.config_manager.get_setting("Device", "id")
         return server_url, api_key, device_id
 
-    def _load_detection_config(self) -> DetectionConfig:
-        """Loads detection settings from the config file, applying types."""
-        config_values = {}
-        # Create a default config instance to get field types and default values
-        default_config = DetectionConfig()
-        type_hints = get_type_hints(DetectionConfig)
-
-        for field in fields(default_config):
-            key = field.name
-            # Get the value from config manager
-            value_str = self.config_manager.get_setting("Detection", key)
-            
-            if value_str is not None:
-                # If value exists in config, try to cast it to the correct type
-                expected_type = type_hints[key]
-                try:
-                    if expected_type is bool:
-                        # Handle boolean conversion for various string inputs
-                        val = value_str.lower() in ('true', '1', 't', 'y', 'yes')
-                    else:
-                        # Cast to the appropriate type (int, float, str)
-                        val = expected_type(value_str)
-                    config_values[key] = val
-                except (ValueError, TypeError):
-                    # If casting fails, fall back to the default value
-                    config_values[key] = getattr(default_config, key)
-            else:
-                # If value is not in config, use the default
-                config_values[key] = getattr(default_config, key)
+    def _load_detection_config(self) -> "DetectionConfig":
+        """Loads detection settings from the config file, applying types (cached until the file changes)."""
+        from detection.config import DetectionConfig
+        return self.config_manager.get_dataclass("Detection", DetectionConfig)
+
+    def _create_serial_communication(self, calibrated: bool = True, alerts: bool = False):
+        """Creates the serial reader with [Serial] baud/stale_after settings (binary frames need a higher baud).
+
+        With calibrated=True and [Calibration] enabled, frames are corrected per cell at ingest.
+        With alerts=True, bed-exit/entry is evaluated on every assembled frame and sent to the [Alerts] hook.
+        """
+        from serialcm.serial_communication import SerialCommunication, BAUD, STALE_AFTER
+        try:
+            baud = int(self.config_manager.get_setting("Serial", "baud", str(BAUD)))
+            stale_after = float(self.config_manager.get_setting("Serial", "stale_after", str(STALE_AFTER)))
+        except ValueError:
+            logging.warning("Invalid [Serial] settings, using defaults")
+            baud, stale_after = BAUD, STALE_AFTER
+        calibration = self._load_calibration() if calibrated else None
+        occupancy = self._create_occupancy_monitor() if alerts else None
+        return SerialCommunication(baud=baud, stale_after=stale_after, calibration=calibration, occupancy=occupancy)
+
+    def _create_occupancy_monitor(self):
+        """Creates the bed-exit fast path with the [Alerts] hook (idle while occupancy_fast_path is off)."""
+        detection_config = self._load_detection_config()
+        from detection.occupancy import OccupancyMonitor, create_hook
+        kind = self.config_manager.get_setting("Alerts", "hook", "none").lower()
+        path = self.config_manager.get_setting("Alerts", "socket_path" if kind == "socket" else "file_path",
+                                               "/tmp/bedsolution-alerts.sock" if kind == "socket" else "bed_alerts.log")
+        try:
+            hook = create_hook(kind, path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Invalid [Alerts] settings ({e}), alerts are only logged")
+            hook = None
+        return OccupancyMonitor(detection_config, [hook] if hook else [])
+
+    def _load_calibration(self):
+        """Loads the [Calibration] lookup table if enabled (None if disabled, missing or unreadable)."""
+        if self.config_manager.get_setting("Calibration", "enabled", "False").lower() != "true":
+            return None
+        from calibration.calibration import Calibration
+        path = self.config_manager.get_setting("Calibration", "path", "calibration.npz")
+        try:
+            return Calibration.load(path)
+        except (OSError, KeyError, ValueError) as e:
+            logging.warning(f"Failed to load calibration {path}: {e}; using raw sensor values")
+            return None
+
+    def _start_run_recorder(self, hub):
+        """If [Logging] record_in_run is on, records every frame to the heatmap log as another hub subscriber.
+
+        Frames are appended to the log every RUN_RECORD_FLUSH_FRAMES frames (one .bfc block), so memory stays
+        bounded over a night and a crash only loses the frames since the last flush.
+        """
+        if self.config_manager.get_setting("Logging", "record_in_run", "False").lower() != "true":
+            return None
+        from ml_utils.mllogger import MLLogger
+        from serialcm.frame_hub import OverflowPolicy
+        mllogger = MLLogger(self.config_manager.get_setting("Logging", "heatmap_log_file", DEFAULT_HEATMAP_LOG),
+                            flush_every=RUN_RECORD_FLUSH_FRAMES)
+        hub.consume("recorder", lambda frame: mllogger.log_heatmap(frame.head, frame.body, frame.ts, copy=False),
+                    maxsize=1024, policy=OverflowPolicy.DROP_OLDEST)
+        return mllogger
+
+    def _start_live_view(self, hub, device_id: str | None):
+        """If [LiveView] is enabled, serves the live heatmap page/WebSocket on the LAN as another hub subscriber."""
+        if self.config_manager.get_setting("LiveView", "enabled", "False").lower() != "true":
+            return None
+        from liveview.server import LiveViewServer
+        host = self.config_manager.get_setting("LiveView", "host", "0.0.0.0")
+        try:
+            port = int(self.config_manager.get_setting("LiveView", "port", "8765"))
+            max_rate = float(self.config_manager.get_setting("LiveView", "max_rate", "10"))
+            deadband = int(self.config_manager.get_setting("LiveView", "deadband", "16"))
+        except ValueError:
+            logging.warning("Invalid [LiveView] settings, using defaults")
+            port, max_rate, deadband = 8765, 10.0, 16
+        live_view = LiveViewServer(self._load_detection_config(), host=host, port=port, max_rate=max_rate,
+                                   deadband=deadband, device=device_id or "")
+        if not live_view.start():
+            return None
+        live_view.attach(hub)
+        return live_view
+
+    def _save_run_recording(self, mllogger) -> str | None:
+        if mllogger is None:
+            return None
+        try:
+            return mllogger.save()
+        except Exception as e:
+            logging.error(f"Failed to save run recording: {e}")
+            return None
+
+    def _create_profiler(self, name: str) -> "Profiler | None":
+        """Creates a profiler for a loop if profiling is enabled via --profile or Settings."""
+        enabled = self.config_manager.get_setting("Profiling", "enabled", "False").lower() == "true"
+        if self.profile_override is not None:
+            enabled = self.profile_override
+        if not enabled:
+            return None
+
+        try:
+            window_sec = float(self.config_manager.get_setting("Profiling", "window_sec", "30"))
+            top_n = int(self.config_manager.get_setting("Profiling", "top_n", "30"))
+        except ValueError:
+            window_sec, top_n = 30.0, 30
+        if self.profile_window_override is not None:
+            window_sec = self.profile_window_override
+
+        from profiling.profiler import Profiler
+        return Profiler(
+            name,
+            output_dir=self.config_manager.get_setting("Profiling", "output_dir", "profiles"),
+            window_sec=window_sec,
+            top_n=top_n,
+            trace_malloc=self.config_manager.get_setting("Profiling", "tracemalloc", "False").lower() == "true",
+        )
 
-        return DetectionConfig(**config_values)
+    def _create_frame_uploader(self):
+        """Creates a compressed raw-frame uploader if enabled in the [Server] settings."""
+        if self.config_manager.get_setting("Server", "upload_frames", "False").lower() != "true":
+            return None
+        from api.upload_queue import FrameUploader
+        uploader = FrameUploader(
+            self.api_client,
+            compression=self.config_manager.get_setting("Server", "frame_compression", "zlib"),
+        )
+        uploader.start()
+        return uploader
+
+    def _print_profile_outputs(self, profiler: "Profiler | None"):
+        """Stops the profiler (if still running) and prints the written files."""
+        if profiler is None:
+            return
+        outputs = profiler.stop()
+        for kind, path in outputs.items():
+            self.console.print(f"[cyan]Profile {kind}: {os.path.abspath(path)}[/cyan]")
 
     def _run_ui(self):
         """Run Screen UI using Rich.Live for a smoother real-time display."""
         logging.info("Starting Run UI mode")
+        from rich.layout import Layout
+        from rich.live import Live
+        from detection.detection import Detection
+        from detection.adaptive import AdaptiveSampler, SamplingState
+        from serialcm.frame_hub import FrameHub
+        from heatmap.heatmap import PressureHeatmap
+
         self._clear_screen()
 
         server_url, api_key, device_id = self._get_server_config()
@@ -145,7 +272,7 @@ class BedSolutionCLI:
         self._pause()
 
         # Initialize Serial, Detection, and Heatmap
-        serial_comm = SerialCommunication()
+        serial_comm = self._create_serial_communication(alerts=True)
 
         if not serial_comm.start():
             logging.error("Failed to start serial communication")
@@ -157,6 +284,9 @@ class BedSolutionCLI:
         detection_config = self._load_detection_config()
         detector = Detection(detection_config)
         heatmap_renderer = PressureHeatmap(detection_config)
+        sampler = AdaptiveSampler(detection_config)
+        # 실행 중 config.ini의 [Detection]이 바뀌면 (튜너 --apply 등) 시리얼 수집 중단 없이 반영
+        config_watch = self.config_manager.watch("Detection")
 
         data_rows_buffer = []
         MAX_DATA_ROWS = 20
@@ -164,21 +294,75 @@ class BedSolutionCLI:
         layout = Layout()
         layout.split(
             Layout(name="header", size=4),
-            Layout(name="main_content", ratio=1)
+            Layout(name="main_content", ratio=1),
+            Layout(name="activity", size=6)
         )
         layout["main_content"].split_row(
             Layout(name="heatmap_display", ratio=2),
             Layout(name="data_stream", ratio=3)
         )
 
-        sync_status = True  # Simulate sync status
+        from api.upload_queue import UploadQueue
+        upload_queue = UploadQueue(self.api_client)
+        upload_queue.start()
+        frame_uploader = self._create_frame_uploader()
+
+        profiler = self._create_profiler("run")
+        if profiler:
+            profiler.watch("FrameBuffer", detector.frame_buffer)
+            profiler.watch("data_rows_buffer", data_rows_buffer)
+            profiler.start()
+
+        # 표시 루프는 최신 프레임만 받고 (느려지면 오래된 프레임 버림), 기록은 별도 구독자로 병행
+        hub = FrameHub(serial_comm)
+        display = hub.subscribe("display", maxsize=1)
+        recorder = self._start_run_recorder(hub)
+        live_view = self._start_live_view(hub, device_id)
+        hub.start()
 
         try:
             with Live(layout, console=self.console, screen=True, redirect_stderr=False, vertical_overflow="visible") as live:
-                for ts, head_raw, body_raw in serial_comm.stream():
-                    # Simulate sync status toggle
-                    sync_status = not sync_status
-                    status_text = "[green]Syncing with server...[/green]" if sync_status else "[red]Local storage (offline)...[/red]"
+                for frame in display:
+                    ts, head_raw, body_raw = frame.ts, frame.head, frame.body
+                    if profiler:
+                        profiler.tick()
+
+                    if config_watch.poll():
+                        detection_config = self._load_detection_config()
+                        detector.update_config(detection_config)
+                        heatmap_renderer.config = sampler.config = detection_config
+                        if live_view:
+                            live_view.config = detection_config
+                        if serial_comm.occupancy is not None:
+                            serial_comm.occupancy.config = detection_config
+                        logging.info("Detection settings reloaded")
+
+                    # 빈 침대/정지 상태에서는 감지/렌더/업로드 주기 감소
+                    if not sampler.should_process(ts, head_raw, body_raw):
+                        continue
+
+                    # 업로드 큐의 마지막 전송 결과로 동기화 상태 표시
+                    if upload_queue.online:
+                        status_text = "[green]Syncing with server...[/green]"
+                    else:
+                        status_text = f"[red]Local storage (offline)... {len(upload_queue.pending)} pending[/red]"
+                    if sampler.state != SamplingState.ACTIVE:
+                        status_text += f" [dim]| Idle ({sampler.state.name.lower()})[/dim]"
+                    if serial_comm.last_stale:
+                        status_text += f" [yellow]| No data: {', '.join(sorted(b.rstrip('_') for b in serial_comm.last_stale))}[/yellow]"
+                    occupancy = serial_comm.occupancy
+                    if occupancy is not None and occupancy.occupied is not None:
+                        event = occupancy.last_event
+                        if event is not None and event["event"] == "exit" and not occupancy.occupied:
+                            at = datetime.datetime.fromtimestamp(event["ts"]).strftime("%H:%M:%S")
+                            status_text += f" [bold red]| BED EXIT at {at}[/bold red]"
+                        else:
+                            status_text += f" [dim]| Bed: {'occupied' if occupancy.occupied else 'empty'}[/dim]"
+                    if detector.spike_filter.total_rejected:
+                        status_text += (f" [dim]| Spikes filtered: {detector.spike_filter.total_rejected}"
+                                        f" ({detector.spike_filter.rejected} last frame)[/dim]")
+                    if live_view:
+                        status_text += f" [dim]| Live view: {live_view.url} ({len(live_view.clients)} watching)[/dim]"
 
                     # Construct and update the header
                     header_content = Text.assemble(
@@ -193,11 +377,14 @@ class BedSolutionCLI:
                         Panel(header_content, title="[bold green]Current Session[/bold green]", title_align="left"))
 
                     # Run detection
-                    detection_result = detector.detect(head_raw, body_raw)
+                    detection_result = detector.detect(head_raw, body_raw, serial_comm.valid, ts)
+                    if live_view:
+                        live_view.publish_detection(ts, detection_result)
 
                     # Extract pressures for table and API
                     head_pressure = detection_result['head'][2] if detection_result['head'] else 0
                     shoulder_pressure = detection_result['shoulder'][2] if detection_result['shoulder'] else 0
+                    elbow_pressure = max(e[2] for e in detection_result['elbows']) if detection_result['elbows'] else 0
                     hip_pressure = detection_result['hip'][2] if detection_result['hip'] else 0
                     heel_pressure = max(h[2] for h in detection_result['heels']) if detection_result['heels'] else 0
 
@@ -206,7 +393,7 @@ class BedSolutionCLI:
                         datetime.datetime.fromtimestamp(ts).strftime("%H:%M:%S"),
                         f"{head_pressure:.2f}",
                         f"{shoulder_pressure:.2f}",
-                        "N/A",  # Elbow
+                        f"{elbow_pressure:.2f}",
                         f"{hip_pressure:.2f}",
                         f"{heel_pressure:.2f}"
                     ))
@@ -236,26 +423,45 @@ class BedSolutionCLI:
                     heels_coords = detection_result['heels']
                     threshold_val = detection_result['threshold']
 
-                    heatmap_panel = heatmap_renderer.render(head_raw, body_raw, head_coords, shoulder_coords, hip_coords, heels_coords, threshold_val)
+                    heatmap_panel = heatmap_renderer.render(head_raw, body_raw, head_coords, shoulder_coords, hip_coords, heels_coords, threshold_val,
+                                                            elbows=detection_result['elbows'], health=detection_result.get('health'))
                     heatmap_panel.height = MAX_DATA_ROWS + 2
                     layout["heatmap_display"].update(heatmap_panel)
-
-                    # Simulate data sending
-                    if sync_status:
-                        self.api_client.send_data(None, None, device_id, {
-                            "occiput": head_pressure, 
-                            "scapula": shoulder_pressure, 
-                            "elbow": 0, # Not detected
-                            "hip": hip_pressure, 
-                            "heel": heel_pressure
-                        })
+                    layout["activity"].update(heatmap_renderer.render_activity(detector.activity))
+
+                    # 업로드 큐에 추가 (백그라운드에서 bulk 전송)
+                    upload_queue.put(device_id, {
+                        "occiput": head_pressure, 
+                        "scapula": shoulder_pressure, 
+                        "elbow": elbow_pressure,
+                        "hip": hip_pressure, 
+                        "heel": heel_pressure
+                    }, ts)
+                    if frame_uploader:
+                        frame_uploader.put(device_id, ts, head_raw, body_raw)
 
         except KeyboardInterrupt:
             pass
         finally:
+            config_watch.close()
+            hub.stop()
+            if live_view:
+                live_view.stop()
+            serial_comm.stop()
+            if serial_comm.occupancy is not None:
+                serial_comm.occupancy.close()
+            if detector.activity is not None:
+                detector.activity.flush() # 진행 중인 분까지 활동량 로그에 기록
+            upload_queue.stop(flush=True)
+            if frame_uploader:
+                frame_uploader.stop(flush=True)
+            recording_path = self._save_run_recording(recorder)
             self._clear_screen()
             self.console.print(Panel("[bold green]Run session ended. Returning to main menu.[/bold green]",
                                 title="[bold yellow]Session Complete[/bold yellow]"))
+            if recording_path:
+                self.console.print(f"Recorded frames saved to {os.path.abspath(recording_path)}")
+            self._print_profile_outputs(profiler)
             self._pause()
 
     def _display_log_details(self, date: str):
@@ -264,7 +470,7 @@ class BedSolutionCLI:
         server_url, api_key, device_id = self._get_server_config()
         with self.console.status(f"[bold green]Fetching details for {date}...", spinner="dots"):
             time.sleep(1)
-            details = self.api_client.get_log_details(None, None, device_id, date)
+            details = self.api_client.get_log_details(device_id, date)
 
         if not details:
             self.console.print(Panel(f"No detailed logs found for [cyan]{date}[/cyan].", title="[bold red]Not Found[/bold red]"))
@@ -347,7 +553,7 @@ class BedSolutionCLI:
 
         with self.console.status("[bold green]Registering device with the server...", spinner="dots"):
             time.sleep(2)
-            new_device_id = self.api_client.register_device(None, None)
+            new_device_id = self.api_client.register_device()
             result_panel = None
             if new_device_id:
                 self.config_manager.update_setting("Device", "id", new_device_id)
@@ -366,6 +572,7 @@ class BedSolutionCLI:
             self._clear_screen()
 
             # Load current config and prepare display
+            from detection.config import DetectionConfig
             loaded_config = self._load_detection_config()
             defaults = DetectionConfig()
             type_hints = get_type_hints(DetectionConfig)
@@ -430,6 +637,326 @@ class BedSolutionCLI:
                 self.console.print(f"[red]❗ Invalid value. Please enter a valid {field_type.__name__}.[/red]")
                 self._pause()
 
+    def _profiling_settings_ui(self):
+        """Profiling Settings Screen UI"""
+        while True:
+            self._clear_screen()
+
+            enabled = self.config_manager.get_setting("Profiling", "enabled", "False")
+            window_sec = self.config_manager.get_setting("Profiling", "window_sec", "30")
+            top_n = self.config_manager.get_setting("Profiling", "top_n", "30")
+            output_dir = self.config_manager.get_setting("Profiling", "output_dir", "profiles")
+            trace_malloc = self.config_manager.get_setting("Profiling", "tracemalloc", "False")
+
+            settings_text = (
+                f"- Enabled: [cyan]{enabled}[/cyan]\n"
+                f"- Window (sec): [cyan]{window_sec}[/cyan]\n"
+                f"- Top N Functions: [cyan]{top_n}[/cyan]\n"
+                f"- Output Directory: [cyan]{output_dir}[/cyan]\n"
+                f"- tracemalloc Snapshots: [cyan]{trace_malloc}[/cyan]"
+            )
+            self.console.print(Panel(settings_text, title="[bold cyan]Profiling Settings[/bold cyan]", title_align="left"))
+            self.console.print()
+
+            choice = questionary.select(
+                "Select an action:",
+                choices=[
+                    "1. Toggle Profiling",
+                    "2. Change Window",
+                    "3. Change Top N",
+                    "4. Change Output Directory",
+                    "5. Toggle tracemalloc",
+                    "q. Return to Settings",
+                ],
+                use_indicator=True
+            ).ask()
+
+            if choice is None or choice == "q. Return to Settings":
+                break
+
+            elif choice == "1. Toggle Profiling":
+                new_value = "False" if enabled.lower() == "true" else "True"
+                self.config_manager.update_setting("Profiling", "enabled", new_value)
+                logging.info(f"Profiling {'enabled' if new_value == 'True' else 'disabled'}")
+
+            elif choice == "2. Change Window":
+                new_window = questionary.text("Enter the profiling window in seconds:", default=window_sec).ask()
+                try:
+                    if new_window:
+                        self.config_manager.update_setting("Profiling", "window_sec", str(float(new_window)))
+                except ValueError:
+                    self.console.print("[red]❗ Invalid value. Please enter a valid float.[/red]")
+                    self._pause()
+
+            elif choice == "3. Change Top N":
+                new_top_n = questionary.text("Enter the number of functions to summarize:", default=top_n).ask()
+                try:
+                    if new_top_n:
+                        self.config_manager.update_setting("Profiling", "top_n", str(int(new_top_n)))
+                except ValueError:
+                    self.console.print("[red]❗ Invalid value. Please enter a valid int.[/red]")
+                    self._pause()
+
+            elif choice == "4. Change Output Directory":
+                new_dir = questionary.text("Enter the output directory:", default=output_dir).ask()
+                if new_dir:
+                    self.config_manager.update_setting("Profiling", "output_dir", new_dir)
+
+            elif choice == "5. Toggle tracemalloc":
+                new_value = "False" if trace_malloc.lower() == "true" else "True"
+                self.config_manager.update_setting("Profiling", "tracemalloc", new_value)
+
+    def _capture_calibration_ui(self, path: str):
+        """Guided capture: empty bed first, then any number of known loads; fits and saves the lookup table."""
+        from calibration.calibration import Calibration, capture
+
+        self._clear_screen()
+        self.console.print(Panel(
+            "Calibration records each sensor cell's output with the bed empty and under known loads.\n"
+            "For load steps, spread the load evenly over the whole mat (e.g. a board with weights).\n"
+            "Use the same unit (e.g. kg) for every step.",
+            title="[bold cyan]Sensor Calibration[/bold cyan]", title_align="left"))
+        seconds = questionary.text("Capture time per step (seconds):", default="10").ask()
+        if seconds is None:
+            return
+        try:
+            seconds = float(seconds)
+        except ValueError:
+            self.console.print("[red]❗ Invalid value. Please enter a valid float.[/red]")
+            self._pause()
+            return
+
+        serial_comm = self._create_serial_communication(calibrated=False)
+        if not serial_comm.start():
+            self.console.print(Panel("[red]❗ Error starting serial communication.[/red]", title="[bold red]Error[/bold red]", title_align="left"))
+            self._pause()
+            return
+        loads, raw = [], []
+        try:
+            stream = serial_comm.stream()
+            if not questionary.confirm("Remove everything from the bed. Ready?", default=True).ask():
+                return
+            with self.console.status(f"Capturing empty bed for {seconds:.0f}s..."):
+                raw.append(capture(stream, seconds, lambda: serial_comm.valid))
+            loads.append(0.0)
+            while True:
+                load = questionary.text("Known load on the mat (blank to finish):", default="").ask()
+                if not load:
+                    break
+                try:
+                    load = float(load)
+                except ValueError:
+                    self.console.print("[red]❗ Invalid value. Please enter a valid float.[/red]")
+                    continue
+                if load <= 0 or load in loads:
+                    self.console.print("[red]❗ Each load must be positive and different from earlier steps.[/red]")
+                    continue
+                if not questionary.confirm(f"Place {load:g} on the mat. Ready?", default=True).ask():
+                    break
+                with self.console.status(f"Capturing {load:g} for {seconds:.0f}s..."):
+                    raw.append(capture(stream, seconds, lambda: serial_comm.valid))
+                loads.append(load)
+        finally:
+            serial_comm.stop()
+
+        try:
+            calibration = Calibration.fit(loads, raw)
+            calibration.save(path)
+        except (OSError, ValueError) as e:
+            logging.error(f"Calibration failed: {e}")
+            self.console.print(f"[red]❗ Calibration failed: {e}[/red]")
+            self._pause()
+            return
+        self.config_manager.update_setting("Calibration", "enabled", "True")
+        summary = calibration.summary()
+        logging.info(f"Calibration saved to {path}: {summary}")
+        self.console.print(f"[green]✔ Calibration saved to {path} and enabled.[/green]")
+        self.console.print(f"- Steps: {', '.join(f'{l:g}' for l in summary['loads'])}")
+        self.console.print(f"- Cells without data: {summary['missing']}")
+        if summary["outliers"]:
+            self.console.print(f"[yellow]- Unusual empty-bed output: {', '.join(summary['outliers'])}[/yellow]")
+        self._pause()
+
+    def _calibration_settings_ui(self):
+        """Sensor Calibration Settings Screen UI"""
+        while True:
+            self._clear_screen()
+
+            enabled = self.config_manager.get_setting("Calibration", "enabled", "False")
+            path = self.config_manager.get_setting("Calibration", "path", "calibration.npz")
+            if os.path.exists(path):
+                status = datetime.datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M")
+            else:
+                status = "Not captured"
+
+            settings_text = (
+                f"- Enabled: [cyan]{enabled}[/cyan]\n"
+                f"- Calibration File: [cyan]{path}[/cyan]\n"
+                f"- Captured: [cyan]{status}[/cyan]"
+            )
+            self.console.print(Panel(settings_text, title="[bold cyan]Sensor Calibration[/bold cyan]", title_align="left"))
+            self.console.print()
+
+            choice = questionary.select(
+                "Select an action:",
+                choices=[
+                    "1. Run Guided Capture",
+                    "2. Toggle Calibration",
+                    "3. Change Calibration File",
+                    "q. Return to Settings",
+                ],
+                use_indicator=True
+            ).ask()
+
+            if choice is None or choice == "q. Return to Settings":
+                break
+
+            elif choice == "1. Run Guided Capture":
+                self._capture_calibration_ui(path)
+
+            elif choice == "2. Toggle Calibration":
+                new_value = "False" if enabled.lower() == "true" else "True"
+                if new_value == "True" and not os.path.exists(path):
+                    self.console.print("[red]❗ Run the guided capture first.[/red]")
+                    self._pause()
+                    continue
+                self.config_manager.update_setting("Calibration", "enabled", new_value)
+                logging.info(f"Calibration {'enabled' if new_value == 'True' else 'disabled'}")
+
+            elif choice == "3. Change Calibration File":
+                new_path = questionary.text("Enter the calibration file path:", default=path).ask()
+                if new_path:
+                    self.config_manager.update_setting("Calibration", "path", new_path)
+
+    def _alerts_settings_ui(self):
+        """Bed-Exit Alerts Settings Screen UI"""
+        from detection.occupancy import HOOKS
+        while True:
+            self._clear_screen()
+
+            hook = self.config_manager.get_setting("Alerts", "hook", "none")
+            socket_path = self.config_manager.get_setting("Alerts", "socket_path", "/tmp/bedsolution-alerts.sock")
+            file_path = self.config_manager.get_setting("Alerts", "file_path", "bed_alerts.log")
+
+            settings_text = (
+                f"- Alert Hook: [cyan]{hook}[/cyan]\n"
+                f"- Socket Path: [cyan]{socket_path}[/cyan]\n"
+                f"- File Path: [cyan]{file_path}[/cyan]\n\n"
+                "[dim]Enter/exit events are sent as JSON within one frame of the change (Run and headless modes).\n"
+                "Thresholds are the occupancy_* Detection Settings; changes apply from the next Run.[/dim]"
+            )
+            self.console.print(Panel(settings_text, title="[bold cyan]Bed-Exit Alerts[/bold cyan]", title_align="left"))
+            self.console.print()
+
+            choice = questionary.select(
+                "Select an action:",
+                choices=[
+                    "1. Change Alert Hook",
+                    "2. Change Socket Path",
+                    "3. Change File Path",
+                    "q. Return to Settings",
+                ],
+                use_indicator=True
+            ).ask()
+
+            if choice is None or choice == "q. Return to Settings":
+                break
+
+            elif choice == "1. Change Alert Hook":
+                new_hook = questionary.select("Send alerts to:", choices=list(HOOKS),
+                                              default=hook if hook in HOOKS else "none").ask()
+                if new_hook:
+                    self.config_manager.update_setting("Alerts", "hook", new_hook)
+                    logging.info(f"Bed-exit alert hook set to {new_hook}")
+
+            elif choice == "2. Change Socket Path":
+                new_path = questionary.text("Enter the Unix datagram socket path:", default=socket_path).ask()
+                if new_path:
+                    self.config_manager.update_setting("Alerts", "socket_path", new_path)
+
+            elif choice == "3. Change File Path":
+                new_path = questionary.text("Enter the alert file path:", default=file_path).ask()
+                if new_path:
+                    self.config_manager.update_setting("Alerts", "file_path", new_path)
+
+    def _live_view_settings_ui(self):
+        """Live View Server Settings Screen UI"""
+        while True:
+            self._clear_screen()
+
+            enabled = self.config_manager.get_setting("LiveView", "enabled", "False")
+            host = self.config_manager.get_setting("LiveView", "host", "0.0.0.0")
+            port = self.config_manager.get_setting("LiveView", "port", "8765")
+            max_rate = self.config_manager.get_setting("LiveView", "max_rate", "10")
+            deadband = self.config_manager.get_setting("LiveView", "deadband", "16")
+
+            settings_text = (
+                f"- Enabled: [cyan]{enabled}[/cyan]\n"
+                f"- Listen Address: [cyan]{host}:{port}[/cyan]\n"
+                f"- Max Updates per Second: [cyan]{max_rate}[/cyan]\n"
+                f"- Deadband: [cyan]{deadband}[/cyan]\n\n"
+                "[dim]Open http://<device address>:<port>/ from a browser on the LAN during Run or headless mode.\n"
+                "Each viewer picks its own update rate up to the maximum; slow viewers skip frames instead of\n"
+                "delaying ingest. Cells that moved less than the deadband keep their last value (0 = exact).\n"
+                "The page has no authentication; only enable it on a trusted network.[/dim]"
+            )
+            self.console.print(Panel(settings_text, title="[bold cyan]Live View Server[/bold cyan]", title_align="left"))
+            self.console.print()
+
+            choice = questionary.select(
+                "Select an action:",
+                choices=[
+                    "1. Toggle Live View",
+                    "2. Change Listen Address",
+                    "3. Change Port",
+                    "4. Change Max Updates per Second",
+                    "5. Change Deadband",
+                    "q. Return to Settings",
+                ],
+                use_indicator=True
+            ).ask()
+
+            if choice is None or choice == "q. Return to Settings":
+                break
+
+            elif choice == "1. Toggle Live View":
+                new_value = "False" if enabled.lower() == "true" else "True"
+                self.config_manager.update_setting("LiveView", "enabled", new_value)
+                logging.info(f"Live view {'enabled' if new_value == 'True' else 'disabled'}")
+
+            elif choice == "2. Change Listen Address":
+                new_host = questionary.text("Enter the address to listen on (0.0.0.0 for all interfaces):",
+                                            default=host).ask()
+                if new_host:
+                    self.config_manager.update_setting("LiveView", "host", new_host)
+
+            elif choice == "3. Change Port":
+                new_port = questionary.text("Enter the port:", default=port).ask()
+                try:
+                    if new_port:
+                        self.config_manager.update_setting("LiveView", "port", str(int(new_port)))
+                except ValueError:
+                    self.console.print("[red]❗ Invalid value. Please enter a valid int.[/red]")
+                    self._pause()
+
+            elif choice == "4. Change Max Updates per Second":
+                new_rate = questionary.text("Enter the maximum updates per second per viewer:", default=max_rate).ask()
+                try:
+                    if new_rate:
+                        self.config_manager.update_setting("LiveView", "max_rate", str(float(new_rate)))
+                except ValueError:
+                    self.console.print("[red]❗ Invalid value. Please enter a valid float.[/red]")
+                    self._pause()
+
+            elif choice == "5. Change Deadband":
+                new_deadband = questionary.text("Enter the deadband in sensor counts (0 = exact):", default=deadband).ask()
+                try:
+                    if new_deadband:
+                        self.config_manager.update_setting("LiveView", "deadband", str(int(new_deadband)))
+                except ValueError:
+                    self.console.print("[red]❗ Invalid value. Please enter a valid int.[/red]")
+                    self._pause()
+
     def _settings_ui(self):
         """Settings Screen UI"""
         logging.info("Opening Settings UI")
@@ -438,9 +965,10 @@ class BedSolutionCLI:
 
             server_url = self.config_manager.get_setting("Server", "url", "Not set")
             api_key = self.config_manager.get_setting("Server", "api_key", "Not set")
-            log_filename = self.config_manager.get_setting("Logging", "heatmap_log_file", "heatmap_log.csv")
+            log_filename = self.config_manager.get_setting("Logging", "heatmap_log_file", DEFAULT_HEATMAP_LOG)
             debug_mode = self.config_manager.get_setting("Logging", "debug_mode", "False")
             log_level = self.config_manager.get_setting("Logging", "log_level", "INFO")
+            record_in_run = self.config_manager.get_setting("Logging", "record_in_run", "False")
 
             masked_api_key = "**********" + api_key[-4:] if len(api_key) > 4 else api_key
 
@@ -449,7 +977,8 @@ class BedSolutionCLI:
                 f"- API Key:  [cyan]{masked_api_key}[/cyan]\n"
                 f"- Log File: [cyan]{log_filename}[/cyan]\n"
                 f"- Debug Mode: [cyan]{debug_mode}[/cyan]\n"
-                f"- Log Level: [cyan]{log_level}[/cyan]"
+                f"- Log Level: [cyan]{log_level}[/cyan]\n"
+                f"- Record During Run: [cyan]{record_in_run}[/cyan]"
             )
             
             self.console.print(Panel(settings_text, title="[bold cyan]Settings[/bold cyan]", title_align="left"))
@@ -463,8 +992,13 @@ class BedSolutionCLI:
                     "3. Change Log File Name",
                     "4. Toggle Debug Mode",
                     "5. Change Log Level",
-                    "6. Detection Settings",
-                    "7. Delete All Settings",
+                    "6. Toggle Recording During Run",
+                    "7. Detection Settings",
+                    "8. Profiling Settings",
+                    "9. Sensor Calibration",
+                    "10. Bed-Exit Alerts",
+                    "11. Live View Server",
+                    "12. Delete All Settings",
                     "q. Return to Main Menu",
                 ],
                 use_indicator=True
@@ -481,9 +1015,8 @@ class BedSolutionCLI:
                     self.config_manager.update_setting("Server", "url", new_url)
                     logging.info(f"Server URL updated to: {new_url}")
                     self.console.print("[green]✔ Server URL saved successfully.[/green]")
-                    # 변경된 설정을 반영하여 APIClient 재초기화
-                    refreshed_api_key = self.config_manager.get_setting("Server", "api_key")
-                    self.api_client = APIClient(new_url, refreshed_api_key)
+                    # 변경된 설정을 반영하도록 APIClient 재생성
+                    self._api_client = None
                     self._pause()
 
             elif choice == "2. Change API Key":
@@ -492,9 +1025,8 @@ class BedSolutionCLI:
                     self.config_manager.update_setting("Server", "api_key", new_key)
                     logging.info("API Key updated")
                     self.console.print("[green]✔ API Key saved successfully.[/green]")
-                    # 변경된 설정을 반영하여 APIClient 재초기화
-                    refreshed_server_url = self.config_manager.get_setting("Server", "url")
-                    self.api_client = APIClient(refreshed_server_url, new_key)
+                    # 변경된 설정을 반영하도록 APIClient 재생성
+                    self._api_client = None
                     self._pause()
 
             elif choice == "3. Change Log File Name":
@@ -539,34 +1071,71 @@ class BedSolutionCLI:
                     self.console.print("[yellow]Note: Restart the application for logging changes to take effect.[/yellow]")
                     self._pause()
 
-            elif choice == "6. Detection Settings":
+            elif choice == "6. Toggle Recording During Run":
+                new_value = "False" if record_in_run.lower() == "true" else "True"
+                self.config_manager.update_setting("Logging", "record_in_run", new_value)
+                logging.info(f"Recording during run {'enabled' if new_value == 'True' else 'disabled'}")
+                self.console.print(f"[green]✔ Recording during run {'enabled' if new_value == 'True' else 'disabled'}. "
+                                   f"Frames are saved to {log_filename}.[/green]")
+                self._pause()
+
+            elif choice == "7. Detection Settings":
                 self._detection_settings_ui()
 
-            elif choice == "7. Delete All Settings":
+            elif choice == "8. Profiling Settings":
+                self._profiling_settings_ui()
+
+            elif choice == "9. Sensor Calibration":
+                self._calibration_settings_ui()
+
+            elif choice == "10. Bed-Exit Alerts":
+                self._alerts_settings_ui()
+
+            elif choice == "11. Live View Server":
+                self._live_view_settings_ui()
+
+            elif choice == "12. Delete All Settings":
                 confirm = questionary.confirm(
                     "Are you sure you want to delete all settings? This action cannot be undone.", default=False
                 ).ask()
                 if confirm:
                     logging.warning("All settings deleted by user")
                     self.config_manager.delete_all_settings()
+                    self._api_client = None
                     self.console.print("[green]✔ All settings have been deleted.[/green]")
                     self._pause()
 
     def _model_training_logs_ui(self):
         """Model Training Logs UI - Real-time data collection for model training"""
         logging.info("Starting Model Training Logs UI mode")
+        from rich.layout import Layout
+        from rich.live import Live
+        from ml_utils.mllogger import MLLogger
+        from ml_utils.capture_session import CaptureSession, save_session
+        from ml_utils.hotkeys import HotkeyListener
+
         self._clear_screen()
 
         self.console.print(Panel("[bold yellow]Model Training Logs Mode[/bold yellow]", title="[bold green]Starting Real-time Data Collection[/bold green]"))
         self.console.print("This mode will collect real-time sensor data for model training.")
+        self.console.print("Press 1-4 during capture to mark posture transitions, 0 to clear the label.")
         self.console.print("Press Ctrl+C to save logs and return to the main menu.")
-        self._pause()
+        self.console.print()
+
+        # 수집 세션 메타데이터
+        subject_id = questionary.text("Subject ID:", default="anonymous").ask()
+        if subject_id is None:
+            return
+        session_id = questionary.text("Session ID:", default=datetime.datetime.now().strftime("%Y%m%d-%H%M%S")).ask()
+        if session_id is None:
+            return
+        notes = questionary.text("Notes (optional):", default="").ask() or ""
 
         # Initialize Serial Communication and MLLogger
-        serial_comm = SerialCommunication()
+        serial_comm = self._create_serial_communication()
         
-        # 설정에서 로그 파일명 가져오기 (기본값: heatmap_log.csv)
-        log_filename = self.config_manager.get_setting("Logging", "heatmap_log_file", fallback="heatmap_log.csv")
+        # 설정에서 로그 파일명 가져오기 (기본값: heatmap_log.bfc)
+        log_filename = self.config_manager.get_setting("Logging", "heatmap_log_file", fallback=DEFAULT_HEATMAP_LOG)
         mllogger = MLLogger(log_filename)
         
         if not serial_comm.start():
@@ -579,9 +1148,15 @@ class BedSolutionCLI:
         log_file_path = os.path.abspath(log_filename)
         buffer_count = 0
 
+        session = CaptureSession(subject_id, session_id, log_filename, notes)
+        # 자세 라벨 단축키 (0: 라벨 해제)
+        label_keys = {"1": "SUPINE", "2": "LEFT_LATERAL", "3": "RIGHT_LATERAL", "4": "PRONE", "0": None}
+        hotkeys = HotkeyListener("".join(label_keys))
+        last_ts = None
+
         layout = Layout()
         layout.split(
-            Layout(name="header", size=6),
+            Layout(name="header", size=9),
             Layout(name="main_content", ratio=1)
         )
         layout["main_content"].split_row(
@@ -591,10 +1166,25 @@ class BedSolutionCLI:
         data_rows_buffer = []
         MAX_DATA_ROWS = 20
 
+        profiler = self._create_profiler("training")
+        if profiler:
+            profiler.watch("MLLogger.buffer", mllogger.buffer)
+            profiler.watch("data_rows_buffer", data_rows_buffer)
+            profiler.start()
+
         try:
+            hotkeys.start()
             with Live(layout, console=self.console, screen=True, redirect_stderr=False, vertical_overflow="visible") as live:
                 for ts, head_raw, body_raw in serial_comm.stream():
-                    mllogger.log_heatmap(head_raw, body_raw)
+                    if profiler:
+                        profiler.tick()
+                    mllogger.log_heatmap(head_raw, body_raw, ts)
+                    last_ts = ts
+
+                    # 단축키 입력은 별도 스레드에서 키를 누른 시각과 함께 수집됨
+                    for key_ts, key in hotkeys.poll():
+                        session.labels.transition(key_ts, label_keys[key])
+                    current_label = session.labels.current or "unlabeled"
 
                     header_content = Text.assemble(
                         Text("Model Training Logs [", style="bold"),
@@ -606,7 +1196,12 @@ class BedSolutionCLI:
                         Text(f"{len(mllogger.buffer)}", style="yellow"),
                         Text("\nMax Display: ", style="bold"),
                         Text(f"{MAX_DATA_ROWS} rows", style="dim"),
-                        Text("\nPress Ctrl+C to save and exit.", style="dim yellow")
+                        Text("\nSession: ", style="bold"),
+                        Text(f"{subject_id} / {session_id}", style="cyan"),
+                        Text("\nLabel: ", style="bold"),
+                        Text(current_label, style="bold magenta"),
+                        Text(f" ({len(session.labels)} intervals)" if hotkeys.enabled else " (hotkeys unavailable: not a terminal)", style="dim"),
+                        Text("\n[1] Supine  [2] Left  [3] Right  [4] Prone  [0] Clear  |  Ctrl+C to save and exit.", style="dim yellow")
                     )
                     layout["header"].update(
                         Panel(header_content, title="[bold green]Data Collection Session[/bold green]", title_align="left"))
@@ -614,14 +1209,11 @@ class BedSolutionCLI:
                     # Create data row for display with individual array elements
                     timestamp = datetime.datetime.fromtimestamp(ts).strftime("%H:%M:%S")
                     
-                    # Extract head and body array values
-                    head_values = [f"{float(val):.2f}" for val in head_raw.flatten()]
-                    body_values = [f"{float(val):.2f}" for val in body_raw.flatten()]
-                    
-                    # Create row with timestamp, head values, body values (최대 8개씩 제한)
-                    max_head_cols = min(len(head_values), 2)
-                    max_body_cols = min(len(body_values), 4)
-                    row_data = [timestamp] + head_values[:max_head_cols] + body_values[:max_body_cols]
+                    # Create row with timestamp, head values, body values (표시하는 앞쪽 셀만 포맷)
+                    max_head_cols = min(head_raw.size, 2)
+                    max_body_cols = min(body_raw.size, 4)
+                    row_data = [timestamp] + [f"{float(val):.2f}" for val in head_raw.flat[:max_head_cols]] \
+                        + [f"{float(val):.2f}" for val in body_raw.flat[:max_body_cols]]
                     data_rows_buffer.append(row_data)
                     
                     if len(data_rows_buffer) > MAX_DATA_ROWS:
@@ -651,13 +1243,19 @@ class BedSolutionCLI:
         except KeyboardInterrupt:
             pass
         finally:
+            serial_comm.stop()
             self._clear_screen()
             self.console.print(Panel("[bold green]Model training session ended. Logs saved. Returning to main menu.[/bold green]",
                                 title="[bold yellow]Session Complete[/bold yellow]"))
+            hotkeys.stop()
+            self._print_profile_outputs(profiler)
             try:
                 saved_path = mllogger.save()
                 if saved_path:
                     self.console.print(f"[green]✔ Logs saved successfully to: {saved_path}[/green]")
+                    session.finish(last_ts)
+                    labels_path = save_session(session)
+                    self.console.print(f"[green]✔ Session labels saved to: {labels_path} ({len(session.labels)} intervals)[/green]")
                 else:
                     self.console.print("[yellow]⚠ No data to save.[/yellow]")
             except Exception as e:
@@ -665,6 +1263,101 @@ class BedSolutionCLI:
             
             self._pause()
 
+    def run_headless(self, duration: float | None = None):
+        """Headless mode: runs serial ingest, detection and upload without the Rich UI."""
+        logging.info("Starting headless mode")
+        from detection.detection import Detection
+        from detection.adaptive import AdaptiveSampler
+        from serialcm.frame_hub import FrameHub
+        from api.upload_queue import UploadQueue
+
+        _, _, device_id = self._get_server_config()
+
+        serial_comm = self._create_serial_communication(alerts=True)
+        if not serial_comm.start():
+            logging.error("Failed to start serial communication")
+            return
+
+        detection_config = self._load_detection_config()
+        detector = Detection(detection_config)
+        sampler = AdaptiveSampler(detection_config)
+        config_watch = self.config_manager.watch("Detection")
+        upload_queue = UploadQueue(self.api_client)
+        upload_queue.start()
+        frame_uploader = self._create_frame_uploader()
+        profiler = self._create_profiler("headless")
+        if profiler:
+            profiler.watch("FrameBuffer", detector.frame_buffer)
+            profiler.start()
+
+        hub = FrameHub(serial_comm)
+        frames = hub.subscribe("detection", maxsize=1)
+        recorder = self._start_run_recorder(hub)
+        live_view = self._start_live_view(hub, device_id)
+        hub.start()
+
+        started = time.monotonic()
+        last_posture = None
+        try:
+            for frame in frames:
+                ts, head_raw, body_raw = frame.ts, frame.head, frame.body
+                if profiler:
+                    profiler.tick()
+                if duration is not None and time.monotonic() - started >= duration:
+                    break
+                if config_watch.poll():
+                    detection_config = self._load_detection_config()
+                    detector.update_config(detection_config)
+                    sampler.config = detection_config
+                    if live_view:
+                        live_view.config = detection_config
+                    if serial_comm.occupancy is not None:
+                        serial_comm.occupancy.config = detection_config
+                    logging.info("Detection settings reloaded")
+                if not sampler.should_process(ts, head_raw, body_raw):
+                    continue
+                detection_result = detector.detect(head_raw, body_raw, serial_comm.valid, ts)
+                if live_view:
+                    live_view.publish_detection(ts, detection_result)
+                if detection_result["posture"] != last_posture:
+                    last_posture = detection_result["posture"]
+                    logging.info(f"Posture changed: {last_posture.name}")
+                if device_id:
+                    upload_queue.put(device_id, {
+                        "occiput": detection_result['head'][2] if detection_result['head'] else 0,
+                        "scapula": detection_result['shoulder'][2],
+                        "elbow": max(e[2] for e in detection_result['elbows']) if detection_result['elbows'] else 0,
+                        "hip": detection_result['hip'][2],
+                        "heel": max(h[2] for h in detection_result['heels']) if detection_result['heels'] else 0
+                    }, ts)
+                    if frame_uploader:
+                        frame_uploader.put(device_id, ts, head_raw, body_raw)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            config_watch.close()
+            hub.stop()
+            if live_view:
+                live_view.stop()
+            serial_comm.stop()
+            if serial_comm.occupancy is not None:
+                serial_comm.occupancy.close()
+            if detector.activity is not None:
+                detector.activity.flush()
+                summary = detector.activity.summary()
+                logging.info(f"Activity: {summary['minutes']} min, movement {summary['activity']:.0f}, "
+                             f"COP path {summary['cop_path']:.1f} cells, posture changes {summary['posture_changes']}")
+            upload_queue.stop(flush=True)
+            if frame_uploader:
+                frame_uploader.stop(flush=True)
+            recording_path = self._save_run_recording(recorder)
+            if recording_path:
+                logging.info(f"Recorded frames saved to {os.path.abspath(recording_path)}")
+            if profiler:
+                for kind, path in profiler.stop().items():
+                    logging.info(f"Profile {kind}: {os.path.abspath(path)}")
+        logging.info("Headless mode finished")
+
     def run(self):
         """Main function to run the CLI applicatio  n."""
         logging.info("BedSolution CLI application started")
@@ -0,0 +1,315 @@
+"""압력 프레임(head, body) 코덱: 키프레임 + 델타, 희소 셀 인코딩, 블록 단위 압축.
+
+레코드 (little endian):
+    u8 kind, f64 ts, payload
+    - KEY_DENSE : i16 x cells
+    - KEY_SPARSE: u16 n, u16 idx x n, i16 value x n  (목록에 없는 셀 = fill)
+    - DELTA     : u16 n, u16 idx x n, i16 diff x n   (이전 프레임 대비 바뀐 셀)
+
+블록: u8 compression, u32 frame_count, u32 payload_len, payload(레코드들, 압축 가능)
+    블록은 항상 키프레임으로 시작하므로 블록 단위로 독립 디코딩할 수 있습니다.
+
+로그 파일(.bfc): MAGIC, u8 version, u8 x4 (head rows/cols, body rows/cols), 블록들
+"""
+from typing import BinaryIO, Iterator, Optional, Tuple
+import struct
+import zlib
+import os
+
+import numpy as np
+
+# =========OPTIONAL LZ4=============
+try:
+    import lz4.frame as lz4frame
+except ImportError:
+    lz4frame = None
+# ===============================
+
+KEY_DENSE = 0
+KEY_SPARSE = 1
+DELTA = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZ4 = 2
+COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lz4": COMPRESSION_LZ4}
+
+MAGIC = b"BFC1"
+VERSION = 1
+HEAD_SHAPE = (2, 3)
+BODY_SHAPE = (12, 7)
+
+_RECORD_HEADER = struct.Struct("<Bd")
+_COUNT = struct.Struct("<H")
+_BLOCK_HEADER = struct.Struct("<BII")
+_FILE_HEADER = struct.Struct("<4sBBBBB")
+
+Frame = Tuple[float, np.ndarray, np.ndarray]
+
+
+def compress(data: bytes, compression: int, level: int = 6) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return data
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, level)
+    if compression == COMPRESSION_LZ4:
+        if lz4frame is None:
+            raise RuntimeError("lz4 압축을 사용하려면 lz4 패키지가 필요합니다.")
+        return lz4frame.compress(data)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def decompress(data: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return data
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_LZ4:
+        if lz4frame is None:
+            raise RuntimeError("lz4 압축 해제에 lz4 패키지가 필요합니다.")
+        return lz4frame.decompress(data)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+class FrameEncoder:
+    """프레임을 키프레임/델타 레코드로 인코딩.
+
+    threshold를 지정하면 threshold 이하 값은 fill로 저장됩니다 (손실 압축).
+    기본값(None)에서는 디코더가 원래 배열을 정확히 복원합니다.
+    """
+    def __init__(self, head_shape: Tuple[int, int] = HEAD_SHAPE, body_shape: Tuple[int, int] = BODY_SHAPE,
+                 keyframe_interval: int = 60, threshold: Optional[int] = None, fill: int = 0):
+        self.head_shape = tuple(head_shape)
+        self.body_shape = tuple(body_shape)
+        self.head_size = int(np.prod(self.head_shape))
+        self.cells = self.head_size + int(np.prod(self.body_shape))
+        if self.cells > 0xFFFF:
+            raise ValueError("cells must fit in uint16 indices")
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.threshold = threshold
+        self.fill = fill
+
+        self._cur = np.empty(self.cells, dtype=np.int32)
+        self._prev = np.empty(self.cells, dtype=np.int32)
+        self._has_prev = False
+        self._since_key = 0
+
+    def reset(self):
+        """다음 프레임을 키프레임으로 강제."""
+        self._has_prev = False
+        self._since_key = 0
+
+    def _load(self, head: np.ndarray, body: np.ndarray) -> np.ndarray:
+        cur = self._cur
+        cur[:self.head_size] = head.reshape(-1)
+        cur[self.head_size:] = body.reshape(-1)
+        if self.threshold is not None:
+            cur[cur <= self.threshold] = self.fill
+        if cur.min() < -0x8000 or cur.max() > 0x7FFF:
+            raise ValueError("frame values must fit in int16")
+        return cur
+
+    @staticmethod
+    def _sparse(idx: np.ndarray, values: np.ndarray) -> bytes:
+        return _COUNT.pack(len(idx)) + idx.astype("<u2").tobytes() + values.astype("<i2").tobytes()
+
+    def _keyframe(self, cur: np.ndarray, ts: float) -> bytes:
+        nz = np.flatnonzero(cur != self.fill)
+        if 2 + 4 * len(nz) < 2 * self.cells:
+            return _RECORD_HEADER.pack(KEY_SPARSE, ts) + self._sparse(nz, cur[nz])
+        return _RECORD_HEADER.pack(KEY_DENSE, ts) + cur.astype("<i2").tobytes()
+
+    def encode(self, head: np.ndarray, body: np.ndarray, ts: float = 0.0) -> bytes:
+        cur = self._load(head, body)
+        record = None
+        if self._has_prev and self._since_key < self.keyframe_interval:
+            diff = cur - self._prev
+            idx = np.flatnonzero(diff)
+            key_size = min(2 * self.cells, 2 + 4 * int(np.count_nonzero(cur != self.fill)))
+            if 2 + 4 * len(idx) < key_size and np.abs(diff[idx]).max(initial=0) <= 0x7FFF:
+                record = _RECORD_HEADER.pack(DELTA, ts) + self._sparse(idx, diff[idx])
+                self._since_key += 1
+        if record is None:
+            record = self._keyframe(cur, ts)
+            self._since_key = 1
+
+        self._prev[:] = cur
+        self._has_prev = True
+        return record
+
+
+class FrameDecoder:
+    """FrameEncoder 레코드를 (ts, head, body)로 복원 (기본 자료형은 저장 형식과 같은 int16)."""
+    def __init__(self, head_shape: Tuple[int, int] = HEAD_SHAPE, body_shape: Tuple[int, int] = BODY_SHAPE,
+                 fill: int = 0, dtype=np.int16):
+        self.head_shape = tuple(head_shape)
+        self.body_shape = tuple(body_shape)
+        self.head_size = int(np.prod(self.head_shape))
+        self.cells = self.head_size + int(np.prod(self.body_shape))
+        self.fill = fill
+        self.dtype = dtype
+        self._frame = np.zeros(self.cells, dtype=np.int32)
+        self._has_key = False
+
+    def _read_sparse(self, data: memoryview, offset: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        (n,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        idx = np.frombuffer(data, dtype="<u2", count=n, offset=offset)
+        offset += 2 * n
+        values = np.frombuffer(data, dtype="<i2", count=n, offset=offset)
+        return idx, values, offset + 2 * n
+
+    def decode_from(self, data, offset: int = 0) -> Tuple[Frame, int]:
+        """data[offset:]의 레코드 하나를 디코딩하고 (프레임, 다음 offset) 반환."""
+        data = memoryview(data)
+        kind, ts = _RECORD_HEADER.unpack_from(data, offset)
+        offset += _RECORD_HEADER.size
+        frame = self._frame
+        if kind == KEY_DENSE:
+            frame[:] = np.frombuffer(data, dtype="<i2", count=self.cells, offset=offset)
+            offset += 2 * self.cells
+            self._has_key = True
+        elif kind == KEY_SPARSE:
+            idx, values, offset = self._read_sparse(data, offset)
+            frame.fill(self.fill)
+            frame[idx] = values
+            self._has_key = True
+        elif kind == DELTA:
+            if not self._has_key:
+                raise ValueError("delta record without a preceding keyframe")
+            idx, diff, offset = self._read_sparse(data, offset)
+            frame[idx] += diff
+        else:
+            raise ValueError(f"Unknown record kind: {kind}")
+
+        head = frame[:self.head_size].reshape(self.head_shape).astype(self.dtype)
+        body = frame[self.head_size:].reshape(self.body_shape).astype(self.dtype)
+        return (ts, head, body), offset
+
+    def decode(self, record: bytes) -> Frame:
+        frame, _ = self.decode_from(record)
+        return frame
+
+
+class FrameBlockEncoder:
+    """프레임을 모아 (키프레임으로 시작하는) 압축 블록으로 만듦."""
+    def __init__(self, compression: str = "zlib", level: int = 6, **encoder_kwargs):
+        self.compression = COMPRESSIONS[compression]
+        self.level = level
+        self.encoder = FrameEncoder(**encoder_kwargs)
+        self._records = []
+        self.first_ts: Optional[float] = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, head: np.ndarray, body: np.ndarray, ts: float = 0.0):
+        if not self._records:
+            self.encoder.reset()
+            self.first_ts = ts
+        self._records.append(self.encoder.encode(head, body, ts))
+
+    def finish(self) -> bytes:
+        payload = compress(b"".join(self._records), self.compression, self.level)
+        block = _BLOCK_HEADER.pack(self.compression, len(self._records), len(payload)) + payload
+        self._records.clear()
+        return block
+
+
+def decode_block(block, decoder: FrameDecoder, offset: int = 0) -> Tuple[list, int]:
+    """블록 하나를 디코딩하여 (프레임 목록, 다음 offset) 반환."""
+    block = memoryview(block)
+    compression, count, length = _BLOCK_HEADER.unpack_from(block, offset)
+    offset += _BLOCK_HEADER.size
+    payload = decompress(bytes(block[offset:offset + length]), compression)
+    frames = []
+    pos = 0
+    for _ in range(count):
+        frame, pos = decoder.decode_from(payload, pos)
+        frames.append(frame)
+    return frames, offset + length
+
+
+class FrameLogWriter:
+    """프레임을 .bfc 로그 파일에 블록 단위로 추가 기록."""
+    def __init__(self, path: str, block_frames: int = 300, compression: str = "zlib",
+                 head_shape: Tuple[int, int] = HEAD_SHAPE, body_shape: Tuple[int, int] = BODY_SHAPE, **encoder_kwargs):
+        self.path = path
+        self.block_frames = max(1, block_frames)
+        self.blocks = FrameBlockEncoder(compression, head_shape=head_shape, body_shape=body_shape, **encoder_kwargs)
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as f:
+                header = _read_header(f)
+            if header != (tuple(head_shape), tuple(body_shape)):
+                raise ValueError(f"{path}: frame shape mismatch {header}")
+        self._file: BinaryIO = open(path, "ab")
+        if not exists:
+            self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, *head_shape, *body_shape))
+
+    def add(self, head: np.ndarray, body: np.ndarray, ts: float):
+        self.blocks.add(head, body, ts)
+        if len(self.blocks) >= self.block_frames:
+            self.flush()
+
+    def flush(self):
+        if len(self.blocks):
+            self._file.write(self.blocks.finish())
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_header(f: BinaryIO) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    raw = f.read(_FILE_HEADER.size)
+    if len(raw) != _FILE_HEADER.size:
+        raise ValueError("truncated frame log header")
+    magic, version, hr, hc, br, bc = _FILE_HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a frame log file")
+    return (hr, hc), (br, bc)
+
+
+def iter_blocks(path: str) -> Iterator[Tuple[int, int]]:
+    """블록의 (파일 offset, 프레임 수)를 순회 (압축 해제 없이 헤더만 읽음)."""
+    with open(path, "rb") as f:
+        _read_header(f)
+        while True:
+            offset = f.tell()
+            raw = f.read(_BLOCK_HEADER.size)
+            if len(raw) < _BLOCK_HEADER.size:
+                return
+            _, count, length = _BLOCK_HEADER.unpack(raw)
+            yield offset, count
+            f.seek(length, os.SEEK_CUR)
+
+
+def read_frame_log(path: str, start_offset: Optional[int] = None, max_blocks: Optional[int] = None,
+                   dtype=np.int16) -> Iterator[Frame]:
+    """.bfc 로그에서 (ts, head, body)를 블록 단위로 스트리밍."""
+    with open(path, "rb") as f:
+        head_shape, body_shape = _read_header(f)
+        if start_offset is not None:
+            f.seek(start_offset)
+        decoder = FrameDecoder(head_shape, body_shape, dtype=dtype)
+        read = 0
+        while max_blocks is None or read < max_blocks:
+            raw = f.read(_BLOCK_HEADER.size)
+            if len(raw) < _BLOCK_HEADER.size:
+                return
+            _, _, length = _BLOCK_HEADER.unpack(raw)
+            payload = f.read(length)
+            if len(payload) < length:
+                return # 마지막 블록이 잘린 경우
+            frames, _ = decode_block(raw + payload, decoder)
+            yield from frames
+            read += 1
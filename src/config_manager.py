@@ -1,42 +1,213 @@
 import configparser
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import fields
 from pathlib import Path
+from typing import Callable, Dict, Set, Tuple, Type, TypeVar, get_type_hints
+
+T = TypeVar("T")
+# Subscriber callback: (changed section names, new config version)
+Subscriber = Callable[[Set[str], int], None]
+
 
 class ConfigManager:
     """
     Handles reading and writing configuration settings to a file (config.ini).
+
+    Every change bumps `version`. Typed dataclass views are cached per version,
+    and edits made to the file by another process are picked up via its mtime.
+    Updates inside `transaction()` are written once, atomically, on commit.
     """
     def __init__(self, config_file="config.ini"):
         self.config_path = Path(config_file)
         self.config = configparser.ConfigParser()
+        self.version = 0
+        self._mtime_ns: int | None = None
+        self._lock = threading.RLock()
+        self._tx_depth = 0
+        self._tx_changed: Set[str] = set()
+        self._subscribers: list[Subscriber] = []
+        self._typed_cache: Dict[Tuple[str, type], Tuple[int, object]] = {}
         self._load()
 
+    def _file_mtime_ns(self) -> int | None:
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
     def _load(self):
         """Loads the configuration from the file."""
+        config = configparser.ConfigParser()
         if self.config_path.exists():
-            self.config.read(self.config_path)
+            config.read(self.config_path)
+        self.config = config
+        self._mtime_ns = self._file_mtime_ns()
 
     def _save(self):
-        """Saves the current configuration to the file."""
-        with self.config_path.open("w") as f:
+        """Saves the current configuration to the file (write to a temp file, then rename)."""
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+        with tmp_path.open("w") as f:
             self.config.write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.config_path)
+        self._mtime_ns = self._file_mtime_ns()
+
+    def _changed(self, sections: Set[str]):
+        """Bumps the version and notifies subscribers (deferred until commit inside a transaction)."""
+        if self._tx_depth:
+            self._tx_changed |= sections
+            return
+        self.version += 1
+        version = self.version
+        for callback in list(self._subscribers):
+            callback(set(sections), version)
+
+    def reload_if_changed(self) -> bool:
+        """Re-reads config.ini if another process modified it. Returns True if it was reloaded."""
+        with self._lock:
+            if self._tx_depth or self._file_mtime_ns() == self._mtime_ns:
+                return False
+            old = {s: dict(self.config.items(s, raw=True)) for s in self.config.sections()}
+            self._load()
+            new = {s: dict(self.config.items(s, raw=True)) for s in self.config.sections()}
+            changed = {s for s in old.keys() | new.keys() if old.get(s) != new.get(s)}
+            if changed:
+                self._changed(changed)
+            return bool(changed)
 
     def get_setting(self, section: str, key: str, fallback: str | None = None) -> str | None:
         """Gets a specific setting value."""
+        self.reload_if_changed()
         return self.config.get(section, key, fallback=fallback)
 
     def update_setting(self, section: str, key: str, value: str):
         """Updates or adds a specific setting."""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        self.config.set(section, key, str(value))
-        self._save()
+        with self.transaction():
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            if self.config.get(section, key, fallback=None) == str(value):
+                return
+            self.config.set(section, key, str(value))
+            self._tx_changed.add(section)
+
+    @contextmanager
+    def transaction(self):
+        """Batches updates: the file is written once and subscribers notified once on commit.
+
+        If the block raises, the in-memory config is restored and nothing is written.
+        """
+        with self._lock:
+            if self._tx_depth == 0:
+                self.reload_if_changed()
+                snapshot = {s: dict(self.config.items(s, raw=True)) for s in self.config.sections()}
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self.config = configparser.ConfigParser()
+                    self.config.read_dict(snapshot)
+                    self._tx_changed = set()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0 and self._tx_changed:
+                changed, self._tx_changed = self._tx_changed, set()
+                self._save()
+                self._changed(changed)
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Registers a change callback. Returns a function that unsubscribes it."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
+
+    def watch(self, section: str, interval: float = 1.0) -> "SectionWatch":
+        """Returns a poller that reports changes to `section`, including edits by other processes."""
+        return SectionWatch(self, section, interval)
+
+    def get_dataclass(self, section: str, cls: Type[T]) -> T:
+        """Returns `cls` populated from `section`, converting values to the field types.
+
+        Missing or invalid values fall back to the field defaults. The instance is
+        cached until the config version changes, so callers must not mutate it.
+        """
+        with self._lock:
+            self.reload_if_changed()
+            cached = self._typed_cache.get((section, cls))
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+
+            type_hints = get_type_hints(cls)
+            values = {}
+            for field in fields(cls):
+                value_str = self.config.get(section, field.name, fallback=None)
+                if value_str is None:
+                    continue
+                expected_type = type_hints[field.name]
+                try:
+                    if expected_type is bool:
+                        values[field.name] = value_str.lower() in ('true', '1', 't', 'y', 'yes')
+                    else:
+                        values[field.name] = expected_type(value_str)
+                except (ValueError, TypeError):
+                    pass
+            instance = cls(**values)
+            self._typed_cache[(section, cls)] = (self.version, instance)
+            return instance
+
+    def update_dataclass(self, section: str, instance, keys=None):
+        """Writes the given dataclass fields (all fields by default) in one transaction."""
+        names = keys if keys is not None else [f.name for f in fields(instance)]
+        with self.transaction():
+            for name in names:
+                self.update_setting(section, name, str(getattr(instance, name)))
 
     def delete_all_settings(self):
         """Deletes the entire configuration file."""
-        if self.config_path.exists():
-            self.config_path.unlink()
-        # Reset the in-memory config object
-        self.config = configparser.ConfigParser()
+        with self._lock:
+            if self.config_path.exists():
+                self.config_path.unlink()
+            sections = set(self.config.sections())
+            # Reset the in-memory config object
+            self.config = configparser.ConfigParser()
+            self._mtime_ns = None
+            self._changed(sections)
+
+
+class SectionWatch:
+    """
+    Polled from a processing loop: `poll()` re-checks the file at most every
+    `interval` seconds and returns True once after the section has changed.
+    """
+    def __init__(self, manager: ConfigManager, section: str, interval: float = 1.0):
+        self.manager = manager
+        self.section = section
+        self.interval = interval
+        self._event = threading.Event()
+        self._next_check = 0.0
+        self._unsubscribe = manager.subscribe(self._on_change)
+
+    def _on_change(self, sections: Set[str], version: int):
+        if self.section in sections:
+            self._event.set()
+
+    def poll(self) -> bool:
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.interval
+            self.manager.reload_if_changed()
+        if self._event.is_set():
+            self._event.clear()
+            return True
+        return False
+
+    def close(self):
+        self._unsubscribe()
+
 
 # Create a single instance to be used throughout the application
 config_manager = ConfigManager()
@@ -0,0 +1,246 @@
+"""움직임(활동량) 지수와 압력 중심(COP) 궤적의 증분 집계.
+
+프레임마다 body 격자에서 value_min 초과분을 하중으로 보고
+- load: 전체 하중 (value_min 초과분의 합)
+- cop: 하중 가중 평균 위치 (row, col), 하중이 없으면 NaN
+- activity: 직전 프레임 대비 셀별 하중 변화량 절댓값의 평균 (L1 / 셀 수)
+를 계산하고, 분 단위/시간 단위 집계를 고정 크기 원형 버퍼에 쌓습니다.
+버퍼 크기가 고정이므로 실행 시간과 무관하게 메모리가 일정하고,
+프레임당 계산은 미리 할당한 버퍼에서 몇 번의 ufunc/dot 호출뿐입니다.
+
+분 단위 집계는 activity_log_path가 있으면 분이 끝날 때마다 CSV에 한 줄씩 추가합니다 (자세 포함).
+적응형 샘플링으로 건너뛴 프레임은 집계되지 않으므로 frames는 실제 처리한 프레임 수입니다.
+"""
+from typing import Dict, Optional
+import csv
+import math
+import os
+
+import numpy as np
+
+from detection.config import DetectionConfig
+
+# 분/시간 집계 레코드
+ROLLUP_DTYPE = np.dtype([
+    ("start", "f8"), # 구간 시작 시각 (epoch 초)
+    ("frames", "i4"),
+    ("activity", "f4"), # 프레임별 activity 합 (구간 내 움직임 총량)
+    ("activity_max", "f4"),
+    ("load", "f4"), # 평균 하중
+    ("cop_r", "f4"), # 하중이 있던 프레임의 평균 COP
+    ("cop_c", "f4"),
+    ("cop_path", "f4"), # COP 이동 거리 합 (셀)
+    ("posture", "i1"), # 가장 많이 판단된 자세 (Posture.value, 없으면 -1)
+    ("posture_changes", "i2"),
+])
+POSTURES = 4
+LOG_FIELDS = ["minute", "frames", "activity", "activity_max", "load", "cop_r", "cop_c", "cop_path", "posture", "posture_changes"]
+
+
+class _Rollup:
+    """진행 중인 구간의 누적값 → ROLLUP_DTYPE 레코드."""
+    def __init__(self):
+        self.posture_counts = np.zeros(POSTURES, dtype=np.int64)
+        self.reset(float("nan"))
+
+    def reset(self, start: float):
+        self.start = start
+        self.frames = 0
+        self.activity = 0.0
+        self.activity_max = 0.0
+        self.load = 0.0
+        self.cop_frames = 0
+        self.cop_r = 0.0
+        self.cop_c = 0.0
+        self.cop_path = 0.0
+        self.posture_counts.fill(0)
+        self.posture_changes = 0
+
+    def add_frame(self, activity: float, load: float, cop_r: float, cop_c: float, step: float,
+                  posture: int, changed: bool):
+        self.frames += 1
+        self.activity += activity
+        self.activity_max = max(self.activity_max, activity)
+        self.load += load
+        if not math.isnan(cop_r):
+            self.cop_frames += 1
+            self.cop_r += cop_r
+            self.cop_c += cop_c
+        self.cop_path += step
+        if 0 <= posture < POSTURES:
+            self.posture_counts[posture] += 1
+        self.posture_changes += changed
+
+    def add_record(self, record: np.void):
+        """완료된 하위 구간(분) 레코드를 합침 (시간 단위 집계용)."""
+        frames = int(record["frames"])
+        if not frames:
+            return
+        self.frames += frames
+        self.activity += float(record["activity"])
+        self.activity_max = max(self.activity_max, float(record["activity_max"]))
+        self.load += float(record["load"]) * frames
+        if not math.isnan(record["cop_r"]):
+            self.cop_frames += frames
+            self.cop_r += float(record["cop_r"]) * frames
+            self.cop_c += float(record["cop_c"]) * frames
+        self.cop_path += float(record["cop_path"])
+        if record["posture"] >= 0:
+            self.posture_counts[record["posture"]] += frames
+        self.posture_changes += int(record["posture_changes"])
+
+    def record(self) -> tuple:
+        frames = max(self.frames, 1)
+        cop = (self.cop_r / self.cop_frames, self.cop_c / self.cop_frames) if self.cop_frames else (math.nan, math.nan)
+        posture = int(self.posture_counts.argmax()) if self.posture_counts.any() else -1
+        return (self.start, self.frames, self.activity, self.activity_max, self.load / frames, *cop,
+                self.cop_path, posture, self.posture_changes)
+
+
+class _Ring:
+    """ROLLUP_DTYPE 고정 크기 원형 버퍼."""
+    def __init__(self, size: int):
+        self.data = np.zeros(max(1, size), dtype=ROLLUP_DTYPE)
+        self.count = 0
+        self._next = 0
+
+    def append(self, record: tuple):
+        self.data[self._next] = record
+        self._next = (self._next + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+
+    def last(self, n: Optional[int] = None) -> np.ndarray:
+        """최근 n개 레코드 (오래된 것부터, 복사본)."""
+        n = self.count if n is None else min(n, self.count)
+        idx = (self._next - n + np.arange(n)) % len(self.data)
+        return self.data[idx]
+
+
+class ActivityTracker:
+    """프레임별 지표 + 분/시간 집계. 원형 버퍼 크기는 기본 24시간(분)/7일(시간)."""
+    def __init__(self, config: DetectionConfig, minutes: int = 24 * 60, hours: int = 7 * 24):
+        self.config = config
+        self.minutes = _Ring(minutes)
+        self.hours = _Ring(hours)
+        self.frames = 0
+        self.last: Dict[str, float] = {"load": 0.0, "cop_r": math.nan, "cop_c": math.nan, "activity": 0.0}
+        self._minute = _Rollup()
+        self._hour = _Rollup()
+        self._shape = None
+        self._posture = -1
+
+    def _allocate(self, shape):
+        h, w = shape
+        self._shape = tuple(shape)
+        self._size = h * w
+        self._w = np.empty(self._size) # value_min 초과 하중
+        self._grid = self._w.reshape(shape) # 입력 복사용 2차원 뷰 (프레임마다 reshape 뷰를 만들지 않음)
+        self._prev = np.empty(self._size)
+        self._diff = np.empty(self._size)
+        self._rows = np.repeat(np.arange(h, dtype=np.float64), w) # 셀별 행/열 좌표 (dot 가중합용)
+        self._cols = np.tile(np.arange(w, dtype=np.float64), h)
+        self._ones = np.ones(self._size)
+        # ufunc/dot에 넘길 스칼라와 결과 (파이썬 스칼라, @ 연산자는 호출마다 임시 배열을 만듦)
+        self._floor = np.array(0.0)
+        self._zero = np.array(0.0)
+        self._acc = np.array(0.0)
+        self._has_prev = False
+
+    def update(self, ts: float, head: np.ndarray, body: np.ndarray, posture=None) -> Dict[str, float]:
+        """프레임 반영 → 이 프레임의 {load, cop_r, cop_c, activity} (head는 현재 사용하지 않음).
+
+        돌려주는 딕셔너리는 self.last이며 다음 프레임에서 갱신됩니다.
+        """
+        if self._shape is None or body.size != self._size:
+            self._allocate(body.shape)
+        w = self._w
+        np.copyto(self._grid, body)
+        self._floor[()] = self.config.value_min
+        np.subtract(w, self._floor, out=w)
+        np.maximum(w, self._zero, out=w)
+
+        load = self._dot(w, self._ones)
+        if load > 0.0:
+            cop_r, cop_c = self._dot(w, self._rows) / load, self._dot(w, self._cols) / load
+        else:
+            cop_r = cop_c = math.nan
+        if self._has_prev:
+            np.subtract(w, self._prev, out=self._diff)
+            np.abs(self._diff, out=self._diff)
+            activity = self._dot(self._diff, self._ones) / self._size
+        else:
+            activity = 0.0
+        prev_r, prev_c = self.last["cop_r"], self.last["cop_c"]
+        step = math.hypot(cop_r - prev_r, cop_c - prev_c) if not (math.isnan(cop_r) or math.isnan(prev_r)) else 0.0
+        np.copyto(self._prev, w)
+        self._has_prev = True
+
+        value = -1 if posture is None else int(getattr(posture, "value", posture))
+        changed = self._posture >= 0 and value >= 0 and value != self._posture
+        if value >= 0:
+            self._posture = value
+
+        self._roll(ts)
+        self._minute.add_frame(activity, load, cop_r, cop_c, step, value, changed)
+        self.frames += 1
+        last = self.last # 같은 딕셔너리를 갱신 (프레임마다 새로 만들지 않음)
+        last["load"], last["cop_r"], last["cop_c"], last["activity"] = load, cop_r, cop_c, activity
+        return last
+
+    def _dot(self, a: np.ndarray, b: np.ndarray) -> float:
+        return float(np.dot(a, b, out=self._acc))
+
+    # 분/시간 경계를 넘으면 진행 중인 구간을 닫아 원형 버퍼에 넣음
+    def _roll(self, ts: float):
+        minute = math.floor(ts / 60.0) * 60.0
+        if math.isnan(self._minute.start):
+            self._minute.reset(minute)
+            self._hour.reset(math.floor(ts / 3600.0) * 3600.0)
+            return
+        if minute == self._minute.start:
+            return
+        self.flush()
+        self._minute.reset(minute)
+        hour = math.floor(ts / 3600.0) * 3600.0
+        if hour != self._hour.start:
+            if self._hour.frames:
+                self.hours.append(self._hour.record())
+            self._hour.reset(hour)
+
+    def flush(self):
+        """진행 중인 분을 닫음 (세션 종료 시 호출하면 마지막 분도 기록됨)."""
+        if not self._minute.frames:
+            return
+        record = self._minute.record()
+        self.minutes.append(record)
+        self._hour.add_record(self.minutes.last(1)[0])
+        self._minute.reset(float("nan"))
+        if self.config.activity_log_path:
+            self._write(self.config.activity_log_path, record)
+
+    def _write(self, path: str, record: tuple):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new:
+                writer.writerow(LOG_FIELDS)
+            writer.writerow([int(record[0]), record[1], f"{record[2]:.2f}", f"{record[3]:.2f}", f"{record[4]:.1f}",
+                             f"{record[5]:.2f}", f"{record[6]:.2f}", f"{record[7]:.2f}", record[8], record[9]])
+
+    def recent(self, field: str, n: int = 60, include_current: bool = True) -> np.ndarray:
+        """최근 n분의 field 값 (오래된 것부터, 진행 중인 분 포함)."""
+        values = self.minutes.last(n - 1 if include_current and self._minute.frames else n)[field].astype(np.float64)
+        if include_current and self._minute.frames:
+            values = np.append(values, self._minute.record()[ROLLUP_DTYPE.names.index(field)])
+        return values
+
+    def summary(self) -> Dict[str, float]:
+        """기록된 전체 분(원형 버퍼에 남은 범위) + 진행 중인 분의 합계."""
+        minutes = self.minutes.last()
+        current = self._minute
+        return {
+            "minutes": int(len(minutes) + (1 if current.frames else 0)),
+            "activity": float(minutes["activity"].sum()) + current.activity,
+            "cop_path": float(minutes["cop_path"].sum()) + current.cop_path,
+            "posture_changes": int(minutes["posture_changes"].sum()) + current.posture_changes,
+        }
@@ -0,0 +1,89 @@
+from enum import Enum
+import numpy as np
+
+from detection.config import DetectionConfig
+
+
+# argmax로 최댓값 조회 (np.max 등 ufunc reduce는 호출마다 내부 반복자를 할당함)
+def _max(x: np.ndarray) -> float:
+    return x.item(x.argmax()) if x.size else 0.0
+
+
+class SamplingState(Enum):
+    ACTIVE = 0 # 움직임 있음: 모든 프레임 처리
+    EMPTY = 1 # 빈 침대
+    QUIESCENT = 2 # 환자가 정지 상태
+
+
+class AdaptiveSampler:
+    """빈 침대/정지 상태에서는 idle_interval_sec 주기로만 프레임을 처리하고,
+    마지막 처리 프레임 대비 quiescent_eps 이상 변화가 생기면 즉시 전체 속도로 복귀."""
+    def __init__(self, config: DetectionConfig):
+        self.config = config
+        self.state = SamplingState.ACTIVE
+        self._ref_head = None
+        self._ref_body = None
+        self._last_process = float("-inf")
+        self._still_since = None
+        self.processed = 0
+        self.skipped = 0
+
+    # 기준/차이 버퍼가 이 프레임에 맞는지 (uint16 프레임은 부호 있는 int32로 넓혀 차이를 계산)
+    # 크기만 비교 (.shape는 접근할 때마다 튜플을 새로 만듦)
+    def _ref_matches(self, head: np.ndarray, body: np.ndarray) -> bool:
+        return (self._ref_head is not None and self._ref_head.size == head.size and self._ref_body.size == body.size
+                and self._ref_head.dtype == np.promote_types(head.dtype, np.int16)
+                and self._ref_body.dtype == np.promote_types(body.dtype, np.int16))
+
+    def _update_ref(self, head: np.ndarray, body: np.ndarray):
+        if not self._ref_matches(head, body):
+            self._ref_head = np.empty(head.shape, dtype=np.promote_types(head.dtype, np.int16))
+            self._ref_body = np.empty(body.shape, dtype=np.promote_types(body.dtype, np.int16))
+            # 프레임마다 차이 배열을 새로 만들지 않도록 작업 버퍼를 함께 할당
+            self._diff_head = np.empty_like(self._ref_head)
+            self._diff_body = np.empty_like(self._ref_body)
+        np.copyto(self._ref_head, head)
+        np.copyto(self._ref_body, body)
+
+    def _change(self, head: np.ndarray, body: np.ndarray) -> float:
+        if not self._ref_matches(head, body):
+            return float("inf")
+        # 넓힌 자료형으로 먼저 복사한 뒤 같은 자료형끼리 빼서 형 변환용 임시 버퍼 할당을 피함
+        np.copyto(self._diff_head, head)
+        np.copyto(self._diff_body, body)
+        np.subtract(self._diff_head, self._ref_head, out=self._diff_head)
+        np.subtract(self._diff_body, self._ref_body, out=self._diff_body)
+        np.abs(self._diff_head, out=self._diff_head)
+        np.abs(self._diff_body, out=self._diff_body)
+        return max(_max(self._diff_head), _max(self._diff_body))
+
+    def _is_empty(self, head: np.ndarray, body: np.ndarray) -> bool:
+        limit = self.config.value_min + self.config.empty_margin
+        return _max(head) <= limit and _max(body) <= limit
+
+    # 이번 프레임에 감지/렌더/업로드를 수행할지 여부
+    def should_process(self, ts: float, head: np.ndarray, body: np.ndarray) -> bool:
+        if not self.config.adaptive_sampling:
+            return True
+
+        if self._change(head, body) > self.config.quiescent_eps:
+            self.state = SamplingState.ACTIVE
+            self._still_since = ts
+        else:
+            if self._still_since is None:
+                self._still_since = ts
+            if self._is_empty(head, body):
+                self.state = SamplingState.EMPTY
+            elif ts - self._still_since >= self.config.quiescent_sec:
+                self.state = SamplingState.QUIESCENT
+            else:
+                self.state = SamplingState.ACTIVE
+
+        if self.state != SamplingState.ACTIVE and ts - self._last_process < self.config.idle_interval_sec:
+            self.skipped += 1
+            return False
+
+        self._update_ref(head, body)
+        self._last_process = ts
+        self.processed += 1
+        return True
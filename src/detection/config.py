@@ -13,3 +13,32 @@ class DetectionConfig:
     heel_search_rows: int = 1 # 발꿈치 탐색 하단 행 수
     log_path: str = "posture_log.csv" # 로그 파일
     use_pillow: bool = True # 배게 사용 (머리 가중 반영용 플래그)
+    adaptive_sampling: bool = True # 빈 침대/정지 상태에서 처리 주기 감소
+    idle_interval_sec: float = 5.0 # 유휴 상태 처리 주기
+    empty_margin: int = 20 # 모든 셀 <= value_min+margin 이면 빈 침대
+    quiescent_eps: float = 15.0 # 프레임 간 최대 변화량이 이 값 이하면 정지
+    quiescent_sec: float = 10.0 # 정지 상태로 판단하기까지의 시간
+    posture_backend: str = "rules" # 자세 판단: rules(규칙) | model(학습된 분류기)
+    posture_model_path: str = "posture_model.npz" # model 백엔드 가중치 파일
+    spike_filter: str = "hampel" # 스파이크 필터: off | median | hampel (감지 전 셀별 시간 방향 필터)
+    spike_window: int = 5 # 시간 필터 프레임 수 (홀수)
+    spike_sigma: float = 3.0 # hampel: 중앙값에서 spike_sigma * MAD(정규화) 이상 벗어나면 대체
+    spike_min_dev: float = 40.0 # hampel 최소 허용 편차 (조용한 셀의 MAD가 0이어도 정상 노이즈는 통과)
+    spike_max_fraction: float = 0.2 # hampel: 이상값 셀이 이 비율을 넘으면 실제 움직임으로 보고 통과
+    spike_spatial_median: bool = False # 시간 필터 뒤 3x3 공간 중앙값
+    health_monitor: bool = True # 고장 셀(dead/saturated/stuck/noisy)을 감지하여 이웃 셀 값으로 대체
+    health_window: int = 60 # 셀 상태 판정 구간 (처리 프레임 수)
+    health_dead_level: int = 5 # 구간 내내 이 값 이하이고 이웃 셀에 하중이 있으면 dead
+    health_saturated_level: int = 1020 # 구간 내내 이 값 이상이고 이웃 셀은 아니면 saturated
+    health_stuck_range: float = 0.0 # 이웃 셀은 움직이는데 구간 내 변화폭이 이 값 이하면 stuck
+    health_noisy_factor: float = 4.0 # 표준편차가 이웃 셀 평균의 N배 이상이면 noisy
+    health_noise_floor: float = 10.0 # noisy 최소 표준편차 / stuck 판정 시 이웃 셀의 최소 표준편차
+    activity_tracking: bool = True # 프레임 간 움직임(활동량)/압력 중심(COP) 분 단위 집계
+    activity_log_path: str = "activity_log.csv" # 분 단위 집계 로그 (빈 문자열이면 기록 안 함)
+    occupancy_fast_path: bool = True # 조립된 프레임마다(평활화 전) 재실/이탈 판정 → 알림 훅
+    occupancy_enter_load: float = 2000.0 # 재실: 하중(value_min 초과분 합) 이상이고
+    occupancy_enter_cells: int = 8 # 활성 셀(value_min+empty_margin 초과) 수 이상
+    occupancy_exit_load: float = 800.0 # 이탈: 하중이 이 값 미만이거나
+    occupancy_exit_cells: int = 3 # 활성 셀 수가 이 값 미만
+    heatmap_mode: str = "cells" # 히트맵 표시: cells(셀당 2칸) | bilinear | bicubic (보간 확대, 반 블록 문자)
+    heatmap_scale: int = 2 # 보간 확대 배율 (2배면 셀 표시와 같은 화면 크기)
@@ -1,11 +1,15 @@
-from numpy.lib.stride_tricks import sliding_window_view
 import numpy as np
 from typing import Tuple, Dict, Optional, List
-import math, time, csv
+import math, time, csv, logging
 from dataclasses import asdict
 from enum import Enum
+from detection.activity import ActivityTracker
 from detection.config import DetectionConfig
 from detection.frame_buffer import FrameBuffer
+from detection.health import SensorHealth
+from detection.spike_filter import SpikeFilter
+from detection.landmarks import LandmarkExtractor
+from detection.segmentation import Component, Segmenter
 
 class TorsoParts(Enum):
     HEAD = 0
@@ -26,8 +30,57 @@ class Detection:
     def __init__(self, config: DetectionConfig):
         self.config = config
         self.frame_buffer = FrameBuffer(config.moving_avg_N)
+        # 임계값 이상 활성화된 셀의 연결 요소 (3셀 미만 요소는 제외)
+        self.segmenter = Segmenter(connectivity=4, min_area=3)
+        self.landmarks = LandmarkExtractor()
+        self._head: Optional[np.ndarray] = None # 클리핑 작업 버퍼
+        self._body: Optional[np.ndarray] = None
+        # 튐 값 제거 (클리핑 이후, 프레임 버퍼에 넣기 전)
+        self.spike_filter = SpikeFilter(config)
+        # 고장 셀 감시 (원시 프레임 기준) — 비정상 셀은 이웃 값으로 채우고, 채울 정상 이웃이 없는 셀만 임계값 계산에서 제외
+        self.health = SensorHealth(config) if config.health_monitor else None
+        self._usable: Optional[Tuple[np.ndarray, np.ndarray]] = None # valid & usable 작업 버퍼
+        # 프레임 간 움직임/압력 중심 집계 (필터링된 프레임 기준, 분 단위 원형 버퍼)
+        self.activity = ActivityTracker(config) if config.activity_tracking else None
+        self.posture_model = self._load_posture_model()
         self._init_log()
 
+    # 설정 핫 리로드: 프레임 버퍼의 누적 프레임은 유지하고 바뀐 부분만 다시 초기화
+    def update_config(self, config: DetectionConfig):
+        old, self.config = self.config, config
+        if config.moving_avg_N != old.moving_avg_N:
+            self.frame_buffer.resize(config.moving_avg_N)
+        if (config.posture_backend, config.posture_model_path) != (old.posture_backend, old.posture_model_path):
+            self.posture_model = self._load_posture_model()
+        if config.log_path != old.log_path:
+            self._init_log()
+        self.spike_filter.config = config
+        if not config.health_monitor:
+            self.health = None
+        elif self.health is None:
+            self.health = SensorHealth(config)
+        else:
+            self.health.config = config
+        if not config.activity_tracking:
+            if self.activity is not None:
+                self.activity.flush()
+            self.activity = None
+        elif self.activity is None:
+            self.activity = ActivityTracker(config)
+        else:
+            self.activity.config = config
+
+    # model 백엔드: 학습된 분류기 로드 (실패 시 규칙 기반으로 대체)
+    def _load_posture_model(self):
+        if self.config.posture_backend != "model":
+            return None
+        from ml_utils.posture_model import PostureModel
+        try:
+            return PostureModel.load(self.config.posture_model_path)
+        except (OSError, KeyError, ValueError) as e:
+            logging.getLogger("detection").warning(f"Posture model unavailable ({e}), using rule-based posture")
+            return None
+
     # ML학습용 로그 초기화 (헤더 포함)
     def _init_log(self):
         with open(self.config.log_path, "w", newline="") as f:
@@ -38,88 +91,33 @@ class Detection:
         pass
 
     # 적응형 임계값
-    def _adaptive_threshold(self, head: np.ndarray, body: np.ndarray) -> float:
-        x = np.concatenate([head.flatten(), body.flatten()])
+    def _adaptive_threshold(self, head: np.ndarray, body: np.ndarray, valid: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> float:
+        if valid is not None and (valid[0].any() or valid[1].any()):
+            x = np.concatenate([head[valid[0]], body[valid[1]]]) # 유효 셀만으로 임계값 계산
+        else:
+            x = np.concatenate([head.flatten(), body.flatten()])
         x = x[np.isfinite(x)]
         x = np.clip(x, self.config.value_min, self.config.value_max)
         return float(np.percentile(x, self.config.percentile_p))
 
-    # 2x2 블록 합
-    def _sum2x2(self, x: np.ndarray) -> float:
-        win = sliding_window_view(x, (2, 2))
-        return win.sum(axis=(-1, -2))
-
-    # 최대값 위치
-    def _argmax2d(self, x: np.ndarray) -> Tuple[int, int]:
-        idx = np.argmax(x)
-        return divmod(idx, x.shape[1])
-
-    # 블록 중심 좌표
-    def _centroid_from_block(self, r: int, c: int) -> Tuple[float, float]:
-        return (r + 0.5, c + 0.5)
-
-    # 행과 열의 최대값 위치
-    def _row_col_max(self, x: np.ndarray) -> Tuple[int, int]:
-        r = int(np.argmax(x.sum(axis=1)))
-        c = int(np.argmax(x.sum(axis=0)))
-        return r, c
-
-    # 몸통 부분 탐지
-    def _detect_torso_parts(self, body: np.ndarray, threshold: float, min_activated: int = 3) -> Dict:
-        sum = self._sum2x2(body)
-
-         # TODO: 임계값을 이용 활성화된 셀 파악
-
-        f_r, f_c = self._argmax2d(sum) # 2x2 블록 합의 최대값 위치
-        r_max, c_max = self._row_col_max(body) # 행과 열의 최대값 위치
-
-        # 포함 여부
-        overlaps_row = (f_r == r_max)
-        overlaps_col = (f_c == c_max)
-
-        torso_h, torso_w = body.shape # 몸통 크기
-        upper_th = math.floor((torso_h-1) * 0.5) # 상단 절반 경계
-        block_center_r, block_center_c = self._centroid_from_block(f_r, f_c) # 최대값 블록 중심 좌표
-
-        part = TorsoParts.SHOULDERS if block_center_r > upper_th else TorsoParts.HIPS
-        # 부위 마스크
-        mask = np.zeros_like(body, dtype=bool)
-        mask[f_r:f_r+2, f_c:f_c+2] = True
-        score = float(sum[f_r, f_c])
-        return {
-            "part_hint": part,
-            "block_rc": (f_r, f_c),
-            "center_rc": (block_center_r, block_center_c),
-            "max_rc": (r_max, c_max),
-            "overlaps": (overlaps_row, overlaps_col),
-            "score": score,
-            "mask": mask,
-            "sum": sum,
-        }
-
-    # Return (row, col, score) if detected, None if not
-    def _detect_head(self, head: np.ndarray, threshold: float) -> Optional[Tuple[int, int, int]]:
-        x = head.copy()
-        x[x < threshold] = 0.0
-        if np.all(~np.isfinite(x)):
+    # 가장 큰 요소의 주축 기울기로 좌/우 측면 판단 (축이 불분명하면 None)
+    def _posture_from_orientation(self, components: List[Component]) -> Optional[Posture]:
+        if not components:
+            return None
+        body = components[0]
+        if body.area < 4 or body.elongation < 1.2:
             return None
-        r, c = self._argmax2d(x)
-        return (r, c, float(x[r, c]))
-    
-    def _detect_heel(self, body: np.ndarray, threshold: float) -> List[Tuple[float, float, float]]:
-        if self.config.heel_search_rows < 1: return []
-        rows = slice(body.shape[0]-self.config.heel_search_rows, body.shape[0])
-        mask = body[rows, :].copy()
-        mask[mask < threshold] = 0.0
-
-        # 열별 최댓값
-        vals = mask.max(axis=0)
-        rows_idx = mask.argmax(axis= 0)
-        candidates = [(rows.start+int(rows_idx[c]), c, float(vals[c])) for c in range(mask.shape[1]) if vals[c] > 0.0]
-        candidates.sort(key=lambda x: x[2], reverse=True)
-        return candidates[:2]
-
-    def _detect_posture(self, head: Optional[Tuple[float, float, float]], shoulder: Tuple[float, float, float], hip: Tuple[float, float, float], threshold: float) -> Posture:
+        dr, dc = body.axis
+        length = body.rows[1] - body.rows[0] + 1
+        # 주축을 따라 머리→발 방향으로 이동할 때의 좌우 변위 (셀)
+        lateral = length * dc / dr if dr > 1e-6 else math.copysign(float(length), dc)
+        if abs(lateral) <= self.config.upright_tolerance_cells:
+            return Posture.SUPINE
+        # 발 방향으로 열이 증가 = shoulder 열 < hip 열
+        return Posture.LEFT_LATERAL if lateral > 0 else Posture.RIGHT_LATERAL
+
+    def _detect_posture(self, head: Optional[Tuple[float, float, float]], shoulder: Tuple[float, float, float], hip: Tuple[float, float, float], threshold: float, components: Optional[List[Component]] = None) -> Posture:
+        oriented = self._posture_from_orientation(components or [])
         cols = []
         if head is not None: cols.append(head[1])
         cols.append(shoulder[1])
@@ -136,6 +134,8 @@ class Detection:
             delta = shoulder[1]-hip[1]
             label = Posture.LEFT_LATERAL if abs(delta) >= self.config.upright_tolerance_cells+1 and delta > 0 else \
                 Posture.RIGHT_LATERAL if abs(delta) >= self.config.upright_tolerance_cells+1 and delta < 0 else Posture.SUPINE
+        if oriented is not None:
+            label = oriented
 
         # 엎드림 탐지
         hip_mean = hip[2]
@@ -144,43 +144,80 @@ class Detection:
 
         return label
 
-    # head_raw: int32, body_raw: int32
-    def detect(self, head_raw: np.ndarray, body_raw: np.ndarray) -> Dict:
-        head = np.clip(head_raw, self.config.value_min, self.config.value_max)
-        body = np.clip(body_raw, self.config.value_min, self.config.value_max)
+    # out에 클리핑 (크기/자료형이 다르면 새로 할당)
+    def _clip(self, raw: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        if out is None or out.shape != raw.shape or out.dtype != raw.dtype:
+            out = np.empty_like(raw)
+        return np.clip(raw, self.config.value_min, self.config.value_max, out=out)
+
+    # head_raw: (2, 3), body_raw: (12, 7) — 센서 원시값은 uint16
+    # valid: (head, body) 셀별 유효 여부 (stale 보드 등) — 무효 셀은 압력 없음(value_min)으로 보고 임계값 계산에서 제외
+    # ts: 프레임 수신 시각 (활동량 분 단위 집계용, 없으면 현재 시각)
+    def detect(self, head_raw: np.ndarray, body_raw: np.ndarray, valid: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+               ts: Optional[float] = None) -> Dict:
+        # 클리핑 전 원시값으로 셀 상태 통계 갱신 (0/1023 고정 셀은 클리핑하면 구분되지 않음)
+        if self.health is not None:
+            self.health.update(head_raw, body_raw, valid)
+        # 원시 프레임 자료형(uint16) 그대로 작업 버퍼에 클리핑 (평균 계산 시에만 누적기에서 넓힘)
+        head = self._head = self._clip(head_raw, self._head)
+        body = self._body = self._clip(body_raw, self._body)
+        if valid is not None:
+            np.putmask(head, ~valid[0], self.config.value_min)
+            np.putmask(body, ~valid[1], self.config.value_min)
+        rejected = self.spike_filter.apply(head, body) if self.spike_filter.enabled else 0
+        if self.health is not None:
+            self.health.inpaint(head, body, self.config.value_min)
+            valid = self._usable_mask(valid)
 
         self.frame_buffer.push(head, body)
         head_avg, body_avg = self.frame_buffer.get_avg()
-
-        adaptive_threshold = self._adaptive_threshold(head_avg, body_avg)
-
-        torso = self._detect_torso_parts(body, adaptive_threshold)
-        f_r, f_c = torso["block_rc"]
-        block_mean = float(body_avg[f_r:f_r+2, f_c:f_c+2].mean())
-
-        if torso["part_hint"] == TorsoParts.SHOULDERS:
-            detected_shoulder = (*torso["center_rc"], block_mean)
-            # 하단 부위 중 최댓값에서 엉덩이 탐색
-            lower = body_avg[body_avg.shape[0]//2:, :]
-            lower_sum = self._sum2x2(lower)
-            l_r, l_c = self._argmax2d(lower_sum)
-            detected_hip = (l_r+body_avg.shape[0]//2+0.5, l_c+0.5, float(lower[l_r:l_r+2, l_c:l_c+2].mean()))
-        elif torso["part_hint"] == TorsoParts.HIPS:
-            detected_hip = (*torso["center_rc"], block_mean)
-            upper = body_avg[:body_avg.shape[0]//2, :]
-            upper_sum = self._sum2x2(upper)
-            u_r, u_c = self._argmax2d(upper_sum)
-            detected_shoulder = (u_r+0.5, u_c+0.5, float(upper[u_r:u_r+2, u_c:u_c+2].mean()))
-
-        detected_head = self._detect_head(head, adaptive_threshold)
-        detected_heels = self._detect_heel(body_avg, adaptive_threshold)
-        posture = self._detect_posture(detected_head, detected_shoulder, detected_hip, adaptive_threshold)
+        result = self.detect_smoothed(head_avg, body_avg, valid)
+        result["health"] = self.health.status if self.health is not None else None
+        result["rejected"] = rejected # 스파이크 필터가 바꾼 셀 수
+        if self.activity is not None:
+            result["activity"] = self.activity.update(time.time() if ts is None else ts, head, body, result["posture"])
+        else:
+            result["activity"] = None
+        return result
+
+    # valid & usable (이웃 평균으로 채운 고장 셀은 실제 하중의 추정값이므로 임계값 계산에 포함 —
+    # 빼면 하중이 있는 셀이 빠져 백분위 임계값이 낮아짐. 채울 정상 이웃이 없는 셀만 제외)
+    def _usable_mask(self, valid: Optional[Tuple[np.ndarray, np.ndarray]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        usable = self.health.usable
+        if usable[0].all() and usable[1].all():
+            return valid
+        if valid is None:
+            return usable
+        if self._usable is None or self._usable[0].shape != usable[0].shape or self._usable[1].shape != usable[1].shape:
+            self._usable = (np.empty_like(usable[0]), np.empty_like(usable[1]))
+        np.logical_and(valid[0], usable[0], out=self._usable[0])
+        np.logical_and(valid[1], usable[1], out=self._usable[1])
+        return self._usable
+
+    # 이동 평균 프레임으로 감지 (프레임 버퍼 상태를 사용하지 않음)
+    def detect_smoothed(self, head_avg: np.ndarray, body_avg: np.ndarray,
+                        valid: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict:
+        adaptive_threshold = self._adaptive_threshold(head_avg, body_avg, valid)
+
+        # 랜드마크와 연결 요소 모두 평활화된 프레임 기준
+        landmarks = self.landmarks.extract(head_avg, body_avg, adaptive_threshold, self.config.heel_search_rows)
+        components = self.segmenter.segment(body_avg, adaptive_threshold)
+
+        detected_head = landmarks["head"]
+        detected_shoulder = landmarks["shoulder"]
+        detected_hip = landmarks["hip"]
+        if self.posture_model is not None:
+            posture = self.posture_model.predict(head_avg, body_avg)
+        else:
+            posture = self._detect_posture(detected_head, detected_shoulder, detected_hip, adaptive_threshold, components)
 
         return {
             "threshold": adaptive_threshold,
             "posture": posture,
             "head": detected_head,
             "shoulder": detected_shoulder,
+            "elbows": landmarks["elbows"],
             "hip": detected_hip,
-            "heels": detected_heels
+            "heels": landmarks["heels"],
+            "components": components,
         }
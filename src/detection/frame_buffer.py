@@ -1,20 +1,91 @@
-from typing import List, Tuple
+from typing import Optional, Tuple
 import numpy as np
 
+
+# 이동 평균 합계 누적기 자료형: 정수 프레임은 int64로 넓혀 정확히 더하고 빼며, 실수 프레임은 float64
+def accumulator_dtype(dtype) -> np.dtype:
+    return np.dtype(np.int64) if np.issubdtype(dtype, np.integer) else np.dtype(np.float64)
+
+
 class FrameBuffer:
+    """최근 maxSize개 프레임의 원형 버퍼와 이동 평균.
+
+    프레임은 입력 자료형(센서 원시값은 uint16) 그대로 보관하고, 넓힌 자료형의 합계 누적기에
+    새 프레임을 더하고 밀려난 프레임을 빼서 평균을 구합니다. 버퍼는 첫 프레임의 크기/자료형으로
+    한 번 할당되므로 push()/get_avg()에서 배열 할당이 없습니다.
+    """
     def __init__(self, max_size: int):
         self.maxSize = max(1, max_size)
-        self.buf_head: List[np.ndarray] = []
-        self.buf_body: List[np.ndarray] = []
+        self.buf_head: Optional[np.ndarray] = None # (maxSize, rows, cols)
+        self.buf_body: Optional[np.ndarray] = None
+        self.count = 0
+        self._next = 0 # 다음에 쓸 슬롯
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _allocate(self, head: np.ndarray, body: np.ndarray):
+        self.buf_head = np.zeros((self.maxSize, *head.shape), dtype=head.dtype)
+        self.buf_body = np.zeros((self.maxSize, *body.shape), dtype=body.dtype)
+        self._sum_head = np.zeros(head.shape, dtype=accumulator_dtype(head.dtype))
+        self._sum_body = np.zeros(body.shape, dtype=accumulator_dtype(body.dtype))
+        self._avg_head = np.zeros(head.shape)
+        self._avg_body = np.zeros(body.shape)
+        self.count = 0
+        self._next = 0
 
     def push(self, head: np.ndarray, body: np.ndarray):
-        self.buf_head.append(head)
-        self.buf_body.append(body)
-        if len(self.buf_head) > self.maxSize:
-            self.buf_head.pop(0)
-            self.buf_body.pop(0)
+        if (self.buf_head is None or self.buf_head.shape[1:] != head.shape or self.buf_body.shape[1:] != body.shape
+                or self.buf_head.dtype != head.dtype or self.buf_body.dtype != body.dtype):
+            self._allocate(head, body)
+        i = self._next
+        if self.count == self.maxSize:
+            np.subtract(self._sum_head, self.buf_head[i], out=self._sum_head)
+            np.subtract(self._sum_body, self.buf_body[i], out=self._sum_body)
+        else:
+            self.count += 1
+        np.copyto(self.buf_head[i], head)
+        np.copyto(self.buf_body[i], body)
+        np.add(self._sum_head, self.buf_head[i], out=self._sum_head)
+        np.add(self._sum_body, self.buf_body[i], out=self._sum_body)
+        self._next = (i + 1) % self.maxSize
+
+    def frames(self) -> Tuple[np.ndarray, np.ndarray]:
+        """보관 중인 프레임을 오래된 순서로 (복사본)."""
+        if self.buf_head is None:
+            return np.empty((0,)), np.empty((0,))
+        order = (np.arange(self.count) + self._next - self.count) % self.maxSize
+        return self.buf_head[order], self.buf_body[order]
+
+    def resize(self, max_size: int):
+        max_size = max(1, max_size)
+        if max_size == self.maxSize:
+            return
+        if self.buf_head is None:
+            self.maxSize = max_size
+            return
+        heads, bodies = self.frames()
+        self.maxSize = max_size
+        self._allocate(heads[0] if len(heads) else self.buf_head[0], bodies[0] if len(bodies) else self.buf_body[0])
+        for head, body in zip(heads[-max_size:], bodies[-max_size:]):
+            self.push(head, body)
 
     def get_avg(self) -> Tuple[np.ndarray, np.ndarray]:
-        H = np.mean(self.buf_head, axis=0)
-        B = np.mean(self.buf_body, axis=0)
-        return H, B
\ No newline at end of file
+        """(head, body) 이동 평균 (float64, 다음 push() 전까지 유효한 공유 배열)."""
+        np.divide(self._sum_head, self.count, out=self._avg_head)
+        np.divide(self._sum_body, self.count, out=self._avg_body)
+        return self._avg_head, self._avg_body
+
+def moving_average(frames: np.ndarray, n: int) -> np.ndarray:
+    """(t, ...) 프레임 배열 전체에 FrameBuffer와 같은 이동 평균을 한 번에 적용.
+
+    i번째 결과는 frames[max(0, i-n+1):i+1]의 평균입니다 (시작 부분은 채워진 프레임만 평균).
+    """
+    n = max(1, n)
+    acc = accumulator_dtype(frames.dtype)
+    cs = np.cumsum(frames, axis=0, dtype=acc)
+    cs = np.concatenate([np.zeros((1, *frames.shape[1:]), dtype=acc), cs])
+    end = np.arange(1, len(frames) + 1)
+    start = np.maximum(0, end - n)
+    count = (end - start).reshape(-1, *([1] * (frames.ndim - 1)))
+    return (cs[end] - cs[start]) / count
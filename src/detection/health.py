@@ -0,0 +1,213 @@
+"""센서 셀 상태 감시 (dead / saturated / stuck / noisy).
+
+프레임마다 셀별 평균/분산(Welford), 최솟값/최댓값을 갱신하고, health_window 프레임마다
+구간 통계로 셀 상태를 다시 판정합니다 (판정 후 통계는 초기화 → 고정 메모리, 프레임당 O(셀 수)).
+빈 셀과 고장 셀을 구분하기 위해 같은 구간의 상하좌우 이웃 셀 통계와 비교합니다.
+
+- DEAD: 구간 내내 health_dead_level 이하인데 이웃 셀에는 하중이 있음 (단선/0 고정)
+- SATURATED: 구간 내내 health_saturated_level 이상인데 이웃 셀은 그렇지 않음 (단락/최댓값 고정)
+- STUCK: 이웃 셀은 움직이는데 구간 내 변화폭이 health_stuck_range 이하 (같은 값에 멈춤)
+- NOISY: 표준편차가 이웃 셀 평균의 health_noisy_factor배 이상 (접촉 불량 등)
+
+유효하지 않은 셀(stale 보드)은 통계에서 제외하고, 구간의 절반 이상 수신된 셀만 판정합니다.
+"""
+from enum import IntEnum
+from typing import List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from detection.config import DetectionConfig
+
+
+class CellHealth(IntEnum):
+    OK = 0
+    DEAD = 1
+    SATURATED = 2
+    STUCK = 3
+    NOISY = 4
+
+
+class _GridStats:
+    """격자 하나(head 또는 body)의 구간 통계."""
+    def __init__(self, shape: Tuple[int, int]):
+        self.shape = tuple(shape)
+        self.size = int(np.prod(shape))
+        self.count = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.status = np.zeros(shape, dtype=np.int8) # CellHealth
+        self.healthy = np.ones(shape, dtype=bool)
+        self.usable = np.ones(shape, dtype=bool) # 정상 셀 + 정상 이웃 값으로 채울 수 있는 비정상 셀
+        # 작업 버퍼 (프레임당 할당 없음)
+        self._x = np.empty(shape)
+        self._m = np.empty(shape) # 유효 여부 (0/1)
+        self._invalid = np.empty(shape, dtype=bool)
+        self._delta = np.empty(shape)
+        self._tmp = np.empty(shape)
+        self._fill: List[Tuple[int, np.ndarray]] = [] # [(셀 번호, 정상 이웃 셀 번호)]
+        # ufunc에 파이썬 스칼라를 넘기면 호출마다 0차원 배열을 만들므로 미리 만들어 둠
+        self._one = np.array(1.0)
+        self._pos_inf = np.array(np.inf)
+        self._neg_inf = np.array(-np.inf)
+
+    def reset(self):
+        self.count.fill(0.0)
+        self.mean.fill(0.0)
+        self.m2.fill(0.0)
+        self.min.fill(np.inf)
+        self.max.fill(-np.inf)
+
+    def update(self, x: np.ndarray, valid: Optional[np.ndarray]):
+        np.copyto(self._x, x)
+        if valid is None:
+            self._m.fill(1.0)
+            self._invalid.fill(False)
+        else:
+            np.copyto(self._m, valid)
+            np.logical_not(valid, out=self._invalid)
+        # Welford: 무효 셀은 delta를 0으로 만들어 평균/M2가 바뀌지 않게 함
+        self.count += self._m
+        np.subtract(self._x, self.mean, out=self._delta)
+        self._delta *= self._m
+        np.maximum(self.count, self._one, out=self._tmp)
+        np.divide(self._delta, self._tmp, out=self._tmp)
+        self.mean += self._tmp
+        np.subtract(self._x, self.mean, out=self._tmp)
+        self._tmp *= self._delta
+        self.m2 += self._tmp
+        # 최솟값/최댓값: 무효 셀은 ±inf로 바꿔 반영되지 않게 함
+        np.copyto(self._tmp, self._x)
+        np.putmask(self._tmp, self._invalid, self._pos_inf)
+        np.minimum(self.min, self._tmp, out=self.min)
+        np.putmask(self._tmp, self._invalid, self._neg_inf)
+        np.maximum(self.max, self._tmp, out=self.max)
+
+    def evaluate(self, config: DetectionConfig, min_count: float) -> bool:
+        """구간 통계로 상태를 다시 판정 (바뀌었으면 True)."""
+        observed = self.count >= min_count
+        std = np.sqrt(self.m2 / np.maximum(self.count, 1.0))
+        mean = np.where(observed, self.mean, np.nan)
+        std = np.where(observed, std, np.nan)
+        nbr_mean, nbr_std = _neighbor_mean(mean), _neighbor_mean(std)
+        loaded = config.value_min + config.empty_margin
+
+        status = np.full(self.shape, CellHealth.OK, dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            noisy = std >= np.maximum(config.health_noise_floor, config.health_noisy_factor * nbr_std)
+            stuck = (self.max - self.min <= config.health_stuck_range) & (nbr_std >= config.health_noise_floor)
+            saturated = (self.min >= config.health_saturated_level) & (nbr_mean < config.health_saturated_level)
+            dead = (self.max <= config.health_dead_level) & (nbr_mean > loaded)
+        # 뒤에 적용한 상태가 우선 (고정된 셀은 변화폭이 0이므로 STUCK보다 DEAD/SATURATED로 표시)
+        status[noisy] = CellHealth.NOISY
+        status[stuck] = CellHealth.STUCK
+        status[saturated] = CellHealth.SATURATED
+        status[dead] = CellHealth.DEAD
+        # 이미 비정상인 셀은 회복 근거가 보일 때만 OK로 되돌림
+        # (예: 이웃 셀도 조용한 구간에서는 stuck 여부를 판단할 수 없으므로 이전 상태 유지)
+        recovered = {
+            CellHealth.DEAD: self.max > config.health_dead_level,
+            CellHealth.SATURATED: self.min < config.health_saturated_level,
+            CellHealth.STUCK: self.max - self.min > config.health_stuck_range,
+            CellHealth.NOISY: ~noisy,
+        }
+        for state, evidence in recovered.items():
+            keep = (self.status == state) & (status == CellHealth.OK) & ~evidence
+            status[keep] = state
+        # 이번 구간에 판정할 만큼 수신되지 않은 셀은 이전 상태 유지
+        status[~observed] = self.status[~observed]
+        changed = not np.array_equal(status, self.status)
+        self.status[:] = status
+        np.equal(self.status, CellHealth.OK, out=self.healthy)
+        if changed:
+            self._plan_fill()
+        return changed
+
+    def _plan_fill(self):
+        h, w = self.shape
+        self._fill = []
+        self.usable.fill(True)
+        for i in np.flatnonzero(~self.healthy):
+            r, c = divmod(int(i), w)
+            nbrs = [y * w + x for y, x in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                    if 0 <= y < h and 0 <= x < w and self.healthy[y, x]]
+            self._fill.append((int(i), np.array(nbrs, dtype=np.intp)))
+            if not nbrs:
+                self.usable[r, c] = False
+
+    def inpaint(self, grid: np.ndarray, fallback: float):
+        flat = grid.reshape(-1)
+        for i, nbrs in self._fill:
+            flat[i] = flat[nbrs].mean() if len(nbrs) else fallback
+
+
+def _neighbor_mean(x: np.ndarray) -> np.ndarray:
+    """상하좌우 이웃 셀 값의 평균 (NaN인 이웃은 제외, 이웃이 없으면 NaN)."""
+    padded = np.pad(x, 1, constant_values=np.nan)
+    nbrs = np.stack([padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:]])
+    valid = np.isfinite(nbrs)
+    total = np.where(valid, nbrs, 0.0).sum(axis=0)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, total / n, np.nan)
+
+
+class SensorHealth:
+    """head/body 셀 상태 감시자. update()는 프레임당 할당 없이 O(셀 수)."""
+    logger = logging.getLogger("sensor_health")
+
+    def __init__(self, config: DetectionConfig, head_shape: Tuple[int, int] = (2, 3), body_shape: Tuple[int, int] = (12, 7)):
+        self.config = config
+        self.head = _GridStats(head_shape)
+        self.body = _GridStats(body_shape)
+        self.frames = 0 # 현재 구간의 프레임 수
+        self.windows = 0 # 판정한 구간 수
+
+    @property
+    def status(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(head, body) 셀별 CellHealth 값."""
+        return self.head.status, self.body.status
+
+    @property
+    def healthy(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.head.healthy, self.body.healthy
+
+    @property
+    def usable(self) -> Tuple[np.ndarray, np.ndarray]:
+        """임계값 계산에 쓸 셀: 정상 셀과 이웃 평균으로 채운 셀 (채울 정상 이웃이 없는 셀만 제외)."""
+        return self.head.usable, self.body.usable
+
+    def update(self, head: np.ndarray, body: np.ndarray, valid: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> bool:
+        """원시 프레임 반영, 구간이 끝나 셀 상태가 바뀌었으면 True."""
+        # 크기만 비교 (.shape는 접근할 때마다 튜플을 새로 만듦)
+        if head.size != self.head.size or body.size != self.body.size:
+            self.__init__(self.config, head.shape, body.shape)
+        self.head.update(head, None if valid is None else valid[0])
+        self.body.update(body, None if valid is None else valid[1])
+        self.frames += 1
+        if self.frames < max(1, self.config.health_window):
+            return False
+        changed = self.head.evaluate(self.config, self.frames / 2)
+        changed = self.body.evaluate(self.config, self.frames / 2) or changed
+        self.head.reset()
+        self.body.reset()
+        self.frames = 0
+        self.windows += 1
+        if changed:
+            self.logger.warning(f"Unhealthy sensor cells: {self.describe() or 'none'}")
+        return changed
+
+    def inpaint(self, head: np.ndarray, body: np.ndarray, fallback: float):
+        """비정상 셀을 정상 이웃 셀의 평균으로 채움 (정상 이웃이 없으면 fallback)."""
+        self.head.inpaint(head, fallback)
+        self.body.inpaint(body, fallback)
+
+    def describe(self) -> str:
+        """비정상 셀 목록 (예: 'body[3,4] DEAD, head[0,1] NOISY')."""
+        items = []
+        for name, grid in (("head", self.head), ("body", self.body)):
+            for r, c in zip(*np.nonzero(grid.status)):
+                items.append(f"{name}[{r},{c}] {CellHealth(int(grid.status[r, c])).name}")
+        return ", ".join(items)
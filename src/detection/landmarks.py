@@ -0,0 +1,155 @@
+"""단일 패스 랜드마크 추출.
+
+평활화된 body 프레임의 적분 영상(누적 합 표)을 프레임당 한 번 계산하고,
+2x2 블록 합, 상/하단 절반의 최댓값 블록, 팔꿈치 후보를 모두 이 표에서 구합니다.
+머리/발뒤꿈치 후보도 같은 평활화 프레임에서 복사 없이 찾습니다.
+작업 버퍼는 프레임 크기별로 미리 할당하므로 정상 상태에서는 프레임당 배열 할당이 없습니다.
+"""
+from typing import List, Optional, Tuple
+import math
+
+import numpy as np
+
+Landmark = Tuple[float, float, float] # (row, col, score)
+
+
+class LandmarkExtractor:
+    def __init__(self, head_shape: Tuple[int, int] = (2, 3), body_shape: Tuple[int, int] = (12, 7)):
+        self._allocate(head_shape, body_shape)
+
+    def _allocate(self, head_shape: Tuple[int, int], body_shape: Tuple[int, int]):
+        h, w = body_shape
+        W = w + 1 # 적분 영상의 행 길이
+        self.head_shape = tuple(head_shape)
+        self.body_shape = tuple(body_shape)
+        self._width = W
+        self._colsum = np.empty((h, w)) # 행 방향 누적 합 (적분 영상 계산용)
+        self._integral = np.zeros((h + 1, W)) # 첫 행/열은 0
+        # 2x2 블록 합을 적분 영상과 같은 행 길이(W)로 저장하여 연속 1차원 연산만 사용
+        # (행마다 마지막 두 칸은 -inf 패딩이라 행 범위 argmax에서 선택되지 않음)
+        n = (h - 2) * W + (w - 1)
+        flat = self._integral.ravel()
+        self._block_rows = np.full((h - 1) * W, -np.inf)
+        self._block_out = self._block_rows[:n]
+        self._terms = (flat[2 * W + 2:2 * W + 2 + n], flat[2:2 + n], flat[2 * W:2 * W + n], flat[:n])
+        grid = self._block_rows.reshape(h - 1, W)
+        self._padding = grid[:, w - 1:]
+        self.blocks = grid[:, :w - 1] # blocks[r, c] = body[r:r+2, c:c+2].sum()
+
+    def region_sum(self, r0: int, c0: int, r1: int, c1: int) -> float:
+        """body[r0:r1, c0:c1]의 합 (extract() 이후 유효)."""
+        ii = self._integral
+        return float(ii[r1, c1] - ii[r0, c1] - ii[r1, c0] + ii[r0, c0])
+
+    def _integrate(self, body: np.ndarray):
+        np.add.accumulate(body, axis=0, out=self._colsum)
+        np.add.accumulate(self._colsum, axis=1, out=self._integral[1:, 1:])
+        # blocks[r, c] = ii[r+2, c+2] - ii[r, c+2] - ii[r+2, c] + ii[r, c]
+        br, tr, bl, tl = self._terms
+        out = self._block_out
+        np.subtract(br, tr, out=out)
+        np.subtract(out, bl, out=out)
+        np.add(out, tl, out=out)
+        self._padding.fill(-np.inf)
+
+    # 블록 행 r0~r1 전체에서 최대 블록 (연속 구간 argmax)
+    def _best_rows(self, r0: int, r1: int) -> Tuple[int, int, float]:
+        W = self._width
+        i = int(self._block_rows[r0 * W:r1 * W].argmax())
+        r, c = divmod(i, W)
+        return r0 + r, c, self._block_rows.item(r0 * W + i)
+
+    # 블록 부분 영역(행 r0~r1, 열 c0~c1)에서 최대 블록 — 행마다 연속 구간 argmax (영역이 비면 None)
+    def _best_block(self, r0: int, r1: int, c0: int, c1: int) -> Optional[Tuple[int, int, float]]:
+        W = self._width
+        best = None
+        for r in range(r0, r1):
+            start = r * W + c0
+            i = int(self._block_rows[start:r * W + c1].argmax())
+            value = self._block_rows.item(start + i)
+            if best is None or value > best[2]:
+                best = (r, c0 + i, value)
+        return best
+
+    def _head(self, head: np.ndarray, threshold: float) -> Optional[Landmark]:
+        i = int(head.argmax())
+        value = head.item(i)
+        if math.isnan(value):
+            return None
+        if value < threshold:
+            return (0, 0, 0.0) # 임계값 이상 셀이 없으면 (0, 0)에 점수 0
+        r, c = divmod(i, head.shape[1])
+        return (r, c, value)
+
+    def _heels(self, body: np.ndarray, threshold: float, search_rows: int) -> List[Landmark]:
+        if search_rows < 1:
+            return []
+        h, w = body.shape
+        start = max(0, h - search_rows)
+        # 열마다 하단 search_rows행의 최댓값 중 점수 상위 2개 열 (같은 점수는 위쪽 행/왼쪽 열 우선)
+        first = second = None
+        for c in range(w):
+            r_best, v_best = start, body.item(start, c)
+            for r in range(start + 1, h):
+                v = body.item(r, c)
+                if v > v_best:
+                    r_best, v_best = r, v
+            if not v_best >= threshold or v_best <= 0.0:
+                continue
+            candidate = (r_best, c, v_best)
+            if first is None or v_best > first[2]:
+                first, second = candidate, first
+            elif second is None or v_best > second[2]:
+                second = candidate
+        return [x for x in (first, second) if x is not None]
+
+    # 어깨~엉덩이 높이에서 몸통 블록 바깥 좌/우 영역의 최대 블록 (평균이 임계값 이상인 것만)
+    def _elbows(self, shoulder_rc: Tuple[int, int], hip_rc: Tuple[int, int], threshold: float) -> List[Landmark]:
+        r0, r1 = sorted((shoulder_rc[0], hip_rc[0]))
+        left = min(shoulder_rc[1], hip_rc[1]) # 몸통 블록이 덮는 가장 왼쪽 열
+        right = max(shoulder_rc[1], hip_rc[1]) + 1 # 가장 오른쪽 열
+        candidates = []
+        for c0, c1 in ((0, left - 1), (right + 1, self.blocks.shape[1])):
+            if c1 <= c0:
+                continue
+            best = self._best_block(r0, r1 + 1, c0, c1)
+            if best is not None and best[2] / 4 >= threshold:
+                r, c, total = best
+                candidates.append((r + 0.5, c + 0.5, total / 4))
+        return candidates
+
+    def extract(self, head: np.ndarray, body: np.ndarray, threshold: float, heel_search_rows: int = 1) -> dict:
+        """평활화된 head/body 프레임의 랜드마크.
+
+        가장 큰 2x2 블록이 상단 절반이면 어깨, 하단이면 엉덩이로 보고
+        나머지 부위는 반대쪽 절반의 최대 블록에서 찾습니다. 점수는 블록 평균입니다.
+        """
+        if head.shape != self.head_shape or body.shape != self.body_shape:
+            self._allocate(head.shape, body.shape)
+        self._integrate(body)
+
+        h = body.shape[0]
+        half = h // 2
+        f_r, f_c, total = self._best_rows(0, h - 1)
+        center = (f_r + 0.5, f_c + 0.5)
+        if center[0] <= math.floor((h - 1) * 0.5):
+            shoulder_rc = (f_r, f_c)
+            shoulder = (*center, total / 4)
+            l_r, l_c, l_total = self._best_rows(half, h - 1)
+            hip_rc = (l_r, l_c)
+            hip = (l_r + 0.5, l_c + 0.5, l_total / 4)
+        else:
+            hip_rc = (f_r, f_c)
+            hip = (*center, total / 4)
+            u_r, u_c, u_total = self._best_rows(0, half - 1)
+            shoulder_rc = (u_r, u_c)
+            shoulder = (u_r + 0.5, u_c + 0.5, u_total / 4)
+
+        return {
+            "block_rc": (f_r, f_c),
+            "head": self._head(head, threshold),
+            "shoulder": shoulder,
+            "hip": hip,
+            "elbows": self._elbows(shoulder_rc, hip_rc, threshold),
+            "heels": self._heels(body, threshold, heel_search_rows),
+        }
@@ -0,0 +1,169 @@
+"""침대 재실/이탈 감지 빠른 경로 (평활화/화면 갱신과 무관).
+
+시리얼 리더 스레드가 보드 데이터를 작업 행렬에 반영할 때마다(SerialCommunication._publish)
+조립된 프레임에서 바로
+- 전체 하중: value_min 초과분의 합 (보정을 켰으면 보정된 값 기준)
+- 활성 셀 수: value_min + empty_margin을 넘는 셀 수
+를 계산하고 히스테리시스로 재실 상태를 판정합니다.
+
+- 비어 있음 → 재실: 하중 >= occupancy_enter_load 이고 활성 셀 >= occupancy_enter_cells
+- 재실 → 이탈: 하중 < occupancy_exit_load 이거나 활성 셀 < occupancy_exit_cells
+
+stream() 폴링, FrameBuffer 이동 평균, 화면 렌더를 거치지 않으므로 상태가 바뀐 보드 줄을
+파싱한 직후 같은 스레드에서 "enter"/"exit" 이벤트를 알림 훅(콜백, Unix 소켓, 파일)으로 보냅니다.
+첫 판정은 현재 상태를 정하기만 하고 이벤트를 보내지 않습니다.
+
+stale이거나 아직 수신되지 않은 보드의 행은 0으로 채워져 있어 "하중 없음"과 구분되지 않으므로
+- 모든 보드가 수신되기 전에는 첫 판정을 하지 않고 (일부 보드만 온 첫 프레임을 빈 침대로 정하지 않음)
+- stale 보드가 있는 동안에는 이탈 판정을 하지 않습니다 (재실 판정은 남은 행의 하중만으로 기준을 넘을 때만).
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import socket
+import threading
+
+import numpy as np
+
+from detection.config import DetectionConfig
+
+HOOKS = ("none", "socket", "file")
+
+
+class CallbackHook:
+    """이벤트마다 함수 호출 (리더 스레드에서 호출되므로 오래 걸리는 작업은 넘겨서 처리)."""
+    def __init__(self, callback: Callable[[Dict], None]):
+        self.callback = callback
+
+    def send(self, event: Dict):
+        self.callback(event)
+
+    def close(self):
+        pass
+
+
+class SocketHook:
+    """Unix 데이터그램 소켓으로 JSON 한 건씩 전송 (수신 쪽이 없으면 버림, 리더 스레드를 막지 않음)."""
+    def __init__(self, path: str):
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def send(self, event: Dict):
+        try:
+            self._sock.sendto(json.dumps(event).encode(), self.path)
+        except OSError as e:
+            logging.getLogger("occupancy").warning(f"Alert socket {self.path} unavailable: {e}")
+
+    def close(self):
+        self._sock.close()
+
+
+class FileHook:
+    """이벤트를 JSON 한 줄씩 파일에 추가 (tail -f 등으로 감시)."""
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, event: Dict):
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def close(self):
+        pass
+
+
+class OccupancyMonitor:
+    logger = logging.getLogger("occupancy")
+
+    def __init__(self, config: DetectionConfig, hooks: Optional[List] = None,
+                 head_shape: Tuple[int, int] = (2, 3), body_shape: Tuple[int, int] = (12, 7)):
+        self.config = config
+        self.hooks = list(hooks or [])
+        self.occupied: Optional[bool] = None # 첫 판정 전에는 None
+        self.load = 0.0
+        self.cells = 0
+        self.last_event: Optional[Dict] = None
+        self.events = 0
+        # 작업 버퍼 (프레임당 할당 없음): head/body를 이어 붙인 셀 값과 격자 모양 뷰
+        head_size = int(np.prod(head_shape))
+        self._x = np.empty(head_size + int(np.prod(body_shape)))
+        self._head = self._x[:head_size].reshape(head_shape)
+        self._body = self._x[head_size:].reshape(body_shape)
+        self._ones = np.ones(self._x.size)
+        self._mask = np.empty(self._x.size, dtype=bool)
+        # ufunc/dot에 넘길 스칼라와 결과 (파이썬 스칼라는 호출마다 0차원 배열을 만듦)
+        self._floor = np.array(0.0)
+        self._zero = np.array(0.0)
+        self._margin = np.array(0.0)
+        self._acc = np.array(0.0)
+
+    def update(self, head: np.ndarray, body: np.ndarray, ts: float, revision: int = 0,
+               partial: bool = False) -> Optional[Dict]:
+        """조립된 프레임 반영 → 재실 상태가 바뀌었으면 이벤트 (보내지는 않음, emit()으로 전송).
+
+        partial: stale이거나 아직 수신되지 않은 보드가 있어 일부 행이 0으로 채워진 프레임
+        """
+        if not self.config.occupancy_fast_path:
+            self.occupied = None # 다시 켜면 첫 판정부터 (꺼져 있는 동안의 변화로 이벤트를 보내지 않음)
+            return None
+        # 크기만 비교 (.shape는 접근할 때마다 튜플을 새로 만듦)
+        if head.size != self._head.size or body.size != self._body.size:
+            self.__init__(self.config, self.hooks, head.shape, body.shape)
+        np.copyto(self._head, head)
+        np.copyto(self._body, body)
+        config = self.config
+        self._floor[()] = config.value_min
+        self._margin[()] = config.empty_margin
+        np.subtract(self._x, self._floor, out=self._x)
+        np.maximum(self._x, self._zero, out=self._x)
+        self.load = load = float(np.dot(self._x, self._ones, out=self._acc))
+        np.greater(self._x, self._margin, out=self._mask)
+        self.cells = cells = int(np.count_nonzero(self._mask))
+
+        if self.occupied is None:
+            if partial:
+                return None
+            self.occupied = load >= config.occupancy_enter_load and cells >= config.occupancy_enter_cells
+            return None
+        if self.occupied:
+            if partial or (load >= config.occupancy_exit_load and cells >= config.occupancy_exit_cells):
+                return None
+            self.occupied = False
+        else:
+            if load < config.occupancy_enter_load or cells < config.occupancy_enter_cells:
+                return None
+            self.occupied = True
+        self.events += 1
+        self.last_event = {"event": "enter" if self.occupied else "exit", "ts": ts, "load": round(load, 1),
+                           "cells": cells, "revision": revision}
+        return self.last_event
+
+    def emit(self, event: Dict):
+        """모든 훅으로 이벤트 전송 (훅 하나가 실패해도 나머지는 보냄)."""
+        if event["event"] == "exit":
+            self.logger.warning(f"Bed exit (load {event['load']:.0f}, {event['cells']} active cells)")
+        else:
+            self.logger.info(f"Bed entered (load {event['load']:.0f}, {event['cells']} active cells)")
+        for hook in self.hooks:
+            try:
+                hook.send(event)
+            except Exception as e:
+                self.logger.error(f"Alert hook {type(hook).__name__} failed: {e}")
+
+    def close(self):
+        for hook in self.hooks:
+            hook.close()
+
+
+def create_hook(kind: str, path: str):
+    """[Alerts] hook 설정 → 훅 (none이면 None)."""
+    if kind not in HOOKS:
+        raise ValueError(f"alert hook must be one of {HOOKS}")
+    if kind == "socket":
+        return SocketHook(path)
+    if kind == "file":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return FileHook(path)
+    return None
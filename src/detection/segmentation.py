@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import math
+import numpy as np
+
+
+@dataclass
+class Component:
+    label: int
+    area: int # 셀 수
+    mass: float # 압력 합
+    centroid: Tuple[float, float] # 압력 가중 중심 (row, col)
+    axis: Tuple[float, float] # 주축 단위 벡터 (dr, dc), dr >= 0 (발 방향)
+    elongation: float # 주축/부축 표준편차 비 (1이면 원형)
+    rows: Tuple[int, int] # 행 범위 [min, max]
+    cols: Tuple[int, int] # 열 범위 [min, max]
+
+
+class Segmenter:
+    """임계값 마스크 → 연결 요소 라벨링 → 요소별 중심/면적/질량/주축.
+
+    라벨링은 평탄화된 인덱스 배열 위의 union-find를 벡터 연산으로 수행합니다.
+    부모는 항상 더 작은 인덱스를 가리키므로 반복마다 트리가 합쳐지며,
+    max_iter로 프레임당 실행 시간을 제한합니다.
+    """
+    def __init__(self, connectivity: int = 4, min_area: int = 1, max_iter: int | None = None):
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity must be 4 or 8")
+        self.connectivity = connectivity
+        self.min_area = max(1, min_area)
+        self.max_iter = max_iter
+        self._edges: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+    # 격자 모양별 인접 셀 쌍 (한 번만 계산)
+    def _edge_pairs(self, shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        if shape not in self._edges:
+            idx = np.arange(shape[0] * shape[1]).reshape(shape)
+            pairs = [(idx[:, :-1], idx[:, 1:]), (idx[:-1, :], idx[1:, :])]
+            if self.connectivity == 8:
+                pairs += [(idx[:-1, :-1], idx[1:, 1:]), (idx[:-1, 1:], idx[1:, :-1])]
+            a = np.concatenate([p[0].ravel() for p in pairs])
+            b = np.concatenate([p[1].ravel() for p in pairs])
+            self._edges[shape] = (a, b)
+        return self._edges[shape]
+
+    @staticmethod
+    def _compress(parent: np.ndarray) -> np.ndarray:
+        # pointer jumping: 모든 노드가 루트를 가리킬 때까지
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                return parent
+            parent = grand
+
+    def label(self, mask: np.ndarray) -> Tuple[np.ndarray, int]:
+        """마스크의 연결 요소 라벨 (배경 -1, 요소 0..n-1)과 요소 수."""
+        flat = mask.ravel()
+        n = flat.size
+        a, b = self._edge_pairs(mask.shape)
+        keep = flat[a] & flat[b]
+        a, b = a[keep], b[keep]
+
+        parent = np.arange(n)
+        max_iter = self.max_iter or (2 * max(1, n).bit_length() + 2)
+        for _ in range(max_iter):
+            parent = self._compress(parent)
+            ra, rb = parent[a], parent[b]
+            diff = ra != rb
+            if not diff.any():
+                break
+            lo = np.minimum(ra[diff], rb[diff])
+            hi = np.maximum(ra[diff], rb[diff])
+            np.minimum.at(parent, hi, lo)
+        parent = self._compress(parent)
+
+        labels = np.full(n, -1, dtype=np.int32)
+        roots, inverse = np.unique(parent[flat], return_inverse=True)
+        labels[flat] = inverse
+        return labels.reshape(mask.shape), len(roots)
+
+    def segment(self, x: np.ndarray, threshold: float) -> List[Component]:
+        """x >= threshold 영역의 연결 요소를 질량 내림차순으로 반환."""
+        labels, count = self.label(x >= threshold)
+        if count == 0:
+            return []
+
+        flat = labels.ravel()
+        on = flat >= 0
+        lab = flat[on]
+        w = x.ravel()[on].astype(np.float64)
+        rr, cc = np.divmod(np.flatnonzero(on), x.shape[1])
+
+        area = np.bincount(lab, minlength=count)
+        mass = np.bincount(lab, weights=w, minlength=count)
+        safe = np.where(mass > 0, mass, 1.0)
+        mr = np.bincount(lab, weights=w * rr, minlength=count) / safe
+        mc = np.bincount(lab, weights=w * cc, minlength=count) / safe
+        dr, dc = rr - mr[lab], cc - mc[lab]
+        crr = np.bincount(lab, weights=w * dr * dr, minlength=count) / safe
+        ccc = np.bincount(lab, weights=w * dc * dc, minlength=count) / safe
+        crc = np.bincount(lab, weights=w * dr * dc, minlength=count) / safe
+
+        rmin = np.full(count, x.shape[0]); np.minimum.at(rmin, lab, rr)
+        rmax = np.full(count, -1); np.maximum.at(rmax, lab, rr)
+        cmin = np.full(count, x.shape[1]); np.minimum.at(cmin, lab, cc)
+        cmax = np.full(count, -1); np.maximum.at(cmax, lab, cc)
+
+        components = []
+        for i in range(count):
+            if area[i] < self.min_area:
+                continue
+            # 2x2 공분산의 주축 (닫힌 형태)
+            theta = 0.5 * math.atan2(2.0 * crc[i], crr[i] - ccc[i])
+            ar, ac = math.cos(theta), math.sin(theta)
+            if ar < 0:
+                ar, ac = -ar, -ac
+            half_tr = 0.5 * (crr[i] + ccc[i])
+            disc = math.sqrt(max(0.0, (0.5 * (crr[i] - ccc[i])) ** 2 + crc[i] ** 2))
+            l1, l2 = half_tr + disc, max(half_tr - disc, 0.0)
+            elongation = math.sqrt(l1 / l2) if l2 > 1e-9 else (math.inf if l1 > 1e-9 else 1.0)
+            components.append(Component(
+                label=i,
+                area=int(area[i]),
+                mass=float(mass[i]),
+                centroid=(float(mr[i]), float(mc[i])),
+                axis=(ar, ac),
+                elongation=elongation,
+                rows=(int(rmin[i]), int(rmax[i])),
+                cols=(int(cmin[i]), int(cmax[i])),
+            ))
+        components.sort(key=lambda comp: comp.mass, reverse=True)
+        return components
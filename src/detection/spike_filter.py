@@ -0,0 +1,233 @@
+"""감지 전 단계의 스파이크/노이즈 필터.
+
+시리얼 순단이나 잘린 줄(`C12 : 8`이 8로 읽히는 등)로 생기는 한 프레임짜리 튐 값이
+이동 평균을 거쳐 몸통 블록 argmax를 흔들지 않도록, 셀마다 최근 spike_window 프레임의
+원형 버퍼로 시간 방향 필터를 적용합니다.
+
+- median: 최근 프레임들의 중앙값으로 대체 (계단 변화는 window//2 프레임 늦게 반영)
+- hampel: 중앙값에서 max(spike_sigma * 1.4826 * MAD, spike_min_dev) 이상 벗어난 셀만 중앙값으로 대체
+  (정상 셀은 원래 값을 그대로 쓰므로 지연이 없음). 이상값 셀이 전체의 spike_max_fraction을 넘으면
+  자세 변화 같은 실제 움직임으로 보고 그 프레임은 그대로 통과시킴
+- spike_spatial_median: 시간 필터 뒤에 3x3 공간 중앙값 추가 (가장자리는 복제)
+
+중앙값은 head/body 셀을 이어 붙인 미리 할당한 작업 버퍼에서 중앙값에 필요한 비교만 남긴
+np.minimum/np.maximum 네트워크로 구하므로 프레임당 배열 할당이 없고, ufunc 호출 수는
+격자 크기와 무관합니다 (창 5프레임이면 중앙값 하나에 14번, 전체 정렬은 30번). rejected는 마지막 프레임에서 spike_min_dev 이상 바뀐 셀 수입니다.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from detection.config import DetectionConfig
+
+MODES = ("off", "median", "hampel")
+MAD_SCALE = 1.4826 # 정규 분포에서 MAD → 표준편차
+
+
+class _MedianNetwork:
+    """(n, *shape) 작업 버퍼의 셀별 중앙값 (홀짝 전치 정렬 네트워크에서 중앙값에 필요한 비교만 남긴 선택 네트워크).
+
+    중앙값에 쓰이지 않는 비교-교환은 빼고, 한쪽 출력만 쓰이면 np.minimum/np.maximum 한 번,
+    양쪽 다 쓰이면 여분 행에 최솟값을 쓰고 행 이름을 바꿔 두 번으로 처리합니다 (복사 없음).
+    연산 순서와 행 배치는 생성 시 한 번만 정하므로 매 호출은 미리 만든 뷰로 ufunc만 호출합니다.
+    호출 후 work 행들의 내용은 정의되지 않습니다 (다음 호출 전에 다시 채움).
+    """
+    def __init__(self, n: int, shape: Tuple[int, ...]):
+        self.n = n
+        buffers = np.empty((n + 1, *shape))
+        self.work = buffers[:n]
+        self.rows = [buffers[i] for i in range(n)]
+        comparators = [(i, i + 1) for p in range(n) for i in range(p % 2, n - 1, 2)]
+        # 뒤에서부터 중앙값 출력에 필요한 선(wire)만 추적
+        needed, kept = {n // 2}, []
+        for i, j in reversed(comparators):
+            lo, hi = i in needed, j in needed
+            if lo or hi:
+                kept.append((i, j, lo, hi))
+                needed |= {i, j}
+        # 선 → 실제 행 배치를 따라가며 ufunc 호출 목록 생성
+        slots = list(range(n))
+        spare = n
+        self.ops = []
+        for i, j, lo, hi in reversed(kept):
+            a, b = buffers[slots[i]], buffers[slots[j]]
+            if lo and hi:
+                self.ops.append((np.minimum, a, b, buffers[spare]))
+                self.ops.append((np.maximum, a, b, b))
+                slots[i], spare = spare, slots[i]
+            elif lo:
+                self.ops.append((np.minimum, a, b, a))
+            else:
+                self.ops.append((np.maximum, a, b, b))
+        self.result = buffers[slots[n // 2]]
+
+    def median(self) -> np.ndarray:
+        for ufunc, a, b, out in self.ops:
+            ufunc(a, b, out=out)
+        return self.result
+
+
+class _SpatialFilter:
+    """격자 하나(head 또는 body)의 3x3 공간 중앙값 (가장자리는 복제)."""
+    def __init__(self, shape: Tuple[int, int]):
+        h, w = shape
+        self.padded = np.empty((h + 2, w + 2))
+        self.network = _MedianNetwork(9, shape)
+        self.shifted = [self.padded[dr:dr + h, dc:dc + w] for dr in range(3) for dc in range(3)]
+        p = self.padded
+        self.edges = [(p[0, 1:-1], p[1, 1:-1]), (p[-1, 1:-1], p[-2, 1:-1]), # 위/아래 행
+                      (p[:, 0], p[:, 1]), (p[:, -1], p[:, -2])] # 왼쪽/오른쪽 열 (모서리 포함)
+        self.interior = p[1:-1, 1:-1]
+
+    def apply(self, x: np.ndarray):
+        """x를 제자리에서 공간 중앙값으로 바꿈."""
+        np.copyto(self.interior, x)
+        for dst, src in self.edges:
+            np.copyto(dst, src)
+        for row, view in zip(self.network.rows, self.shifted):
+            np.copyto(row, view)
+        np.copyto(x, self.network.median())
+
+
+class _FrameFilter:
+    """head와 body 셀을 이어 붙인 (cells,) 벡터의 시간 필터 상태 (프레임당 ufunc 호출 수가 셀 수와 무관)."""
+    def __init__(self, head_shape: Tuple[int, int], body_shape: Tuple[int, int], window: int):
+        self.head_shape, self.body_shape = tuple(head_shape), tuple(body_shape)
+        n_head = int(np.prod(head_shape))
+        cells = n_head + int(np.prod(body_shape))
+        self.window = window
+        self.ring = np.empty((window, cells))
+        self.ring_rows = [self.ring[i] for i in range(window)]
+        self.filled = False
+        self._next = 0
+        self.temporal = _MedianNetwork(window, (cells,))
+        self.x = np.empty(cells) # 입력 (float64)
+        self.out = np.empty(cells)
+        self.median = np.empty(cells)
+        self.dev = np.empty(cells)
+        self.limit = np.empty(cells)
+        self.mask = np.empty(cells, dtype=bool)
+        # 입력/출력의 head/body 부분 (격자 모양 뷰)
+        self.x_head, self.x_body = self.x[:n_head].reshape(head_shape), self.x[n_head:].reshape(body_shape)
+        self.out_head, self.out_body = self.out[:n_head].reshape(head_shape), self.out[n_head:].reshape(body_shape)
+        self.spatial_head, self.spatial_body = _SpatialFilter(head_shape), _SpatialFilter(body_shape)
+
+    def matches(self, head: np.ndarray, body: np.ndarray, window: int) -> bool:
+        return head.shape == self.head_shape and body.shape == self.body_shape and window == self.window
+
+    def push(self, head: np.ndarray, body: np.ndarray):
+        np.copyto(self.x_head, head)
+        np.copyto(self.x_body, body)
+        if not self.filled:
+            # 첫 프레임으로 버퍼를 채워 시작 직후에도 중앙값이 정의되게 함
+            np.copyto(self.ring, self.x)
+            self.filled = True
+        else:
+            np.copyto(self.ring_rows[self._next], self.x)
+            self._next = (self._next + 1) % self.window
+
+    def temporal_median(self) -> np.ndarray:
+        np.copyto(self.temporal.work, self.ring)
+        np.copyto(self.median, self.temporal.median())
+        return self.median
+
+    def mad(self) -> np.ndarray:
+        # 행마다 빼기 (2차원 - 1차원 브로드캐스트는 반복자 버퍼를 할당함)
+        for src, dst in zip(self.ring_rows, self.temporal.rows):
+            np.subtract(src, self.median, out=dst)
+        np.abs(self.temporal.work, out=self.temporal.work)
+        return self.temporal.median()
+
+    def spatial_median(self):
+        self.spatial_head.apply(self.out_head)
+        self.spatial_body.apply(self.out_body)
+
+
+class SpikeFilter:
+    """head/body 프레임 필터. apply()는 입력 배열을 제자리에서 필터링하고 바뀐 셀 수를 돌려줍니다."""
+    def __init__(self, config: DetectionConfig):
+        self.config = config
+        self.state: Optional[_FrameFilter] = None
+        self.rejected = 0 # 마지막 프레임에서 spike_min_dev 이상 바뀐 셀 수
+        self.total_rejected = 0
+        self.frames = 0
+        # ufunc에 넘길 스칼라 (파이썬 스칼라는 호출마다 0차원 배열을 만듦)
+        self._scale = np.array(0.0)
+        self._floor = np.array(0.0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.spike_filter != "off" or self.config.spike_spatial_median
+
+    def reset(self):
+        self.state = None
+
+    def _window(self) -> int:
+        n = max(3, int(self.config.spike_window))
+        return n if n % 2 else n + 1 # 중앙값이 하나로 정해지도록 홀수
+
+    def apply(self, head: np.ndarray, body: np.ndarray) -> int:
+        if self.config.spike_filter not in MODES:
+            raise ValueError(f"spike_filter must be one of {MODES}")
+        window = self._window()
+        if self.state is None or not self.state.matches(head, body, window):
+            self.state = _FrameFilter(head.shape, body.shape, window)
+        state = self.state
+        self._scale[()] = self.config.spike_sigma * MAD_SCALE
+        self._floor[()] = self.config.spike_min_dev
+        # hampel 이상값이 프레임 전체에 넓게 퍼져 있으면 튐이 아니라 실제 움직임(자세 변화)으로 보고 통과
+        outliers = self._outliers(state, head, body)
+        accept = outliers > self.config.spike_max_fraction * (head.size + body.size)
+        rejected = self._filter(state, head, body, accept)
+        self.rejected = rejected
+        self.total_rejected += rejected
+        self.frames += 1
+        return rejected
+
+    def _outliers(self, state: _FrameFilter, head: np.ndarray, body: np.ndarray) -> int:
+        """버퍼에 프레임을 넣고 시간 중앙값을 갱신, hampel이면 이상값 셀(state.mask) 수."""
+        state.push(head, body)
+        if self.config.spike_filter == "off":
+            return 0
+        median = state.temporal_median()
+        if self.config.spike_filter != "hampel":
+            return 0
+        # |x - median| > max(k * MAD, floor)
+        np.multiply(state.mad(), self._scale, out=state.limit)
+        np.maximum(state.limit, self._floor, out=state.limit)
+        np.subtract(state.x, median, out=state.dev)
+        np.abs(state.dev, out=state.dev)
+        np.greater(state.dev, state.limit, out=state.mask)
+        return int(np.count_nonzero(state.mask))
+
+    def _filter(self, state: _FrameFilter, head: np.ndarray, body: np.ndarray, accept: bool) -> int:
+        out = state.out
+        mode = self.config.spike_filter
+        if mode == "off" or (mode == "hampel" and accept):
+            np.copyto(out, state.x)
+        elif mode == "median":
+            np.copyto(out, state.median)
+        else:
+            # hampel: 이상값 셀만 중앙값으로 대체
+            np.copyto(out, state.x)
+            np.putmask(out, state.mask, state.median)
+        if self.config.spike_spatial_median:
+            state.spatial_median()
+        # 바뀐 셀 수 (spike_min_dev 이상)
+        np.subtract(out, state.x, out=state.dev)
+        np.abs(state.dev, out=state.dev)
+        np.greater(state.dev, self._floor, out=state.mask)
+        np.copyto(head, state.out_head, casting="unsafe")
+        np.copyto(body, state.out_body, casting="unsafe")
+        return int(np.count_nonzero(state.mask))
+
+
+def filter_frames(head: np.ndarray, body: np.ndarray, config: DetectionConfig) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(n, ...) 프레임 시퀀스를 순서대로 필터링한 복사본과 프레임별 바뀐 셀 수 (오프라인 재생용)."""
+    head, body = head.copy(), body.copy()
+    rejected = np.zeros(len(body), dtype=np.int64)
+    spike_filter = SpikeFilter(config)
+    if spike_filter.enabled:
+        for i in range(len(body)):
+            rejected[i] = spike_filter.apply(head[i], body[i])
+    return head, body, rejected
@@ -0,0 +1,258 @@
+"""DetectionConfig 파라미터 탐색 (그리드/랜덤 서치, 병렬 재생).
+
+라벨된 수집 로그를 여러 설정으로 재생하여 정확도와 안정성(같은 자세 구간 내
+판단 뒤바뀜 빈도)으로 순위를 매기고, 최적 설정을 config_manager에 저장합니다.
+
+- 설정 목록은 평활화 키(value_min, value_max, moving_avg_N, spike_*, health_*)별로 묶어 프로세스 풀에 분배
+- 각 워커는 평활화 키별로 클리핑/스파이크 필터/고장 셀 대체/이동 평균 프레임과 임계값 계산에 쓸
+  셀 마스크를 한 번만 계산하여 캐시 (Detection.detect()와 같은 순서)
+- 말뭉치는 워커 초기화 시 한 번만 전달
+- 그리드 밖의 필드는 config.ini [Detection]의 현재 값 (--apply는 그리드 필드만 저장)
+
+src 디렉터리에서 실행:
+    python -m detection.tuner a.csv b.bfc                       # 기본 그리드
+    python -m detection.tuner a.csv --grid percentile_p=60,70,80 --grid moving_avg_N=1,3
+    python -m detection.tuner a.csv --random 200 --workers 8 --apply
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from typing import Dict, Iterator, List, Optional, Tuple, get_type_hints
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from detection.config import DetectionConfig
+from detection.detection import Detection
+from detection.frame_buffer import moving_average
+from detection.health import SensorHealth
+from detection.spike_filter import filter_frames
+
+# 기본 탐색 공간 (head_expand_lr, use_pillow는 현재 감지 로직에서 사용되지 않아 제외)
+DEFAULT_GRID: Dict[str, list] = {
+    "percentile_p": [55.0, 60.0, 65.0, 70.0, 75.0, 80.0, 85.0],
+    "moving_avg_N": [1, 3, 5],
+    "upright_tolerance_cells": [0, 1, 2],
+    "prone_ratio": [0.7, 0.8, 0.9, 1.0],
+    "heel_search_rows": [1, 2],
+}
+
+# 평활화 결과에 영향을 주는 필드 (같은 값을 가진 설정끼리 캐시 공유)
+SMOOTHING_KEYS = ("value_min", "value_max", "moving_avg_N", "spike_filter", "spike_window", "spike_sigma",
+                  "spike_min_dev", "spike_max_fraction", "spike_spatial_median", "health_monitor", "health_window",
+                  "health_dead_level", "health_saturated_level", "health_stuck_range", "health_noisy_factor",
+                  "health_noise_floor", "empty_margin")
+
+_corpus: Dict[str, np.ndarray] = {}
+# 평활화 키 → (head_avg, body_avg, 프레임별 임계값 계산 셀 마스크 (head, body) 또는 None)
+_smoothed_cache: Dict[tuple, Tuple[np.ndarray, np.ndarray, Optional[Tuple[np.ndarray, np.ndarray]]]] = {}
+
+
+def parse_grid(items: List[str]) -> Dict[str, list]:
+    """`key=v1,v2,...` 목록을 DetectionConfig 필드 타입에 맞춰 변환."""
+    hints = get_type_hints(DetectionConfig)
+    names = {f.name for f in fields(DetectionConfig)}
+    grid = {}
+    for item in items:
+        key, sep, values = item.partition("=")
+        if not sep or key not in names:
+            raise ValueError(f"invalid grid '{item}' (expected <DetectionConfig field>=v1,v2,...)")
+        cast = (lambda v: v.lower() in ("true", "1", "t", "y", "yes")) if hints[key] is bool else hints[key]
+        grid[key] = [cast(v) for v in values.split(",") if v]
+    return grid
+
+
+def iter_configs(base: DetectionConfig, grid: Dict[str, list], samples: Optional[int] = None,
+                 seed: int = 0) -> Iterator[DetectionConfig]:
+    """그리드 전체 또는 그리드에서 중복 없이 뽑은 samples개의 설정."""
+    keys = list(grid)
+    sizes = [len(grid[k]) for k in keys]
+    total = int(np.prod(sizes))
+    if samples is None or samples >= total:
+        combos = itertools.product(*(grid[k] for k in keys))
+    else:
+        flat = np.random.default_rng(seed).choice(total, size=samples, replace=False)
+        combos = ([grid[k][i] for k, i in zip(keys, np.unravel_index(f, sizes))] for f in flat)
+    for combo in combos:
+        yield replace(base, **dict(zip(keys, combo)))
+
+
+def _smoothing_key(config: DetectionConfig) -> tuple:
+    return tuple(getattr(config, k) for k in SMOOTHING_KEYS)
+
+
+def _init_worker(corpus: Dict[str, np.ndarray]):
+    global _corpus
+    _corpus = corpus
+    _smoothed_cache.clear()
+
+
+def _replay_health(config: DetectionConfig, head_raw: np.ndarray, body_raw: np.ndarray, head: np.ndarray,
+                   body: np.ndarray, usable: Tuple[np.ndarray, np.ndarray]) -> bool:
+    """로그 하나의 원시 프레임으로 고장 셀 감시를 재생하며 필터링된 프레임을 제자리에서 대체하고
+    프레임별 임계값 계산 셀 마스크를 usable에 기록 (비정상 셀이 한 번이라도 있었으면 True)."""
+    health = SensorHealth(config, head_raw.shape[1:], body_raw.shape[1:])
+    flagged = False
+    for i in range(len(body_raw)):
+        health.update(head_raw[i], body_raw[i])
+        health.inpaint(head[i], body[i], config.value_min)
+        usable[0][i], usable[1][i] = health.usable
+        flagged = flagged or not (health.healthy[0].all() and health.healthy[1].all())
+    return flagged
+
+
+def _smoothed(config: DetectionConfig) -> Tuple[np.ndarray, np.ndarray, Optional[Tuple[np.ndarray, np.ndarray]]]:
+    """(head_avg, body_avg, usable) — 로그 파일(segment) 경계에서 이동 평균과 고장 셀 감시를 다시 시작.
+
+    usable은 프레임별 임계값 계산 셀 마스크 (고장 셀 감시가 꺼져 있거나 비정상 셀이 없었으면 None).
+    """
+    key = _smoothing_key(config)
+    if key not in _smoothed_cache:
+        head = np.clip(_corpus["head"], config.value_min, config.value_max)
+        body = np.clip(_corpus["body"], config.value_min, config.value_max)
+        head_avg = np.empty(head.shape)
+        body_avg = np.empty(body.shape)
+        usable = (np.ones(head.shape, dtype=bool), np.ones(body.shape, dtype=bool))
+        flagged = False
+        bounds = np.flatnonzero(np.diff(_corpus["segment"])) + 1
+        for s, e in zip(np.r_[0, bounds], np.r_[bounds, len(body)]):
+            # Detection.detect()와 같이 (원시값으로 셀 상태 갱신) 클리핑 → 스파이크 필터 → 고장 셀 대체 → 이동 평균
+            head_seg, body_seg, _ = filter_frames(head[s:e], body[s:e], config)
+            if config.health_monitor:
+                flagged = _replay_health(config, _corpus["head"][s:e], _corpus["body"][s:e], head_seg, body_seg,
+                                         (usable[0][s:e], usable[1][s:e])) or flagged
+            head_avg[s:e] = moving_average(head_seg, config.moving_avg_N)
+            body_avg[s:e] = moving_average(body_seg, config.moving_avg_N)
+        _smoothed_cache[key] = (head_avg, body_avg, usable if flagged else None)
+    return _smoothed_cache[key]
+
+
+def score_predictions(truth: np.ndarray, pred: np.ndarray, segment: np.ndarray) -> Dict[str, float]:
+    """정확도와 안정성: flip_rate는 정답이 바뀌지 않는 연속 프레임 쌍 중 판단이 바뀐 비율."""
+    same = (truth[1:] == truth[:-1]) & (segment[1:] == segment[:-1])
+    flips = (pred[1:] != pred[:-1]) & same
+    return {
+        "accuracy": float((pred == truth).mean()),
+        "flip_rate": float(flips.sum() / max(1, same.sum())),
+    }
+
+
+def evaluate_shard(configs: List[DetectionConfig]) -> List[Dict]:
+    """워커에서 설정 묶음을 재생 (같은 평활화 키끼리 묶여 있어 캐시가 재사용됨)."""
+    results = []
+    for config in configs:
+        head_avg, body_avg, usable = _smoothed(config)
+        detector = Detection(replace(config, log_path=os.devnull))
+        valid = (lambda i: (usable[0][i], usable[1][i])) if usable is not None else (lambda i: None)
+        pred = np.fromiter((detector.detect_smoothed(head_avg[i], body_avg[i], valid(i))["posture"].value
+                            for i in range(len(body_avg))), dtype=np.int64, count=len(body_avg))
+        results.append({"config": config, **score_predictions(_corpus["labels"], pred, _corpus["segment"])})
+    return results
+
+
+def _shards(configs: List[DetectionConfig], workers: int) -> List[List[DetectionConfig]]:
+    """평활화 키로 정렬한 뒤 연속 구간으로 나눠 한 워커가 같은 키를 최대한 연달아 처리하게 함."""
+    configs = sorted(configs, key=_smoothing_key)
+    n_shards = max(1, min(len(configs), workers * 4))
+    size = -(-len(configs) // n_shards)
+    return [configs[i:i + size] for i in range(0, len(configs), size)]
+
+
+def tune(corpus: Dict[str, np.ndarray], configs: List[DetectionConfig], workers: Optional[int] = None,
+         stability_weight: float = 0.5) -> List[Dict]:
+    """모든 설정을 평가하여 score(= accuracy - stability_weight * flip_rate) 내림차순으로 반환."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _init_worker(corpus)
+        results = [r for shard in _shards(configs, 1) for r in evaluate_shard(shard)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(corpus,)) as pool:
+            results = [r for rs in pool.map(evaluate_shard, _shards(configs, workers)) for r in rs]
+    for r in results:
+        r["score"] = r["accuracy"] - stability_weight * r["flip_rate"]
+    results.sort(key=lambda r: (-r["score"], -r["accuracy"], r["flip_rate"]))
+    return results
+
+
+def load_corpus(logs: List[str]) -> Dict[str, np.ndarray]:
+    """라벨된 로그들을 이어 붙인 말뭉치 (segment: 로그 번호). 로그가 없으면 합성 데이터."""
+    if not logs:
+        from benchmarks.synthetic import generate_corpus
+        corpus = generate_corpus()
+        return {"head": corpus["head"], "body": corpus["body"], "labels": corpus["labels"],
+                "segment": np.zeros(len(corpus["labels"]), dtype=np.int64)}
+    from ml_utils.dataset import encode_labels, load_frames
+    parts = {"head": [], "body": [], "labels": [], "segment": []}
+    for i, path in enumerate(logs):
+        _, head, body, names = load_frames(path)
+        labels = encode_labels(names)
+        keep = labels >= 0
+        parts["head"].append(head[keep]); parts["body"].append(body[keep]); parts["labels"].append(labels[keep])
+        parts["segment"].append(np.full(int(keep.sum()), i, dtype=np.int64))
+    corpus = {k: np.concatenate(v) for k, v in parts.items()}
+    if len(corpus["labels"]) == 0:
+        raise ValueError("라벨이 있는 프레임이 없습니다.")
+    return corpus
+
+
+def apply_config(config: DetectionConfig, keys: List[str]):
+    """탐색한 필드만 config_manager의 [Detection] 섹션에 한 번에 저장 (실행 중인 감지 루프가 다시 읽음)."""
+    from config_manager import config_manager
+    config_manager.update_dataclass("Detection", config, keys)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="DetectionConfig grid/random search over labeled logs")
+    parser.add_argument("logs", nargs="*", help="라벨된 MLLogger 로그 (없으면 합성 데이터)")
+    parser.add_argument("--grid", action="append", default=[], metavar="KEY=V1,V2,...",
+                        help="탐색할 값 목록 (지정한 필드는 기본 그리드를 대체)")
+    parser.add_argument("--only", action="store_true", help="--grid로 지정한 필드만 탐색")
+    parser.add_argument("--random", type=int, metavar="N", help="그리드 전체 대신 N개를 무작위로 평가")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--stability-weight", type=float, default=0.5, help="score = accuracy - w * flip_rate")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", help="전체 결과를 JSON으로 저장할 경로")
+    parser.add_argument("--apply", action="store_true", help="최적 설정을 config.ini [Detection]에 저장")
+    args = parser.parse_args(argv)
+
+    user_grid = parse_grid(args.grid)
+    grid = user_grid if args.only else {**DEFAULT_GRID, **user_grid}
+    corpus = load_corpus(args.logs)
+    # 그리드 밖의 필드는 장치의 현재 [Detection] 설정값으로 평가 (--apply는 그리드 필드만 저장하므로)
+    from config_manager import config_manager
+    base_config = config_manager.get_dataclass("Detection", DetectionConfig)
+    base = {f.name: getattr(base_config, f.name) for f in fields(DetectionConfig) if f.name not in grid}
+    configs = list(iter_configs(base_config, grid, args.random, args.seed))
+    print(f"{len(configs)} configs x {len(corpus['labels'])} frames")
+    print("base [Detection]: " + ", ".join(f"{k}={v}" for k, v in base.items()))
+
+    start = time.perf_counter()
+    results = tune(corpus, configs, args.workers, args.stability_weight)
+    elapsed = time.perf_counter() - start
+    print(f"done in {elapsed:.1f}s ({len(configs) * len(corpus['labels']) / elapsed:,.0f} frames/s)")
+
+    keys = list(grid)
+    print(f"{'#':>3} {'score':>7} {'accuracy':>9} {'flips':>7}  " + "  ".join(keys))
+    for rank, r in enumerate(results[:args.top], 1):
+        values = "  ".join(f"{getattr(r['config'], k)}" for k in keys)
+        print(f"{rank:>3} {r['score']:7.3f} {r['accuracy']:9.3f} {r['flip_rate']:7.3f}  {values}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"base": base,
+                       "results": [{**r, "config": {k: getattr(r["config"], k) for k in keys}} for r in results]},
+                      f, indent=2)
+
+    if args.apply:
+        apply_config(results[0]["config"], keys)
+        print("best config saved to [Detection]: " + ", ".join(f"{k}={getattr(results[0]['config'], k)}" for k in keys))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
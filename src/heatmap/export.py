@@ -0,0 +1,558 @@
+"""녹화된 로그(MLLogger .csv/.bfc) → PNG 프레임 / 애니메이션 GIF / 타임랩스 AVI 일괄 내보내기.
+
+실시간 화면(PressureHeatmap)과 같은 색상표와 기호(랜드마크 H/S/P/L/E, 고장 셀 x/!/=/~)를
+RGB 배열로 그리고, 외부 라이브러리 없이 NumPy + zlib로 인코딩합니다.
+- PNG: 팔레트(색인) PNG, 모든 행 Up 필터 (확대된 히트맵은 위아래 행이 비슷하여 압축이 잘 됨)
+- GIF: 고정 256색 팔레트(히트맵 단계 + 배경/글자색)의 색인 이미지이므로 양자화가 필요 없음, 순수 파이썬 LZW
+- AVI: 무압축 24비트 DIB (압축 코덱 없이 대부분의 플레이어와 ffmpeg에서 재생)
+프레임 위쪽에는 녹화 시각과 감지된 자세를 표시합니다.
+PNG는 --every초마다(기본 10초, 0이면 모든 프레임), 타임랩스(GIF/AVI)는 녹화 시각 기준 --timelapse초마다
+첫 프레임을 골라 --fps로 재생합니다. Run 기록은 10Hz 이상이므로 하룻밤이 28만 프레임을 넘어
+모든 프레임을 PNG로 쓰면 파일 28만여 개(약 1.7GB)가 됩니다 (감지는 간격과 관계없이 모든 프레임에 적용).
+
+로그를 블록(.bfc)/행(.csv) 단위 시간 구간으로 나눠 프로세스 풀에 분배하고, 각 워커는 자기 구간만
+디스크에서 스트리밍하여 감지(랜드마크) → 렌더 → 인코딩합니다. 구간 앞의 워밍업 프레임을 먼저 재생하여
+이동 평균/스파이크 필터/셀 상태 감시를 채운 뒤 출력을 시작하므로 구간 경계에서도 기호가 이어집니다.
+PNG는 워커가 바로 쓰고, 부모 프로세스는 구간 순서대로 타임랩스 프레임만 받아 이어 씁니다.
+
+src 디렉터리에서 실행:
+    python -m heatmap.export night.bfc --png export/ --gif night.gif --avi night.avi
+    python -m heatmap.export heatmap_log.csv --png export/ --every 60 --mode cells --cell-px 24 --workers 8
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import argparse
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from detection.config import DetectionConfig
+from detection.detection import Detection
+from heatmap.heatmap import HEATMAP_MODES, PressureHeatmap
+from heatmap.upsample import axis_weights
+
+# 팔레트: 0..HEAT_LEVELS-1 히트맵 단계, 그 뒤로 고정색
+HEAT_LEVELS = 240
+BACKGROUND, BLACK, WHITE = HEAT_LEVELS, HEAT_LEVELS + 1, HEAT_LEVELS + 2
+
+# 5x7 비트맵 글꼴 (행마다 하위 5비트, 16진수 7바이트) — 목록에 없는 글자는 공백
+FONT = {
+    "0": "0e11131519110e", "1": "040c040404040e", "2": "0e11010204081f", "3": "1f02040201110e",
+    "4": "02060a121f0202", "5": "1f101e0101110e", "6": "0608101e11110e", "7": "1f010204080808",
+    "8": "0e11110e11110e", "9": "0e11110f01020c", ":": "000c0c000c0c00", "-": "0000001f000000",
+    "A": "0e11111f111111", "B": "1e11111e11111e", "C": "0e11101010110e", "D": "1c12111111121c",
+    "E": "1f10101e10101f", "F": "1f10101e101010", "G": "0e11101711110f", "H": "1111111f111111",
+    "I": "0e04040404040e", "J": "0702020202120c", "K": "11121418141211", "L": "1010101010101f",
+    "M": "111b1515111111", "N": "11111915131111", "O": "0e11111111110e", "P": "1e11111e101010",
+    "Q": "0e11111115120d", "R": "1e11111e141211", "S": "0f10100e01011e", "T": "1f040404040404",
+    "U": "1111111111110e", "V": "11111111110a04", "W": "1111111515150a",
+    "X": "11110a040a1111", "Y": "1111110a040404", "Z": "1f01020408101f",
+    "x": "0000110a040a11", "!": "04040404040004", "=": "00001f001f0000", "~": "00000815020000",
+    "?": "0e110102040004",
+}
+GLYPH_SHAPE = (7, 5)
+
+
+@lru_cache(maxsize=256)
+def _glyph(char: str, scale: int, outline: bool = False) -> np.ndarray:
+    """글자 비트맵 (7*scale, 5*scale) bool — outline이면 scale 두께로 팽창한 테두리 포함 (가장자리 여백 포함)."""
+    rows = bytes.fromhex(FONT.get(char, "00000000000000"))
+    mask = (np.frombuffer(rows, dtype=np.uint8)[:, None] >> np.arange(4, -1, -1)) & 1
+    mask = np.kron(mask, np.ones((scale, scale), dtype=np.uint8)).astype(bool)
+    if outline:
+        padded = np.pad(mask, scale)
+        grown = np.zeros_like(padded)
+        for dr in range(-scale, scale + 1):
+            for dc in range(-scale, scale + 1):
+                grown |= np.roll(np.roll(padded, dr, axis=0), dc, axis=1)
+        mask = grown
+    mask.flags.writeable = False # 캐시되어 공유되므로 읽기 전용
+    return mask
+
+
+class FrameRenderer:
+    """프레임 + 감지 결과 → 팔레트 색인 이미지 (위쪽 글자 줄 + 히트맵), palette[색인] = RGB."""
+    def __init__(self, config: DetectionConfig, cell_px: int = 16, mode: str = "bilinear"):
+        if mode not in HEATMAP_MODES:
+            raise ValueError(f"mode must be one of {HEATMAP_MODES}")
+        self.config = config
+        self.cell_px = max(1, int(cell_px))
+        self.mode = mode
+        self.heatmap = PressureHeatmap(config) # 색상표/기호 배치는 실시간 화면과 같은 코드 사용
+        self.text_scale = max(1, self.cell_px // 12)
+        self.symbol_scale = max(1, self.cell_px // 8)
+        self.bar_rows = (2 * (GLYPH_SHAPE[0] + 2) + 1) * self.text_scale # 시각 + 자세 두 줄
+        self.palette = np.zeros((256, 3), dtype=np.uint8)
+        span = config.value_max - config.value_min
+        for i in range(HEAT_LEVELS):
+            self.palette[i] = self.heatmap._colormap_rgb(config.value_min + i / (HEAT_LEVELS - 1) * span)
+        self.palette[BACKGROUND] = (32, 32, 32)
+        self.palette[BLACK] = (0, 0, 0)
+        self.palette[WHITE] = (255, 255, 255)
+        self._shapes: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
+
+    def frame_shape(self, head_shape: Tuple[int, int], body_shape: Tuple[int, int]) -> Tuple[int, int]:
+        """출력 이미지 (높이, 너비)."""
+        rows, cols = head_shape[0] + body_shape[0], max(head_shape[1], body_shape[1])
+        return self.bar_rows + rows * self.cell_px, cols * self.cell_px
+
+    def _allocate(self, head_shape: Tuple[int, int], body_shape: Tuple[int, int]):
+        px = self.cell_px
+        cols = max(head_shape[1], body_shape[1])
+        self._image = np.empty(self.frame_shape(head_shape, body_shape), dtype=np.uint8)
+        self._heat = self._image[self.bar_rows:] # 히트맵 영역
+        self._canvas = np.zeros(self._heat.shape, dtype=np.float32) # 빈 칸 영역은 계속 0
+        r, c = np.divmod(np.arange(self._heat.size), cols * px)
+        r, c = r // px, c // px
+        pad = np.where(r < head_shape[0], c >= head_shape[1], c >= body_shape[1]) # head 오른쪽 빈 칸 (배경색)
+        self._pad = np.flatnonzero(pad)
+        if self.mode == "cells":
+            # 픽셀 → 이어 붙인 셀 번호
+            head_size = int(np.prod(head_shape))
+            self._cells = np.empty(head_size + int(np.prod(body_shape)), dtype=np.float32)
+            src = np.where(r < head_shape[0], r * head_shape[1] + c, head_size + (r - head_shape[0]) * body_shape[1] + c)
+            self._source = np.where(pad, 0, src)
+        else:
+            # 보간은 행/열로 분리되므로 격자마다 (행 가중치) @ 격자 @ (열 가중치).T — 캔버스 전체 행렬 곱보다 훨씬 작음
+            self._blocks = []
+            top = 0
+            for rows, grid_cols in (head_shape, body_shape):
+                self._blocks.append((top, grid_cols * px, axis_weights(rows, px, self.mode).astype(np.float32),
+                                     axis_weights(grid_cols, px, self.mode).T.astype(np.float32)))
+                top += rows * px
+        self._shapes = (tuple(head_shape), tuple(body_shape))
+
+    def _heat_levels(self, head: np.ndarray, body: np.ndarray):
+        canvas = self._canvas
+        if self.mode == "cells":
+            np.copyto(self._cells[:head.size], head.reshape(-1), casting="unsafe")
+            np.copyto(self._cells[head.size:], body.reshape(-1), casting="unsafe")
+            np.take(self._cells, self._source, out=canvas.reshape(-1))
+        else:
+            for (top, width, row_w, col_w), grid in zip(self._blocks, (head, body)):
+                canvas[top:top + row_w.shape[0], :width] = row_w @ grid.astype(np.float32) @ col_w
+        vmin, vmax = self.config.value_min, self.config.value_max
+        canvas -= vmin
+        canvas *= (HEAT_LEVELS - 1) / max(vmax - vmin, 1)
+        np.clip(canvas, 0, HEAT_LEVELS - 1, out=canvas)
+        np.rint(canvas, out=canvas)
+        np.copyto(self._heat, canvas, casting="unsafe")
+        self._heat.reshape(-1)[self._pad] = BACKGROUND
+
+    def _blit(self, mask: np.ndarray, top: int, left: int, color: int):
+        image = self._image
+        r0, c0 = max(top, 0), max(left, 0)
+        r1, c1 = min(top + mask.shape[0], image.shape[0]), min(left + mask.shape[1], image.shape[1])
+        if r0 < r1 and c0 < c1:
+            image[r0:r1, c0:c1][mask[r0 - top:r1 - top, c0 - left:c1 - left]] = color
+
+    def _text(self, text: str, top: int, left: int):
+        s = self.text_scale
+        for i, char in enumerate(text):
+            self._blit(_glyph(char, s), top, left + i * (GLYPH_SHAPE[1] + 1) * s, WHITE)
+
+    def _symbol(self, char: str, r: int, c: int, color: int):
+        """셀 (r, c) 중앙에 기호 (흰 기호는 검은 테두리로 어떤 배경색에서도 보이게)."""
+        s, px = self.symbol_scale, self.cell_px
+        cy, cx = self.bar_rows + r * px + px // 2, c * px + px // 2
+        if color == WHITE:
+            outline = _glyph(char, s, outline=True)
+            self._blit(outline, cy - outline.shape[0] // 2, cx - outline.shape[1] // 2, BLACK)
+        mask = _glyph(char, s)
+        self._blit(mask, cy - mask.shape[0] // 2, cx - mask.shape[1] // 2, color)
+
+    def render_indexed(self, head: np.ndarray, body: np.ndarray, result: Dict, ts: Optional[float] = None) -> np.ndarray:
+        """result: Detection.detect() 결과 — 반환 이미지는 다음 호출에서 재사용됨 (보관하려면 복사)."""
+        if self._shapes != (head.shape, body.shape):
+            self._allocate(head.shape, body.shape)
+        self._heat_levels(head, body)
+
+        # 실시간 화면과 같은 기호 배치 (랜드마크가 고장 셀 기호보다 우선)
+        heatmap, row_offset = self.heatmap, head.shape[0]
+        overlays = heatmap._overlay_heatmap(result["head"], result["shoulder"], result["hip"], result["heels"],
+                                            result.get("elbows", ()))
+        overlays = {**heatmap._overlay_health(result.get("health"), row_offset),
+                    **heatmap._adjust_overlays_with_row_offset(overlays, row_offset)}
+        rows, cols = head.shape[0] + body.shape[0], max(head.shape[1], body.shape[1])
+        for (r, c), (sym, style) in overlays.items():
+            if 0 <= r < rows and 0 <= c < cols:
+                self._symbol(sym, r, c, BLACK if "black" in style else WHITE)
+
+        self._image[:self.bar_rows] = BACKGROUND
+        s = self.text_scale
+        if ts is not None:
+            self._text(datetime.fromtimestamp(ts).strftime("%H:%M:%S"), s, s)
+        posture = result.get("posture")
+        if posture is not None:
+            self._text(posture.name.replace("_", " "), (GLYPH_SHAPE[0] + 3) * s, s)
+        return self._image
+
+    def rgb(self, indexed: np.ndarray) -> np.ndarray:
+        return self.palette[indexed]
+
+    def render_rgb(self, head: np.ndarray, body: np.ndarray, result: Dict, ts: Optional[float] = None) -> np.ndarray:
+        """(높이, 너비, 3) uint8 RGB."""
+        return self.rgb(self.render_indexed(head, body, result, ts))
+
+
+# ---------------- PNG ----------------
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def encode_png(pixels: np.ndarray, palette: Optional[np.ndarray] = None, level: int = 6) -> bytes:
+    """(높이, 너비, 3) uint8 RGB 또는 (높이, 너비) 색인 + palette (256, 3) → PNG (8비트, 모든 행 Up 필터).
+
+    색인 이미지는 팔레트 PNG로 저장 (같은 RGB로 디코딩되며 압축할 데이터가 RGB의 1/3).
+    """
+    h, w = pixels.shape[:2]
+    rows = np.ascontiguousarray(pixels, dtype=np.uint8).reshape(h, -1)
+    raw = np.empty((h, rows.shape[1] + 1), dtype=np.uint8)
+    raw[:, 0] = 2 # Up: 바로 위 행과의 차 (mod 256, 첫 행은 위 행을 0으로 봄)
+    raw[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=raw[1:, 1:])
+    color_type = 2 if pixels.ndim == 3 else 3
+    header = _png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, color_type, 0, 0, 0))
+    if color_type == 3:
+        header += _png_chunk(b"PLTE", np.ascontiguousarray(palette, dtype=np.uint8).tobytes())
+    return (b"\x89PNG\r\n\x1a\n" + header
+            + _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), level))
+            + _png_chunk(b"IEND", b""))
+
+
+# ---------------- GIF ----------------
+
+def lzw_encode(data: bytes, min_code_size: int = 8) -> bytes:
+    """GIF LZW (가변 코드 길이, 코드 4096개가 차면 clear 코드 후 다시 시작)."""
+    clear, eoi = 1 << min_code_size, (1 << min_code_size) + 1
+    bits, next_code = min_code_size + 1, eoi + 1
+    table: Dict[int, int] = {}
+    out = bytearray()
+    acc, n = clear, bits
+    prefix = data[0]
+    for k in data[1:]:
+        key = (prefix << 8) | k
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        acc |= prefix << n
+        n += bits
+        while n >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            n -= 8
+        if next_code >= (1 << bits) and bits < 12:
+            bits += 1
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+        else:
+            acc |= clear << n
+            n += bits
+            table.clear()
+            bits, next_code = min_code_size + 1, eoi + 1
+        prefix = k
+    acc |= prefix << n
+    n += bits
+    if next_code >= (1 << bits) and bits < 12:
+        bits += 1
+    acc |= eoi << n
+    n += bits
+    while n > 0:
+        out.append(acc & 0xFF)
+        acc >>= 8
+        n -= 8
+    return bytes(out)
+
+
+def encode_gif_frame(indexed: np.ndarray, delay_cs: int) -> bytes:
+    """색인 이미지 → GIF 프레임 (그래픽 제어 확장 + 이미지 서술자 + LZW 데이터, 전역 팔레트 사용)."""
+    h, w = indexed.shape
+    data = lzw_encode(np.ascontiguousarray(indexed, dtype=np.uint8).tobytes())
+    blocks = b"".join(bytes([len(data[i:i + 255])]) + data[i:i + 255] for i in range(0, len(data), 255))
+    return (b"\x21\xf9\x04\x04" + struct.pack("<H", delay_cs) + b"\x00\x00"
+            + b"\x2c" + struct.pack("<HHHHB", 0, 0, w, h, 0)
+            + b"\x08" + blocks + b"\x00")
+
+
+class GifWriter:
+    """애니메이션 GIF (전역 팔레트 256색, 무한 반복)를 프레임 단위로 기록."""
+    def __init__(self, path: str, palette: np.ndarray, width: int, height: int):
+        self.path = path
+        self.frames = 0
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF7, 0, 0)
+                         + np.ascontiguousarray(palette, dtype=np.uint8).tobytes()
+                         + b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+    def add(self, frame: bytes):
+        """encode_gif_frame()의 결과."""
+        self._file.write(frame)
+        self.frames += 1
+
+    def close(self):
+        self._file.write(b"\x3b")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------- AVI ----------------
+
+class AviWriter:
+    """무압축 24비트 AVI (RIFF, 'DIB ' 스트림 하나 + idx1 색인) — 프레임 수는 close()에서 채움."""
+    def __init__(self, path: str, width: int, height: int, fps: float):
+        self.path = path
+        self.width, self.height = width, height
+        self.stride = (width * 3 + 3) & ~3 # DIB 행은 4바이트 단위
+        self.frame_size = self.stride * height
+        self.frames = 0
+        self._index: List[int] = []
+        rate = max(1, int(round(fps * 1000)))
+        avih = struct.pack("<14I", int(1e6 * 1000 / rate), self.frame_size * rate // 1000, 0, 0x10, 0, 0, 1,
+                           self.frame_size, width, height, 0, 0, 0, 0)
+        strh = struct.pack("<4s4sIHHIIIIIIIIhhhh", b"vids", b"DIB ", 0, 0, 0, 0, 1000, rate, 0, 0,
+                           self.frame_size, 0xFFFFFFFF, 0, 0, 0, width, height)
+        strf = struct.pack("<IiiHHIIiiII", 40, width, height, 1, 24, 0, self.frame_size, 0, 0, 0, 0)
+        strl = b"strl" + b"strh" + struct.pack("<I", len(strh)) + strh + b"strf" + struct.pack("<I", len(strf)) + strf
+        hdrl = b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih + b"LIST" + struct.pack("<I", len(strl)) + strl
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(b"RIFF\0\0\0\0AVI LIST" + struct.pack("<I", len(hdrl)) + hdrl)
+        # 나중에 채울 위치: avih dwTotalFrames, strh dwLength, movi LIST 크기
+        self._total_frames_at = 12 + 8 + 4 + 8 + 16
+        self._length_at = 12 + 8 + len(hdrl) - len(strl) + 4 + 8 + 32
+        self._movi_at = self._file.tell()
+        self._file.write(b"LIST\0\0\0\0movi")
+        self._row = np.empty((height, self.stride), dtype=np.uint8)
+        self._row[:, width * 3:] = 0
+
+    def add(self, rgb: np.ndarray):
+        """(높이, 너비, 3) uint8 RGB → 아래 행부터 BGR."""
+        pixels = self._row[:, :self.width * 3].reshape(self.height, self.width, 3)
+        np.copyto(pixels, rgb[::-1, :, ::-1])
+        self._index.append(self._file.tell() - self._movi_at - 8)
+        self._file.write(b"00db" + struct.pack("<I", self.frame_size))
+        self._file.write(self._row.tobytes())
+        self.frames += 1
+
+    def close(self):
+        f = self._file
+        movi_end = f.tell()
+        f.write(b"idx1" + struct.pack("<I", 16 * len(self._index)))
+        for offset in self._index:
+            f.write(b"00db" + struct.pack("<III", 0x10, offset, self.frame_size))
+        end = f.tell()
+        for pos, value in ((4, end - 8), (self._movi_at + 4, movi_end - self._movi_at - 8),
+                           (self._total_frames_at, self.frames), (self._length_at, self.frames)):
+            f.seek(pos)
+            f.write(struct.pack("<I", value))
+        f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------- 병렬 내보내기 ----------------
+
+class Chunk(NamedTuple):
+    offset: int # 읽기 시작 위치 (워밍업 포함, .bfc 블록 / .csv 행 시작 바이트)
+    limit: int # 읽을 블록(.bfc) / 행(.csv) 수
+    skip: int # 출력하지 않는 앞쪽 워밍업 프레임 수
+    first: int # 첫 출력 프레임의 로그 전체 기준 번호 (PNG 파일 이름)
+
+
+@dataclass
+class ExportJob:
+    path: str
+    config: DetectionConfig
+    t0: float # 로그 첫 프레임 시각 (간격 구간 기준)
+    png_dir: Optional[str] = None
+    every: float = 10.0 # PNG 간격 (초, 0이면 모든 프레임)
+    timelapse: float = 0.0 # 타임랩스 프레임 간격 (초, 0이면 모든 프레임)
+    gif: bool = False
+    video: bool = False # 타임랩스 색인 프레임을 부모로 보냄 (AVI)
+    fps: float = 10.0
+    mode: str = "bilinear"
+    cell_px: int = 16
+    png_level: int = 1 # zlib 레벨 (1: 6 대비 약 1/7 시간에 파일은 약 1.3배)
+
+
+def warmup_frames(config: DetectionConfig) -> int:
+    """구간 앞에서 먼저 재생할 프레임 수 (이동 평균, 스파이크 필터, 셀 상태 판정 구간)."""
+    return max(config.moving_avg_N, config.spike_window, config.health_window if config.health_monitor else 0, 1)
+
+
+def _chunk_size(total: int, workers: int, chunk_frames: Optional[int]) -> int:
+    # 기본: 워커당 구간 4개 정도 (워밍업 재생 비용이 구간 길이에 비해 작도록 최소 10분 분량)
+    return max(1, chunk_frames) if chunk_frames else max(600, math.ceil(total / (workers * 4)))
+
+
+def plan_chunks(path: str, warmup: int, workers: int = 1, chunk_frames: Optional[int] = None) -> List[Chunk]:
+    """로그를 chunk_frames 이상씩의 시간 구간으로 나눔 (.bfc는 블록 경계, .csv는 행 경계)."""
+    chunks = []
+    if path.endswith(".bfc"):
+        from codec.frame_codec import iter_blocks
+        blocks = list(iter_blocks(path))
+        starts = np.concatenate([[0], np.cumsum([count for _, count in blocks], dtype=np.int64)])
+        chunk_frames = _chunk_size(int(starts[-1]), workers, chunk_frames)
+        i = 0
+        while i < len(blocks):
+            end = i + 1
+            while end < len(blocks) and starts[end] - starts[i] < chunk_frames:
+                end += 1
+            j = i
+            while j > 0 and starts[i] - starts[j] < warmup:
+                j -= 1
+            chunks.append(Chunk(blocks[j][0], end - j, int(starts[i] - starts[j]), int(starts[i])))
+            i = end
+    else:
+        from ml_utils.dataset import csv_row_offsets
+        offsets = csv_row_offsets(path)
+        chunk_frames = _chunk_size(len(offsets), workers, chunk_frames)
+        for start in range(0, len(offsets), chunk_frames):
+            warm = min(warmup, start)
+            size = min(chunk_frames, len(offsets) - start)
+            chunks.append(Chunk(int(offsets[start - warm]), warm + size, warm, start))
+    return chunks
+
+
+def iter_log(path: str, offset: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray, np.ndarray]]:
+    """로그 구간을 (ts, head, body)로 스트리밍."""
+    if path.endswith(".bfc"):
+        from codec.frame_codec import read_frame_log
+        yield from read_frame_log(path, start_offset=offset, max_blocks=limit, dtype=np.uint16)
+    else:
+        from ml_utils.dataset import iter_heatmap_csv
+        for ts, head, body, _ in iter_heatmap_csv(path, start_offset=offset, max_rows=limit):
+            yield ts, head, body
+
+
+def _bucket(ts: float, t0: float, interval: float, i: int) -> int:
+    return i if interval <= 0 else int((ts - t0) // interval)
+
+
+def export_chunk(job: ExportJob, chunk: Chunk) -> Dict:
+    """워커: 구간을 재생하며 PNG를 쓰고, 타임랩스 프레임은 (색인 이미지, GIF 프레임)으로 반환."""
+    detector = Detection(replace(job.config, log_path=os.devnull, activity_tracking=False))
+    renderer = FrameRenderer(job.config, job.cell_px, job.mode)
+    delay = max(2, int(round(100 / job.fps)))
+    frames = pngs = 0
+    timelapse = []
+    # 간격 구간이 바뀐 첫 프레임만 내보냄 (워밍업 프레임으로 이전 구간의 구간 번호를 이어받음)
+    last_png = last_lapse = None
+    for i, (ts, head, body) in enumerate(iter_log(job.path, chunk.offset, chunk.limit)):
+        result = detector.detect(head, body, ts=ts)
+        png_bucket = _bucket(ts, job.t0, job.every, i)
+        lapse_bucket = _bucket(ts, job.t0, job.timelapse, i)
+        want_png = job.png_dir is not None and png_bucket != last_png
+        want_lapse = (job.gif or job.video) and lapse_bucket != last_lapse
+        last_png, last_lapse = png_bucket, lapse_bucket
+        if i < chunk.skip:
+            continue
+        frames += 1
+        if not (want_png or want_lapse):
+            continue
+        indexed = renderer.render_indexed(head, body, result, ts)
+        if want_png:
+            with open(os.path.join(job.png_dir, f"frame_{chunk.first + i - chunk.skip:06d}.png"), "wb") as f:
+                f.write(encode_png(indexed, renderer.palette, job.png_level))
+            pngs += 1
+        if want_lapse:
+            timelapse.append((indexed.copy() if job.video else None,
+                              encode_gif_frame(indexed, delay) if job.gif else None))
+    return {"frames": frames, "pngs": pngs, "timelapse": timelapse}
+
+
+def export_log(path: str, config: DetectionConfig, png_dir: Optional[str] = None, gif_path: Optional[str] = None,
+               avi_path: Optional[str] = None, every: float = 10.0, timelapse: float = 60.0, fps: float = 10.0,
+               mode: str = "bilinear", cell_px: int = 16, workers: Optional[int] = None,
+               chunk_frames: Optional[int] = None) -> Dict:
+    """로그 하나를 내보냄 → {"frames", "pngs", "gif_frames", "avi_frames", "chunks", "seconds"}."""
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    first = next(iter_log(path, limit=1), None)
+    if first is None:
+        raise ValueError(f"{path}: 프레임이 없습니다.")
+    if png_dir is not None:
+        os.makedirs(png_dir, exist_ok=True)
+    chunks = plan_chunks(path, warmup_frames(config), workers, chunk_frames)
+    job = ExportJob(path, config, first[0], png_dir, every, timelapse if (gif_path or avi_path) else 0.0,
+                    gif=gif_path is not None, video=avi_path is not None, fps=fps, mode=mode, cell_px=cell_px)
+
+    renderer = FrameRenderer(config, cell_px, mode)
+    height, width = renderer.frame_shape(first[1].shape, first[2].shape)
+    gif = GifWriter(gif_path, renderer.palette, width, height) if gif_path else None
+    avi = AviWriter(avi_path, width, height, fps) if avi_path else None
+    summary = {"frames": 0, "pngs": 0, "gif_frames": 0, "avi_frames": 0, "chunks": len(chunks)}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(chunks) > 1 else None
+    try:
+        results = pool.map(export_chunk, repeat(job), chunks) if pool else map(export_chunk, repeat(job), chunks)
+        # 구간 순서대로 받아 타임랩스 프레임을 이어 씀 (먼저 끝난 구간의 결과만 잠시 보관됨)
+        for result in results:
+            summary["frames"] += result["frames"]
+            summary["pngs"] += result["pngs"]
+            for indexed, gif_frame in result["timelapse"]:
+                if gif_frame is not None:
+                    gif.add(gif_frame)
+                if indexed is not None:
+                    avi.add(renderer.rgb(indexed))
+    finally:
+        if pool:
+            pool.shutdown()
+        for writer in (gif, avi):
+            if writer is not None:
+                writer.close()
+    summary["gif_frames"] = gif.frames if gif else 0
+    summary["avi_frames"] = avi.frames if avi else 0
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export a recorded heatmap log to PNG frames / GIF / AVI timelapse")
+    parser.add_argument("log", help="MLLogger 로그 (.csv 또는 .bfc)")
+    parser.add_argument("--png", metavar="DIR", help="PNG 프레임을 저장할 디렉터리")
+    parser.add_argument("--gif", metavar="PATH", help="타임랩스 애니메이션 GIF")
+    parser.add_argument("--avi", metavar="PATH", help="타임랩스 무압축 AVI")
+    parser.add_argument("--every", type=float, default=10.0, help="PNG 간격 (초, 0이면 모든 프레임)")
+    parser.add_argument("--timelapse", type=float, default=60.0, help="타임랩스 프레임 간격 (녹화 시각 기준 초)")
+    parser.add_argument("--fps", type=float, default=10.0, help="타임랩스 재생 속도")
+    parser.add_argument("--mode", choices=HEATMAP_MODES, default="bilinear")
+    parser.add_argument("--cell-px", type=int, default=16, help="센서 셀 하나의 픽셀 크기")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-frames", type=int, default=None, help="워커 작업 단위 프레임 수")
+    args = parser.parse_args(argv)
+    if not (args.png or args.gif or args.avi):
+        parser.error("--png, --gif, --avi 중 하나 이상을 지정하세요.")
+
+    # 실시간 화면과 같은 값 범위/감지 설정 (config.ini [Detection])
+    from config_manager import config_manager
+    config = config_manager.get_dataclass("Detection", DetectionConfig)
+    summary = export_log(args.log, config, png_dir=args.png, gif_path=args.gif, avi_path=args.avi, every=args.every,
+                         timelapse=args.timelapse, fps=args.fps, mode=args.mode, cell_px=args.cell_px,
+                         workers=args.workers, chunk_frames=args.chunk_frames)
+    print(f"{summary['frames']} frames in {summary['chunks']} chunks, {summary['seconds']:.1f}s: "
+          f"{summary['pngs']} PNG, {summary['gif_frames']} GIF frames, {summary['avi_frames']} AVI frames")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,13 +6,49 @@ from rich.text import Text
 from rich.table import Table
 from rich.text import Text
 from rich.columns import Columns
+from rich.color import Color
+from rich.style import Style
+from rich.text import Span
 from rich import box
 
+from detection.activity import ActivityTracker
 from detection.config import DetectionConfig
+from detection.health import CellHealth
+from heatmap.upsample import METHODS, canvas_weights
+
+# 고장 셀 표시 기호 (랜드마크 기호가 같은 칸에 있으면 랜드마크가 우선)
+HEALTH_SYMBOLS = {
+    CellHealth.DEAD: ("x", "Dead sensor"),
+    CellHealth.SATURATED: ("!", "Saturated sensor"),
+    CellHealth.STUCK: ("=", "Stuck sensor"),
+    CellHealth.NOISY: ("~", "Noisy sensor"),
+}
+
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+HEATMAP_MODES = ("cells",) + METHODS
+COLOR_LEVELS = 64 # 확대 보기의 색상 단계 수 (값을 양자화하여 미리 만든 스타일 재사용)
+HALF_BLOCK = "▀" # 글자색 = 위쪽 픽셀, 배경색 = 아래쪽 픽셀
+
+# 값 목록 → 한 글자씩의 막대 (최댓값 기준, NaN은 공백)
+def sparkline(values: np.ndarray, top: Optional[float] = None) -> str:
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    top = top if top is not None else (float(finite.max()) if finite.size else 0.0)
+    if top <= 0:
+        return "".join(" " if np.isnan(v) else SPARK_CHARS[1] for v in values)
+    levels = np.clip(np.rint(values / top * (len(SPARK_CHARS) - 2)), 0, len(SPARK_CHARS) - 2) + 1
+    return "".join(" " if np.isnan(v) else SPARK_CHARS[int(l)] for v, l in zip(values, levels))
 
 class PressureHeatmap:
     def __init__(self, config: DetectionConfig):
         self.config = config
+        # 확대 보기 상태: 색상 조회 테이블(값 범위가 바뀌면 다시 만듦)과 (위, 아래) 색상 쌍별 스타일
+        self._lut_range: Optional[Tuple[int, int]] = None
+        self._lut: List[Color] = []
+        self._pair_styles: Dict[int, Style] = {}
+        self._cells: Optional[np.ndarray] = None
+        self._canvas: Optional[np.ndarray] = None
+        self._levels: Optional[np.ndarray] = None
 
     def _rgb_hex(self, r,g,b): return f"#{int(r):02x}{int(g):02x}{int(b):02x}"
 
@@ -38,7 +74,17 @@ class PressureHeatmap:
                         break
         return mask
         
-    def _overlay_heatmap(self, head, shoulder, hip, heels):
+    def _overlay_health(self, health, row_offset: int) -> Dict[Tuple[int, int], Tuple[str, str]]:
+        ov = {}
+        if health is None:
+            return ov
+        for grid, offset in zip(health, (0, row_offset)):
+            for r, c in zip(*np.nonzero(grid)):
+                sym, _ = HEALTH_SYMBOLS[CellHealth(int(grid[r, c]))]
+                ov[(int(r) + offset, int(c))] = (sym, "bold black")
+        return ov
+
+    def _overlay_heatmap(self, head, shoulder, hip, heels, elbows=()):
         ov = {}
         if head is not None:
             r,c,_ = head; ov[(int(round(r)), int(round(c)))] = ("H", "bold white")
@@ -46,6 +92,8 @@ class PressureHeatmap:
         hr,hc,_ = hip; ov[(int(round(hr)), int(round(hc)))] = ("P", "bold white")
         for r,c,_ in heels:
             ov[(int(round(r)), int(round(c)))] = ("L", "bold white")
+        for r,c,_ in elbows:
+            ov[(int(round(r)), int(round(c)))] = ("E", "bold white")
         return ov
 
     def _merge_head_body(self, head: np.ndarray, body: np.ndarray, fill_value: float = 0.0) -> Tuple[np.ndarray, int]:
@@ -79,9 +127,11 @@ class PressureHeatmap:
             adjusted[(r+row_offset, c)] = (sym, fgstyle)
         return adjusted
 
-    def _render(self, head: np.ndarray, body: np.ndarray, overlays: Dict[Tuple[int, int], Tuple[str, str]], threshold: float) -> Panel:
+    def _render(self, head: np.ndarray, body: np.ndarray, overlays: Dict[Tuple[int, int], Tuple[str, str]], threshold: float,
+                health=None) -> Panel:
         merged, row_offset = self._merge_head_body(head, body)
-        overlays = self._adjust_overlays_with_row_offset(overlays, row_offset)
+        health_overlays = self._overlay_health(health, row_offset)
+        overlays = {**health_overlays, **self._adjust_overlays_with_row_offset(overlays, row_offset)}
         thr = (merged >= threshold)
         boundary = self._boundary_mask(thr)
 
@@ -109,6 +159,9 @@ class PressureHeatmap:
                 row_text.append(Text(ch, style=style))
             table.add_row(row_text)
         
+        return self._with_legend(table, health_overlays, "Heatmap")
+
+    def _with_legend(self, table, health_overlays: Dict[Tuple[int, int], Tuple[str, str]], title: str) -> Panel:
         # 오버레이 범례 생성
         legend_table = Table.grid(padding=1)
         legend_table.add_column("Symbol", style="bold white", justify="center")
@@ -117,17 +170,91 @@ class PressureHeatmap:
         legend_items = [
             ("H", "Head"),
             ("S", "Shoulder"),
+            ("E", "Elbow"),
             ("P", "Hip"),
             ("L", "Heels")
         ]
         
+        # 고장 셀이 있을 때만 해당 기호 범례 추가
+        shown = {sym for sym, _ in health_overlays.values()}
+        legend_items += [(sym, description) for sym, description in HEALTH_SYMBOLS.values() if sym in shown]
+
         for symbol, description in legend_items:
             legend_table.add_row(symbol, description)
         
         # 히트맵 오른쪽에 범례 배치
         combined_content = Columns([table, legend_table], equal=False, expand=False)
         
-        return Panel(combined_content, title="Heatmap", padding=(1, 1), box=box.SQUARE)
+        return Panel(combined_content, title=title, padding=(1, 1), box=box.SQUARE)
+
+    def _color_lut(self) -> List[Color]:
+        key = (self.config.value_min, self.config.value_max)
+        if key != self._lut_range:
+            span = self.config.value_max - self.config.value_min
+            values = self.config.value_min + np.arange(COLOR_LEVELS) / (COLOR_LEVELS - 1) * span
+            self._lut = [Color.from_rgb(*self._colormap_rgb(v)) for v in values]
+            self._lut_range = key
+            self._pair_styles = {}
+        return self._lut
+
+    def _pair_style(self, key: int) -> Style:
+        style = self._pair_styles.get(key)
+        if style is None:
+            lut = self._color_lut()
+            top, bottom = divmod(key, COLOR_LEVELS)
+            style = self._pair_styles[key] = Style(color=lut[top], bgcolor=lut[bottom])
+        return style
+
+    def _upsample_levels(self, head: np.ndarray, body: np.ndarray, scale: int, method: str) -> np.ndarray:
+        """보간 확대 + 색상 단계 양자화 → (캔버스 행, 캔버스 열) uint8 (행렬 곱 한 번, 작업 버퍼 재사용)."""
+        weights = canvas_weights(head.shape, body.shape, scale, method)
+        if self._canvas is None or self._canvas.size != weights.shape[0] or self._cells.size != weights.shape[1]:
+            self._cells = np.empty(weights.shape[1], dtype=np.float32)
+            self._canvas = np.empty(weights.shape[0], dtype=np.float32)
+            self._levels = np.empty(weights.shape[0], dtype=np.uint8)
+        np.copyto(self._cells[:head.size], head.reshape(-1), casting="unsafe")
+        np.copyto(self._cells[head.size:], body.reshape(-1), casting="unsafe")
+        canvas = np.matmul(weights, self._cells, out=self._canvas)
+        vmin, vmax = self.config.value_min, self.config.value_max
+        canvas -= vmin
+        canvas *= (COLOR_LEVELS - 1) / max(vmax - vmin, 1)
+        np.clip(canvas, 0, COLOR_LEVELS - 1, out=canvas)
+        np.rint(canvas, out=canvas)
+        np.copyto(self._levels, canvas, casting="unsafe")
+        width = max(head.shape[1], body.shape[1]) * scale
+        return self._levels.reshape(-1, width)
+
+    def _render_upsampled(self, head: np.ndarray, body: np.ndarray, overlays: Dict[Tuple[int, int], Tuple[str, str]],
+                          health=None) -> Panel:
+        """보간 확대 보기: 터미널 한 칸에 위/아래 두 픽셀 (반 블록 문자), 같은 색이 이어지는 구간은 스팬 하나로."""
+        scale, method = max(1, int(self.config.heatmap_scale)), self.config.heatmap_mode
+        levels = self._upsample_levels(head, body, scale, method)
+        row_offset = head.shape[0]
+        health_overlays = self._overlay_health(health, row_offset)
+        # 셀 좌표 기호 → 셀 중앙에 해당하는 터미널 위치 (행은 픽셀 2개당 한 줄)
+        symbols = {}
+        for (r, c), value in {**health_overlays, **self._adjust_overlays_with_row_offset(overlays, row_offset)}.items():
+            symbols[((2 * r * scale + scale) // 4, c * scale + scale // 2)] = value
+
+        table = Table.grid(padding=0)
+        width = levels.shape[1]
+        for tr in range(levels.shape[0] // 2):
+            keys = (levels[2 * tr].astype(np.int32) * COLOR_LEVELS + levels[2 * tr + 1]).tolist()
+            chars = [HALF_BLOCK] * width
+            spans = []
+            start = 0
+            for c in range(1, width + 1):
+                if c < width and keys[c] == keys[start]:
+                    continue
+                spans.append(Span(start, c, self._pair_style(keys[start])))
+                start = c
+            for c in range(width):
+                if (tr, c) in symbols:
+                    sym, fgstyle = symbols[(tr, c)]
+                    chars[c] = sym
+                    spans.append(Span(c, c + 1, Style.parse(fgstyle) + Style(bgcolor=self._color_lut()[keys[c] // COLOR_LEVELS])))
+            table.add_row(Text("".join(chars), spans=spans))
+        return self._with_legend(table, health_overlays, f"Heatmap ({method} x{scale})")
 
     # Draw heatmap to console
     def render(self,
@@ -136,8 +263,37 @@ class PressureHeatmap:
                shoulder: Tuple[float, float, float], 
                hip: Tuple[float, float, float], 
                heels: List[Tuple[float, float, float]],
-               threshold: float) -> Panel:
-        overlays = self._overlay_heatmap(head, shoulder, hip, heels)
-        panel = self._render(H, B, overlays, threshold)
+               threshold: float,
+               elbows: List[Tuple[float, float, float]] = (),
+               health: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Panel:
+        """health: Detection 결과의 (head, body) 셀 상태 (CellHealth) — 고장 셀에 기호 표시."""
+        overlays = self._overlay_heatmap(head, shoulder, hip, heels, elbows)
+        if self.config.heatmap_mode not in HEATMAP_MODES:
+            raise ValueError(f"heatmap_mode must be one of {HEATMAP_MODES}")
+        if self.config.heatmap_mode != "cells":
+            return self._render_upsampled(H, B, overlays, health)
+        panel = self._render(H, B, overlays, threshold, health)
         return panel
-        
\ No newline at end of file
+        
+
+    # 최근 minutes분의 활동량/하중/COP 이동 거리 스파크라인 (마지막 칸은 진행 중인 분)
+    def render_activity(self, activity: Optional[ActivityTracker], minutes: int = 60) -> Panel:
+        if activity is None:
+            return Panel(Text("Activity tracking disabled", style="dim"), title="Activity", box=box.SQUARE)
+        table = Table.grid(padding=(0, 1))
+        table.add_column("Metric", style="bold")
+        table.add_column("Sparkline", style="cyan", no_wrap=True)
+        table.add_column("Now", justify="right")
+        last = activity.last
+        cop = "-" if np.isnan(last["cop_r"]) else f"({last['cop_r']:.1f}, {last['cop_c']:.1f})"
+        rows = [
+            ("Movement", "activity", f"{last['activity']:.1f}"),
+            ("Load", "load", f"{last['load']:.0f}"),
+            ("COP path", "cop_path", cop),
+        ]
+        for name, field, now in rows:
+            table.add_row(name, sparkline(activity.recent(field, minutes)), now)
+        total = activity.summary()
+        table.add_row("Session", f"{total['minutes']} min, movement {total['activity']:.0f}, "
+                                 f"COP path {total['cop_path']:.1f} cells, posture changes {total['posture_changes']}", "")
+        return Panel(table, title=f"Activity (last {minutes} min, per minute)", box=box.SQUARE)
@@ -0,0 +1,59 @@
+"""히트맵 보간 확대용 가중치 행렬 (격자 모양별로 한 번만 계산).
+
+head/body 격자를 각각 scale배로 보간하여 세로로 이어 붙인 캔버스를 만드는 선형 사상을
+(캔버스 픽셀 수, head 셀 수 + body 셀 수) 행렬 하나로 미리 계산해 두고,
+프레임마다 `weights @ cells` 행렬 곱 한 번으로 확대합니다.
+head 오른쪽의 빈 칸(격자 폭 차이)은 가중치가 0인 행이므로 0으로 채워집니다.
+
+- bilinear: 이웃 2x2 셀의 선형 보간
+- bicubic: 이웃 4x4 셀의 Keys 3차 보간 (a=-0.5, 가장자리는 복제) — 최댓값을 약간 넘을 수 있음
+"""
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+METHODS = ("bilinear", "bicubic")
+
+
+def _kernel(method: str, d: np.ndarray) -> np.ndarray:
+    d = np.abs(d)
+    if method == "bilinear":
+        return np.clip(1.0 - d, 0.0, None)
+    a = -0.5
+    return np.where(d <= 1, (a + 2) * d ** 3 - (a + 3) * d ** 2 + 1,
+                    np.where(d < 2, a * d ** 3 - 5 * a * d ** 2 + 8 * a * d - 4 * a, 0.0))
+
+
+def axis_weights(n: int, scale: int, method: str) -> np.ndarray:
+    """1차원 보간 가중치 (n * scale, n): 출력 픽셀 중심을 입력 셀 좌표로 옮겨 이웃 셀에 가중치 배분."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    src = (np.arange(n * scale) + 0.5) / scale - 0.5 # 출력 픽셀 중심의 입력 좌표
+    taps = 2 if method == "bilinear" else 4
+    base = np.floor(src).astype(int) - (taps // 2 - 1)
+    weights = np.zeros((n * scale, n))
+    for k in range(taps):
+        idx = base + k
+        w = _kernel(method, src - idx)
+        np.add.at(weights, (np.arange(n * scale), np.clip(idx, 0, n - 1)), w) # 가장자리 밖 셀은 가장자리 셀로
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+@lru_cache(maxsize=16)
+def canvas_weights(head_shape: Tuple[int, int], body_shape: Tuple[int, int], scale: int,
+                   method: str) -> np.ndarray:
+    """[head 셀, body 셀] (이어 붙인 1차원) → 캔버스 ((head 행 + body 행) * scale, 최대 열 * scale) 픽셀 가중치."""
+    width = max(head_shape[1], body_shape[1]) * scale
+    blocks = []
+    for rows, cols in (head_shape, body_shape):
+        grid = np.kron(axis_weights(rows, scale, method), axis_weights(cols, scale, method)) # (픽셀, 셀)
+        padded = np.zeros((rows * scale, width, rows * cols))
+        padded[:, :cols * scale] = grid.reshape(rows * scale, cols * scale, rows * cols)
+        blocks.append(padded.reshape(-1, rows * cols))
+    head, body = blocks
+    weights = np.zeros((head.shape[0] + body.shape[0], head.shape[1] + body.shape[1]), dtype=np.float32)
+    weights[:head.shape[0], :head.shape[1]] = head
+    weights[head.shape[0]:, head.shape[1]:] = body
+    weights.flags.writeable = False # 캐시되어 공유되므로 읽기 전용
+    return weights
@@ -0,0 +1,407 @@
+"""LAN 실시간 보기 서버 (asyncio HTTP + WebSocket, 외부 라이브러리 없음).
+
+간호사실 PC의 브라우저에서 여러 침대를 동시에 보기 위한 내장 서버입니다 (침대마다 장치 하나, 페이지 하나).
+- GET /   : 히트맵 페이지 (liveview/index.html)
+- GET /ws : WebSocket — 연결 직후 JSON hello(장치, 격자 모양, 값 범위, 자세 이름, 허용된 전송률) 후 바이너리 메시지.
+            전송률(초당 메시지 수)은 ?rate=N 또는 텍스트 메시지 {"rate": N}으로 협상 (max_rate 이하로 제한)
+
+수집 쪽(FrameHub 구독 스레드의 publish_frame, 감지 루프의 publish_detection)은 최신 스냅숏을 바꾸고
+이벤트 루프를 깨우기만 하므로(대기열, 소켓 I/O 없음) 느린 브라우저가 있어도 수집/감지는 기다리지 않습니다.
+클라이언트마다
+- 협상한 간격마다 그 시점의 최신 스냅숏 하나만 보냄 (밀린 프레임을 쌓지 않고 건너뜀)
+- 커널 송신 버퍼(send_buffer) 밖에 쌓인 데이터가 high_water를 넘으면 쓰지 않고 비워지기를 기다리며, stall_timeout 동안 비워지지 않으면 연결 종료
+- 마지막으로 보낸 스냅숏 대비 바뀐 셀만 보냄 (기준이 history에서 밀려났거나 델타가 더 크면 키프레임)
+같은 기준 → 같은 스냅숏 메시지는 한 번만 인코딩하여 클라이언트들이 공유합니다.
+센서 노이즈로 매 프레임 모든 셀이 바뀌지 않도록 직전 스냅숏 대비 deadband 이하로 변한 셀은 이전 값을 유지합니다.
+
+바이너리 메시지 (little endian):
+    u8 kind (0 키프레임, 1 델타), u8 posture (Posture 값, 255 없음), u16 n, u8 m, u32 revision, f64 ts
+    m x (u8 기호 ASCII, u8 행, u8 열) — 실시간 화면과 같은 랜드마크 기호 위치 (head 아래에 body를 이어 붙인 격자)
+    키프레임: u16 값 x n (head 셀, body 셀 순서)
+    델타    : u8 셀 번호 x n, u16 값 x n
+"""
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+
+import numpy as np
+
+from detection.config import DetectionConfig
+from detection.detection import Posture
+from heatmap.heatmap import PressureHeatmap
+
+KEYFRAME = 0
+DELTA = 1
+NO_POSTURE = 255
+HEADER = struct.Struct("<BBHBId")
+MIN_RATE = 0.1
+PAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html")
+
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+MAX_CLIENT_MESSAGE = 4096 # 클라이언트 → 서버는 전송률 요청 정도만 받음
+
+
+def ws_frame(payload: bytes, opcode: int = OP_BINARY) -> bytes:
+    """서버 → 클라이언트 WebSocket 프레임 (FIN, 마스크 없음)."""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+
+def _unmask(payload: bytes, mask: bytes) -> bytes:
+    n = len(payload)
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+
+class Snapshot:
+    """클라이언트들이 공유하는 상태 (cells는 바꾸지 않음)."""
+    __slots__ = ("revision", "ts", "cells", "posture", "marks", "encoded")
+
+    def __init__(self, revision: int, ts: float, cells: np.ndarray, posture: int, marks: bytes):
+        self.revision = revision
+        self.ts = ts
+        self.cells = cells
+        self.posture = posture
+        self.marks = marks
+        self.encoded: Dict[int, bytes] = {} # 기준 revision (키프레임은 -1) → WebSocket 프레임 (이벤트 루프에서만 사용)
+
+
+class _Client:
+    __slots__ = ("writer", "interval", "revision", "next_at", "sent", "bytes", "skipped")
+
+    def __init__(self, writer: asyncio.StreamWriter, rate: float):
+        self.writer = writer
+        self.interval = 1.0 / rate
+        self.revision = 0 # 마지막으로 보낸 스냅숏 (0: 아직 없음 → 키프레임)
+        self.next_at = 0.0
+        self.sent = 0
+        self.bytes = 0
+        self.skipped = 0 # 송신 버퍼가 차서 건너뛴 횟수
+
+
+class LiveViewServer:
+    logger = logging.getLogger("live_view")
+
+    def __init__(self, config: DetectionConfig, host: str = "0.0.0.0", port: int = 8765, max_rate: float = 10.0,
+                 deadband: int = 16, device: str = "", head_shape: Tuple[int, int] = (2, 3),
+                 body_shape: Tuple[int, int] = (12, 7), history: int = 64, high_water: int = 64 * 1024,
+                 send_buffer: int = 16 * 1024, stall_timeout: float = 10.0):
+        self.config = config
+        self.host = host
+        self.port = port # port=0이면 start() 후 실제 포트
+        self.max_rate = max(MIN_RATE, max_rate)
+        self.deadband = deadband
+        self.device = device
+        self.head_shape, self.body_shape = tuple(head_shape), tuple(body_shape)
+        self.history = history
+        self.high_water = high_water
+        self.send_buffer = send_buffer # 커널 송신 버퍼 (크면 느린 클라이언트에 오래된 프레임이 커널에 쌓임)
+        self.stall_timeout = stall_timeout
+        self.clients: Set[_Client] = set()
+        self.disconnected = 0 # 송신 버퍼가 비워지지 않아 끊은 연결 수
+        self._heatmap = PressureHeatmap(config) # 랜드마크 기호 배치는 실시간 화면과 같은 코드 사용
+        # 수집 스레드 쪽 상태 (_lock)
+        self._lock = threading.Lock()
+        self._revision = 0
+        self._cells: Optional[np.ndarray] = None
+        self._posture = NO_POSTURE
+        self._marks = b""
+        self._latest: Optional[Snapshot] = None
+        self._wake_pending = False
+        # 이벤트 루프 쪽 상태
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._current: Optional[Snapshot] = None
+        self._bases: Dict[int, np.ndarray] = {} # 최근 스냅숏 revision → cells (델타 기준)
+        self._order: Deque[int] = deque()
+        self._changed: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._page = b""
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------- 수집 쪽 (다른 스레드에서 호출, 막히지 않음) ----------------
+
+    def publish_frame(self, ts: float, head: np.ndarray, body: np.ndarray) -> int:
+        """조립된 프레임 반영 → 스냅숏 revision."""
+        if head.size != np.prod(self.head_shape) or body.size != np.prod(self.body_shape):
+            raise ValueError(f"frame shape {head.shape}/{body.shape} does not match {self.head_shape}/{self.body_shape}")
+        cells = np.concatenate((head.reshape(-1), body.reshape(-1)))
+        cells = np.clip(np.rint(cells) if cells.dtype.kind == "f" else cells, 0, 0xFFFF).astype("<u2")
+        with self._lock:
+            previous = self._cells
+            if previous is not None and self.deadband > 0:
+                keep = np.abs(cells.astype(np.int32) - previous) <= self.deadband
+                cells[keep] = previous[keep]
+            cells.flags.writeable = False
+            self._cells = cells
+            revision = self._snapshot(ts)
+        self._wake()
+        return revision
+
+    def publish_detection(self, ts: float, result: Dict) -> int:
+        """Detection.detect() 결과의 자세/랜드마크 반영 → 스냅숏 revision (프레임이 아직 없으면 0)."""
+        posture = result["posture"].value if result.get("posture") is not None else NO_POSTURE
+        overlays = self._heatmap._overlay_heatmap(result["head"], result["shoulder"], result["hip"], result["heels"],
+                                                  result.get("elbows", ()))
+        overlays = self._heatmap._adjust_overlays_with_row_offset(overlays, self.head_shape[0])
+        marks = b"".join(struct.pack("<BBB", ord(sym), r, c) for (r, c), (sym, _) in overlays.items()
+                         if 0 <= r < 256 and 0 <= c < 256)
+        with self._lock:
+            self._posture, self._marks = posture, marks
+            if self._cells is None:
+                return 0
+            revision = self._snapshot(ts)
+        self._wake()
+        return revision
+
+    def _snapshot(self, ts: float) -> int:
+        self._revision = self._revision % 0xFFFFFFFF + 1 # u32, 0은 "아직 받은 것 없음"
+        self._latest = Snapshot(self._revision, ts, self._cells, self._posture, self._marks)
+        return self._revision
+
+    def _wake(self):
+        # 루프가 처리하기 전까지의 스냅숏은 최신 것 하나로 합쳐짐 (루프가 바빠도 콜백이 쌓이지 않음)
+        loop = self._loop
+        if loop is None or self._wake_pending:
+            return
+        self._wake_pending = True
+        try:
+            loop.call_soon_threadsafe(self._on_snapshot)
+        except RuntimeError: # 루프 종료 중
+            pass
+
+    def attach(self, hub):
+        """FrameHub 구독 (최신 프레임만, 별도 스레드에서 publish_frame)."""
+        return hub.consume("live-view", lambda frame: self.publish_frame(frame.ts, frame.head, frame.body), maxsize=1)
+
+    # ---------------- 서버 스레드 ----------------
+
+    def start(self) -> bool:
+        """서버 스레드 시작 (포트를 열지 못하면 False)."""
+        with open(PAGE_PATH, "rb") as f:
+            self._page = f.read()
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,), name="live-view", daemon=True)
+        self._thread.start()
+        started.wait(5.0)
+        return self._loop is not None
+
+    def stop(self):
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def stats(self) -> Dict:
+        clients = list(self.clients)
+        return {"clients": len(clients), "sent": sum(c.sent for c in clients), "bytes": sum(c.bytes for c in clients),
+                "skipped": sum(c.skipped for c in clients), "disconnected": self.disconnected}
+
+    def _run(self, started: threading.Event):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._serve(started))
+        except Exception as e:
+            self.logger.error(f"Live view server failed: {e}")
+        finally:
+            self._loop = None
+            started.set()
+            loop.close()
+
+    async def _serve(self, started: threading.Event):
+        self._changed, self._stopping = asyncio.Event(), asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            self.logger.error(f"Live view server could not listen on {self.host}:{self.port}: {e}")
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self._loop = asyncio.get_running_loop()
+        self.logger.info(f"Live view at {self.url}")
+        started.set()
+        self._on_snapshot() # start() 전에 들어온 프레임
+        await self._stopping.wait()
+        self._loop = None
+        server.close()
+        for client in list(self.clients):
+            client.writer.transport.abort()
+        await asyncio.wait_for(server.wait_closed(), 5.0)
+
+    def _on_snapshot(self):
+        self._wake_pending = False # 최신 스냅숏을 읽기 전에 내려야 그 뒤의 발행이 다시 깨움
+        snapshot = self._latest
+        if snapshot is None or snapshot is self._current:
+            return
+        self._current = snapshot
+        self._bases[snapshot.revision] = snapshot.cells
+        self._order.append(snapshot.revision)
+        while len(self._order) > self.history:
+            self._bases.pop(self._order.popleft(), None)
+        self._changed.set() # 기다리던 클라이언트를 모두 깨우고 다음 변경을 기다리도록 바로 내림
+        self._changed.clear()
+
+    def _message(self, snapshot: Snapshot, base: int) -> bytes:
+        key = base if base in self._bases else -1
+        message = snapshot.encoded.get(key)
+        if message is not None:
+            return message
+        cells = snapshot.cells
+        payload = None
+        if key >= 0 and cells.size <= 256:
+            changed = np.flatnonzero(cells != self._bases[key])
+            if 3 * changed.size < 2 * cells.size: # 델타(셀당 3바이트)가 키프레임(셀당 2바이트)보다 작을 때만
+                payload = HEADER.pack(DELTA, snapshot.posture, changed.size, len(snapshot.marks) // 3,
+                                      snapshot.revision, snapshot.ts) + snapshot.marks \
+                    + changed.astype(np.uint8).tobytes() + cells[changed].tobytes()
+        if payload is None:
+            payload = HEADER.pack(KEYFRAME, snapshot.posture, cells.size, len(snapshot.marks) // 3,
+                                  snapshot.revision, snapshot.ts) + snapshot.marks + cells.tobytes()
+        message = snapshot.encoded[key] = ws_frame(payload)
+        return message
+
+    def _rate(self, value) -> float:
+        try:
+            rate = float(value)
+        except (TypeError, ValueError):
+            return self.max_rate
+        return min(self.max_rate, max(MIN_RATE, rate)) if rate == rate else self.max_rate
+
+    # ---------------- 연결 처리 ----------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10.0)
+            lines = request.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {k.strip().lower(): v.strip() for k, v in (l.split(":", 1) for l in lines[1:] if ":" in l)}
+            url = urlsplit(target)
+            if method != "GET":
+                self._reply(writer, "405 Method Not Allowed", b"", "text/plain")
+            elif url.path in ("/", "/index.html"):
+                self._reply(writer, "200 OK", self._page, "text/html; charset=utf-8")
+            elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket" and "sec-websocket-key" in headers:
+                await self._websocket(reader, writer, headers["sec-websocket-key"], parse_qs(url.query))
+            else:
+                self._reply(writer, "404 Not Found", b"", "text/plain")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError,
+                ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _reply(self, writer: asyncio.StreamWriter, status: str, body: bytes, content_type: str):
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                     f"Cache-Control: no-cache\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+
+    async def _websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, key: str, query: Dict):
+        accept = base64.b64encode(hashlib.sha1(key.encode("latin-1") + _WS_GUID).digest()).decode("ascii")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("latin-1"))
+        client = _Client(writer, self._rate(query.get("rate", [self.max_rate])[0]))
+        if self.send_buffer:
+            writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        writer.transport.set_write_buffer_limits(high=self.high_water)
+        writer.write(ws_frame(json.dumps({
+            "type": "hello", "device": self.device, "head": self.head_shape, "body": self.body_shape,
+            "cells": int(np.prod(self.head_shape) + np.prod(self.body_shape)),
+            "value_min": self.config.value_min, "value_max": self.config.value_max,
+            "postures": [p.name for p in Posture], "rate": 1.0 / client.interval, "max_rate": self.max_rate,
+        }).encode(), OP_TEXT))
+        self.clients.add(client)
+        sender = asyncio.create_task(self._send_loop(client))
+        try:
+            await self._read_loop(reader, client)
+        finally:
+            sender.cancel()
+            self.clients.discard(client)
+
+    async def _read_loop(self, reader: asyncio.StreamReader, client: _Client):
+        writer = client.writer
+        try:
+            while True:
+                head = await reader.readexactly(2)
+                opcode, length = head[0] & 0x0F, head[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", await reader.readexactly(8))[0]
+                if length > MAX_CLIENT_MESSAGE:
+                    writer.write(ws_frame(struct.pack("!H", 1009), OP_CLOSE))
+                    return
+                mask = await reader.readexactly(4) if head[1] & 0x80 else b""
+                payload = await reader.readexactly(length)
+                if mask:
+                    payload = _unmask(payload, mask)
+                if opcode == OP_CLOSE:
+                    writer.write(ws_frame(payload[:2], OP_CLOSE))
+                    return
+                if opcode == OP_PING:
+                    writer.write(ws_frame(payload, OP_PONG))
+                elif opcode == OP_TEXT:
+                    self._on_text(client, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+    def _on_text(self, client: _Client, payload: bytes):
+        try:
+            request = json.loads(payload)
+        except ValueError:
+            return
+        if isinstance(request, dict) and "rate" in request:
+            rate = self._rate(request["rate"])
+            client.interval = 1.0 / rate
+            client.writer.write(ws_frame(json.dumps({"type": "rate", "rate": rate}).encode(), OP_TEXT))
+
+    async def _send_loop(self, client: _Client):
+        loop = asyncio.get_running_loop()
+        transport = client.writer.transport
+        while not transport.is_closing():
+            snapshot = self._current
+            if snapshot is None or snapshot.revision == client.revision:
+                await self._changed.wait()
+                continue
+            delay = client.next_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay) # 그 사이에 들어온 스냅숏은 최신 것만 보냄
+                continue
+            if transport.get_write_buffer_size() > self.high_water:
+                # 느린 클라이언트: 더 쌓지 않고 버퍼가 비워지기를 기다림 (이 클라이언트의 태스크만 대기)
+                client.skipped += 1
+                try:
+                    await asyncio.wait_for(client.writer.drain(), self.stall_timeout)
+                except (asyncio.TimeoutError, ConnectionError):
+                    self.disconnected += 1
+                    self.logger.warning(f"Live view client {transport.get_extra_info('peername')} stalled, disconnecting")
+                    transport.abort()
+                    return
+                continue
+            message = self._message(snapshot, client.revision)
+            client.writer.write(message)
+            client.revision = snapshot.revision
+            client.sent += 1
+            client.bytes += len(message)
+            client.next_at = max(client.next_at + client.interval, loop.time())
@@ -1,5 +1,24 @@
-from cli import BedSolutionCLI
+import argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="BedSolution Device")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="Run/Training/Headless 루프를 cProfile + 샘플링 프로파일러로 측정")
+    parser.add_argument("--profile-window", type=float, default=None,
+                        help="프로파일링 구간 (초, 기본값: Settings의 Profiling 설정)")
+    parser.add_argument("--headless", action="store_true",
+                        help="UI 없이 수집/감지/전송만 실행")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="headless 모드 실행 시간 (초)")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    cli = BedSolutionCLI()
-    cli.run()
\ No newline at end of file
+    args = parse_args()
+    from cli import BedSolutionCLI
+    cli = BedSolutionCLI(profile=args.profile, profile_window=args.profile_window)
+    if args.headless:
+        cli.run_headless(args.duration)
+    else:
+        cli.run()
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import List, Optional
+import json
+import os
+
+from ml_utils.label_index import LabelIndex
+
+SIDECAR_SUFFIX = ".labels.json"
+SIDECAR_VERSION = 1
+
+
+def sidecar_path(log_file_path: str) -> str:
+    return log_file_path + SIDECAR_SUFFIX
+
+
+@dataclass
+class CaptureSession:
+    """라벨링된 수집 세션: 피험자/세션 메타데이터 + 자세 라벨 구간."""
+    subject_id: str
+    session_id: str
+    log_file: str
+    notes: str = ""
+    started_at: float = field(default_factory=lambda: datetime.now().timestamp())
+    ended_at: Optional[float] = None
+    labels: LabelIndex = field(default_factory=LabelIndex)
+
+    def finish(self, ts: Optional[float] = None):
+        self.ended_at = ts if ts is not None else datetime.now().timestamp()
+        self.labels.close(self.ended_at)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["labels"] = self.labels.to_list()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CaptureSession":
+        data = dict(data)
+        labels = LabelIndex.from_list(data.pop("labels", []))
+        return cls(labels=labels, **data)
+
+
+def load_sessions(log_file_path: str) -> List[CaptureSession]:
+    path = sidecar_path(log_file_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [CaptureSession.from_dict(s) for s in data.get("sessions", [])]
+
+
+def save_session(session: CaptureSession) -> str:
+    """로그 파일 옆 사이드카(.labels.json)에 세션을 추가 (임시 파일 후 교체)."""
+    sessions = [s for s in load_sessions(session.log_file) if s.session_id != session.session_id]
+    sessions.append(session)
+    path = sidecar_path(session.log_file)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": SIDECAR_VERSION, "sessions": [s.to_dict() for s in sessions]}, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def merged_labels(sessions: List[CaptureSession]) -> LabelIndex:
+    """여러 세션의 라벨 구간을 하나의 인덱스로 병합."""
+    index = LabelIndex()
+    for session in sessions:
+        for start, end, label in session.labels.to_list():
+            index.add(start, float("inf") if end is None else end, label)
+    return index
@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from detection.detection import Posture
+from ml_utils.capture_session import load_sessions, merged_labels
+
+HEAD_SHAPE = (2, 3)
+BODY_SHAPE = (12, 7)
+HEAD_CELLS = HEAD_SHAPE[0] * HEAD_SHAPE[1]
+BODY_CELLS = BODY_SHAPE[0] * BODY_SHAPE[1]
+POSTURE_NAMES = [p.name for p in Posture]
+
+
+def _parse_ts(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _parse_cells(row: Dict[str, str], prefix: str, count: int) -> List[float]:
+    values = []
+    i = 0
+    while len(values) < count and f"{prefix}_{i}" in row:
+        cell = row[f"{prefix}_{i}"].strip()
+        if cell.startswith("["):
+            # 이전 MLLogger 형식: 행 단위 리스트 문자열 ("[1.0, 2.0, 3.0]")
+            values.extend(json.loads(cell))
+        else:
+            values.append(float(cell))
+        i += 1
+    if len(values) != count:
+        raise ValueError(f"expected {count} {prefix} cells, got {len(values)}")
+    return values
+
+
+def csv_row_offsets(path: str) -> np.ndarray:
+    """데이터 행마다 시작 바이트 위치 (헤더 제외, 빈 줄 제외 — 파일을 줄 단위로 읽기만 함)."""
+    offsets = []
+    with open(path, "rb") as f:
+        pos = len(f.readline())
+        for line in f:
+            if line.strip():
+                offsets.append(pos)
+            pos += len(line)
+    return np.array(offsets, dtype=np.int64)
+
+
+def iter_heatmap_csv(path: str, start_offset: Optional[int] = None,
+                     max_rows: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray, np.ndarray, Optional[str]]]:
+    """MLLogger CSV에서 (ts, head, body, posture 컬럼 값 또는 None)을 순회.
+
+    start_offset: csv_row_offsets()의 행 시작 위치부터 읽음 (헤더는 파일 처음에서 읽음), max_rows: 최대 행 수
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if start_offset is not None:
+            reader.fieldnames # 헤더를 먼저 읽은 뒤 이동
+            f.seek(start_offset)
+        for i, row in enumerate(reader):
+            if max_rows is not None and i >= max_rows:
+                return
+            head = np.array(_parse_cells(row, "head", HEAD_CELLS)).reshape(HEAD_SHAPE)
+            body = np.array(_parse_cells(row, "body", BODY_CELLS)).reshape(BODY_SHAPE)
+            yield _parse_ts(row["timestamp"]), head, body, (row.get("posture") or None)
+
+
+def _compact(frames: np.ndarray) -> np.ndarray:
+    """센서 원시값 범위의 정수 프레임(이전 로그의 "512.0" 포함)은 uint16으로, 아니면 그대로."""
+    if frames.size and (frames.min() < 0 or frames.max() > 0xFFFF or not np.array_equal(frames, np.rint(frames))):
+        return frames
+    return frames.astype(np.uint16)
+
+
+def load_frames(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Optional[str]]]:
+    """MLLogger 로그(.csv 또는 .bfc)를 (ts (n,), head (n,2,3), body (n,12,7), labels)로 로드.
+
+    라벨은 `posture` 컬럼 또는 수집 세션 사이드카(.labels.json)의 구간에서 가져옵니다.
+    """
+    if path.endswith(".bfc"):
+        from codec.frame_codec import read_frame_log
+        rows = [(ts, h, b, None) for ts, h, b in read_frame_log(path)]
+    else:
+        rows = list(iter_heatmap_csv(path))
+    if not rows:
+        return np.empty(0), np.empty((0, *HEAD_SHAPE), dtype=np.uint16), np.empty((0, *BODY_SHAPE), dtype=np.uint16), []
+    ts = np.array([r[0] for r in rows], dtype=np.float64)
+    head = _compact(np.stack([r[1] for r in rows]))
+    body = _compact(np.stack([r[2] for r in rows]))
+    labels = [r[3] for r in rows]
+
+    sessions = load_sessions(path)
+    if sessions:
+        codes = merged_labels(sessions).lookup_many(ts, POSTURE_NAMES)
+        labels = [label or (POSTURE_NAMES[c] if c >= 0 else None) for label, c in zip(labels, codes)]
+    return ts, head, body, labels
+
+
+def encode_labels(labels: List[Optional[str]]) -> np.ndarray:
+    """자세 이름 → Posture 값 (라벨 없음은 -1)."""
+    return np.array([Posture[l.upper()].value if l else -1 for l in labels], dtype=np.int64)
+
+
+def _session_ids(path: str, ts: np.ndarray) -> np.ndarray:
+    """프레임별 수집 세션 번호 (세션 밖 프레임은 -1)."""
+    ids = np.full(len(ts), -1, dtype=np.int64)
+    for i, session in enumerate(load_sessions(path)):
+        end = session.ended_at if session.ended_at is not None else np.inf
+        ids[(ts >= session.started_at) & (ts <= end)] = i
+    return ids
+
+
+def export_splits(log_paths: List[str], out_dir: str, val_ratio: float = 0.2, seed: int = 0) -> Dict[str, int]:
+    """라벨된 프레임을 train/val .npz로 내보냄 (head, body, labels, ts, group).
+
+    같은 세션의 프레임이 train/val에 나뉘지 않도록 세션 단위로 분할하며,
+    세션이 하나뿐이면 시간 구간(블록) 단위로 분할합니다.
+    """
+    heads, bodies, labels, stamps, groups = [], [], [], [], []
+    group_offset = 0
+    for path in log_paths:
+        ts, head, body, names = load_frames(path)
+        y = encode_labels(names)
+        group = _session_ids(path, ts)
+        keep = y >= 0
+        heads.append(head[keep]); bodies.append(body[keep]); labels.append(y[keep]); stamps.append(ts[keep])
+        groups.append(np.where(group[keep] >= 0, group[keep] + group_offset, group_offset))
+        group_offset = int(groups[-1].max(initial=group_offset)) + 1
+
+    head, body, y = np.concatenate(heads), np.concatenate(bodies), np.concatenate(labels)
+    ts, group = np.concatenate(stamps), np.concatenate(groups)
+    if len(y) == 0:
+        raise ValueError("라벨이 있는 프레임이 없습니다.")
+
+    unique_groups = np.unique(group)
+    if len(unique_groups) < 2:
+        # 세션이 하나뿐이면 60초 블록 단위로 분할
+        group = ((ts - ts.min()) // 60).astype(np.int64)
+        unique_groups = np.unique(group)
+    rng = np.random.default_rng(seed)
+    n_val = max(1, int(round(len(unique_groups) * val_ratio))) if len(unique_groups) > 1 else 0
+    val_groups = rng.choice(unique_groups, size=n_val, replace=False)
+    is_val = np.isin(group, val_groups)
+
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {}
+    for name, mask in (("train", ~is_val), ("val", is_val)):
+        # 배치 로딩을 위해 압축하지 않은 연속 배열로 저장
+        np.savez(os.path.join(out_dir, f"{name}.npz"),
+                 head=head[mask].astype(np.float32), body=body[mask].astype(np.float32),
+                 labels=y[mask], ts=ts[mask], group=group[mask])
+        counts[name] = int(mask.sum())
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export labeled capture sessions as train/val splits")
+    parser.add_argument("logs", nargs="+", help="MLLogger 로그 파일 (.csv 또는 .bfc)")
+    parser.add_argument("--out", default="dataset", help="출력 디렉터리")
+    parser.add_argument("--val-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    counts = export_splits(args.logs, args.out, args.val_ratio, args.seed)
+    print(f"train: {counts['train']} frames, val: {counts['val']} frames -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
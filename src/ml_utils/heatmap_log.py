@@ -2,6 +2,8 @@ import numpy as np
 from datetime import date
 
 class HeatmapLog:
+    __slots__ = ("head", "body", "date")
+
     def __init__(self, date: date, head: np.ndarray, body: np.ndarray):
         self.head = head
         self.body = body
@@ -15,6 +17,7 @@ class HeatmapLog:
                 'body': [],
             }
         }
-        result['heatmap']['head'] = self.head.tolist()
-        result['heatmap']['body'] = self.body.tolist()
+        # 셀 단위 컬럼(head_i, body_i)으로 저장하도록 1차원으로 평탄화
+        result['heatmap']['head'] = self.head.ravel().tolist()
+        result['heatmap']['body'] = self.body.ravel().tolist()
         return result
\ No newline at end of file
@@ -0,0 +1,73 @@
+from queue import Empty, SimpleQueue
+from typing import List, Optional, Tuple
+import os
+import select
+import sys
+import threading
+import time
+
+# =========TERMIOS IMPORT=============
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+# ===============================
+
+
+class HotkeyListener:
+    """별도 스레드에서 단일 키 입력을 읽어 (누른 시각, 키)를 큐에 넣음.
+
+    수집 루프는 `poll()`로 대기 없이 꺼내기만 하므로 캡처 지연이 생기지 않으며,
+    라벨 시각은 루프가 처리한 시점이 아닌 키를 누른 시점으로 기록됩니다.
+    터미널이 아니면(파이프, Windows 등) 비활성화됩니다.
+    """
+    def __init__(self, keys: str):
+        self.keys = set(keys)
+        self.events: SimpleQueue = SimpleQueue()
+        self.enabled = termios is not None and sys.stdin.isatty()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._saved_attrs = None
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        fd = sys.stdin.fileno()
+        self._saved_attrs = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+        self._thread = threading.Thread(target=self._loop, args=(fd,), name="hotkeys", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._saved_attrs is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved_attrs)
+            self._saved_attrs = None
+
+    def _loop(self, fd: int):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], 0.1)
+            if not ready:
+                continue
+            key = os.read(fd, 1).decode("utf-8", errors="ignore")
+            if key in self.keys:
+                self.events.put((time.time(), key))
+
+    def poll(self) -> List[Tuple[float, str]]:
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except Empty:
+                return events
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,74 @@
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+import math
+
+import numpy as np
+
+
+class LabelIndex:
+    """시간 구간 [start, end) → 자세 라벨 인덱스.
+
+    구간은 시작 시각 순으로 정렬되어 있고 서로 겹치지 않으므로
+    프레임 하나의 라벨 조회는 이진 탐색(O(log n))으로 수행됩니다.
+    """
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.labels: List[str] = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def current(self) -> Optional[str]:
+        """아직 닫히지 않은 마지막 구간의 라벨."""
+        if self.labels and math.isinf(self.ends[-1]):
+            return self.labels[-1]
+        return None
+
+    def add(self, start: float, end: float, label: str):
+        """구간 추가 (기존 구간과 겹치면 ValueError)."""
+        i = bisect_right(self.starts, start)
+        if (i > 0 and self.ends[i - 1] > start) or (i < len(self.starts) and self.starts[i] < end):
+            raise ValueError(f"interval [{start}, {end}) overlaps an existing label")
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.labels.insert(i, label)
+
+    def close(self, ts: float):
+        if self.current is not None:
+            self.ends[-1] = max(ts, self.starts[-1])
+
+    # 라벨 전환: 현재 구간을 ts에서 닫고 새 구간 시작 (label=None이면 라벨 없음 구간)
+    def transition(self, ts: float, label: Optional[str]):
+        self.close(ts)
+        if label is not None:
+            self.add(ts, math.inf, label)
+
+    def lookup(self, ts: float) -> Optional[str]:
+        i = bisect_right(self.starts, ts) - 1
+        if i >= 0 and ts < self.ends[i]:
+            return self.labels[i]
+        return None
+
+    def lookup_many(self, ts: np.ndarray, names: List[str]) -> np.ndarray:
+        """프레임 시각 배열의 라벨을 names 내 인덱스로 반환 (라벨 없음 -1)."""
+        if not self.starts:
+            return np.full(len(ts), -1, dtype=np.int64)
+        starts = np.asarray(self.starts)
+        ends = np.asarray(self.ends)
+        codes = np.array([names.index(l) for l in self.labels], dtype=np.int64)
+        i = np.searchsorted(starts, ts, side="right") - 1
+        valid = i >= 0
+        valid[valid] = ts[valid] < ends[i[valid]]
+        return np.where(valid, codes[np.maximum(i, 0)], -1)
+
+    def to_list(self) -> List[Tuple[float, Optional[float], str]]:
+        return [(s, None if math.isinf(e) else e, l) for s, e, l in zip(self.starts, self.ends, self.labels)]
+
+    @classmethod
+    def from_list(cls, items) -> "LabelIndex":
+        index = cls()
+        for start, end, label in items:
+            index.add(float(start), math.inf if end is None else float(end), label)
+        return index
@@ -4,55 +4,69 @@ from datetime import datetime
 import csv
 import os
 
+FRAME_LOG_EXT = ".bfc" # 키프레임+델타 압축 프레임 로그 (codec.frame_codec)
+DEFAULT_LOG_FILE = "heatmap_log" + FRAME_LOG_EXT # 새 로그는 압축 형식 (.csv로 지정하면 CSV)
+
 class MLLogger:
-    def __init__(self, log_file_path="heatmap_log.csv"):
+    # flush_every: 버퍼가 이 프레임 수에 도달할 때마다 파일에 이어서 기록 (장시간 기록 시 메모리 고정,
+    # 비정상 종료 시에도 마지막 기록 이후 프레임만 유실). None이면 save() 호출 시 한 번에 기록
+    def __init__(self, log_file_path=DEFAULT_LOG_FILE, flush_every: int | None = None):
         self.buffer = []
         self.log_file_path = log_file_path
+        self.flush_every = flush_every
+        self.written = 0 # 파일에 기록한 프레임 수
     
-    def log_heatmap(self, head: np.ndarray, body: np.ndarray):
-        self.buffer.append(HeatmapLog(datetime.now(), head, body))
+    def log_heatmap(self, head: np.ndarray, body: np.ndarray, ts: float | None = None, copy: bool = True):
+        # ts: 스트림 수신 시각 (라벨 구간과 정렬하기 위해 사용)
+        date = datetime.fromtimestamp(ts) if ts is not None else datetime.now()
+        # stream()의 프레임은 다음 프레임에서 재사용되는 뷰이므로 복사하여 보관
+        # (FrameHub 프레임처럼 공유용 복사본이면 copy=False)
+        if copy:
+            head, body = head.copy(), body.copy()
+        self.buffer.append(HeatmapLog(date, head, body))
+        if self.flush_every and len(self.buffer) >= self.flush_every:
+            try:
+                self.save()
+            except Exception:
+                self.buffer.clear() # 기록 실패 시에도 메모리가 늘지 않도록 이번 묶음은 버림
+                raise
 
     def save(self):
         if not self.buffer:
-            return None
+            return self.log_file_path if self.written else None
+
+        if self.log_file_path.endswith(FRAME_LOG_EXT):
+            return self._save_frame_log()
         
         file_exists = os.path.exists(self.log_file_path)
         
         try:
-            with open(self.log_file_path, 'w', newline='', encoding='utf-8') as csvfile:
+            # 기존 파일이 있으면 헤더 없이 이어서 기록
+            with open(self.log_file_path, 'a' if file_exists else 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
                 first_log = self.buffer[0]
-                first_dict = first_log.to_dict()
-                
-                fieldnames = ['timestamp']
-                head_size = len(first_dict['heatmap']['head'])
-
-                for i in range(head_size):
-                    fieldnames.append(f'head_{i}')
-                
-                body_size = len(first_dict['heatmap']['body'])
-                for i in range(body_size):
-                    fieldnames.append(f'body_{i}')
-                
                 if not file_exists:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                
+                    writer.writerow(['timestamp']
+                                    + [f'head_{i}' for i in range(first_log.head.size)]
+                                    + [f'body_{i}' for i in range(first_log.body.size)])
+
+                # 셀 값은 원시 정수(uint16) 그대로 기록 ("512.0" 대신 "512")
                 for heatmap_log in self.buffer:
-                    log_dict = heatmap_log.to_dict()
-                    row_data = {
-                        'timestamp': log_dict['timestamp']
-                    }
-                    for i, value in enumerate(log_dict['heatmap']['head']):
-                        row_data[f'head_{i}'] = value
-                    for i, value in enumerate(log_dict['heatmap']['body']):
-                        row_data[f'body_{i}'] = value
-                    
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writerow(row_data)
+                    writer.writerow([heatmap_log.date.isoformat()]
+                                    + heatmap_log.head.ravel().tolist() + heatmap_log.body.ravel().tolist())
             
+            self.written += len(self.buffer)
             self.buffer.clear()
             return self.log_file_path
             
         except Exception as e:
             raise
-    
\ No newline at end of file
+
+    def _save_frame_log(self):
+        from codec.frame_codec import FrameLogWriter
+        with FrameLogWriter(self.log_file_path) as writer:
+            for heatmap_log in self.buffer:
+                writer.add(heatmap_log.head, heatmap_log.body, heatmap_log.date.timestamp())
+        self.written += len(self.buffer)
+        self.buffer.clear()
+        return self.log_file_path
@@ -0,0 +1,176 @@
+"""NumPy 전용 자세 분류기 (로지스틱 회귀 또는 은닉층 1개 MLP).
+
+학습:
+    python -m ml_utils.posture_model heatmap_log.bfc [--hidden 16] [--out posture_model.npz]
+
+추론은 (특징 표준화 → 행렬곱 → argmax)만 수행하므로 CPU에서 프레임당 수십 us 수준입니다.
+"""
+from typing import Optional, Tuple
+import argparse
+import sys
+
+import numpy as np
+
+from detection.config import DetectionConfig
+from detection.detection import Posture
+
+N_CLASSES = len(Posture)
+
+
+def extract_features(head: np.ndarray, body: np.ndarray, value_min: float, value_max: float) -> np.ndarray:
+    """(..., 2, 3), (..., 12, 7) 프레임 → (..., F) 특징.
+
+    정규화된 90개 셀 + 행/열 합 분포 + 압력 중심(행, 열) + 총 하중 + 활성 셀 비율.
+    """
+    span = max(value_max - value_min, 1e-9)
+    # uint16 원시 프레임에서 바로 빼면 value_min 미만 값이 순환하므로 float64로 넓혀서 계산
+    h = np.clip(np.subtract(head, value_min, dtype=np.float64) / span, 0.0, 1.0)
+    b = np.clip(np.subtract(body, value_min, dtype=np.float64) / span, 0.0, 1.0)
+    lead = b.shape[:-2]
+    cells = np.concatenate([h.reshape(*lead, -1), b.reshape(*lead, -1)], axis=-1)
+
+    total = b.sum(axis=(-1, -2))
+    safe = np.where(total > 0, total, 1.0)
+    rows = b.sum(axis=-1) / safe[..., None]
+    cols = b.sum(axis=-2) / safe[..., None]
+    cop_r = (rows * np.arange(b.shape[-2])).sum(axis=-1) / b.shape[-2]
+    cop_c = (cols * np.arange(b.shape[-1])).sum(axis=-1) / b.shape[-1]
+    active = (b > 0.5).mean(axis=(-1, -2))
+    derived = np.stack([cop_r, cop_c, total / b.shape[-1] / b.shape[-2], active], axis=-1)
+    return np.concatenate([cells, rows, cols, derived], axis=-1)
+
+
+class PostureModel:
+    def __init__(self, mean: np.ndarray, std: np.ndarray, weights: list, value_min: float, value_max: float):
+        self.mean = mean
+        self.std = std
+        self.weights = weights # [(W, b), ...]
+        self.value_min = value_min
+        self.value_max = value_max
+
+    @classmethod
+    def load(cls, path: str) -> "PostureModel":
+        data = np.load(path)
+        layers = int(data["layers"])
+        weights = [(data[f"W{i}"], data[f"b{i}"]) for i in range(layers)]
+        return cls(data["mean"], data["std"], weights, float(data["value_min"]), float(data["value_max"]))
+
+    def save(self, path: str):
+        arrays = {"mean": self.mean, "std": self.std, "layers": np.array(len(self.weights)),
+                  "value_min": np.array(self.value_min), "value_max": np.array(self.value_max)}
+        for i, (W, b) in enumerate(self.weights):
+            arrays[f"W{i}"] = W.astype(np.float32)
+            arrays[f"b{i}"] = b.astype(np.float32)
+        np.savez_compressed(path, **arrays)
+
+    def logits(self, features: np.ndarray) -> np.ndarray:
+        x = (features - self.mean) / self.std
+        for i, (W, b) in enumerate(self.weights):
+            x = x @ W + b
+            if i < len(self.weights) - 1:
+                x = np.maximum(x, 0.0)
+        return x
+
+    def predict_batch(self, head: np.ndarray, body: np.ndarray) -> np.ndarray:
+        return np.argmax(self.logits(extract_features(head, body, self.value_min, self.value_max)), axis=-1)
+
+    def predict(self, head: np.ndarray, body: np.ndarray) -> Posture:
+        return Posture(int(self.predict_batch(head, body)))
+
+
+def train(head: np.ndarray, body: np.ndarray, labels: np.ndarray, config: Optional[DetectionConfig] = None,
+          hidden: int = 0, epochs: int = 300, lr: float = 0.05, l2: float = 1e-4, seed: int = 0) -> PostureModel:
+    """전체 배치 Adam으로 softmax 분류기 학습 (labels < 0 인 프레임은 제외, config 생략 시 기본값)."""
+    config = config or DetectionConfig()
+    keep = labels >= 0
+    X = extract_features(head[keep], body[keep], config.value_min, config.value_max)
+    y = labels[keep]
+    if len(y) == 0:
+        raise ValueError("라벨이 있는 프레임이 없습니다.")
+
+    mean = X.mean(axis=0)
+    std = X.std(axis=0) + 1e-6
+    X = (X - mean) / std
+    Y = np.eye(N_CLASSES)[y]
+
+    rng = np.random.default_rng(seed)
+    sizes = [X.shape[1]] + ([hidden] if hidden > 0 else []) + [N_CLASSES]
+    params = []
+    for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+        params += [rng.normal(0.0, np.sqrt(2.0 / fan_in), (fan_in, fan_out)), np.zeros(fan_out)]
+    m = [np.zeros_like(p) for p in params]
+    v = [np.zeros_like(p) for p in params]
+
+    for step in range(1, epochs + 1):
+        # forward
+        acts = [X]
+        for i in range(0, len(params), 2):
+            z = acts[-1] @ params[i] + params[i + 1]
+            acts.append(np.maximum(z, 0.0) if i < len(params) - 2 else z)
+        logits = acts[-1] - acts[-1].max(axis=1, keepdims=True)
+        prob = np.exp(logits)
+        prob /= prob.sum(axis=1, keepdims=True)
+
+        # backward
+        grad = (prob - Y) / len(y)
+        grads = [None] * len(params)
+        for i in range(len(params) - 2, -1, -2):
+            grads[i] = acts[i // 2].T @ grad + l2 * params[i]
+            grads[i + 1] = grad.sum(axis=0)
+            if i > 0:
+                grad = (grad @ params[i].T) * (acts[i // 2] > 0)
+
+        # Adam
+        for i, g in enumerate(grads):
+            m[i] = 0.9 * m[i] + 0.1 * g
+            v[i] = 0.999 * v[i] + 0.001 * g * g
+            m_hat = m[i] / (1 - 0.9 ** step)
+            v_hat = v[i] / (1 - 0.999 ** step)
+            params[i] -= lr * m_hat / (np.sqrt(v_hat) + 1e-8)
+
+    weights = [(params[i], params[i + 1]) for i in range(0, len(params), 2)]
+    return PostureModel(mean, std, weights, config.value_min, config.value_max)
+
+
+def split(n: int, val_ratio: float = 0.2, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    idx = np.random.default_rng(seed).permutation(n)
+    n_val = int(round(n * val_ratio))
+    return idx[n_val:], idx[:n_val]
+
+
+def main(argv=None) -> int:
+    from config_manager import config_manager
+    from ml_utils.dataset import load_frames, encode_labels
+
+    parser = argparse.ArgumentParser(description="Train the NumPy posture classifier")
+    parser.add_argument("logs", nargs="+", help="MLLogger 로그 파일 (.csv 또는 .bfc, posture 라벨 필요)")
+    parser.add_argument("--out", default="posture_model.npz")
+    parser.add_argument("--hidden", type=int, default=0, help="은닉층 크기 (0이면 로지스틱 회귀)")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--val-ratio", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    heads, bodies, labels = [], [], []
+    for path in args.logs:
+        _, head, body, names = load_frames(path)
+        heads.append(head)
+        bodies.append(body)
+        labels.append(encode_labels(names))
+    head, body, y = np.concatenate(heads), np.concatenate(bodies), np.concatenate(labels)
+    labeled = np.flatnonzero(y >= 0)
+    train_idx, val_idx = split(len(labeled), args.val_ratio)
+    train_idx, val_idx = labeled[train_idx], labeled[val_idx]
+
+    # 특징 정규화 범위(value_min/max)는 실행 중인 감지기와 같은 config.ini [Detection] 값을 사용
+    config = config_manager.get_dataclass("Detection", DetectionConfig)
+    model = train(head[train_idx], body[train_idx], y[train_idx], config, hidden=args.hidden, epochs=args.epochs)
+    model.save(args.out)
+    if len(val_idx):
+        acc = float((model.predict_batch(head[val_idx], body[val_idx]) == y[val_idx]).mean())
+        print(f"validation accuracy: {acc:.3f} ({len(val_idx)} frames)")
+    print(f"saved: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import cProfile
+import pstats
+import io
+import os
+import sys
+import time
+import threading
+import tracemalloc
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def _approx_size(obj: Any) -> int:
+    """컨테이너/배열의 대략적인 메모리 크기(bytes)."""
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            if isinstance(item, np.ndarray):
+                size += int(item.nbytes)
+            elif hasattr(item, "__dict__"):
+                size += sum(_approx_size(v) for v in vars(item).values())
+            else:
+                size += sys.getsizeof(item)
+    elif hasattr(obj, "__dict__"):
+        size += sum(_approx_size(v) for v in vars(obj).values())
+    return size
+
+
+class _StackSampler:
+    """대상 스레드의 콜스택을 주기적으로 샘플링하여 collapsed-stack 형식으로 집계."""
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="profiler-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """Run/Training 루프를 일정 시간(window_sec) 동안 프로파일링.
+
+    - cProfile 결과(.prof)와 샘플링 기반 flamegraph용 collapsed stack(.collapsed) 저장
+    - 누적 시간 기준 상위 N개 함수 요약(.txt) 저장
+    - trace_malloc 사용 시 시작/종료 시점 tracemalloc 스냅샷 비교 결과 저장
+    """
+    def __init__(self, name: str, output_dir: str = "profiles", window_sec: float = 30.0,
+                 top_n: int = 30, sample_interval: float = 0.005, trace_malloc: bool = False):
+        self.name = name
+        self.output_dir = output_dir
+        self.window_sec = window_sec
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.trace_malloc = trace_malloc
+        self.logger = logging.getLogger("profiler")
+
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._start_time = 0.0
+        self._malloc_start: Optional[tracemalloc.Snapshot] = None
+        self._owns_tracemalloc = False # 이 프로파일러가 시작한 추적만 종료 (다른 곳에서 켠 추적은 유지)
+        self._watched: Dict[str, Any] = {}
+        self._watched_start: Dict[str, tuple] = {}
+        self.active = False
+        self.outputs: Dict[str, str] = {}
+
+    # 메모리 증가를 추적할 객체 등록 (FrameBuffer, MLLogger.buffer 등)
+    def watch(self, name: str, obj: Any):
+        self._watched[name] = obj
+        if self.active:
+            self._watched_start[name] = self._measure(obj)
+
+    def _measure(self, obj: Any) -> tuple:
+        length = len(obj) if hasattr(obj, "__len__") else -1
+        return length, _approx_size(obj)
+
+    def start(self):
+        if self.active:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.trace_malloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._owns_tracemalloc = True
+            self._malloc_start = tracemalloc.take_snapshot()
+        self._watched_start = {name: self._measure(obj) for name, obj in self._watched.items()}
+
+        self._sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._start_time = time.monotonic()
+        self.active = True
+        self._profile.enable()
+        self.logger.info(f"Profiling started: {self.name} (window={self.window_sec}s)")
+
+    # 루프에서 매 프레임 호출: 측정 구간이 끝나면 자동 종료
+    def tick(self) -> bool:
+        if self.active and time.monotonic() - self._start_time >= self.window_sec:
+            self.stop()
+        return self.active
+
+    def stop(self) -> Dict[str, str]:
+        if not self.active:
+            return self.outputs
+        self._profile.disable()
+        self._sampler.stop()
+        self.active = False
+        elapsed = time.monotonic() - self._start_time
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.output_dir, f"{self.name}-{stamp}")
+
+        prof_path = f"{base}.prof"
+        self._profile.dump_stats(prof_path)
+        self.outputs["prof"] = prof_path
+
+        collapsed_path = f"{base}.collapsed"
+        self._sampler.write(collapsed_path)
+        self.outputs["collapsed"] = collapsed_path
+
+        summary_path = f"{base}.txt"
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(f"Profile: {self.name}\nWindow: {elapsed:.2f}s\n\n")
+            f.write(self.summary())
+            f.write(self._malloc_report())
+        self.outputs["summary"] = summary_path
+
+        self.logger.info(f"Profiling finished: {self.name} -> {base}.*")
+        return self.outputs
+
+    # 누적 시간 기준 상위 N개 함수
+    def summary(self) -> str:
+        if self._profile is None:
+            return ""
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        return stream.getvalue()
+
+    def _malloc_report(self) -> str:
+        lines: List[str] = []
+        if self._watched:
+            lines.append("\n=== Watched objects (len, approx bytes) ===")
+            for name, obj in self._watched.items():
+                start_len, start_size = self._watched_start.get(name, (-1, 0))
+                end_len, end_size = self._measure(obj)
+                lines.append(f"{name}: len {start_len} -> {end_len}, bytes {start_size} -> {end_size} ({end_size - start_size:+d})")
+
+        if self.trace_malloc and self._malloc_start is not None:
+            end = tracemalloc.take_snapshot()
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+            diff = end.filter_traces(filters).compare_to(self._malloc_start.filter_traces(filters), "lineno")
+            lines.append(f"\n=== tracemalloc top {self.top_n} allocation growth ===")
+            for stat in diff[:self.top_n]:
+                lines.append(str(stat))
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+            self._malloc_start = None
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,104 @@
+"""압축 바이너리 시리얼 프레임 (텍스트 형식과 같은 포트에서 자동 판별).
+
+프레임 구조 (리틀 엔디언):
+    SYNC(0xAA 0x55) | board(uint8, 0~6 → UNO0_~UNO6_) | count(uint8) | values(uint16 x count) | crc(uint16)
+
+crc는 board~values 바이트의 CRC-16/CCITT-FALSE (다항식 0x1021, 초기값 0xFFFF)입니다.
+Arduino 쪽 예시:
+    uint8_t buf[4 + 2 * N + 2] = {0xAA, 0x55, BOARD_ID, N};
+    memcpy(buf + 4, values, 2 * N);                    // uint16_t values[N]
+    uint16_t crc = crc16_ccitt(buf + 2, 2 + 2 * N);     // 0xFFFF 초기값
+    buf[4 + 2 * N] = crc & 0xFF; buf[5 + 2 * N] = crc >> 8;
+    Serial.write(buf, sizeof(buf));
+"""
+from binascii import crc_hqx
+from typing import List, Tuple, Union
+import time
+
+import numpy as np
+
+from serialcm.board import BoardData
+
+SYNC = b"\xaa\x55"
+HEADER_SIZE = 4 # SYNC + board + count
+CRC_SIZE = 2
+MAX_CHANNELS = 32
+MAX_PENDING = 4096 # 구분자 없이 쌓인 바이트가 이 크기를 넘으면 버림
+BOARD_NAMES = [f"UNO{i}_" for i in range(0, 7)]
+VALUE_DTYPE = np.dtype("<u2")
+
+
+def crc16(payload: bytes) -> int:
+    return crc_hqx(payload, 0xFFFF)
+
+
+def encode_frame(board_id: int, values) -> bytes:
+    """보드 번호와 채널 값으로 바이너리 프레임 생성 (시뮬레이터/테스트용)."""
+    values = np.asarray(values, dtype=VALUE_DTYPE)
+    payload = bytes([board_id, len(values)]) + values.tobytes()
+    return SYNC + payload + crc16(payload).to_bytes(2, "little")
+
+
+# feed() 결과: ("text", 줄) | ("frame", BoardData) | ("error", 사유)
+Item = Tuple[str, Union[str, BoardData]]
+
+
+class StreamSplitter:
+    """시리얼 바이트 스트림을 텍스트 줄과 바이너리 프레임으로 분리.
+
+    텍스트 형식은 ASCII만 사용하므로 0xAA 0x55가 먼저 나오면 바이너리 프레임으로,
+    줄바꿈이 먼저 나오면 텍스트 줄로 판단합니다. 길이/보드 번호가 맞지 않거나
+    CRC가 틀린 프레임은 버리고 다음 SYNC부터 다시 찾습니다.
+    """
+    def __init__(self, max_channels: int = MAX_CHANNELS):
+        self.max_channels = max_channels
+        self._buf = bytearray()
+        self.frames = 0
+        self.errors = 0
+
+    def feed(self, chunk: bytes) -> List[Item]:
+        buf = self._buf
+        buf += chunk
+        items: List[Item] = []
+        pos = 0
+        while pos < len(buf):
+            sync = buf.find(SYNC, pos)
+            newline = buf.find(b"\n", pos)
+            if newline != -1 and (sync == -1 or newline < sync):
+                items.append(("text", buf[pos:newline].decode("utf-8", errors="replace")))
+                pos = newline + 1
+                continue
+            if sync == -1:
+                break
+            if buf[pos:sync].strip():
+                # SYNC 앞의 줄바꿈 없는 조각 (끊긴 텍스트 줄 등)
+                self.errors += 1
+                items.append(("error", "unterminated text before frame"))
+            pos = sync
+            if len(buf) < sync + HEADER_SIZE:
+                break
+            board_id, count = buf[sync + 2], buf[sync + 3]
+            if board_id >= len(BOARD_NAMES) or not 0 < count <= self.max_channels:
+                self.errors += 1
+                items.append(("error", f"bad frame header (board={board_id}, count={count})"))
+                pos = sync + 1
+                continue
+            end = sync + HEADER_SIZE + 2 * count + CRC_SIZE
+            if len(buf) < end:
+                break
+            payload = bytes(buf[sync + 2:end - CRC_SIZE])
+            if crc16(payload) != int.from_bytes(buf[end - CRC_SIZE:end], "little"):
+                self.errors += 1
+                items.append(("error", f"crc mismatch for {BOARD_NAMES[board_id]}"))
+                pos = sync + 1
+                continue
+            values = np.frombuffer(payload, dtype=VALUE_DTYPE, count=count, offset=2)
+            self.frames += 1
+            items.append(("frame", BoardData(BOARD_NAMES[board_id], time.time(), None, values)))
+            pos = end
+        del buf[:pos]
+        if len(buf) > MAX_PENDING:
+            self.errors += 1
+            items.append(("error", f"dropped {len(buf)} bytes without line or frame boundary"))
+            buf.clear()
+        return items
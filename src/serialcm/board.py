@@ -1,10 +1,13 @@
 import time
 
 class BoardData:
-    def __init__(self, board: str, receive_time: time, data: dict):
+    def __init__(self, board: str, receive_time: time, data: dict, values=None):
         self.board = board
         self.receive_time = receive_time
         self.data = data
+        self.values = values # 바이너리 프레임: 채널 순서의 uint16 배열 (텍스트 형식은 None)
 
     def __str__(self):
-        return f"BoardData(board={self.board}, receive_time={self.receive_time}, data={self.data})"
\ No newline at end of file
+        if self.values is not None:
+            return f"BoardData(board={self.board}, receive_time={self.receive_time}, values={self.values.tolist()})"
+        return f"BoardData(board={self.board}, receive_time={self.receive_time}, data={self.data})"
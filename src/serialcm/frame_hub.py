@@ -0,0 +1,183 @@
+"""센서 스트림 다중 구독 (pub/sub).
+
+펌프 스레드 하나가 SerialCommunication.stream()을 읽어 프레임을 한 번만 만들고(읽기 전용 복사본),
+모든 구독자가 같은 Frame 객체를 공유합니다. 구독자마다 크기가 제한된 큐와 넘침 정책을 가집니다.
+
+- DROP_OLDEST: 큐가 가득 차면 가장 오래된 프레임을 버림 (화면 표시 등 최신 프레임만 중요한 경우)
+- BLOCK: 큐에 자리가 날 때까지 펌프가 대기 (모든 프레임이 필요한 경우, 느리면 다른 구독자도 지연됨)
+- SAMPLE: 큐가 가득 찬 동안에는 N번째 프레임마다 하나만 받아 가장 오래된 프레임과 교체
+  (뒤처진 소비자가 구간 전체를 잃는 대신 고르게 솎아진 프레임을 받음)
+"""
+from collections import deque
+from enum import Enum
+from typing import Callable, Iterator, List, Optional
+import logging
+import threading
+
+import numpy as np
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+    SAMPLE = "sample"
+
+
+class Frame:
+    """구독자들이 공유하는 프레임 (head/body는 읽기 전용이므로 그대로 보관해도 됨)."""
+    __slots__ = ("revision", "ts", "head", "body")
+
+    def __init__(self, revision: int, ts: float, head: np.ndarray, body: np.ndarray):
+        self.revision = revision
+        self.ts = ts
+        self.head = head
+        self.body = body
+
+
+class Subscription:
+    def __init__(self, hub: "FrameHub", name: str, maxsize: int = 8,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST, every: int = 4):
+        self.hub = hub
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.policy = OverflowPolicy(policy)
+        self.every = max(1, every)
+        self.queue: deque = deque()
+        self.delivered = 0
+        self.dropped = 0
+        self.closed = False
+        self._overflow_count = 0
+        self._cv = threading.Condition()
+
+    def _offer(self, frame: Frame, stop: threading.Event):
+        with self._cv:
+            if len(self.queue) >= self.maxsize:
+                if self.policy == OverflowPolicy.BLOCK:
+                    while len(self.queue) >= self.maxsize and not self.closed and not stop.is_set():
+                        self._cv.wait(0.1)
+                    if self.closed or stop.is_set():
+                        return
+                elif self.policy == OverflowPolicy.SAMPLE:
+                    self._overflow_count += 1
+                    if self._overflow_count % self.every:
+                        self.dropped += 1
+                        return
+                    self.queue.popleft()
+                    self.dropped += 1
+                else:
+                    self.queue.popleft()
+                    self.dropped += 1
+            else:
+                self._overflow_count = 0
+            self.queue.append(frame)
+            self._cv.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """다음 프레임 (timeout 안에 없거나 구독이 닫히면 None)."""
+        with self._cv:
+            if not self.queue and not self.closed:
+                self._cv.wait(timeout)
+            if not self.queue:
+                return None
+            frame = self.queue.popleft()
+            self.delivered += 1
+            self._cv.notify_all()
+            return frame
+
+    def __iter__(self) -> Iterator[Frame]:
+        while not self.closed or self.queue:
+            frame = self.get(0.1)
+            if frame is not None:
+                yield frame
+
+    def close(self):
+        with self._cv:
+            self.closed = True
+            self._cv.notify_all()
+        self.hub.unsubscribe(self)
+
+
+class FrameHub:
+    logger = logging.getLogger("frame_hub")
+
+    def __init__(self, serial_comm, min_interval: float = 0.1, timeout: float = 0.1):
+        self.serial_comm = serial_comm
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.frames = 0
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._consumers: List[threading.Thread] = []
+
+    def subscribe(self, name: str, maxsize: int = 8, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                  every: int = 4) -> Subscription:
+        subscription = Subscription(self, name, maxsize, policy, every)
+        with self._lock:
+            self._subscribers = self._subscribers + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscription]
+
+    def consume(self, name: str, callback: Callable[[Frame], None], maxsize: int = 256,
+                policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST, every: int = 4) -> Subscription:
+        """구독을 만들고 별도 스레드에서 프레임마다 callback 호출 (구독을 닫으면 남은 프레임 처리 후 종료)."""
+        subscription = self.subscribe(name, maxsize, policy, every)
+
+        def run():
+            for frame in subscription:
+                try:
+                    callback(frame)
+                except Exception as e:
+                    self.logger.error(f"Subscriber {name} failed: {e}")
+
+        thread = threading.Thread(target=run, name=f"hub-{name}", daemon=True)
+        self._consumers.append(thread)
+        thread.start()
+        return subscription
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._pump, name="frame-hub", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1.0)
+            self._thread = None
+        for subscription in list(self._subscribers):
+            subscription.close()
+        for thread in self._consumers:
+            thread.join(timeout=5.0)
+        self._consumers = []
+
+    def _pump(self):
+        store = self.serial_comm.store
+        try:
+            for ts, head, body in self.serial_comm.stream(self.min_interval, self.timeout):
+                if self._stop.is_set():
+                    break
+                subscribers = self._subscribers
+                if not subscribers:
+                    continue
+                # 구독자 수와 무관하게 프레임당 한 번만 복사하여 공유
+                head = head.copy()
+                body = body.copy()
+                head.flags.writeable = False
+                body.flags.writeable = False
+                frame = Frame(store.latest().revision, ts, head, body)
+                self.frames += 1
+                for subscription in subscribers:
+                    subscription._offer(frame, self._stop)
+        finally:
+            # 스트림이 끝나면 구독자들의 반복도 (남은 프레임 처리 후) 끝나도록 닫음
+            for subscription in list(self._subscribers):
+                subscription.close()
+
+    def stats(self) -> List[dict]:
+        return [{"name": s.name, "policy": s.policy.value, "queued": len(s.queue),
+                 "delivered": s.delivered, "dropped": s.dropped} for s in self._subscribers]
@@ -0,0 +1,82 @@
+"""리더 스레드 → 소비자 프레임 전달용 트리플 버퍼.
+
+쓰기 쪽(포트 리더 스레드들)은 보드 데이터를 작업 행렬에 반영한 뒤 back 버퍼에 복사하여
+middle과 교체(발행)하고, 읽기 쪽은 새 프레임이 있으면 front와 middle을 교체하여 가져갑니다.
+읽기 쪽이 들고 있는 front 버퍼는 다음 acquire() 전까지 쓰기 쪽이 건드리지 않으므로
+복사 없이 읽기 전용 뷰로 넘길 수 있고, 정상 상태에서는 프레임당 배열 할당이 없습니다.
+
+소비자가 프레임을 다음 acquire() 이후까지 보관하려면 직접 복사해야 합니다.
+"""
+from typing import Optional, Tuple
+import threading
+import time
+
+import numpy as np
+
+# 센서 원시값(0~1023)은 uint16으로 보관 (float64 대비 1/4 크기)
+FRAME_DTYPE = np.dtype(np.uint16)
+
+
+class Snapshot:
+    """발행된 프레임 (head/body는 읽기 전용 뷰, 다음 acquire() 전까지 유효)."""
+    __slots__ = ("revision", "ts", "head", "body")
+
+    def __init__(self, head: np.ndarray, body: np.ndarray):
+        self.revision = 0
+        self.ts = 0.0
+        self.head = head
+        self.body = body
+
+
+class FrameStore:
+    def __init__(self, head_shape: Tuple[int, int] = (2, 3), body_shape: Tuple[int, int] = (12, 7),
+                 dtype=FRAME_DTYPE):
+        # 쓰기 쪽 작업 행렬 (보드별 최신 값, _cv 잠금 하에서만 수정)
+        self.head = np.zeros(head_shape, dtype=dtype)
+        self.body = np.zeros(body_shape, dtype=dtype)
+        self.revision = 0
+
+        self._head_bufs = np.zeros((3, *head_shape), dtype=dtype)
+        self._body_bufs = np.zeros((3, *body_shape), dtype=dtype)
+        self._snapshots = []
+        for i in range(3):
+            head, body = self._head_bufs[i].view(), self._body_bufs[i].view()
+            head.flags.writeable = False
+            body.flags.writeable = False
+            self._snapshots.append(Snapshot(head, body))
+        self._back, self._middle, self._front = 0, 1, 2
+        self._fresh = False
+        self._cv = threading.Condition()
+
+    @property
+    def lock(self) -> threading.Condition:
+        """작업 행렬(head/body)을 수정할 때 잡는 잠금 (수정 후 publish() 호출)."""
+        return self._cv
+
+    def publish(self, ts: Optional[float] = None):
+        """작업 행렬을 back 버퍼에 복사하고 middle과 교체 (lock을 잡은 상태에서 호출)."""
+        b = self._back
+        np.copyto(self._head_bufs[b], self.head)
+        np.copyto(self._body_bufs[b], self.body)
+        self.revision += 1
+        snapshot = self._snapshots[b]
+        snapshot.revision = self.revision
+        snapshot.ts = time.time() if ts is None else ts
+        self._back, self._middle = self._middle, b
+        self._fresh = True
+        self._cv.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """새로 발행된 프레임을 가져옴 (timeout 안에 없으면 None). 이전에 가져온 프레임은 무효가 됨."""
+        with self._cv:
+            if not self._fresh:
+                self._cv.wait(timeout)
+                if not self._fresh:
+                    return None
+            self._front, self._middle = self._middle, self._front
+            self._fresh = False
+            return self._snapshots[self._front]
+
+    def latest(self) -> Snapshot:
+        """마지막으로 acquire()한 프레임."""
+        return self._snapshots[self._front]
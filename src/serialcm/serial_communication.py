@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 import time, re, sys, threading
-from glob import glob
 from serialcm.board import BoardData
+from serialcm.frame_store import FRAME_DTYPE, FrameStore
 import numpy as np
 import logging
 
@@ -11,98 +11,99 @@ try:
 except ImportError:
     sys.exit(1)
 # ===============================
+from serialcm.supervisor import SerialSupervisor
 
 # =========CONSTANTS=============
 BAUD = 9600
 TIMEOUT = 2
+STALE_AFTER = 3.0 # 이 시간(초) 이상 수신이 없는 보드는 stale로 보고 값을 사용하지 않음
 BOARDS = [f"UNO{i}_" for i in range(0, 7)] # UNO0_ ~ UNO6_
 HEAD_BOARD = "UNO0_"
+FRAME_MAX = int(np.iinfo(FRAME_DTYPE).max)
 """
 - UNO0 (무MUX): C0~C5 → A: C0~C2, B: C3~C5  (7칸 폭 '가운데 정렬')
 - UNO1~UNO6 (MUX): A: C0~C6, B: C7~C13
 - 허용 포맷:
   1) UNO{n}_Ck : v
   2) [UNO{n}] Ck=v
+  3) 바이너리 프레임 (serialcm/binary_protocol.py) — 같은 포트에서 자동 판별
 """
 # ===============================
 
 class SerialCommunication:
-    boards = {} # {board: Device}
-    boards_lock = threading.Lock()
-    update_cv = threading.Condition(boards_lock)
-    revision = 0
     communication_logger = logging.getLogger("serial_communication")
     
-    def __init__(self):
-        self.ports = [] # list of serial ports
-        self.threads = [] # list of serial threads
-
+    def __init__(self, baud: int = BAUD, stale_after: float = STALE_AFTER, calibration=None, occupancy=None):
+        # 바이너리 프레임으로 20~50Hz 샘플링 시 115200 이상 권장
+        self.baud = baud
+        self.stale_after = stale_after
+        self.calibration = calibration # calibration.calibration.Calibration (None이면 원시값 그대로)
+        self.occupancy = occupancy # detection.occupancy.OccupancyMonitor (발행할 때마다 재실/이탈 판정)
+        self.supervisor: Optional[SerialSupervisor] = None
+        self.boards: Dict[str, BoardData] = {} # {board: 마지막 수신 데이터}
+        # 리더 스레드가 채우고 stream()이 복사 없이 읽는 트리플 버퍼
+        self.store = FrameStore((2, 3), (12, 7))
+        # 보드별 작업 행렬 내 위치 (A, B 두 행을 채널 순서로 편 뷰)와 텍스트 형식 채널 키
+        self._rows = {board: self.store.head.reshape(-1) if board == HEAD_BOARD else self.store.body[2 * idx - 2:2 * idx].reshape(-1)
+                      for idx, board in enumerate(BOARDS)}
+        self._keys = {board: [f"{board}C{c}" for c in range(len(rows))] for board, rows in self._rows.items()}
+        # 보드별 첫 셀의 전체 셀 번호 (head 6칸 → body 행 우선, 보정 테이블 순서)
+        self._cell_start = {board: 0 if board == HEAD_BOARD else self.store.head.size + (2 * idx - 2) * self.store.body.shape[1]
+                            for idx, board in enumerate(BOARDS)}
+        self.last_stale: Set[str] = set(BOARDS) # stale 또는 아직 수신되지 않은 보드 (감시자가 갱신)
+        self.valid = self.valid_mask(self.last_stale) # (head, body) 셀별 유효 여부, stale 상태가 바뀔 때만 다시 계산
+
+    # 포트 감시자 시작: 끊긴 포트 재연결, 새로 꽂힌 포트 연결, 보드별 링크 상태 집계
     def start(self):
-        if not self._find_ports():
+        if self.supervisor is None:
+            self.supervisor = SerialSupervisor(SerialCommunication._parse, self._publish, baud=self.baud,
+                                               stale_after=self.stale_after, boards=BOARDS, on_stale=self._on_stale)
+        if not self.supervisor.start():
+            self.communication_logger.info("No serial ports found")
+            self.stop()
             return False
-        self._generate_serial_threads()
-
-    def _convert_to_matrix(self, boards: dict) -> (np.ndarray, np.ndarray):
-        # Convert board to matrix (head, body)
-        head = np.zeros((2, 3))
-        body = np.zeros((12, 7))
-
+        return True
+
+    def stop(self):
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            self.supervisor = None
+
+    @property
+    def ports(self) -> list:
+        return sorted(self.supervisor.links) if self.supervisor else []
+
+    def stale_boards(self) -> Set[str]:
+        """stale 또는 아직 한 번도 수신되지 않은 보드."""
+        return set(self.last_stale)
+
+    def valid_mask(self, stale: Optional[Set[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(head, body) 셀별 유효 여부 — stale 보드가 담당하는 행은 False."""
+        stale = self.last_stale if stale is None else stale
+        head = np.ones((2, 3), dtype=bool)
+        body = np.ones((12, 7), dtype=bool)
         for idx, board in enumerate(BOARDS):
-            data = boards.get(board)
-            if not data:
+            if board not in stale:
                 continue
-            data = data.data
-            if not data:
-                continue
-
-            top = 2 * idx
-            bottom = top + 1
-
             if board == HEAD_BOARD:
-                for c in range(3):
-                    val = data.get(f"{board}C{c}")
-                    if val:
-                        head[top][c] = val
-                for c in range(3):
-                    val = data.get(f"{board}C{3 + c}")
-                    if val:
-                        head[bottom][c] = val
+                head[:] = False
             else:
-                for c in range(7):
-                    val = data.get(f"{board}C{c}")
-                    if val:
-                        body[top-2][c] = val
-                for c in range(7):
-                    val = data.get(f"{board}C{7 + c}")
-                    if val:
-                        body[bottom-2][c] = val
+                body[2 * idx - 2:2 * idx] = False
         return head, body
 
+    # head/body는 읽기 전용 뷰이며 다음 프레임을 요청하기 전까지만 유효 (보관하려면 복사)
     def stream(self, min_interval: float = 0.1, timeout: float = 0.1) -> (time.time, np.ndarray, np.ndarray):
-        last_rev = -1
         last_emit = 0.0
         while True:
-            with self.update_cv:
-                # Wait for update
-                self.update_cv.wait(timeout=timeout)
-                rev_now = self.revision
-                board_snapshot = SerialCommunication.boards
-                now = time.time()
-
-            if rev_now == last_rev and (now-last_emit) < min_interval:
-                continue
-
-            head, body = self._convert_to_matrix(board_snapshot)
-            last_rev = rev_now
+            snapshot = self.store.acquire(timeout)
+            now = time.time()
+            if snapshot is None:
+                if now - last_emit < min_interval:
+                    continue
+                # 새 데이터가 없어도 min_interval마다 마지막 프레임을 다시 전달
+                snapshot = self.store.latest()
             last_emit = now
-            yield now, head, body
-            
-    
-    # Find serial ports connected with arduino
-    def _find_ports(self) -> list:
-        self.ports = sorted(glob("/dev/ttyACM*") + glob("/dev/ttyUSB*"))
-        self.communication_logger.info(f"Found {len(self.ports)} ports")
-        return self.ports
+            yield now, snapshot.head, snapshot.body
 
     @staticmethod
     def _parse(line: str, port: str) -> Optional[BoardData]:
@@ -140,47 +141,41 @@ class SerialCommunication:
         SerialCommunication.communication_logger.warning(f"Failed to parse line from {port}: {line}")
         return None
 
-    # Serial thread for reading data from arduino
-    @staticmethod
-    def _serial_thread(port):
-        SerialCommunication.communication_logger.info(f"Starting serial thread for {port}")
-        try:
-            s = serial.Serial(port, BAUD, timeout=TIMEOUT)
-            SerialCommunication.communication_logger.info(f"Serial connection established for {port}")
-            time.sleep(2.0) # wait for arduino to reset
-            s.reset_input_buffer()
-            SerialCommunication.communication_logger.info(f"Input buffer reset for {port}")
-
-            while True:
-                line = s.readline()
-                if not line:
-                    continue
-                try:
-                    line = line.decode("utf-8").strip()
-                except UnicodeDecodeError:
-                    # non utf-8 line
-                    SerialCommunication.communication_logger.warning(f"Unicode decode error for {port}: {line}")
-                    continue
-                except Exception as e:
-                    # other errors
-                    SerialCommunication.communication_logger.error(f"Error decoding line from {port}: {e}")
-                    continue
-
-                data = SerialCommunication._parse(line, port)
-                if not data:
-                    continue
-                with SerialCommunication.update_cv:
-                    SerialCommunication.boards[data.board] = data
-                    SerialCommunication.revision += 1
-                    SerialCommunication.update_cv.notify_all()
-                    SerialCommunication.communication_logger.debug(f"Device data updated for {data.board}: {data.data}")
-        except Exception as e:
-            SerialCommunication.communication_logger.error(f"Serial thread error for {port}: {e}")
-            pass
-
-    def _generate_serial_threads(self):
-        for port in self.ports:
-            new_thread = threading.Thread(target=SerialCommunication._serial_thread, args=(port,), daemon=True)
-            self.threads.append(new_thread)
-            self.communication_logger.info(f"Started thread for {port}")
-            new_thread.start()
\ No newline at end of file
+    # 리더 스레드에서 파싱된 보드 데이터를 작업 행렬에 반영하고 발행
+    def _publish(self, data: BoardData):
+        rows = self._rows[data.board]
+        with self.store.lock:
+            self.boards[data.board] = data
+            if data.values is not None:
+                n = min(len(rows), len(data.values))
+                rows[:n] = data.values[:n]
+            else:
+                # 텍스트 형식: 줄에 없는 채널은 0 (이전 동작과 동일), uint16 범위를 벗어난 값은 잘라냄
+                for c, key in enumerate(self._keys[data.board]):
+                    rows[c] = min(max(data.data.get(key, 0), 0), FRAME_MAX)
+            if self.calibration is not None:
+                # 셀별 조회 테이블로 제자리 보정 (미리 할당한 인덱스 버퍼 + np.take, 보정 모델과 무관하게 일정한 비용)
+                self.calibration.apply_cells(rows, self._cell_start[data.board], rows)
+            self.store.publish()
+            # 재실/이탈 빠른 경로: 평활화/stream() 폴링을 거치지 않고 조립된 프레임에서 바로 판정
+            # (stale/미수신 보드의 0으로 채운 행을 빈 침대로 읽지 않도록 partial로 알림)
+            occupancy, event = self.occupancy, None
+            if occupancy is not None:
+                event = occupancy.update(self.store.head, self.store.body, time.time(), self.store.revision,
+                                         partial=bool(self.last_stale))
+        # 알림 훅은 잠금 밖에서 호출 (다른 리더 스레드의 발행을 막지 않음)
+        if event is not None:
+            event["stale"] = sorted(b.rstrip("_") for b in self.last_stale)
+            occupancy.emit(event)
+        self.communication_logger.debug(f"Device data updated for {data.board}")
+
+    # 감시자에서 stale 보드 목록이 바뀔 때 호출: 마지막 값에 멈춘 행을 0으로 지우고 발행
+    def _on_stale(self, stale: Set[str]):
+        newly_stale = stale - self.last_stale
+        self.last_stale = stale
+        self.valid = self.valid_mask(stale)
+        if newly_stale:
+            with self.store.lock:
+                for board in newly_stale:
+                    self._rows[board][:] = 0
+                self.store.publish()
@@ -0,0 +1,256 @@
+from dataclasses import dataclass, field
+from glob import glob
+from typing import Callable, Dict, List, Optional, Set
+import logging
+import os
+import random
+import threading
+import time
+
+import serial
+
+from serialcm.binary_protocol import StreamSplitter
+from serialcm.board import BoardData
+
+PORT_PATTERNS = ("/dev/ttyACM*", "/dev/ttyUSB*")
+
+
+@dataclass
+class LinkStats:
+    """보드(또는 아직 식별되지 않은 포트)별 링크 상태."""
+    port: str
+    boards: Set[str] = field(default_factory=set)
+    connected: bool = False
+    lines: int = 0
+    parse_errors: int = 0
+    reconnects: int = 0
+    last_seen: float = 0.0 # 마지막으로 파싱에 성공한 시각
+    line_rate: float = 0.0 # 최근 구간의 초당 파싱 성공 줄 수
+    error_rate: float = 0.0 # 최근 구간의 파싱 실패 비율
+    last_error: str = ""
+    protocol: str = "" # 마지막으로 수신한 형식: text | binary
+    _window_start: float = 0.0
+    _window_lines: int = 0
+    _window_errors: int = 0
+
+    def record(self, now: float, ok: bool, window: float):
+        if ok:
+            self.lines += 1
+            self._window_lines += 1
+            self.last_seen = now
+        else:
+            self.parse_errors += 1
+            self._window_errors += 1
+        elapsed = now - self._window_start
+        if elapsed >= window:
+            total = self._window_lines + self._window_errors
+            self.line_rate = self._window_lines / elapsed
+            self.error_rate = self._window_errors / total if total else 0.0
+            self._window_start, self._window_lines, self._window_errors = now, 0, 0
+
+    def age(self, now: float) -> float:
+        return now - self.last_seen if self.last_seen else float("inf")
+
+
+class SerialSupervisor:
+    """시리얼 포트 감시자.
+
+    - 포트마다 리더 스레드를 두고, 케이블 순단 등으로 끊기면 지수 백오프로 다시 연결
+    - 주기적으로 /dev/ttyACM*, /dev/ttyUSB*를 다시 스캔하여 새로 꽂힌 포트를 연결
+    - 포트에서 처음 파싱된 줄로 어떤 UNOn 보드가 연결되어 있는지 식별
+      (열 때 DTR을 내려 보드 리셋을 피하고, 고정 2초 대기 대신 첫 유효 줄을 기다림)
+    - 보드별 줄 수신률/파싱 실패율/마지막 수신 경과 시간을 집계하고
+      stale_after초 이상 수신이 없는 보드를 stale로 표시
+    """
+    logger = logging.getLogger("serial_supervisor")
+
+    def __init__(self, parse: Callable[[str, str], Optional[BoardData]], publish: Callable[[BoardData], None],
+                 baud: int = 9600, read_timeout: float = 0.5, stale_after: float = 3.0,
+                 rescan_interval: float = 2.0, backoff_initial: float = 0.5, backoff_max: float = 30.0,
+                 rate_window: float = 5.0, patterns=PORT_PATTERNS, boards: Optional[List[str]] = None,
+                 on_stale: Optional[Callable[[Set[str]], None]] = None):
+        self.parse = parse
+        self.publish = publish
+        self.boards = boards # 기대하는 보드 목록 (한 번도 수신되지 않은 보드도 stale로 보고)
+        self.on_stale = on_stale # stale 보드 집합이 바뀔 때 호출
+        self.baud = baud
+        self.read_timeout = read_timeout
+        self.stale_after = stale_after
+        self.rescan_interval = rescan_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.rate_window = rate_window
+        self.patterns = patterns
+
+        self.links: Dict[str, LinkStats] = {} # {port: LinkStats}
+        self.board_ports: Dict[str, str] = {} # {board: port}
+        self._workers: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stale: Set[str] = set(boards or [])
+        self._stale_lock = threading.Lock()
+
+    def scan(self) -> List[str]:
+        return sorted(p for pattern in self.patterns for p in glob(pattern))
+
+    def start(self) -> bool:
+        """포트를 스캔하여 리더를 시작 (포트가 하나도 없으면 False, 이후 핫플러그는 계속 감시)."""
+        ports = self._rescan()
+        self._thread = threading.Thread(target=self._monitor, name="serial-supervisor", daemon=True)
+        self._thread.start()
+        return bool(ports)
+
+    def stop(self):
+        self._stop.set()
+        for worker in list(self._workers.values()) + ([self._thread] if self._thread else []):
+            worker.join(timeout=self.read_timeout + 1.0)
+
+    def _rescan(self) -> List[str]:
+        ports = self.scan()
+        with self._lock:
+            for port in ports:
+                worker = self._workers.get(port)
+                if worker is not None and worker.is_alive():
+                    continue
+                self.links.setdefault(port, LinkStats(port))
+                worker = threading.Thread(target=self._port_worker, args=(port,), name=f"serial-{port}", daemon=True)
+                self._workers[port] = worker
+                self.logger.info(f"Starting reader for {port}")
+                worker.start()
+        return ports
+
+    def _monitor(self):
+        next_rescan = 0.0
+        while not self._stop.wait(self.stale_after / 4):
+            if time.monotonic() >= next_rescan:
+                next_rescan = time.monotonic() + self.rescan_interval
+                self._rescan()
+            self._update_stale()
+
+    def _update_stale(self):
+        with self._stale_lock:
+            stale = self.stale_boards(self.boards)
+            if stale == self._stale:
+                return
+            for board in stale - self._stale:
+                if board in self.board_ports:
+                    self.logger.warning(f"{board} is stale (no data for {self.stale_after:.1f}s)")
+            for board in self._stale - stale:
+                self.logger.info(f"{board} receiving data")
+            self._stale = stale
+            if self.on_stale is not None:
+                self.on_stale(stale)
+
+    def _open(self, port: str) -> serial.Serial:
+        link = serial.Serial()
+        link.port = port
+        link.baudrate = self.baud
+        link.timeout = self.read_timeout
+        link.dtr = False # 열 때 DTR 토글로 인한 Arduino 리셋 방지 (리셋되더라도 첫 유효 줄까지 대기)
+        link.open()
+        link.reset_input_buffer()
+        return link
+
+    def _port_worker(self, port: str):
+        stats = self.links[port]
+        backoff = self.backoff_initial
+        while not self._stop.is_set() and os.path.exists(port):
+            try:
+                link = self._open(port)
+            except (serial.SerialException, OSError) as e:
+                stats.last_error = str(e)
+                self.logger.warning(f"Failed to open {port}: {e} (retry in {backoff:.1f}s)")
+            else:
+                stats.connected = True
+                self.logger.info(f"Serial connection established for {port}")
+                lines_before = stats.lines
+                try:
+                    self._read_loop(port, link, stats)
+                except (serial.SerialException, OSError) as e:
+                    stats.last_error = str(e)
+                    self.logger.warning(f"Serial link lost on {port}: {e}")
+                finally:
+                    stats.connected = False
+                    link.close()
+                if self._stop.is_set():
+                    break
+                stats.reconnects += 1
+                if stats.lines > lines_before:
+                    backoff = self.backoff_initial # 데이터를 받은 연결이었으면 백오프 초기화
+            # 여러 포트가 동시에 재연결을 시도하지 않도록 지터 추가
+            self._stop.wait(backoff * random.uniform(0.8, 1.2))
+            backoff = min(backoff * 2, self.backoff_max)
+        self.logger.info(f"Reader for {port} stopped")
+
+    def _read_loop(self, port: str, link: serial.Serial, stats: LinkStats):
+        # 줄 단위가 아닌 바이트 단위로 읽어 텍스트 줄과 바이너리 프레임을 함께 처리
+        splitter = StreamSplitter()
+        while not self._stop.is_set():
+            chunk = link.read(max(1, link.in_waiting))
+            if not chunk:
+                continue
+            now = time.time()
+            for kind, item in splitter.feed(chunk):
+                if kind == "text":
+                    line = item.strip()
+                    if not line:
+                        continue
+                    data = self.parse(line, port)
+                elif kind == "frame":
+                    data = item
+                else:
+                    self.logger.debug(f"Discarded data from {port}: {item}")
+                    data = None
+                stats.record(now, data is not None, self.rate_window)
+                if data is None:
+                    continue
+                stats.protocol = kind if kind == "text" else "binary"
+                if data.board not in stats.boards:
+                    self._identify(port, data.board)
+                self.publish(data)
+
+    def _identify(self, port: str, board: str):
+        with self._lock:
+            previous = self.board_ports.get(board)
+            if previous is not None and previous != port:
+                self.links[previous].boards.discard(board)
+            self.board_ports[board] = port
+            self.links[port].boards.add(board)
+        self.logger.info(f"{port} identified as {board}")
+        self._update_stale()
+
+    def board_stats(self, board: str) -> Optional[LinkStats]:
+        port = self.board_ports.get(board)
+        return self.links.get(port) if port else None
+
+    def stale_boards(self, boards: Optional[List[str]] = None, now: Optional[float] = None) -> Set[str]:
+        """stale_after초 이상 수신이 없는 보드 (boards를 주면 한 번도 식별되지 않은 보드도 포함)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            known = dict(self.board_ports)
+        candidates = boards if boards is not None else list(known)
+        stale = set()
+        for board in candidates:
+            port = known.get(board)
+            if port is None or self.links[port].age(now) > self.stale_after:
+                stale.add(board)
+        return stale
+
+    def health(self) -> List[dict]:
+        """포트별 상태 요약 (UI/로그용)."""
+        now = time.time()
+        with self._lock:
+            links = list(self.links.values())
+        return [{
+            "port": s.port,
+            "boards": sorted(s.boards),
+            "connected": s.connected,
+            "line_rate": s.line_rate,
+            "error_rate": s.error_rate,
+            "age": s.age(now),
+            "reconnects": s.reconnects,
+            "stale": s.age(now) > self.stale_after,
+            "last_error": s.last_error,
+            "protocol": s.protocol,
+        } for s in sorted(links, key=lambda s: s.port)]